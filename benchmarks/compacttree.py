@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2017 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+# \file compacttree.py
+# benchmark of memory used by loaded components
+#
+# usage: python benchmarks/compacttree.py [number of components]
+
+""" benchmark of memory used by loaded components """
+
+import os
+import sys
+import time
+import resource
+import multiprocessing
+
+
+# provides the resident memory of the process
+# \returns memory in MB
+def memory():
+    try:
+        with open("/proc/self/statm") as fl:
+            return int(fl.read().split()[1]) \
+                * resource.getpagesize() / 1024. / 1024.
+    except (IOError, OSError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.
+
+
+# loads the components into the component list
+# \param args (xml strings, number of components, compact) tuple
+# \returns (load time in seconds, memory in MB, open time in seconds) tuple
+def load(args):
+    xmls, number, compact = args
+    from PyQt5.QtWidgets import QApplication
+    from nxsconfigtool.ComponentList import ComponentList
+    app = QApplication([])
+    cpList = ComponentList("components")
+    cpList.compact = compact
+    components = []
+    start = memory()
+    begin = time.time()
+    for i in range(number):
+        cp = cpList.createElement("cp%s" % i)
+        cp.set(xmls[i % len(xmls)])
+        components.append(cp)
+    loaded = time.time() - begin
+    used = memory() - start
+    begin = time.time()
+    for cp in components[:100]:
+        cp.createGUI()
+        cp.view.model().rowCount(cp.view.model().rootIndex)
+    opened = (time.time() - begin) / 100
+    app.quit()
+    return loaded, used, opened
+
+
+# loads the components in a separate process
+# \param xmls component xml strings
+# \param number number of components
+# \param compact if compact trees are used
+# \returns (load time in seconds, memory in MB, open time in seconds) tuple
+def measure(xmls, number, compact):
+    pool = multiprocessing.Pool(1)
+    try:
+        return pool.map(load, [(xmls, number, compact)])[0]
+    finally:
+        pool.close()
+        pool.join()
+
+
+def main():
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    xmls = []
+    for fname in sorted(os.listdir("components")):
+        if fname.endswith(".xml"):
+            with open(os.path.join("components", fname)) as fl:
+                xmls.append(fl.read())
+    print("%12s %12s %16s %14s" % (
+        "mode", "load [s]", "MB/1000 comps", "open [ms]"))
+    for compact in [False, True]:
+        loaded, used, opened = measure(xmls, number, compact)
+        print("%12s %12.3f %16.1f %14.2f" % (
+            "compact" if compact else "DOM", loaded,
+            used * 1000. / number, opened * 1000))
+
+
+if __name__ == "__main__":
+    main()
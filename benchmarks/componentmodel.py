@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2017 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+# \file componentmodel.py
+# benchmark of component model traversal
+#
+# usage: python benchmarks/componentmodel.py [component files]
+
+""" benchmark of component model traversal """
+
+import os
+import sys
+import time
+
+from PyQt5.QtCore import QModelIndex
+from PyQt5.QtXml import QDomDocument
+
+from nxsconfigtool.ComponentModel import ComponentModel
+
+
+# reads the component document
+# \param fname file name
+# \returns DOM document
+def readDocument(fname):
+    doc = QDomDocument()
+    with open(fname, "rb") as fl:
+        if not doc.setContent(fl.read()):
+            raise ValueError("cannot parse %s" % fname)
+    return doc
+
+
+# creates a document with a group of fields
+# \param nfields number of fields
+# \returns DOM document
+def createDocument(nfields):
+    doc = QDomDocument()
+    definition = doc.createElement("definition")
+    doc.appendChild(definition)
+    group = doc.createElement("group")
+    group.setAttribute("type", "NXentry")
+    group.setAttribute("name", "entry")
+    definition.appendChild(group)
+    for i in range(nfields):
+        field = doc.createElement("field")
+        field.setAttribute("name", "field%s" % i)
+        field.setAttribute("type", "NX_FLOAT")
+        group.appendChild(field)
+    return doc
+
+
+# visits all model indices as a view does when the tree is expanded
+# \param model component model
+# \param parent parent index
+# \returns number of visited indices
+def traverse(model, parent):
+    count = 0
+    for row in range(model.rowCount(parent)):
+        index = model.index(row, 0, parent)
+        model.parent(index)
+        model.data(index)
+        count += 1 + traverse(model, index)
+    return count
+
+
+# measures traversal time of the model
+# \param doc DOM document
+# \returns (number of indices, first time, repaint time) tuple
+#          with times in seconds
+def measure(doc):
+    model = ComponentModel(doc, [])
+    start = time.time()
+    count = traverse(model, QModelIndex())
+    first = time.time() - start
+    start = time.time()
+    traverse(model, QModelIndex())
+    return count, first, time.time() - start
+
+
+def main():
+    fnames = sys.argv[1:] or [
+        os.path.join("components", fname)
+        for fname in sorted(os.listdir("components"))
+        if fname.endswith(".xml")]
+    print("%30s %10s %12s %12s" % (
+        "component", "indices", "first [s]", "repaint [s]"))
+    for fname in fnames:
+        print("%30s %10s %12.4f %12.4f" % (
+            (os.path.basename(fname),) + measure(readDocument(fname))))
+    for nfields in [100, 500, 1000, 2000]:
+        print("%30s %10s %12.4f %12.4f" % (
+            ("%s fields" % nfields,) + measure(createDocument(nfields))))
+
+
+if __name__ == "__main__":
+    main()
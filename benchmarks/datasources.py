@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2017 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+# \file datasources.py
+# benchmark of setting datasources in the datasource list
+#
+# usage: python benchmarks/datasources.py [number of datasources]
+
+""" benchmark of setting datasources in the datasource list """
+
+import sys
+import tempfile
+import shutil
+import time
+
+from PyQt5.QtWidgets import QApplication
+
+from nxsconfigtool.DataSourceList import DataSourceList
+
+
+# datasource XML templates
+TEMPLATES = [
+    '<definition><datasource type="CLIENT" name="%s">'
+    '<record name="%s"/></datasource></definition>',
+    '<definition><datasource type="TANGO" name="%s">'
+    '<device name="p09/motor/exp.01" member="attribute"/>'
+    '<record name="%s"/></datasource></definition>',
+    '<definition><datasource type="DB" name="%s">'
+    '<database dbname="tango" dbtype="MYSQL"/>'
+    '<query format="SCALAR">SELECT %s</query></datasource></definition>',
+    '<definition><datasource type="PYEVAL" name="%s">'
+    '<result name="result">ds.result = "%s"</result>'
+    '</datasource></definition>'
+]
+
+
+# creates datasources
+# \param nds number of datasources
+# \returns dictionary with datasources, i.e. name : xml
+def createDataSources(nds):
+    return dict(("ds%s" % i, TEMPLATES[i % len(TEMPLATES)] % (i, i))
+                for i in range(nds))
+
+
+def main():
+    nds = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    app = QApplication([])
+    directory = tempfile.mkdtemp()
+    try:
+        datasources = createDataSources(nds)
+        widgets = len(app.allWidgets())
+        dslist = DataSourceList(directory)
+        dslist.createGUI()
+        start = time.time()
+        dslist.setList(datasources)
+        total = time.time() - start
+        app.processEvents()
+        widgets = len(app.allWidgets()) - widgets
+
+        start = time.time()
+        xml = [el.instance.get() for el in dslist.elements.values()]
+        serialized = time.time() - start
+        dslist.close()
+    finally:
+        shutil.rmtree(directory)
+
+    print("%-25s %12s" % ("datasources", len(xml)))
+    print("%-25s %12.4f" % ("setList [s]", total))
+    print("%-25s %12.2f" % ("per datasource [ms]", 1000. * total / nds))
+    print("%-25s %12.4f" % ("get [s]", serialized))
+    print("%-25s %12s" % ("widgets", widgets))
+    print("%-25s %12.2f" % ("widgets per datasource", float(widgets) / nds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2017 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+# \file largecomponent.py
+# benchmark of loading large components
+#
+# usage: python benchmarks/largecomponent.py [sizes in MB]
+
+""" benchmark of loading large components """
+
+import sys
+import time
+import resource
+import multiprocessing
+
+from PyQt5.QtCore import QModelIndex
+
+from nxsconfigtool.ComponentModel import ComponentModel
+from nxsconfigtool.ElementData import parseComponent
+from nxsconfigtool.LazyDocument import LazyDocument
+
+
+# creates a component source of the given size
+# \param size size in MB
+# \returns xml bytes
+def createSource(size):
+    field = '<field name="f%s" type="NX_FLOAT" units="mm">' \
+        '<strategy mode="STEP"/><datasource type="CLIENT" name="ds%s">' \
+        '<record name="r%s"/></datasource></field>'
+    groups = []
+    length = 0
+    while length < size * 1024 * 1024:
+        group = '<group type="NXcollection" name="g%s">%s</group>' % (
+            len(groups), "".join(field % (i, i, i) for i in range(100)))
+        groups.append(group)
+        length += len(group)
+    return ('<?xml version="1.0"?><definition>'
+            '<group type="NXentry" name="entry">%s</group></definition>'
+            % "".join(groups)).encode("utf-8")
+
+
+# loads the component and shows its top levels
+# \param args (source, streamed) tuple
+# \returns (load time in seconds, peak memory in MB) tuple
+def load(args):
+    source, streamed = args
+    start = time.time()
+    if streamed:
+        lazy = LazyDocument(source, 3)
+        model = ComponentModel(lazy.load(), [], lazy=lazy)
+    else:
+        model = ComponentModel(parseComponent(source), [])
+    definition = model.index(0, 0, model.index(0, 0, QModelIndex()))
+    model.rowCount(model.index(0, 0, definition))
+    return (time.time() - start,
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.)
+
+
+# loads the component in a separate process
+# \param source xml bytes
+# \param streamed if the streaming loader is used
+# \returns (load time in seconds, peak memory in MB) tuple
+def measure(source, streamed):
+    pool = multiprocessing.Pool(1)
+    try:
+        return pool.map(load, [(source, streamed)])[0]
+    finally:
+        pool.close()
+        pool.join()
+
+
+def main():
+    sizes = [float(size) for size in sys.argv[1:]] or [1, 10, 50]
+    print("%10s %12s %12s %12s %12s" % (
+        "size [MB]", "full [s]", "full [MB]", "stream [s]", "stream [MB]"))
+    for size in sizes:
+        source = createSource(size)
+        print("%10s %12.3f %12.1f %12.3f %12.1f" % (
+            (size,) + measure(source, False) + measure(source, True)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2017 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+# \file merger.py
+# benchmark of component merging versus the number of siblings
+#
+# usage: python benchmarks/merger.py [sibling counts]
+
+""" benchmark of component merging """
+
+import sys
+import time
+
+from PyQt5.QtXml import QDomDocument
+
+from nxsconfigtool.Merger import Merger
+
+
+# creates a document with a group of fields
+# \param nfields number of different fields
+# \param duplicates number of fields defined twice
+# \returns DOM document
+def createDocument(nfields, duplicates=10):
+    doc = QDomDocument()
+    definition = doc.createElement("definition")
+    doc.appendChild(definition)
+    group = doc.createElement("group")
+    group.setAttribute("type", "NXentry")
+    group.setAttribute("name", "entry")
+    definition.appendChild(group)
+    for i in list(range(nfields)) + list(range(min(duplicates, nfields))):
+        field = doc.createElement("field")
+        field.setAttribute("name", "field%s" % i)
+        field.setAttribute("type", "NX_FLOAT")
+        field.setAttribute("units", "mm")
+        strategy = doc.createElement("strategy")
+        strategy.setAttribute("mode", "STEP")
+        field.appendChild(strategy)
+        group.appendChild(field)
+    return doc
+
+
+# measures merging time
+# \param nfields number of siblings
+# \returns merging time in seconds
+def measure(nfields):
+    doc = createDocument(nfields)
+    merger = Merger(doc)
+    start = time.time()
+    merger.run()
+    duration = time.time() - start
+    if merger.exception is not None:
+        raise merger.exception
+    return duration
+
+
+def main():
+    counts = [int(arg) for arg in sys.argv[1:]] \
+        or [10, 50, 100, 200, 500, 1000, 2000]
+    print("%10s %12s" % ("siblings", "time [s]"))
+    for nfields in counts:
+        print("%10s %12.4f" % (nfields, measure(nfields)))
+
+
+if __name__ == "__main__":
+    main()
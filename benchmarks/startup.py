@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2017 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+# \file startup.py
+# benchmark of the application startup
+#
+# usage: python benchmarks/startup.py [number of runs]
+#
+# Forms precompiled by "python setup.py build_py" are used if they exist
+
+""" benchmark of the application startup """
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+
+# source directory
+SOURCEDIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# script measuring import and creation of the main window
+WINDOW = """
+import sys
+import time
+start = time.time()
+from PyQt5.QtWidgets import QApplication
+from nxsconfigtool.MainWindow import MainWindow
+imported = time.time()
+app = QApplication([])
+app.setOrganizationName("nxsdesigner-benchmark")
+form = MainWindow(sys.argv[1], sys.argv[2])
+form.show()
+app.processEvents()
+print("%s %s" % (imported - start, time.time() - imported))
+"""
+
+
+# runs the command
+# \param args command arguments
+# \returns (wall time in seconds, output) tuple
+def run(args):
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        [SOURCEDIR] + ([env["PYTHONPATH"]] if env.get("PYTHONPATH") else []))
+    start = time.time()
+    output = subprocess.check_output(args, cwd=SOURCEDIR, env=env)
+    return time.time() - start, output.decode("utf-8")
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    directory = tempfile.mkdtemp()
+    try:
+        for name in ["components", "datasources"]:
+            os.mkdir(os.path.join(directory, name))
+        version = []
+        imports = []
+        windows = []
+        for _ in range(runs):
+            version.append(run([sys.executable,
+                                os.path.join(SOURCEDIR, "nxsdesigner"),
+                                "--version"])[0])
+            output = run([sys.executable, "-c", WINDOW,
+                          os.path.join(directory, "components"),
+                          os.path.join(directory, "datasources")])[1]
+            times = [float(tm) for tm in output.split()[-2:]]
+            imports.append(times[0])
+            windows.append(times[1])
+    finally:
+        shutil.rmtree(directory)
+
+    print("%-30s %12s %12s" % ("stage", "min [s]", "mean [s]"))
+    for label, times in [("nxsdesigner --version", version),
+                         ("import MainWindow", imports),
+                         ("create MainWindow", windows)]:
+        print("%-30s %12.4f %12.4f" % (
+            label, min(times), sum(times) / len(times)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2017 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+# \file tagclicked.py
+# benchmark of selecting items in the component tree
+#
+# usage: python benchmarks/tagclicked.py [number of fields]
+
+""" benchmark of selecting items in the component tree """
+
+import sys
+import time
+
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtXml import QDomDocument
+
+from nxsconfigtool.Component import Component
+from nxsconfigtool.NodeDlg import NodeDlg
+
+
+# creates a component document
+# \param nfields number of fields
+# \returns XML string
+def createXML(nfields):
+    fields = "".join(
+        '<field name="field%s" type="NX_FLOAT" units="mm">'
+        '<strategy mode="STEP"/>'
+        '<datasource type="CLIENT" name="ds%s">'
+        '<record name="rec%s"/></datasource>'
+        '<attribute name="long_name">field %s</attribute></field>'
+        % (i, i, i, i) for i in range(nfields))
+    return '<definition><group type="NXentry" name="entry">%s' \
+        '<link name="data" target="/entry/field0"/></group>' \
+        '</definition>' % fields
+
+
+# provides indices of all items of the component tree
+# \param model component model
+# \param parent parent index
+# \returns list of indices in depth-first order
+def indices(model, parent):
+    found = []
+    for row in range(model.rowCount(parent)):
+        index = model.index(row, 0, parent)
+        found.append(index)
+        found.extend(indices(model, index))
+    return found
+
+
+def main():
+    nfields = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    app = QApplication([])
+    component = Component()
+    component.document = QDomDocument()
+    component.document.setContent(createXML(nfields))
+    slots = []
+    tagClicked = component.tagClicked
+
+    # measures the selection slot
+    # \param index selected index
+    def timedTagClicked(index):
+        start = time.time()
+        tagClicked(index)
+        slots.append(time.time() - start)
+    component.tagClicked = timedTagClicked
+    component.createGUI()
+    component.dialog.show()
+    app.processEvents()
+
+    model = component.view.model()
+    items = [index for index in indices(model, model.rootIndex)
+             if index.internalPointer().node.nodeName() in
+             component._tagClasses.keys()]
+    times = []
+    for index in items:
+        start = time.time()
+        component.view.setCurrentIndex(index)
+        app.processEvents()
+        times.append(time.time() - start)
+    total = sum(times)
+    print("%-20s %12s" % ("items", len(items)))
+    print("%-20s %12.2f" % ("mean click [ms]", 1000. * total / len(times)))
+    print("%-20s %12.2f" % ("max click [ms]", 1000. * max(times)))
+    print("%-20s %12.2f" % (
+        "mean tagClicked [ms]", 1000. * sum(slots) / len(slots)))
+    print("%-20s %12.2f" % ("max tagClicked [ms]", 1000. * max(slots)))
+    print("%-20s %12.4f" % ("total [s]", total))
+    print("%-20s %12s" % (
+        "editor widgets", len(component.dialog.findChildren(NodeDlg))))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,373 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2017 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+# \package nxsconfigtool nexdatas
+# \file AsyncServer.py
+# asynchronous client of the configuration server
+
+""" asynchronous client of the configuration server """
+
+import sys
+import threading
+import time
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+import logging
+# message logger
+logger = logging.getLogger("nxsdesigner")
+
+if sys.version_info > (3,):
+    unicode = str
+
+
+# error raised when a result of a cancelled operation is requested
+class CancelledError(Exception):
+    pass
+
+
+# error raised when a result is not ready in the given time
+class TimeoutError(Exception):
+    pass
+
+
+# result of a server operation executed in the worker thread
+class Future(object):
+
+    # constructor
+    # \param function function to execute
+    # \param args function positional arguments
+    # \param kwargs function keyword arguments
+    def __init__(self, function, args=None, kwargs=None):
+        # function to execute
+        self.function = function
+        # function positional arguments
+        self.args = args or ()
+        # function keyword arguments
+        self.kwargs = kwargs or {}
+        # condition guarding the state
+        self.__condition = threading.Condition()
+        # state, i.e. PENDING, RUNNING, CANCELLED or FINISHED
+        self.__state = "PENDING"
+        # function result
+        self.__result = None
+        # raised exception
+        self.__exception = None
+        # functions called with the future when it is done
+        self.__callbacks = []
+
+    # cancels the operation
+    # \brief A pending operation is not executed. A result of a running
+    #        operation is dropped but the operation itself cannot be
+    #        interrupted
+    # \returns True if the operation was cancelled
+    def cancel(self):
+        with self.__condition:
+            if self.__state in ["CANCELLED", "FINISHED"]:
+                return self.__state == "CANCELLED"
+            running = self.__state == "RUNNING"
+            self.__state = "CANCELLED"
+            self.__condition.notify_all()
+        if not running:
+            self.__invokeCallbacks()
+        return True
+
+    # checks if the operation was cancelled
+    # \returns True if the operation was cancelled
+    def cancelled(self):
+        return self.__state == "CANCELLED"
+
+    # checks if the operation is being executed
+    # \returns True if the operation is being executed
+    def running(self):
+        return self.__state == "RUNNING"
+
+    # checks if the operation is finished or cancelled
+    # \returns True if the operation is finished or cancelled
+    def done(self):
+        return self.__state in ["CANCELLED", "FINISHED"]
+
+    # waits for the operation
+    # \param timeout time in seconds to wait, without limit if None
+    def __wait(self, timeout):
+        with self.__condition:
+            if not self.done():
+                self.__condition.wait(timeout)
+            if self.__state == "CANCELLED":
+                raise CancelledError()
+            if self.__state != "FINISHED":
+                raise TimeoutError()
+
+    # provides the operation result
+    # \param timeout time in seconds to wait, without limit if None
+    # \returns the function result
+    def result(self, timeout=None):
+        self.__wait(timeout)
+        if self.__exception is not None:
+            raise self.__exception
+        return self.__result
+
+    # provides the exception raised by the operation
+    # \param timeout time in seconds to wait, without limit if None
+    # \returns the exception or None
+    def exception(self, timeout=None):
+        self.__wait(timeout)
+        return self.__exception
+
+    # adds a function called with the future when it is done
+    # \brief The function is called from the worker thread or immediately
+    #        if the future is already done
+    # \param callback function with the future as an argument
+    def addDoneCallback(self, callback):
+        with self.__condition:
+            if not self.done():
+                self.__callbacks.append(callback)
+                return
+        self.__call(callback)
+
+    # executes the function
+    # \brief It is called by the worker thread
+    def run(self):
+        with self.__condition:
+            if self.__state != "PENDING":
+                return
+            self.__state = "RUNNING"
+        result = None
+        exception = None
+        try:
+            result = self.function(*self.args, **self.kwargs)
+        except Exception as e:
+            exception = e
+        with self.__condition:
+            if self.__state == "RUNNING":
+                self.__result = result
+                self.__exception = exception
+                self.__state = "FINISHED"
+            self.__condition.notify_all()
+        self.__invokeCallbacks()
+
+    # calls the done callbacks
+    def __invokeCallbacks(self):
+        with self.__condition:
+            callbacks = self.__callbacks
+            self.__callbacks = []
+        for callback in callbacks:
+            self.__call(callback)
+
+    # calls the given done callback
+    # \param callback function with the future as an argument
+    def __call(self, callback):
+        try:
+            callback(self)
+        except Exception as e:
+            logger.warning("callback error: %s" % unicode(e))
+
+
+# asynchronous client of the configuration server
+# \brief All operations are executed one by one in a worker thread
+#        so two operations never use the device proxy at once
+class AsyncServer(object):
+
+    # constructor
+    # \param server ConfigurationServer instance or a compatible object
+    def __init__(self, server):
+        # configuration server
+        self.server = server
+        # queue of futures to execute
+        self.__queue = queue.Queue()
+        # futures which are not done
+        self.__futures = []
+        # condition guarding the future list
+        self.__lock = threading.Condition()
+        # worker thread
+        self.__worker = None
+
+    # starts the worker thread if needed
+    def __start(self):
+        if self.__worker is None or not self.__worker.is_alive():
+            self.__worker = threading.Thread(target=self.__work)
+            self.__worker.daemon = True
+            self.__worker.start()
+
+    # executes queued futures
+    def __work(self):
+        while True:
+            future = self.__queue.get()
+            if future is None:
+                break
+            future.run()
+
+    # removes the done future from the future list
+    # \param future the done future
+    def __remove(self, future):
+        with self.__lock:
+            if future in self.__futures:
+                self.__futures.remove(future)
+            self.__lock.notify_all()
+
+    # submits a function to the worker thread
+    # \param function function to execute
+    # \param args function positional arguments
+    # \param kwargs function keyword arguments
+    # \returns future of the function result
+    def submit(self, function, *args, **kwargs):
+        future = Future(function, args, kwargs)
+        with self.__lock:
+            self.__futures.append(future)
+            self.__start()
+        future.addDoneCallback(self.__remove)
+        self.__queue.put(future)
+        return future
+
+    # submits a method of the configuration server
+    # \param name method name
+    # \param args method arguments
+    # \returns future of the method result
+    def call(self, name, *args):
+        return self.submit(getattr(self.server, name), *args)
+
+    # provides a number of operations which are not done
+    # \returns number of pending and running operations
+    def pending(self):
+        with self.__lock:
+            return len(self.__futures)
+
+    # cancels all operations which are not done
+    def cancelAll(self):
+        with self.__lock:
+            futures = list(self.__futures)
+        for future in futures:
+            future.cancel()
+
+    # waits until all operations are done
+    # \brief Cancelled operations which are already running are waited
+    #        for as well since they cannot be interrupted
+    # \param timeout time in seconds to wait, without limit if None
+    # \returns True if no operation is pending or running
+    def wait(self, timeout=None):
+        end = None if timeout is None else time.time() + timeout
+        with self.__lock:
+            while self.__futures:
+                if end is None:
+                    self.__lock.wait()
+                else:
+                    remaining = end - time.time()
+                    if remaining <= 0:
+                        return False
+                    self.__lock.wait(remaining)
+            return True
+
+    # stops the worker thread
+    # \param wait if the running operation should be waited for
+    # \param timeout time in seconds to wait, without limit if None
+    # \returns True if the worker thread is stopped
+    def shutdown(self, wait=True, timeout=None):
+        self.cancelAll()
+        worker = self.__worker
+        stopped = True
+        if worker is not None:
+            self.__queue.put(None)
+            if wait:
+                worker.join(timeout)
+            stopped = not worker.is_alive()
+        self.__worker = None
+        return stopped
+
+    # connects to the configuration server
+    # \returns future
+    def connect(self):
+        return self.call("connect")
+
+    # fetches all components
+    # \param callback function called with dictionaries of the fetched
+    #        components as they arrive
+    # \returns future of dictionary with names : xml of components
+    def fetchComponents(self, callback=None):
+        return self.call("fetchComponents", callback)
+
+    # fetches all datasources
+    # \param callback function called with dictionaries of the fetched
+    #        datasources as they arrive
+    # \returns future of dictionary with names : xml of datasources
+    def fetchDataSources(self, callback=None):
+        return self.call("fetchDataSources", callback)
+
+    # stores the component
+    # \param name component name
+    # \param xml XML content of the component
+    # \returns future
+    def storeComponent(self, name, xml):
+        return self.call("storeComponent", name, xml)
+
+    # stores the datasource
+    # \param name datasource name
+    # \param xml XML content of the datasource
+    # \returns future
+    def storeDataSource(self, name, xml):
+        return self.call("storeDataSource", name, xml)
+
+    # stores the given components
+    # \param components list of (name, xml) tuples
+    # \param callback function called with a number of processed components
+    # \returns future of (stored, skipped, failures) tuple
+    def storeComponents(self, components, callback=None):
+        return self.call("storeComponents", components, callback)
+
+    # stores the given datasources
+    # \param datasources list of (name, xml) tuples
+    # \param callback function called with a number of processed
+    #        datasources
+    # \returns future of (stored, skipped, failures) tuple
+    def storeDataSources(self, datasources, callback=None):
+        return self.call("storeDataSources", datasources, callback)
+
+    # deletes the component
+    # \param name component name
+    # \returns future
+    def deleteComponent(self, name):
+        return self.call("deleteComponent", name)
+
+    # deletes the datasource
+    # \param name datasource name
+    # \returns future
+    def deleteDataSource(self, name):
+        return self.call("deleteDataSource", name)
+
+    # sets the given component mandatory
+    # \param name component name
+    # \returns future
+    def setMandatory(self, name):
+        return self.call("setMandatory", name)
+
+    # provides the mandatory components
+    # \returns future of list of the mandatory components
+    def getMandatory(self):
+        return self.call("getMandatory")
+
+    # unsets the given component mandatory
+    # \param name component name
+    # \returns future
+    def unsetMandatory(self, name):
+        return self.call("unsetMandatory", name)
+
+    # closes connection
+    # \returns future
+    def close(self):
+        return self.call("close")
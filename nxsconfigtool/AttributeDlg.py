@@ -20,12 +20,11 @@
 # Attribute dialog class
 
 """ attribute dialog """
-import os
 
 from PyQt5.QtWidgets import (QDialog, QDialogButtonBox, QMessageBox)
-from PyQt5 import uic
 
 # from .ui.ui_attributedlg import Ui_AttributeDlg
+from .UiLoader import UiForm
 from .Errors import CharacterError
 
 import logging
@@ -33,9 +32,7 @@ import sys
 # message logger
 logger = logging.getLogger("nxsdesigner")
 
-_formclass, _baseclass = uic.loadUiType(
-    os.path.join(os.path.dirname(os.path.abspath(__file__)),
-                 "ui", "attributedlg.ui"))
+_formclass = UiForm("attributedlg")
 
 if sys.version_info > (3,):
     unicode = str
@@ -0,0 +1,160 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2017 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+# \package nxsconfigtool nexdatas
+# \file BatchProcessor.py
+# headless merging and validation of component directories
+
+""" headless merging and validation of component directories """
+
+import io
+import os
+import sys
+import json
+import multiprocessing
+
+from .Merger import Merger
+from .ElementData import parseComponent, componentXML
+
+if sys.version_info > (3,):
+    unicode = str
+
+
+# available batch modes
+MODES = ["merge", "validate"]
+
+
+# parses the component file
+# \param path file path
+# \returns DOM document
+def _loadDocument(path):
+    with io.open(path, "r", encoding="utf-8") as fl:
+        return parseComponent(fl.read())
+
+
+# serializes the document in the way Component.save does it
+# \param document DOM document
+# \returns xml string
+def _getXML(document):
+    return componentXML(document, 2)
+
+
+# merges or validates the given component file
+# \brief It runs the Merger rules synchronously without GUI
+# \param path file path
+# \param mode batch mode, i.e. merge or validate
+# \returns dictionary with file, status, changed and errors
+def processFile(path, mode="validate"):
+    result = {"file": path, "status": "ok", "changed": False, "errors": []}
+    try:
+        document = _loadDocument(path)
+        before = unicode(document.toString(0))
+        merger = Merger(document)
+        merger.run()
+        if merger.exception is not None:
+            result["status"] = "error"
+            result["errors"].append(unicode(merger.exception).strip())
+            merger.exception = None
+            return result
+        result["changed"] = unicode(document.toString(0)) != before
+        if mode == "merge" and result["changed"]:
+            with io.open(path, "w", encoding="utf-8") as fl:
+                fl.write(_getXML(document))
+    except Exception as e:
+        result["status"] = "error"
+        result["errors"].append(unicode(e).strip())
+    return result
+
+
+# merges or validates the given component file
+# \param args (path, mode) tuple
+# \returns dictionary returned by processFile
+def _processFile(args):
+    return processFile(*args)
+
+
+# merges or validates all components of the directory
+class BatchProcessor(object):
+
+    # constructor
+    # \param directory component directory
+    # \param mode batch mode, i.e. merge or validate
+    # \param processes number of worker processes, the cpu count if None
+    def __init__(self, directory, mode="validate", processes=None):
+        if mode not in MODES:
+            raise ValueError("unknown batch mode: %s" % mode)
+        # component directory
+        self.directory = directory
+        # batch mode
+        self.mode = mode
+        # number of worker processes
+        self.processes = processes or multiprocessing.cpu_count()
+        # component file extention
+        self.extention = ".xml"
+        # excluded extention
+        self.disextention = ".ds.xml"
+
+    # provides component files of the directory
+    # \returns sorted list of file paths
+    def files(self):
+        return sorted(
+            os.path.join(self.directory, el)
+            for el in os.listdir(self.directory)
+            if (el.endswith(self.extention)
+                and (not self.disextention
+                     or not el.endswith(self.disextention))))
+
+    # processes all component files
+    # \returns report dictionary
+    def run(self):
+        files = self.files()
+        tasks = [(path, self.mode) for path in files]
+        if self.processes > 1 and len(files) > 1:
+            pool = multiprocessing.Pool(min(self.processes, len(files)))
+            try:
+                results = pool.map(_processFile, tasks)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            results = [_processFile(task) for task in tasks]
+        errors = len([res for res in results if res["status"] != "ok"])
+        return {"mode": self.mode,
+                "directory": self.directory,
+                "total": len(results),
+                "changed": len([res for res in results if res["changed"]]),
+                "errors": errors,
+                "files": results}
+
+
+# runs the batch mode and writes a JSON report
+# \param mode batch mode, i.e. merge or validate
+# \param directory component directory
+# \param processes number of worker processes, the cpu count if None
+# \param stream output stream of the report
+# \returns exit status, i.e. 0 if no errors were found
+def main(mode, directory, processes=None, stream=None):
+    stream = stream or sys.stdout
+    try:
+        report = BatchProcessor(directory, mode, processes).run()
+    except Exception as e:
+        report = {"mode": mode, "directory": directory, "total": 0,
+                  "changed": 0, "errors": 1, "files": [],
+                  "message": unicode(e)}
+    stream.write(json.dumps(report, indent=2, sort_keys=True))
+    stream.write("\n")
+    return 1 if report["errors"] else 0
@@ -0,0 +1,462 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2017 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+# \package nxsconfigtool nexdatas
+# \file CompactTree.py
+# compact tree of component documents which are not open
+
+""" compact tree of component documents which are not open """
+
+import sys
+import xml.parsers.expat as expat
+from array import array
+from collections import Counter
+
+from PyQt5.QtXml import QDomDocument, QDomNode
+
+from .DomTools import DomTools
+
+if sys.version_info > (3,):
+    unicode = str
+
+
+# escapes the text in the same way as QDomDocument.toString
+# \param text given text
+# \param quotes if quotation marks are escaped
+# \param attribute if the text is an attribute value
+# \returns escaped text
+def _escape(text, quotes=False, attribute=False):
+    text = text.replace("&", "&amp;").replace("<", "&lt;").replace(
+        "\r", "&#xd;")
+    if quotes:
+        text = text.replace('"', "&quot;")
+    if attribute:
+        text = text.replace("\n", "&#xa;").replace("\t", "&#x9;")
+    return text.replace("]]>", "]]&gt;")
+
+
+# table of strings with reference counts
+# \brief Strings are removed when they are not referred by any tree
+class StringTable(object):
+
+    # constructor
+    def __init__(self):
+        # strings, None for free ids
+        self.strings = []
+        # ids of strings, i.e. string : id
+        self.ids = {}
+        # numbers of references to the strings
+        self.counts = []
+        # free ids
+        self.free = []
+
+    # provides number of the stored strings
+    # \returns number of strings
+    def __len__(self):
+        return len(self.ids)
+
+    # provides the string id and increases its reference count
+    # \param string given string
+    # \returns string id
+    def intern(self, string):
+        ide = self.ids.get(string)
+        if ide is None:
+            if self.free:
+                ide = self.free.pop()
+                self.strings[ide] = string
+                self.counts[ide] = 0
+            else:
+                ide = len(self.strings)
+                self.strings.append(string)
+                self.counts.append(0)
+            self.ids[string] = ide
+        self.counts[ide] += 1
+        return ide
+
+    # decreases the reference count and removes the unused string
+    # \param ide string id
+    def release(self, ide):
+        self.counts[ide] -= 1
+        if not self.counts[ide]:
+            self.ids.pop(self.strings[ide])
+            self.strings[ide] = None
+            self.free.append(ide)
+
+
+# compact tree of the component document
+# \brief Nodes are kept in parallel arrays in the document order.
+#        Tag names, attributes and texts are stored as ids of the string
+#        table shared by all trees and released when the tree is deleted
+class CompactTree(object):
+
+    # string table shared by all trees
+    table = StringTable()
+
+    # supported node types
+    nodeTypes = [
+        int(QDomNode.DocumentNode), int(QDomNode.ElementNode),
+        int(QDomNode.TextNode), int(QDomNode.CDATASectionNode),
+        int(QDomNode.CommentNode), int(QDomNode.ProcessingInstructionNode)]
+
+    # constructor
+    # \param document DOM document
+    # \throws ValueError if the document contains not supported nodes
+    def __init__(self, document):
+        # node types, see QDomNode.NodeType
+        self.types = array('b')
+        # ids of tag names and of processing instruction targets
+        self.names = array('i')
+        # ids of texts, comments and of processing instruction data
+        self.values = array('i')
+        # positions of parents, -1 for the document
+        self.parents = array('i')
+        # positions of the first children, -1 if there are no children
+        self.firstChildren = array('i')
+        # positions of the next siblings, -1 for the last child
+        self.nextSiblings = array('i')
+        # positions of node attributes in the attribute array,
+        #  with an additional position of the array end
+        self.firstAttributes = array('i')
+        # ids of attribute names and values
+        self.attributes = array('i')
+        # references of the document
+        self.__references = None
+        # positions of attributes in the source order of their elements,
+        #  None if the source order is not known
+        self.__sourceOrder = None
+
+        self.__build(document)
+
+    # destructor
+    # \brief It releases the strings of the tree
+    def __del__(self):
+        release = self.table.release
+        for ide in self.names:
+            if ide >= 0:
+                release(ide)
+        for ide in self.values:
+            if ide >= 0:
+                release(ide)
+        for ide in self.attributes:
+            release(ide)
+
+    # provides the state for pickling
+    # \brief String ids are replaced by positions in the list of
+    #        the tree strings. Attributes are given in the source order
+    #        if it is known
+    # \returns dictionary with arrays and strings of the tree
+    def __getstate__(self):
+        strings = self.table.strings
+        local = {}
+        state = {"strings": []}
+
+        def localIds(ids):
+            result = array('i')
+            for ide in ids:
+                if ide >= 0 and ide not in local:
+                    local[ide] = len(state["strings"])
+                    state["strings"].append(strings[ide])
+                result.append(local[ide] if ide >= 0 else -1)
+            return result
+
+        state["names"] = localIds(self.names)
+        state["values"] = localIds(self.values)
+        attributes = self.attributes
+        if self.__sourceOrder is not None:
+            attributes = array('i')
+            for i in self.__sourceOrder:
+                attributes.append(self.attributes[2 * i])
+                attributes.append(self.attributes[2 * i + 1])
+        state["attributes"] = localIds(attributes)
+        for key in ["types", "parents", "firstChildren", "nextSiblings",
+                    "firstAttributes"]:
+            state[key] = getattr(self, key)
+        return state
+
+    # sets the state from pickling
+    # \brief Strings of the tree are added to the string table and
+    #        attributes are put in the order of QDom elements of this
+    #        process which depends on its hash seed and, for names in
+    #        the same hash bucket, on the order of the given attributes
+    # \param state dictionary with arrays and strings of the tree
+    def __setstate__(self, state):
+        strings = state["strings"]
+        intern = self.table.intern
+        for key in ["types", "parents", "firstChildren", "nextSiblings",
+                    "firstAttributes"]:
+            setattr(self, key, state[key])
+        for key in ["names", "values"]:
+            setattr(self, key, array(
+                'i', [intern(strings[ide]) if ide >= 0 else -1
+                      for ide in state[key]]))
+        attributes = state["attributes"]
+        orders = {}
+        self.attributes = array('i')
+        for index in range(len(self.types)):
+            start = self.firstAttributes[index]
+            end = self.firstAttributes[index + 1]
+            names = tuple(strings[attributes[i]]
+                          for i in range(start, end, 2))
+            if len(names) > 1 and names not in orders:
+                orders[names] = self.__attributeOrder(names)
+            for i in orders[names] if len(names) > 1 else range(len(names)):
+                self.attributes.append(intern(names[i]))
+                self.attributes.append(
+                    intern(strings[attributes[start + 2 * i + 1]]))
+        self.__references = None
+        self.__sourceOrder = None
+
+    # sets the source order of attributes used for pickling
+    # \brief QDom elements do not keep the attribute order of the source
+    #        so it is read by expat. The order is used by trees sent to
+    #        other processes, which put attributes in the order of their
+    #        QDom elements in the same way as parsing the source would do
+    # \param text xml source of the tree
+    # \returns True if the source order has been found
+    def setSourceOrder(self, text):
+        self.__sourceOrder = None
+        sources = []
+        parser = expat.ParserCreate()
+        parser.ordered_attributes = True
+        parser.StartElementHandler = \
+            lambda name, attributes: sources.append(attributes[::2])
+        try:
+            parser.Parse(text, True)
+        except expat.ExpatError:
+            return False
+        elements = [index for index in range(len(self.types))
+                    if self.types[index] == QDomNode.ElementNode]
+        if len(elements) != len(sources):
+            return False
+        strings = self.table.strings
+        order = array('i')
+        for index, names in zip(elements, sources):
+            start = self.firstAttributes[index] // 2
+            end = self.firstAttributes[index + 1] // 2
+            positions = dict(
+                (strings[self.attributes[2 * i]], i)
+                for i in range(start, end))
+            if len(names) != len(positions) or \
+                    any(name not in positions for name in names):
+                return False
+            order.extend(positions[name] for name in names)
+        self.__sourceOrder = order
+        return True
+
+    # provides the order of attributes in QDom elements
+    # \param names attribute names
+    # \returns list of positions of the names
+    @classmethod
+    def __attributeOrder(cls, names):
+        document = QDomDocument()
+        element = document.createElement("element")
+        for name in names:
+            element.setAttribute(name, "")
+        attrs = element.attributes()
+        positions = dict((name, i) for i, name in enumerate(names))
+        return [positions[unicode(attrs.item(i).nodeName())]
+                for i in range(attrs.count())]
+
+    # provides number of the tree nodes
+    # \returns number of nodes with the document node
+    def __len__(self):
+        return len(self.types)
+
+    # provides positions of the node children
+    # \param index position of the node
+    # \returns list of children positions
+    def children(self, index=0):
+        children = []
+        child = self.firstChildren[index]
+        while child >= 0:
+            children.append(child)
+            child = self.nextSiblings[child]
+        return children
+
+    # appends the node to the arrays
+    # \param node DOM node
+    # \param parent position of the parent
+    # \param previous position of the previous sibling
+    # \returns position of the node
+    # \throws ValueError if the node type is not supported
+    def __add(self, node, parent, previous):
+        index = len(self.types)
+        ntype = int(node.nodeType())
+        if ntype not in self.nodeTypes:
+            raise ValueError("not supported node: %s" % node.nodeName())
+        self.types.append(ntype)
+        self.names.append(
+            self.table.intern(unicode(node.nodeName()))
+            if ntype in (QDomNode.ElementNode,
+                         QDomNode.ProcessingInstructionNode) else -1)
+        self.values.append(
+            -1 if ntype in (QDomNode.DocumentNode, QDomNode.ElementNode)
+            else self.table.intern(unicode(node.nodeValue())))
+        self.parents.append(parent)
+        self.firstChildren.append(-1)
+        self.nextSiblings.append(-1)
+        self.firstAttributes.append(len(self.attributes))
+        attrs = node.attributes()
+        intern = self.table.intern
+        for i in range(attrs.count()):
+            attr = attrs.item(i)
+            self.attributes.append(intern(unicode(attr.nodeName())))
+            self.attributes.append(intern(unicode(attr.nodeValue())))
+        if previous >= 0:
+            self.nextSiblings[previous] = index
+        elif parent >= 0:
+            self.firstChildren[parent] = index
+        return index
+
+    # fills the arrays with nodes of the document
+    # \param document DOM document
+    def __build(self, document):
+        self.__add(document, -1, -1)
+        stack = [(document.firstChild(), 0, -1)]
+        while stack:
+            node, parent, previous = stack.pop()
+            if node.isNull():
+                continue
+            index = self.__add(node, parent, previous)
+            stack.append((node.nextSibling(), parent, index))
+            stack.append((node.firstChild(), index, -1))
+        self.firstAttributes.append(len(self.attributes))
+
+    # creates the DOM node
+    # \param document DOM document
+    # \param index position of the node
+    # \returns DOM node
+    def __createNode(self, document, index):
+        strings = self.table.strings
+        ntype = self.types[index]
+        if ntype == QDomNode.ElementNode:
+            node = document.createElement(strings[self.names[index]])
+            attributes = self.attributes
+            for i in range(self.firstAttributes[index],
+                           self.firstAttributes[index + 1], 2):
+                node.setAttribute(strings[attributes[i]],
+                                  strings[attributes[i + 1]])
+        elif ntype == QDomNode.TextNode:
+            node = document.createTextNode(strings[self.values[index]])
+        elif ntype == QDomNode.CDATASectionNode:
+            node = document.createCDATASection(strings[self.values[index]])
+        elif ntype == QDomNode.CommentNode:
+            node = document.createComment(strings[self.values[index]])
+        else:
+            node = document.createProcessingInstruction(
+                strings[self.names[index]], strings[self.values[index]])
+        return node
+
+    # creates the DOM document
+    # \returns DOM document
+    def toDocument(self):
+        document = QDomDocument()
+        stack = [(self.firstChildren[0], document)]
+        while stack:
+            index, parent = stack.pop()
+            if index < 0:
+                continue
+            node = self.__createNode(document, index)
+            parent.appendChild(node)
+            stack.append((self.nextSiblings[index], parent))
+            stack.append((self.firstChildren[index], node))
+        return document
+
+    # counts $datasources and $components references of the document
+    # \brief Every distinct text and attribute value is scanned once
+    # \returns Counter with (label, name) : number of references
+    def references(self):
+        if self.__references is None:
+            counts = Counter(ide for ide in self.values if ide >= 0)
+            counts.update(self.attributes[1::2])
+            self.__references = Counter()
+            for ide, count in counts.items():
+                for key, number in DomTools.findReferences(
+                        self.table.strings[ide]).items():
+                    self.__references[key] += count * number
+        return Counter(self.__references)
+
+    # provides the document XML in the form of the saved XML
+    # \brief The XML is written directly from the arrays with the layout
+    #        of QDomDocument.toString
+    # \param indent number of added spaces during pretty printing
+    # \returns xml string with the xml processing instruction
+    def sourceXML(self, indent=0):
+        strings = self.table.strings
+        types = self.types
+        firstChildren = self.firstChildren
+        nextSiblings = self.nextSiblings
+        texts = (QDomNode.TextNode, QDomNode.CDATASectionNode)
+        parts = ["<?xml version='1.0'?>\n"]
+        # position, depth, position of the previous sibling or
+        # of the last child for closing tags, closing flag
+        stack = [(firstChildren[0], 0, -1, False)]
+        while stack:
+            index, depth, previous, closing = stack.pop()
+            if index < 0:
+                continue
+            ntype = types[index]
+            following = nextSiblings[index]
+            newline = following < 0 or types[following] not in texts
+            pad = previous < 0 or types[previous] not in texts
+            if closing:
+                if types[previous] not in texts:
+                    parts.append(" " * (depth * indent))
+                parts.append("</%s>" % strings[self.names[index]])
+                if newline:
+                    parts.append("\n")
+            elif ntype == QDomNode.ElementNode:
+                if pad:
+                    parts.append(" " * (depth * indent))
+                parts.append("<" + strings[self.names[index]])
+                attributes = self.attributes
+                for i in range(self.firstAttributes[index],
+                               self.firstAttributes[index + 1], 2):
+                    parts.append(' %s="%s"' % (
+                        strings[attributes[i]],
+                        _escape(strings[attributes[i + 1]], True, True)))
+                first = firstChildren[index]
+                if first >= 0:
+                    parts.append(">" if types[first] in texts else ">\n")
+                    last = first
+                    while nextSiblings[last] >= 0:
+                        last = nextSiblings[last]
+                    stack.append((index, depth, last, True))
+                    stack.append((first, depth + 1, -1, False))
+                    continue
+                parts.append("/>")
+                if newline:
+                    parts.append("\n")
+            elif ntype == QDomNode.TextNode:
+                parts.append(_escape(
+                    strings[self.values[index]],
+                    types[self.parents[index]] != QDomNode.ElementNode))
+            elif ntype == QDomNode.CDATASectionNode:
+                parts.append("<![CDATA[%s]]>" % strings[self.values[index]])
+            elif ntype == QDomNode.CommentNode:
+                value = strings[self.values[index]]
+                if pad:
+                    parts.append(" " * (depth * indent))
+                parts.append("<!--%s%s-->" % (
+                    value, " " if value.endswith("-") else ""))
+                if newline:
+                    parts.append("\n")
+            else:
+                parts.append("<?%s %s?>\n" % (
+                    strings[self.names[index]], strings[self.values[index]]))
+            stack.append((following, depth, index, False))
+        return "".join(parts)
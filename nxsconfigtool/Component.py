@@ -23,6 +23,7 @@
 
 import os
 import sys
+import zlib
 
 from PyQt5.QtCore import (QModelIndex, Qt,
                           QFileInfo, QFile, QIODevice, QTextStream)
@@ -41,6 +42,9 @@ from .DefinitionDlg import DefinitionDlg
 from .Merger import Merger, MergerDlg, IncompatibleNodeError
 from .ComponentModel import ComponentModel
 from .DomTools import DomTools
+from .ElementData import parseComponent, componentXML
+from .LazyDocument import LazyDocument
+from .CompactTree import CompactTree
 from .ComponentDlg import ComponentDlg
 
 import logging
@@ -58,6 +62,24 @@ class Component(object):
     # \brief Sets variables
     def __init__(self, parent=None):
 
+        # revision of the component DOM document
+        self.__revision = 0
+        # (revision key, dirty flag) of the last dirtiness check
+        self.__dirtyCache = (None, None)
+        # lazy document with pending subtrees of the component document
+        self.__lazy = None
+        # lazy document or compact tree which source is the saved XML
+        #  not created yet
+        self.__savedSource = None
+        # compact tree of the document of the not open component
+        self.__compact = None
+
+        # minimal size of component files loaded by the streaming loader,
+        #  the streaming loader is not used if None
+        self.streamSize = 2 * 1024 * 1024
+        # number of tree levels built by the streaming loader
+        self.streamDepth = 3
+
         # directory from which components are loaded by default
         self.directory = ""
         # component view
@@ -116,6 +138,10 @@ class Component(object):
         # current component tag
         self._currentTag = None
         self._frameLayout = None
+        # item widgets shown in the frame, i.e. tag : widget
+        self._frameWidgets = {}
+        # initial states of the item widgets, i.e. tag : state
+        self._frameStates = {}
 
         # if merging compited
         self._merged = False
@@ -130,7 +156,7 @@ class Component(object):
         self._allAttributes = False
 
         # saved XML
-        self.savedXML = None
+        self.__savedXML = None
 
         # tag counter
         self._tagCnt = 0
@@ -141,27 +167,196 @@ class Component(object):
         self.datasources = []
 
     # fetches $datasources and $components from xml
-    # \brief populate components and datasources
+    # \brief populate components and datasources. References are taken
+    #        from the index of the view model which is updated on edits,
+    #        without the model the whole document is scanned
     def fetchElements(self):
-        dss = set()
-        cps = set()
-        if hasattr(self.document, "toString"):
-            xml = unicode(self.document.toString(0))
-            dss = set(DomTools.findElements(xml, "datasources"))
-            cps = set(DomTools.findElements(xml, "components"))
-        self.components = list(cps)
-        self.datasources = list(dss)
+        references = {}
+        model = self.__documentModel()
+        if model is not None:
+            references = model.references()
+        elif hasattr(self.__document, "toString"):
+            references = DomTools.findReferences(
+                unicode(self.__document.toString(0)))
+            if self.__lazy is not None:
+                references.update(self.__lazy.references())
+        elif self.__compact is not None:
+            references = self.__compact.references()
+        self.components = list(set(
+            name for label, name in references if label == "components"))
+        self.datasources = list(set(
+            name for label, name in references if label == "datasources"))
+        if hasattr(self.parent, "elementChanged"):
+            self.parent.elementChanged(self)
+
+    # provides the view model of the component document
+    # \returns the model or None if there is no model of the document
+    def __documentModel(self):
+        try:
+            model = self.view.model() if self.view is not None else None
+        except Exception:
+            model = None
+        if not hasattr(model, "references") \
+                or not hasattr(self.__document, "toString"):
+            return None
+        if model.rootIndex.internalPointer().node != self.__document:
+            return None
+        return model
+
+    # creates the view model of the component document
+    # \returns component model
+    def __createModel(self):
+        self.__expand()
+        return ComponentModel(self.__document, self._allAttributes,
+                              self.parent, self.__lazy)
+
+    # creates pending subtrees of the streamed document
+    # \param index index of the subtree root, the document if not valid
+    # \param levels number of levels below the item which have to be
+    #        created, all if None
+    def __fetchSubtree(self, index=QModelIndex(), levels=None):
+        if self.__lazy is None:
+            return
+        model = self.__documentModel()
+        if model is not None:
+            model.fetchSubtree(index, levels)
+        elif not index.isValid():
+            self.__lazy.materialize()
+        if not index.isValid():
+            self.__lazy = None
+
+    # creates the DOM document from the compact tree
+    def __expand(self):
+        if self.__compact is not None:
+            self.__document = self.__compact.toDocument()
+            self.__compact = None
+            self.__revision += 1
+
+    # keeps the document of the not open component in the compact tree
+    # \brief The DOM document, the view with its model and the saved XML
+    #        are released. The DOM document is created again
+    #        on the first access, e.g. when the component is opened.
+    #        Streamed documents are not compacted
+    # \returns True if the document was compacted
+    def compact(self):
+        if self.dialog is not None or self.__lazy is not None \
+                or not hasattr(self.__document, "toString"):
+            return False
+        saved = not self.isDirty()
+        try:
+            self.__compact = CompactTree(self.__document)
+        except ValueError as e:
+            logger.warn("Failed to compact %s: %s" % (self.name, e))
+            return False
+        self.__document = None
+        if saved:
+            self.__savedXML = None
+            self.__savedSource = self.__compact
+        self.view = None
+        self._frameWidgets = {}
+        self._frameStates = {}
+        self._frameLayout = None
+        self._currentTag = None
+        return True
+
+    # compacts the document if the component is not open and the component
+    #  list keeps not open components in the compact tree
+    def compactClosed(self):
+        if getattr(self.parent, "compact", False):
+            self.compact()
 
     # provides attribute flag
     # \returns flag if all attributes have to be shown
     def getAttrFlag(self):
         return self._allAttributes
 
+    # provides the component DOM document
+    # \brief Pending subtrees of the streamed document and the document
+    #        of the compact tree are created
+    # \returns DOM document
+    def __getDocument(self):
+        self.__expand()
+        self.__fetchSubtree()
+        return self.__document
+
+    # sets the component DOM document
+    # \param document DOM document
+    def __setDocument(self, document):
+        self.__document = document
+        self.__lazy = None
+        self.__compact = None
+        self.__revision += 1
+
+    # the component DOM document
+    document = property(__getDocument, __setDocument,
+                        doc='component DOM document')
+
+    # provides the saved XML
+    # \brief The saved XML of the streamed or compacted document is created
+    #        from its source on the first access. The not changed streamed
+    #        document provides it without parsing its source
+    # \returns saved XML string
+    def __getSavedXML(self):
+        if self.__savedSource is not None \
+                and self.__savedSource is self.__lazy \
+                and not self.__lazy.modified:
+            return self.__lazy.toXML()
+        if self.__savedSource is not None:
+            self.__savedXML = self.__savedSource.sourceXML()
+            self.__savedSource = None
+        return self.__savedXML
+
+    # sets the saved XML
+    # \param xml saved XML string
+    def __setSavedXML(self, xml):
+        self.__savedXML = xml
+        self.__savedSource = None
+        self.__dirtyCache = (None, None)
+
+    # stores the current document as the saved one
+    def __storeSavedXML(self):
+        if self.__lazy is not None:
+            self.savedXML = None
+            self.__savedSource = self.__lazy
+        else:
+            self.savedXML = self.get()
+
+    # the saved XML
+    savedXML = property(__getSavedXML, __setSavedXML,
+                        doc='saved XML')
+
+    # provides a key which changes with every modification of the document
+    # \brief Compact trees and not modified lazy documents do not change
+    # \returns revision key or None if modifications are not tracked
+    def revisionKey(self):
+        if self.__compact is not None or (
+                self.__lazy is not None and not self.__lazy.modified):
+            return (self.__revision, None)
+        try:
+            model = self.view.model() if self.view is not None else None
+        except Exception:
+            model = None
+        revision = getattr(model, "revision", None)
+        if revision is None:
+            return None
+        return (self.__revision, revision)
+
     # checks if not saved
     # \returns True if it is not saved
     def isDirty(self):
+        if self.__lazy is not None and self.__lazy is self.__savedSource \
+                and not self.__lazy.modified:
+            return False
+        if self.__compact is not None \
+                and self.__compact is self.__savedSource:
+            return False
+        key = self.revisionKey()
+        if key is not None and self.__dirtyCache[0] == key:
+            return self.__dirtyCache[1]
         string = self.get()
-        return False if string == self.savedXML else True
+        dirty = False if string == self.savedXML else True
+        self.__dirtyCache = (key, dirty)
+        return dirty
 
     # provides the path of component tree for a given node
     # \param node DOM node
@@ -236,7 +431,7 @@ class Component(object):
             pindex = pindex.parent()
 
         child = index.internalPointer().node
-        row = DomTools.getNodeRow(child, self.document)
+        row = DomTools.getNodeRow(child, self.__document)
         path.insert(0, (row, unicode(child.nodeName())))
 
         return path
@@ -273,35 +468,251 @@ class Component(object):
             self.tagClicked(index)
             self.view.expand(index)
 
+    # selects item defined by the path of elements in component tree
+    # \brief Element positions skip text and comment nodes
+    # \param path path represented as a list with elements:
+    #        (position among sibling elements, node name)
+    # \returns True if the item is found
+    def showElementPath(self, path):
+        node = self.document
+        rows = []
+        for position, name in path:
+            children = node.childNodes()
+            found = None
+            for row in range(children.count()):
+                child = children.item(row)
+                if child.isElement():
+                    if position == 0:
+                        found = row
+                        break
+                    position -= 1
+            if found is None:
+                return False
+            node = children.item(found)
+            if unicode(node.nodeName()) != name:
+                return False
+            rows.append((found, name))
+        self._selectItem(rows)
+        return True
+
     # provides the state of the component dialog
     # \returns tuple with (xml string, path)
     def getState(self):
         path = self._getPath()
         return (self.document.toString(0), path)
 
+    # provides the state of the component part which an item command
+    #  can change
+    # \brief The part is the parent of the current item or the whole
+    #        document. It is copied without serialization
+    # \param full if the command can change the whole document
+    # \returns tuple with ((rows of the part, copy of the part), path)
+    def getScopeState(self, full=False):
+        rows = []
+        node = None if full else self._getCurrentNode()
+        if node is not None:
+            rows = self._getNodeRows(node)[:-1]
+        scope = self._findRows(rows)[0]
+        if scope is None:
+            rows = []
+            scope = self.document
+        return ((rows, scope.cloneNode(True)), self._getPath())
+
     # sets the state of the component dialog
-    # \param state tuple with (xml string, path)
+    # \param state tuple with (xml string, path) or with (change, path)
+    #        provided by getStateDelta()
     def setState(self, state):
         (xml, path) = state
-        try:
-            self._loadFromString(xml)
-        except (IOError, OSError, ValueError) as e:
-            error = "Failed to load: %s" % e
-            logger.warn(error)
+        if isinstance(xml, tuple):
+            delta, snapshot = xml
+            if delta is not None and not self._applyDelta(delta):
+                logger.warn("Failed to apply changes of %s" % self.name)
+                delta = None
+            if delta is None and not self._restoreSnapshot(snapshot):
+                logger.warn("Failed to restore %s" % self.name)
+        else:
+            try:
+                self._loadFromString(xml)
+            except (IOError, OSError, ValueError) as e:
+                error = "Failed to load: %s" % e
+                logger.warn(error)
         self._hideFrame()
         self._selectItem(path)
 
+    # provides compact states of the document change
+    # \brief The part copied by getScopeState() is compared with the
+    #        current document. The states keep the changed subtree or
+    #        attributes, see DomTools.diffNodes(), and a compressed
+    #        snapshot of the part restored when the change cannot be applied
+    # \param scopeState state provided by getScopeState() before the change
+    # \returns (old, new) tuple of states for setState()
+    def getStateDelta(self, scopeState):
+        (rows, copy), oldPath = scopeState
+        path = self._getPath()
+        scope = self._findRows(rows)[0] if self.document is not None else None
+        if scope is None or scope.nodeName() != copy.nodeName():
+            return ((None, self._getSnapshot(rows, copy)), oldPath), \
+                ((None, self._getSnapshot([], self.document)), path)
+        old = self._getSnapshot(rows, copy)
+        new = self._getSnapshot(rows, scope)
+        nodePath, start, current, target = DomTools.diffNodes(copy, scope)
+        if not rows and not nodePath \
+                and (start is not None or current != target):
+            return ((None, old), oldPath), ((None, new), path)
+        nodePath = rows + nodePath
+        return (((nodePath, start, target, current), old), oldPath), \
+            (((nodePath, start, current, target), new), path)
+
+    # provides the compressed snapshot of the component part
+    # \param rows rows of the part
+    # \param node DOM node of the part
+    # \returns (rows, compressed xml) tuple
+    @classmethod
+    def _getSnapshot(cls, rows, node):
+        return (rows, zlib.compress(DomTools.toString(node).encode("utf-8")))
+
+    # replaces the component part by its snapshot
+    # \param snapshot (rows, compressed xml) tuple, see _getSnapshot()
+    # \returns True if the part was replaced
+    def _restoreSnapshot(self, snapshot):
+        rows, data = snapshot
+        xml = zlib.decompress(data).decode("utf-8")
+        if not rows:
+            try:
+                self._loadFromString(xml)
+            except (IOError, OSError, ValueError) as e:
+                logger.warn("Failed to load: %s" % e)
+                return False
+            return True
+        node, model, index = self._findRows(rows[:-1])
+        if node is None or rows[-1] >= node.childNodes().count():
+            return False
+        nodes = self._createNodes([(False, xml)])
+        if nodes is None:
+            return False
+        self._replaceChildren(node, model, index, rows[-1], 1, nodes)
+        return True
+
+    # provides the child rows leading from the document to the given node
+    # \param node DOM node
+    # \returns list of child rows
+    @classmethod
+    def _getNodeRows(cls, node):
+        rows = []
+        parent = node.parentNode()
+        while not parent.isNull():
+            rows.insert(0, DomTools.getNodeRow(node, parent))
+            node = parent
+            parent = node.parentNode()
+        return rows
+
+    # finds the node with the given child rows
+    # \param rows list of child rows leading from the document
+    # \returns (node, model, index) tuple with model and index of the node
+    #          if the view is shown, (None, None, None) if not found
+    def _findRows(self, rows):
+        node = self.document
+        for row in rows:
+            node = node.childNodes().item(row)
+            if node.isNull():
+                return None, None, None
+        model = self.view.model() \
+            if self.view is not None and self.dialog else None
+        index = None
+        if model is not None:
+            index = model.rootIndex
+            for row in rows:
+                index = model.index(row, 0, index)
+            if not index.isValid() or index.internalPointer().node != node:
+                return None, None, None
+        return node, model, index
+
+    # creates nodes from serialized children
+    # \param texts list of (isText, string) tuples, see
+    #        DomTools.getChildTexts()
+    # \returns list of DOM nodes or None if the XML cannot be parsed
+    def _createNodes(self, texts):
+        nodes = []
+        for isText, text in texts:
+            if isText:
+                nodes.append(self.document.createTextNode(text))
+                continue
+            document = QDomDocument()
+            if not document.setContent("<delta>%s</delta>" % text)[0] \
+                    or document.documentElement().childNodes().count() != 1:
+                return None
+            nodes.append(self.document.importNode(
+                document.documentElement().firstChild(), True))
+        return nodes
+
+    # replaces children of the node
+    # \param node DOM node
+    # \param model component model or None without the view
+    # \param index model index of the node
+    # \param start row of the first replaced child
+    # \param count number of replaced children
+    # \param nodes list of new DOM children
+    def _replaceChildren(self, node, model, index, start, count, nodes):
+        if model is not None:
+            for _ in range(count):
+                model.removeItem(start, index)
+            for i, child in enumerate(nodes):
+                if start + i < node.childNodes().count():
+                    model.insertItem(start + i, child, index)
+                else:
+                    model.appendItem(child, index)
+        else:
+            for _ in range(count):
+                node.removeChild(node.childNodes().item(start))
+            for i, child in enumerate(nodes):
+                if start + i < node.childNodes().count():
+                    node.insertBefore(child, node.childNodes().item(start + i))
+                else:
+                    node.appendChild(child)
+
+    # applies the document change
+    # \param delta (path, start, current, target) tuple, see
+    #        DomTools.diffNodes()
+    # \returns True if the document contained the current content
+    def _applyDelta(self, delta):
+        nodePath, start, current, target = delta
+        node, model, index = self._findRows(nodePath)
+        if node is None:
+            return False
+
+        if start is None:
+            if DomTools.getAttributes(node) != current:
+                return False
+            if current != target:
+                element = node.toElement()
+                for name in current.keys():
+                    element.removeAttribute(name)
+                for name, value in target.items():
+                    element.setAttribute(name, value)
+                if model is not None:
+                    model.dataChanged.emit(index, index)
+            return True
+
+        if DomTools.getChildTexts(node, start, len(current)) != current:
+            return False
+        nodes = self._createNodes(target)
+        if nodes is None:
+            return False
+        self._replaceChildren(node, model, index, start, len(current), nodes)
+        return True
+
     # updates the component dialog
     # \brief It creates model and frame item
     def updateForm(self):
         self.dialog.ui.splitter.setStretchFactor(0, 1)
         self.dialog.ui.splitter.setStretchFactor(1, 1)
 
-        model = ComponentModel(self.document, self._allAttributes, self.parent)
-        self.view.setModel(model)
+        self.view.setModel(self.__createModel())
         self.connectView()
 
         self.dialog.ui.widget = QWidget(self.dialog)
+        self._frameWidgets = {None: self.dialog.ui.widget}
+        self._frameStates = {}
         self._frameLayout = QGridLayout()
         self._frameLayout.addWidget(self.dialog.ui.widget)
         self.dialog.ui.frame.setLayout(self._frameLayout)
@@ -504,6 +915,7 @@ class Component(object):
         if not sel or not index.isValid():
             return
 
+        self.__fetchSubtree(index)
         node = sel.node
 
         clipboard = QApplication.clipboard()
@@ -541,6 +953,7 @@ class Component(object):
         if not sel:
             return
 
+        self.__fetchSubtree(index)
         node = sel.node
 
         clipboard = QApplication.clipboard()
@@ -608,22 +1021,25 @@ class Component(object):
                                externalClose=None, externalStore=None,
                                externalDSLink=None):
         if externalSave and self.externalSave is None:
-            self.dialog.ui.savePushButton.clicked.connect(
-                externalSave)
+            if self.dialog is not None:
+                self.dialog.ui.savePushButton.clicked.connect(
+                    externalSave)
             # self.parent.connect(
             #     self.dialog.ui.savePushButton, SIGNAL("clicked()"),
             #     externalSave)
             self.externalSave = externalSave
         if externalStore and self.externalStore is None:
-            self.dialog.ui.storePushButton.clicked.connect(
-                externalStore)
+            if self.dialog is not None:
+                self.dialog.ui.storePushButton.clicked.connect(
+                    externalStore)
             # self.parent.connect(
             #     self.dialog.ui.storePushButton, SIGNAL("clicked()"),
             #     externalStore)
             self.externalStore = externalStore
         if externalClose and self.externalClose is None:
-            self.dialog.ui.closePushButton.clicked.connect(
-                externalClose)
+            if self.dialog is not None:
+                self.dialog.ui.closePushButton.clicked.connect(
+                    externalClose)
             # self.parent.connect(
             #     self.dialog.ui.closePushButton, SIGNAL("clicked()"),
             #     externalClose)
@@ -691,9 +1107,7 @@ class Component(object):
             model = self.view.model()
             model.setAttributeView(self._allAttributes)
 #             self.view.reset()
-            newModel = ComponentModel(
-                self.document, self._allAttributes, self.parent)
-            self.view.setModel(newModel)
+            self.view.setModel(self.__createModel())
             self.connectView()
             self._hideFrame()
             if cNode:
@@ -712,6 +1126,7 @@ class Component(object):
             logger.warn("Not valid index item")
             return
 
+        self.__fetchSubtree(index, self.streamDepth)
         node = item.node
         nNode = node.nodeName()
 
@@ -729,21 +1144,13 @@ class Component(object):
                     self.dialog.ui.widget.hide()
 
             self.dialog.ui.frame.hide()
-            self._frameLayout.removeWidget(self.dialog.ui.widget)
-            self.dialog.ui.widget = self._tagClasses[
-                unicode(nNode)](self.dialog)
-            self.dialog.ui.widget.root = self.document
-            self.dialog.ui.widget.setFromNode(node)
-            self.dialog.ui.widget.createGUI()
+            self.dialog.ui.widget = self._frameWidget(unicode(nNode), node)
             if hasattr(self.dialog.ui.widget, "connectExternalActions"):
                 self.dialog.ui.widget.connectExternalActions(
                     externalApply=self.externalApply,
                     externalDSLink=self.externalDSLink)
-            if hasattr(self.dialog.ui.widget, "treeMode"):
-                self.dialog.ui.widget.treeMode()
             self.dialog.ui.widget.view = self.view
             self.dialog.ui.view = self.view
-            self._frameLayout.addWidget(self.dialog.ui.widget)
             self.dialog.ui.widget.show()
             self.dialog.ui.frame.show()
         else:
@@ -751,6 +1158,34 @@ class Component(object):
                 self.dialog.ui.widget.hide()
             self.dialog.ui.widget = None
 
+    # provides the item widget set from the DOM node
+    # \brief Widgets are created once per tag and reused for all nodes
+    #        of the tag after resetting them to their initial state
+    # \param tag node tag
+    # \param node DOM node
+    # \returns item widget
+    def _frameWidget(self, tag, node):
+        widget = self._frameWidgets.get(tag)
+        if widget is None:
+            widget = self._tagClasses[tag](self.dialog)
+            if hasattr(widget, "getState"):
+                self._frameStates[tag] = widget.getState()
+            widget.root = self.__document
+            widget.setFromNode(node)
+            widget.createGUI()
+            if hasattr(widget, "treeMode"):
+                widget.treeMode()
+            widget.hide()
+            self._frameLayout.addWidget(widget)
+            self._frameWidgets[tag] = widget
+        else:
+            if tag in self._frameStates:
+                widget.setState(self._frameStates[tag])
+            widget.root = self.__document
+            widget.setFromNode(node)
+            widget.updateForm()
+        return widget
+
     # opens context Menu
     # \param position in the component tree
     def _openMenu(self, position):
@@ -771,9 +1206,11 @@ class Component(object):
     # sets up context menu
     # \param actions list of the context menu actions
     def addContextMenu(self, actions):
+        self._actions = actions
+        if self.view is None:
+            return
         self.view.setContextMenuPolicy(Qt.CustomContextMenu)
         self.view.customContextMenuRequested.connect(self._openMenu)
-        self._actions = actions
 
     # resizes column size after tree item expansion
     # \param index index of the expanded item
@@ -821,14 +1258,15 @@ class Component(object):
             try:
                 fh = QFile(self._componentFile)
                 if fh.open(QIODevice.ReadOnly):
-                    self._loadFromString(fh)
+                    self._loadFromString(fh, True)
                     self._xmlPath = self._componentFile
                     fi = QFileInfo(self._componentFile)
                     self.name = unicode(fi.fileName())
 
                     if self.name[-4:] == '.xml':
                         self.name = self.name[:-4]
-                    self.savedXML = self.get()
+                    self.__storeSavedXML()
+                    self.compactClosed()
                     return self._componentFile
                 else:
                     QMessageBox.warning(
@@ -852,33 +1290,59 @@ class Component(object):
     def set(self, xml, new=False):
         self._componentFile = os.path.join(
             self.directory, self.name + ".xml")
-        self._loadFromString(xml)
+        self._loadFromString(xml, True)
         self._xmlPath = self._componentFile
-        self.savedXML = self.get()
+        self.__storeSavedXML()
+        self.compactClosed()
         self.fetchElements()
         return self._componentFile
 
-    # sets component from XML string
-    # \param xml XML string
-    def _loadFromString(self, xml):
-        self.document = QDomDocument()
+    # sets component from the compact tree of its document
+    # \brief The tree is kept as the saved source and the DOM document is
+    #        created on the first access. Components with a dialog need
+    #        the DOM document and are not set
+    # \param tree compact tree, e.g. parsed in background
+    # \returns True if the component was set
+    def setCompact(self, tree):
+        if self.dialog is not None:
+            return False
+        self._componentFile = os.path.join(
+            self.directory, self.name + ".xml")
+        self.document = None
+        self.__compact = tree
+        self.__savedXML = None
+        self.__savedSource = tree
+        self.__dirtyCache = (None, None)
+        self.view = None
+        self._xmlPath = self._componentFile
+        self.fetchElements()
+        return True
 
-        if not self.document.setContent(xml):
-            raise ValueError("could not parse XML")
-        children = self.document.childNodes()
-
-        j = 0
-        for _ in range(children.count()):
-            ch = children.item(j)
-            if str(ch.nodeName()).strip() in \
-                    ['xml', 'xml-stylesheet', "#comment"]:
-                self.document.removeChild(ch)
-            else:
-                j += 1
+    # sets component from XML string
+    # \brief XML of at least streamSize bytes can be loaded by the streaming
+    #        loader which creates only streamDepth levels of the tree,
+    #        deeper subtrees are created when they are shown or edited
+    # \param xml XML string or opened file
+    # \param stream if the streaming loader can be used
+    def _loadFromString(self, xml, stream=False):
+        lazy = None
+        if stream and self.streamSize is not None:
+            if hasattr(xml, "readAll"):
+                xml = bytes(xml.readAll())
+            if len(xml) >= self.streamSize:
+                lazy = LazyDocument(xml, self.streamDepth)
+                try:
+                    lazy.load()
+                except ValueError as e:
+                    logger.warn("Streaming loader failed: %s" % e)
+                    lazy = None
+        if lazy is not None:
+            self.document = lazy.document
+            self.__lazy = lazy
+        else:
+            self.document = parseComponent(xml)
         if self.dialog and self.dialog.ui:
-            newModel = ComponentModel(
-                self.document, self._allAttributes, self.parent)
-            self.view.setModel(newModel)
+            self.view.setModel(self.__createModel())
             self.connectView()
 
     # loads the component item from the xml file
@@ -1234,8 +1698,7 @@ class Component(object):
                     self.dialog.ui.widget.widget.setVisible(False)
                 else:
                     self.dialog.ui.widget.setVisible(False)
-            self.dialog.ui.widget = QWidget(self.dialog)
-            self._frameLayout.addWidget(self.dialog.ui.widget)
+            self.dialog.ui.widget = self._frameWidgets[None]
             self.dialog.ui.widget.show()
             self.dialog.ui.frame.show()
 
@@ -1318,16 +1781,17 @@ class Component(object):
         return ds
 
     # provides the component in xml string
+    # \brief Pending subtrees of the not changed streamed document are
+    #        copied from its source
     # \param indent number of added spaces during pretty printing
     # \returns xml string
     def get(self, indent=0):
+        if self.__lazy is not None and not self.__lazy.modified:
+            return self.__lazy.toXML(indent)
+        if self.__compact is not None:
+            return self.__compact.sourceXML(indent)
         if hasattr(self.document, "toString"):
-            processing = self.document.createProcessingInstruction(
-                "xml", "version='1.0'")
-            self.document.insertBefore(processing, self.document.firstChild())
-            string = unicode(self.document.toString(indent))
-            self.document.removeChild(processing)
-            return string
+            return componentXML(self.document, indent)
 
     # saves the component
     # \brief It saves the component in the xml file
@@ -22,19 +22,16 @@
 """ component widget """
 
 from PyQt5.QtWidgets import (QDialog, QWidget)
-from PyQt5 import uic
 
 # from .ui.ui_componentdlg import Ui_ComponentDlg
+from .UiLoader import UiForm
 from .DomTools import DomTools
 
 import logging
-import os
 # message logger
 logger = logging.getLogger("nxsdesigner")
 
-_formclass, _baseclass = uic.loadUiType(
-    os.path.join(os.path.dirname(os.path.abspath(__file__)),
-                 "ui", "componentdlg.ui"))
+_formclass = UiForm("componentdlg")
 
 
 # compoent dialog
@@ -74,6 +71,7 @@ class ComponentDlg(QDialog):
     def closeEvent(self, event):
         super(ComponentDlg, self).closeEvent(event)
         self.component.dialog = None
+        self.component.compactClosed()
         event.accept()
 
     # rejects component closing
@@ -23,43 +23,69 @@
 
 
 # dialog defining a tag link
+# \brief Items keep their row numbers so parent and child lookups do not
+#        search the sibling lists
 class ComponentItem(object):
 
+    __slots__ = ["node", "parent", "row", "display", "references",
+                 "__childItems"]
+
     # constructor
     # \param node DOM node of item
     # \param parent patent instance
-    def __init__(self, node, parent=None):
+    # \param row row number of the item in its parent
+    def __init__(self, node, parent=None, row=0):
         # DOM node
         self.node = node
         # list with child items
         self.__childItems = []
         # the parent ComponentItem of the item
         self.parent = parent
+        # row number of the item in its parent
+        self.row = row
+        # (cache key, display strings) of the item set by the model
+        self.display = None
+        # Counter of element references in the item subtree set by the model
+        self.references = None
 
     # provides indexs of given child
     # \param child
     # \returns child index
     def index(self, child):
+        row = child.row
+        if row < len(self.__childItems) and self.__childItems[row] is child:
+            return row
         return self.__childItems.index(child)
 
     # provides a number of the current item
     # \returns a number of the current item
     def childNumber(self):
         if self.parent:
-            return self.parent.index(self)
+            return self.row
         return 0
 
+    # provides the child items which are already created
+    # \returns list of child items
+    def loadedChildren(self):
+        return list(self.__childItems)
+
+    # updates row numbers of the children
+    # \param start list index of the first child to update
+    def __renumber(self, start):
+        for row in range(start, len(self.__childItems)):
+            self.__childItems[row].row = row
+
     # provides the child item for the given list index
     # \param i child index
     # \returns requested child Item
     def child(self, i):
         size = len(self.__childItems)
-        if i in range(size):
+        if 0 <= i < size:
             return self.__childItems[i]
-        if i >= 0 and i < self.node.childNodes().count():
+        childNodes = self.node.childNodes()
+        if i >= 0 and i < childNodes.count():
             for j in range(size, i + 1):
-                childNode = self.node.childNodes().item(j)
-                childItem = ComponentItem(childNode, self)
+                childItem = ComponentItem(childNodes.item(j), self, j)
                 self.__childItems.append(childItem)
             return childItem
 
@@ -71,9 +97,8 @@ class ComponentItem(object):
         if position < 0 or position + count > self.node.childNodes().count():
             return False
 
-        for _ in range(count):
-            if position < len(self.__childItems):
-                self.__childItems.pop(position)
+        del self.__childItems[position:position + count]
+        self.__renumber(position)
 
         return True
 
@@ -83,14 +108,15 @@ class ComponentItem(object):
     # \returns if indices not out of range
     def insertChildren(self, position, count):
 
-        if position < 0 or position > self.node.childNodes().count():
+        childNodes = self.node.childNodes()
+        if position < 0 or position > childNodes.count():
             return False
 
-        for i in range(position, position + count):
-            if position <= len(self.__childItems):
-                childNode = self.node.childNodes().item(i)
-                childItem = ComponentItem(childNode, self)
-                self.__childItems.insert(i, childItem)
+        if position <= len(self.__childItems):
+            self.__childItems[position:position] = [
+                ComponentItem(childNodes.item(i), self, i)
+                for i in range(position, position + count)]
+            self.__renumber(position + count)
 
         return True
 
@@ -24,7 +24,9 @@
 
 
 from .Component import Component
+from .DomTools import DomTools
 from .ElementList import ElementList
+from .FileLoader import compactComponent
 
 import logging
 # message logger
@@ -43,6 +45,13 @@ class ComponentList(ElementList):
         # show all attribures or only the type attribute
         self._allAttributes = False
 
+        # if documents of not open components are kept in compact trees
+        self.compact = False
+
+        # datasource references of not loaded files,
+        # i.e. path: ((size, mtime), datasources)
+        self._fileReferences = {}
+
         # widget title
         self.title = "Components"
         # element name
@@ -61,10 +70,12 @@ class ComponentList(ElementList):
             return self._allAttributes
         self._allAttributes = True if status else False
         for k in self.elements.keys():
-            if hasattr(self.elements[k], "instance") \
-                    and self.elements[k].instance:
-                self.elements[k].instance.viewAttributes(
-                    self._allAttributes)
+            el = self.elements[k]
+            instance = el.loadedInstance() \
+                if hasattr(el, "loadedInstance") \
+                else getattr(el, "instance", None)
+            if instance:
+                instance.viewAttributes(self._allAttributes)
 
     # retrives element name from file name
     # \param fname filename
@@ -84,17 +95,76 @@ class ComponentList(ElementList):
         dlg = Component(self)
         dlg.directory = self.directory
         dlg.name = name
-        dlg.createGUI()
+        if not self.compact:
+            dlg.createGUI()
+        return dlg
+
+    # creates the element instance and loads it from its file
+    # \param el labeled object of the element
+    # \param externalActions dictionary with external actions
+    # \param itemActions actions of the context menu
+    # \param text prefetched content of the element file
+    # \param data compact tree of the element file parsed in background
+    # \returns element instance
+    def _loadElement(self, el, externalActions=None, itemActions=None,
+                     text=None, data=None):
+        dlg = super(ComponentList, self)._loadElement(
+            el, externalActions, itemActions, text, data)
+        dlg.viewAttributes(self._allAttributes)
         return dlg
 
+    # provides the function parsing component files in background
+    # \brief Components which are kept in compact trees are parsed
+    #        by the workers
+    # \returns compactComponent or None
+    def _fileParser(self):
+        if self.compact and not self.lazy:
+            return compactComponent
+
+    # stores datasource references of the file read in background
+    # \param el labeled object of the element
+    # \param prefetched dictionary with the file read in background
+    def _prefetched(self, el, prefetched):
+        if not prefetched["error"]:
+            self._fileReferences[el.fileInfo[0]] = (
+                el.fileInfo[1:], prefetched["datasources"])
+
+    # provides the element name and its references
+    # \brief Datasources of not loaded components are read from their files
+    # \param el labeled object of the element
+    # \returns (name, list of (kind, name) tuples) tuple
+    def _elementReferences(self, el):
+        if hasattr(el, "isLoaded") and not el.isLoaded():
+            return el.name, [
+                ("datasources", name) for name in self._fileDataSources(el)]
+        return super(ComponentList, self)._elementReferences(el)
+
+    # provides names of components which use the given datasource
+    # \param datasource datasource name
+    # \returns list of component names
     def dataSourceComponents(self, datasource):
-        comps = set()
-        for cp in self.elements.values():
-            if cp and cp.name and cp.instance:
-                if hasattr(cp.instance, "datasources"):
-                    if datasource in cp.instance.datasources:
-                        comps.add(cp.name)
-        return list(comps)
+        return [name for kind, name in
+                self.dependencies.users(("datasources", datasource))
+                if kind == "components"]
+
+    # provides datasources referred in a not loaded component file
+    # \param cp labeled object of the component
+    # \returns list of datasource names
+    def _fileDataSources(self, cp):
+        if not cp.fileInfo or not cp.fileInfo[0]:
+            return []
+        fpath, size, mtime = cp.fileInfo
+        if fpath in self._fileReferences \
+                and self._fileReferences[fpath][0] == (size, mtime):
+            return self._fileReferences[fpath][1]
+        try:
+            with open(fpath) as fl:
+                text = fl.read()
+        except Exception:
+            return []
+        dss = DomTools.findElements(text, "datasources")
+        self._fileReferences[fpath] = ((size, mtime), dss)
+        return dss
 
 
 if __name__ == "__main__":
@@ -21,10 +21,17 @@
 
 """ component model for tree view """
 
+import itertools
+
 from PyQt5.QtCore import (QAbstractItemModel, Qt, QModelIndex)
 from PyQt5.QtXml import QDomNode
 
 from . ComponentItem import ComponentItem
+from . DomTools import DomTools
+
+
+# revision counter shared by all models
+_revisions = itertools.count(1)
 
 
 # model for component tree
@@ -33,17 +40,109 @@ class ComponentModel(QAbstractItemModel):
     # \param document DOM document
     # \param parent widget
     # \param allAttributes True if show all attributes in the tree
-    def __init__(self, document, allAttributes, parent=None):
+    # \param lazy lazy document with pending subtrees of the document
+    def __init__(self, document, allAttributes, parent=None, lazy=None):
         super(ComponentModel, self).__init__(parent)
 
         # show all attribures or only the type attribute
         self.__allAttributes = allAttributes
 
+        # lazy document with pending subtrees of the document
+        self.__lazy = lazy
+
         # root item of the tree
         self.__rootItem = ComponentItem(document)
         # index of the root item
         self.rootIndex = self.createIndex(0, 0, self.__rootItem)
 
+        # revision of the model data, unique among all models
+        self.revision = next(_revisions)
+        self.dataChanged.connect(self.touch)
+
+    # marks the model data as modified
+    # \brief It updates the model revision which also invalidates
+    #        the cached display data, and drops the cached references of
+    #        the changed items or of all items if no index is given
+    # \param topLeft index of the first changed item
+    # \param bottomRight index of the last changed item
+    def touch(self, topLeft=None, bottomRight=None, *args):
+        self.revision = next(_revisions)
+        if self.__lazy is not None:
+            self.__lazy.modified = True
+        if topLeft is None or not topLeft.isValid():
+            self.__invalidate(self.__rootItem, True)
+            return
+        parent = topLeft.parent()
+        last = bottomRight.row() if bottomRight is not None \
+            and bottomRight.isValid() else topLeft.row()
+        for row in range(topLeft.row(), last + 1):
+            index = self.index(row, 0, parent)
+            if index.isValid():
+                self.__invalidate(index.internalPointer(), True)
+
+    # drops the cached references of the item and its ancestors
+    # \param item changed item
+    # \param subtree if the references of the item descendants
+    #        are also dropped
+    def __invalidate(self, item, subtree=False):
+        if subtree:
+            items = item.loadedChildren()
+            while items:
+                child = items.pop()
+                child.references = None
+                items.extend(child.loadedChildren())
+        while item is not None:
+            item.references = None
+            item = item.parent
+
+    # marks the model data as modified by inserting or removing children
+    # \param item parent item
+    def __childrenChanged(self, item):
+        self.revision = next(_revisions)
+        if self.__lazy is not None:
+            self.__lazy.modified = True
+        self.__invalidate(item)
+
+    # counts $datasources and $components references in the document
+    # \brief Counters of subtrees are cached in the items and dropped
+    #        when the items are changed, pending subtrees are counted
+    #        by the lazy document
+    # \param index index of the subtree root, the document if not valid
+    # \returns Counter with (label, name) : number of references
+    def references(self, index=QModelIndex()):
+        item = index.internalPointer() if index.isValid() \
+            else self.__rootItem
+        references = self.__references(item)
+        if self.__lazy is not None:
+            references = references + self.__lazy.references(
+                item.node if index.isValid() else None)
+        return references
+
+    # creates pending subtrees of the lazy document
+    # \brief It is called before the items are edited or shown
+    #        in the item frame
+    # \param index index of the subtree root, the document if not valid
+    # \param levels number of levels below the item which have to be
+    #        created, all if None
+    def fetchSubtree(self, index=QModelIndex(), levels=None):
+        if self.__lazy is None:
+            return
+        if self.__lazy.materialize(
+                index.internalPointer().node if index.isValid() else None,
+                levels):
+            self.__invalidate(self.__rootItem, True)
+
+    # counts references in the item subtree
+    # \param item component item
+    # \returns Counter with (label, name) : number of references
+    def __references(self, item):
+        if item.references is None:
+            item.references = DomTools.nodeReferences(
+                item.node,
+                [self.__references(child)
+                 for child in item.loadedChildren()])
+        return item.references
+
     # provides access to the header data
     # \param section integer index of the table column
     # \param orientation orientation of the header
@@ -69,7 +168,40 @@ class ComponentModel(QAbstractItemModel):
     def setAttributeView(self, allAttributes):
         self.__allAttributes = allAttributes
 
+    # provides display strings of the node
+    # \param node DOM node
+    # \returns tuple with name, attribute and value column strings
+    def __displayData(self, node):
+        attributeMap = node.attributes()
+#        if node.nodeName() == 'xml':
+#            return
+
+        name = None
+        if attributeMap.contains("name"):
+            name = attributeMap.namedItem("name").nodeValue()
+        if name is not None:
+            label = str(node.nodeName() + ": " + name)
+        else:
+            label = str(node.nodeName())
+
+        if self.__allAttributes:
+            attributes = []
+            for i in range(attributeMap.count()):
+                attribute = attributeMap.item(i)
+                attributes.append(attribute.nodeName() + "=\""
+                                  + attribute.nodeValue() + "\"")
+            attributes = str(" ".join(attributes) + "  ")
+        else:
+            attributes = str(
+                (attributeMap.namedItem("type").nodeValue() + "  ")
+                if attributeMap.contains("type") else str("  "))
+
+        value = str(" ".join(node.nodeValue().split("\n")))
+        return (label, attributes, value)
+
     # provides read access to the model data
+    # \brief Display strings are cached in the items until the model
+    #        revision or the attribute view changes
     # \param index of the model item
     # \param role access type of the data
     # \returns data defined for the given index and formated according
@@ -80,39 +212,16 @@ class ComponentModel(QAbstractItemModel):
         if role != Qt.DisplayRole:
             return None
 
-        item = index.internalPointer()
-        node = item.node
-
-        attributeMap = node.attributes()
-#        if node.nodeName() == 'xml':
-#            return
-
-        if index.column() == 0:
-            name = None
-            if attributeMap.contains("name"):
-                name = attributeMap.namedItem("name").nodeValue()
-
-            if name is not None:
-                return str(node.nodeName() + ": " + name)
-            else:
-                return str(node.nodeName())
-        elif index.column() == 1:
-            if self.__allAttributes:
-                attributes = []
-                for i in range(attributeMap.count()):
-                    attribute = attributeMap.item(i)
-                    attributes.append(attribute.nodeName() + "=\""
-                                      + attribute.nodeValue() + "\"")
-                return str(" ".join(attributes) + "  ")
-            else:
-                return str(
-                    (attributeMap.namedItem("type").nodeValue() + "  ")
-                    if attributeMap.contains("type") else str("  "))
-
-        elif index.column() == 2:
-            return str(" ".join(node.nodeValue().split("\n")))
-        else:
+        column = index.column()
+        if column > 2:
             return ""
+        item = index.internalPointer()
+        key = (self.revision, self.__allAttributes)
+        display = item.display
+        if display is None or display[0] != key:
+            display = (key, self.__displayData(item.node))
+            item.display = display
+        return display[1][column]
 
     # provides flag of the model item
     # \param index of the model item
@@ -183,8 +292,22 @@ class ComponentModel(QAbstractItemModel):
 
         if not hasattr(parentItem, "node") or parentItem.node is None:
             return 0
+        if self.__lazy is not None and self.__lazy.isPending(parentItem.node):
+            self.__lazy.materialize(parentItem.node, 1)
+            self.__invalidate(parentItem)
         return parentItem.node.childNodes().count()
 
+    # checks if the item has children
+    # \brief Pending subtrees of the lazy document are not created
+    # \param parent parent index
+    # \returns True if the item has children
+    def hasChildren(self, parent=QModelIndex()):
+        if self.__lazy is not None and parent.isValid() \
+                and parent.column() == 0 \
+                and self.__lazy.isPending(parent.internalPointer().node):
+            return True
+        return QAbstractItemModel.hasChildren(self, parent)
+
     # provides number of the model columns
     # \param parent parent index
     # \returns 3 which corresponds to component tag tree, tag attributes,
@@ -210,6 +333,7 @@ class ComponentModel(QAbstractItemModel):
         item.node.insertBefore(node, previous)
 #
         status = item.insertChildren(position, 1)
+        self.__childrenChanged(item)
 
         self.endInsertRows()
 
@@ -232,6 +356,7 @@ class ComponentModel(QAbstractItemModel):
         item.node.insertAfter(node, previous)
 #
         status = item.insertChildren(position, 1)
+        self.__childrenChanged(item)
 
         self.endInsertRows()
 
@@ -250,6 +375,7 @@ class ComponentModel(QAbstractItemModel):
 
         status = item.removeChildren(position, 1)
         item.node.removeChild(node)
+        self.__childrenChanged(item)
         self.endRemoveRows()
         return status
 
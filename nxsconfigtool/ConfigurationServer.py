@@ -22,23 +22,74 @@
 """ Provides connects to configuration server"""
 
 import logging
+import hashlib
+import threading
 import time
+import sys
 
-from .ConnectDlg import ConnectDlg
+try:
+    import queue
+except ImportError:
+    import Queue as queue
 
+from .ConnectionManager import connections, PYTANGO_AVAILABLE
 
-try:
-    try:
-        import tango
-    except Exception:
-        import PyTango as tango
-    # if module tango avalable
-    PYTANGO_AVAILABLE = True
-    logger = logging.getLogger("nxsdesigner")
-except ImportError as e:
-    PYTANGO_AVAILABLE = False
-    logger = logging.getLogger("nxsdesigner")
-    logger.info("tango is not available: %s" % e)
+# message logger
+logger = logging.getLogger("nxsdesigner")
+
+if not PYTANGO_AVAILABLE:
+    logger.info("tango is not available")
+
+if sys.version_info > (3,):
+    unicode = str
+
+
+# scheduler of chunks fetched by a pool of threads
+# \brief The chunk size grows while chunks are fetched faster than
+#        the target latency and shrinks when they are slower or when
+#        they have to be bisected because of failing elements
+class ChunkScheduler(object):
+
+    # constructor
+    # \param names list of element names
+    # \param size initial chunk size
+    # \param maxSize maximal chunk size
+    # \param latency target time in seconds of fetching one chunk
+    def __init__(self, names, size, maxSize, latency):
+        # element names
+        self.names = names
+        # position of the next chunk
+        self.position = 0
+        # size of the next chunk
+        self.size = max(1, min(size, maxSize))
+        # maximal chunk size
+        self.maxSize = max(1, maxSize)
+        # target time in seconds of fetching one chunk
+        self.latency = latency
+        # lock of the position and the size
+        self.__lock = threading.Lock()
+
+    # provides the next chunk
+    # \returns list of element names, empty if all chunks are taken
+    def next(self):
+        with self.__lock:
+            start = self.position
+            self.position = min(len(self.names), start + self.size)
+            return self.names[start:self.position]
+
+    # adapts the chunk size to the fetched chunk
+    # \param size size of the fetched chunk
+    # \param duration time in seconds of fetching the chunk
+    # \param failures number of failed commands of the chunk
+    def report(self, size, duration, failures=0):
+        with self.__lock:
+            if failures:
+                size = size // 2
+            elif duration > self.latency:
+                size = int(size * self.latency / duration)
+            elif duration < self.latency / 2:
+                size = size * 2
+            self.size = max(1, min(self.maxSize, size))
 
 
 # configuration server
@@ -61,6 +112,29 @@ class ConfigurationServer(object):
         # device proxy
         self._proxy = None
 
+        # manager of persistent device connections
+        self.manager = connections
+
+        # lock serializing all calls of the device proxy
+        self.lock = threading.RLock()
+
+        # content hashes of elements known to be stored on the server,
+        # i.e. {"components": {name: hash}, "datasources": {name: hash}}
+        self._hashes = {"components": {}, "datasources": {}}
+        # device name of the recorded hashes
+        self._hashDevice = None
+
+        # maximal number of elements fetched by one command
+        # when the bulk fetch fails
+        self.chunkSize = 64
+        # target time in seconds of fetching one chunk
+        self.chunkLatency = 1.0
+        # number of threads fetching the chunks
+        self.workers = 4
+
+        # local cache of the server elements, not used if None
+        self.cache = None
+
     # sets server from string
     # \param device string
     def setServer(self, device):
@@ -101,36 +175,47 @@ class ConfigurationServer(object):
         else:
             return str(self.device)
 
+    # provides content hash of the given xml
+    # \param xml XML string
+    # \returns hash string
+    @classmethod
+    def _hash(cls, xml):
+        return hashlib.md5(unicode(xml).encode("utf-8")).hexdigest()
+
+    # records contents of the elements stored on the server
+    # \param kind element kind, i.e. components or datasources
+    # \param elements dictionary with names : xml of elements
+    def _setHashes(self, kind, elements):
+        self._hashes[kind] = dict(
+            (name, self._hash(xml)) for name, xml in elements.items() if xml)
+
+    # checks if the element content is known to be stored on the server
+    # \param kind element kind, i.e. components or datasources
+    # \param name element name
+    # \param xml XML content of the element
+    # \returns True if the server has the same content
+    def isStored(self, kind, name, xml):
+        return self._hashes[kind].get(unicode(name)) == self._hash(xml)
+
     # connects to the configuration server
     # \brief It opens the configuration Tango device
     def connect(self):
-        self._proxy = tango.DeviceProxy(self.getDeviceName())
-        if self._proxy:
-            found = False
-            cnt = 0
-            while not found and cnt < 1000:
-                if cnt > 1:
-                    time.sleep(0.01)
-                try:
-                    if self._proxy.state() != tango.DevState.RUNNING:
-                        found = True
-                except Exception:
-
-                    time.sleep(0.01)
-                    found = False
-                cnt += 1
-
-            if found:
-                self._proxy.set_timeout_millis(25000)
-                self._proxy.set_source(tango.DevSource.DEV)
-                self._proxy.command_inout("Open")
-                self.connected = True
-            else:
-                raise Exception("Cannot connect to: %s" % str(self.device))
+        with self.lock:
+            if self.getDeviceName() != self._hashDevice:
+                self._hashes = {"components": {}, "datasources": {}}
+                self._hashDevice = self.getDeviceName()
+            self._proxy = self.manager.connect(self.getDeviceName())
+            self.connected = True
+
+    # provides connection latency metrics
+    # \returns dictionary with metrics of the current device
+    def metrics(self):
+        return self.manager.metrics(self.getDeviceName())
 
     # opens connection to the configuration server
     # \brief It fetches parameters of tango device and calls connect() method
     def open(self):
+        from .ConnectDlg import ConnectDlg
         aform = ConnectDlg()
         if self.device:
             aform.device = self.device
@@ -147,99 +232,279 @@ class ConfigurationServer(object):
             self.port = aform.port
             self.connect()
 
+    # fetches the given elements and bisects the chunks which fail
+    # \brief A failing element is isolated by splitting its chunk
+    #        into halves, the element gets an empty content
+    # \param command command fetching the elements
+    # \param names list of element names
+    # \returns (elements, failures) tuple with dictionary of names : xml
+    #          of elements and number of failed commands
+    def _fetchChunk(self, command, names):
+        try:
+            return dict(zip(names, self._proxy.command_inout(
+                command, list(names)))), 0
+        except Exception as e:
+            if len(names) < 2:
+                logger.debug("%s %s: %s" % (command, names, e))
+                return dict((name, "") for name in names), 1
+        half = len(names) // 2
+        elements, failures = self._fetchChunk(command, names[:half])
+        second, more = self._fetchChunk(command, names[half:])
+        elements.update(second)
+        return elements, failures + more + 1
+
+    # fetches chunks of the scheduler until all of them are taken
+    # \brief It is run by each thread of the pool
+    # \param command command fetching the elements
+    # \param scheduler chunk scheduler
+    # \param results queue of fetched dictionaries, None is put at the end
+    def _fetchScheduled(self, command, scheduler, results):
+        try:
+            chunk = scheduler.next()
+            while chunk:
+                start = time.time()
+                elements, failures = self._fetchChunk(command, chunk)
+                scheduler.report(len(chunk), time.time() - start, failures)
+                results.put(elements)
+                chunk = scheduler.next()
+        finally:
+            results.put(None)
+
+    # fetches the given elements in chunks by a pool of threads
+    # \brief The chunk size is adapted to the observed latency and
+    #        failures, see ChunkScheduler
+    # \param command command fetching the elements
+    # \param names list of element names
+    # \param callback function called with a dictionary of each fetched
+    #        chunk, i.e. names : xml of elements
+    # \returns dictionary with names : xml of elements
+    def _fetchChunks(self, command, names, callback=None):
+        elements = {}
+        if not names:
+            return elements
+        scheduler = ChunkScheduler(
+            names, len(names) // (4 * self.workers), self.chunkSize,
+            self.chunkLatency)
+        results = queue.Queue()
+        threads = [
+            threading.Thread(target=self._fetchScheduled,
+                             args=(command, scheduler, results))
+            for _ in range(max(1, min(self.workers, len(names))))]
+        for thread in threads:
+            thread.start()
+        running = len(threads)
+        while running:
+            chunk = results.get()
+            if chunk is None:
+                running -= 1
+            else:
+                elements.update(chunk)
+                if callback:
+                    callback(chunk)
+        for thread in threads:
+            thread.join()
+        return elements
+
+    # fetches all elements of the given kind
+    # \brief The server does not provide versions of its elements, a diff
+    #        of the name lists cannot tell changed elements so all elements
+    #        are fetched and the local cache only keeps the last state for
+    #        the offline mode. When the bulk command fails the elements are
+    #        fetched in chunks, see _fetchChunks()
+    # \param kind element kind, i.e. components or datasources
+    # \param listCommand command providing the element names
+    # \param command command fetching the elements
+    # \param callback function called with dictionaries of the fetched
+    #        elements as they arrive
+    # \returns dictionary with names : xml of elements
+    def _fetchElements(self, kind, listCommand, command, callback=None):
+        with self.lock:
+            if self._proxy and self.connected:
+                names = list(self._proxy.command_inout(listCommand))
+                elements = {}
+                if names:
+                    try:
+                        elements = dict(zip(names, self._proxy.command_inout(
+                            command, names)))
+                        if callback:
+                            callback(elements)
+                    except Exception as e:
+                        logger.debug("%s: %s" % (command, e))
+                        elements = self._fetchChunks(command, names, callback)
+                self._updateCache("update", kind, elements, names)
+                self._flushCache()
+                self._setHashes(kind, elements)
+                return elements
+
     # fetch all components
+    # \param callback function called with dictionaries of the fetched
+    #        components as they arrive
     # \returns dictionary with names : xml of components
-    def fetchComponents(self):
-        names = []
-        comps = []
-        if self._proxy and self.connected:
-            names = self._proxy.command_inout("AvailableComponents")
-
-            try:
-                comps = self._proxy.command_inout("Components", names)
-            except Exception:
-                comps = []
-                for n in names:
-                    try:
-                        xml = self._proxy.command_inout("Components", [n])
-                        comps.append(xml[0])
-                    except Exception:
-                        comps.append("")
-            return dict(zip(names, comps))
+    def fetchComponents(self, callback=None):
+        return self._fetchElements(
+            "components", "AvailableComponents", "Components", callback)
 
     # fetch all datasources
+    # \param callback function called with dictionaries of the fetched
+    #        datasources as they arrive
     # \returns dictionary with names : xml of datasources
-    def fetchDataSources(self):
-        names = []
-        ds = []
-        if self._proxy and self.connected:
-            names = self._proxy.command_inout("AvailableDataSources")
+    def fetchDataSources(self, callback=None):
+        return self._fetchElements(
+            "datasources", "AvailableDataSources", "DataSources", callback)
+
+    # updates the local cache of the current device
+    # \brief Errors of the cache are only logged
+    # \param method cache method, i.e. update or remove
+    # \param kind element kind, i.e. components or datasources
+    # \param args method arguments
+    def _updateCache(self, method, kind, *args):
+        if self.cache is not None:
             try:
-                ds = self._proxy.command_inout("DataSources", names)
-            except Exception:
-                ds = []
-                for n in names:
-                    try:
-                        xml = self._proxy.command_inout("DataSources", [n])
-                        ds.extend(xml)
-                    except Exception:
-                        ds.append("")
-
-            return dict(zip(names, ds))
+                getattr(self.cache, method)(
+                    self.getDeviceName(), kind, *args)
+            except Exception as e:
+                logger.warning("cannot update cache: %s" % unicode(e))
+
+    # writes the changed indices of the local cache
+    # \brief Single stores and deletes are written by the next fetch,
+    #        store of all elements or close
+    def _flushCache(self):
+        if self.cache is not None:
+            try:
+                self.cache.flush()
+            except Exception as e:
+                logger.warning("cannot write cache: %s" % unicode(e))
+
+    # stores the element
+    # \param kind element kind, i.e. components or datasources
+    # \param command store command
+    # \param name element name
+    # \param xml XML content of the element
+    # \param cache if the local cache should be updated
+    def _storeElement(self, kind, command, name, xml, cache=True):
+        with self.lock:
+            if self._proxy and self.connected:
+                self._proxy.XMLString = str(xml)
+                self._proxy.command_inout(command, str(name))
+                self._hashes[kind][unicode(name)] = self._hash(xml)
+                if cache:
+                    self._updateCache("update", kind, {unicode(name): xml})
 
     # stores the component
     # \param name component name
     # \param xml XML content of the component
     def storeComponent(self, name, xml):
-        if self._proxy and self.connected:
-            self._proxy.XMLString = str(xml)
-            self._proxy.command_inout("StoreComponent", str(name))
+        self._storeElement("components", "StoreComponent", name, xml)
 
     # stores the datasource
     # \param name datasource name
     # \param xml XML content of the datasource
     def storeDataSource(self, name, xml):
-        if self._proxy and self.connected:
-            self._proxy.XMLString = str(xml)
-            self._proxy.command_inout("StoreDataSource", str(name))
+        self._storeElement("datasources", "StoreDataSource", name, xml)
+
+    # stores the given elements using the current connection
+    # \param kind element kind, i.e. components or datasources
+    # \param command store command
+    # \param elements list of (name, xml) tuples
+    # \param callback function called with a number of processed elements
+    # \returns (stored, skipped, failures) tuple with lists of stored and
+    #          unchanged element names and dictionary with name : error
+    def _storeElements(self, kind, command, elements, callback=None):
+        with self.lock:
+            stored = []
+            skipped = []
+            failures = {}
+            contents = {}
+            for i, (name, xml) in enumerate(elements):
+                if self.isStored(kind, name, xml):
+                    skipped.append(name)
+                else:
+                    try:
+                        self._storeElement(kind, command, name, xml, False)
+                        stored.append(name)
+                        contents[unicode(name)] = xml
+                    except Exception as e:
+                        failures[name] = unicode(e)
+                if callback:
+                    callback(i + 1)
+            if contents:
+                self._updateCache("update", kind, contents)
+                self._flushCache()
+            return stored, skipped, failures
+
+    # stores the given components with one connection
+    # \brief The XMLString attribute is shared by the store commands
+    #         so the components are sent one by one, the components which
+    #         content is known to be stored on the server are skipped
+    # \param components list of (name, xml) tuples
+    # \param callback function called with a number of processed components
+    # \returns (stored, skipped, failures) tuple with lists of stored and
+    #          unchanged component names and dictionary with name : error
+    def storeComponents(self, components, callback=None):
+        return self._storeElements(
+            "components", "StoreComponent", components, callback)
+
+    # stores the given datasources with one connection
+    # \brief The XMLString attribute is shared by the store commands
+    #         so the datasources are sent one by one, the datasources which
+    #         content is known to be stored on the server are skipped
+    # \param datasources list of (name, xml) tuples
+    # \param callback function called with a number of processed
+    #        datasources
+    # \returns (stored, skipped, failures) tuple with lists of stored and
+    #          unchanged datasource names and dictionary with name : error
+    def storeDataSources(self, datasources, callback=None):
+        return self._storeElements(
+            "datasources", "StoreDataSource", datasources, callback)
 
     # stores the component
     # \param name component name
     def deleteComponent(self, name):
-        if self._proxy and self.connected:
-            self._proxy.command_inout("DeleteComponent", str(name))
+        with self.lock:
+            if self._proxy and self.connected:
+                self._proxy.command_inout("DeleteComponent", str(name))
+                self._hashes["components"].pop(unicode(name), None)
+                self._updateCache("remove", "components", [unicode(name)])
 
     # stores the datasource
     # \param name datasource name
     def deleteDataSource(self, name):
-        if self._proxy and self.connected:
-            self._proxy.command_inout("DeleteDataSource", str(name))
+        with self.lock:
+            if self._proxy and self.connected:
+                self._proxy.command_inout("DeleteDataSource", str(name))
+                self._hashes["datasources"].pop(unicode(name), None)
+                self._updateCache("remove", "datasources", [unicode(name)])
 
     # set the given component mandatory
     # \param name component name
     def setMandatory(self, name):
-        if self._proxy and self.connected:
-            self._proxy.command_inout("SetMandatoryComponents",
-                                      [str(name)])
+        with self.lock:
+            if self._proxy and self.connected:
+                self._proxy.command_inout("SetMandatoryComponents",
+                                          [str(name)])
 
     # get the mandatory components
     # returns list of the mandatory components
     def getMandatory(self):
-        if self._proxy and self.connected:
-            return self._proxy.command_inout("MandatoryComponents")
+        with self.lock:
+            if self._proxy and self.connected:
+                return self._proxy.command_inout("MandatoryComponents")
 
     # unset the given component mandatory
     # \param name component name
     def unsetMandatory(self, name):
-        if self._proxy and self.connected:
-            self._proxy.command_inout("UnsetMandatoryComponents", [str(name)])
+        with self.lock:
+            if self._proxy and self.connected:
+                self._proxy.command_inout("UnsetMandatoryComponents",
+                                          [str(name)])
 
     # closes connecion
     # \brief It closes connecion to configuration server
     def close(self):
-        if self._proxy and self.connected:
-            if self._proxy.state() == tango.DevState.OPEN:
-                self._proxy.command_inout("Close")
+        with self.lock:
+            self._flushCache()
+            if self._proxy and self.connected:
+                self.manager.close(self.getDeviceName())
                 self.connected = False
 
 
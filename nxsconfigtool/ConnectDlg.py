@@ -21,11 +21,11 @@
 
 """ server connect widget """
 
-import os
 import sys
 
 from PyQt5.QtWidgets import (QDialog, QMessageBox)
-from PyQt5 import uic
+
+from .UiLoader import UiForm
 
 # from .ui.ui_connectdlg import Ui_ConnectDlg
 
@@ -33,9 +33,7 @@ import logging
 # message logger
 logger = logging.getLogger("nxsdesigner")
 
-_formclass, _baseclass = uic.loadUiType(
-    os.path.join(os.path.dirname(os.path.abspath(__file__)),
-                 "ui", "connectdlg.ui"))
+_formclass = UiForm("connectdlg")
 
 if sys.version_info > (3,):
     unicode = str
@@ -0,0 +1,193 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2017 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+# \package nxsconfigtool nexdatas
+# \file ConnectionManager.py
+# persistent connections to configuration server devices
+
+""" persistent connections to configuration server devices """
+
+import threading
+import time
+
+import logging
+# message logger
+logger = logging.getLogger("nxsdesigner")
+
+try:
+    try:
+        import tango
+    except Exception:
+        import PyTango as tango
+    # if module tango avalable
+    PYTANGO_AVAILABLE = True
+except ImportError:
+    PYTANGO_AVAILABLE = False
+
+
+# provides metrics of a device without connections
+# \returns dictionary with zero metrics
+def _emptyMetrics():
+    return {"connects": 0, "reused": 0, "failures": 0, "attempts": 0,
+            "last": 0.0, "total": 0.0, "max": 0.0}
+
+
+# persistent connections to configuration server devices
+# \brief Device proxies are cached per device name and open sessions
+#        are reused, so a repeated connect costs a single state() call
+class ConnectionManager(object):
+
+    # constructor
+    # \param factory function creating a device proxy from a device name,
+    #        tango.DeviceProxy if None
+    # \param timeout total time in seconds to wait for the device
+    # \param delay first delay in seconds between state checks
+    # \param maxDelay maximal delay in seconds between state checks
+    def __init__(self, factory=None, timeout=10.0, delay=0.01,
+                 maxDelay=0.5):
+        # function creating a device proxy
+        self.factory = factory
+        # total time in seconds to wait for the device
+        self.timeout = timeout
+        # first delay in seconds between state checks
+        self.delay = delay
+        # maximal delay in seconds between state checks
+        self.maxDelay = maxDelay
+        # device timeout in milliseconds
+        self.timeoutMillis = 25000
+        # state of the device which is not ready
+        self.runningState = tango.DevState.RUNNING \
+            if PYTANGO_AVAILABLE else "RUNNING"
+        # state of the device with an open session
+        self.openState = tango.DevState.OPEN \
+            if PYTANGO_AVAILABLE else "OPEN"
+        # source of the device data
+        self.source = tango.DevSource.DEV if PYTANGO_AVAILABLE else None
+        # cached device proxies, i.e. {device: proxy}
+        self.__proxies = {}
+        # devices with open sessions
+        self.__opened = set()
+        # connection metrics, i.e. {device: {name: value}}
+        self.__metrics = {}
+        # lock of the proxy cache
+        self.__lock = threading.Lock()
+
+    # provides the cached device proxy
+    # \param device device name
+    # \returns device proxy
+    def proxy(self, device):
+        with self.__lock:
+            if device not in self.__proxies:
+                factory = self.factory or tango.DeviceProxy
+                self.__proxies[device] = factory(device)
+            return self.__proxies[device]
+
+    # checks if the session of the device is open
+    # \param device device name
+    # \returns True if the session was opened and not closed
+    def isOpen(self, device):
+        return device in self.__opened
+
+    # connects to the device and opens its session
+    # \brief An open session is reused, otherwise the device state is
+    #        polled with exponential backoff up to the total timeout
+    # \param device device name
+    # \returns device proxy
+    def connect(self, device):
+        start = time.time()
+        proxy = self.proxy(device)
+        if device in self.__opened:
+            try:
+                if proxy.state() == self.openState:
+                    self.__record(device, start, 1, True)
+                    return proxy
+            except Exception as e:
+                logger.debug("session of %s lost: %s" % (device, e))
+            self.__opened.discard(device)
+
+        delay = self.delay
+        attempts = 0
+        while True:
+            attempts += 1
+            try:
+                if proxy.state() != self.runningState:
+                    break
+            except Exception as e:
+                logger.debug("state of %s: %s" % (device, e))
+            if time.time() - start + delay > self.timeout:
+                self.__record(device, start, attempts, False, True)
+                raise Exception("Cannot connect to: %s" % str(device))
+            time.sleep(delay)
+            delay = min(2 * delay, self.maxDelay)
+
+        proxy.set_timeout_millis(self.timeoutMillis)
+        if self.source is not None:
+            proxy.set_source(self.source)
+        proxy.command_inout("Open")
+        self.__opened.add(device)
+        self.__record(device, start, attempts, False)
+        return proxy
+
+    # closes the session of the device
+    # \param device device name
+    def close(self, device):
+        if device in self.__opened:
+            self.__opened.discard(device)
+            proxy = self.proxy(device)
+            if proxy.state() == self.openState:
+                proxy.command_inout("Close")
+
+    # removes the cached device proxy
+    # \param device device name
+    def forget(self, device):
+        with self.__lock:
+            self.__proxies.pop(device, None)
+        self.__opened.discard(device)
+
+    # records connection metrics
+    # \param device device name
+    # \param start start time of the connection
+    # \param attempts number of state checks
+    # \param reused if the open session was reused
+    # \param failed if the connection failed
+    def __record(self, device, start, attempts, reused, failed=False):
+        latency = time.time() - start
+        metrics = self.__metrics.setdefault(device, _emptyMetrics())
+        metrics["connects"] += 1
+        metrics["reused"] += 1 if reused else 0
+        metrics["failures"] += 1 if failed else 0
+        metrics["attempts"] += attempts
+        metrics["last"] = latency
+        metrics["total"] += latency
+        metrics["max"] = max(metrics["max"], latency)
+        logger.debug("connect to %s: %.4f s (%s checks%s)" % (
+            device, latency, attempts, ", reused" if reused else ""))
+
+    # provides connection latency metrics
+    # \param device device name
+    # \returns dictionary with numbers of connects, reused sessions,
+    #          failures and state checks and with the last, total, mean
+    #          and maximal latency in seconds
+    def metrics(self, device):
+        metrics = dict(self.__metrics.get(device) or _emptyMetrics())
+        metrics["mean"] = metrics["total"] / metrics["connects"] \
+            if metrics["connects"] else 0.0
+        return metrics
+
+
+# connection manager shared by the configuration server clients
+connections = ConnectionManager()
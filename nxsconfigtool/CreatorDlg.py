@@ -20,24 +20,20 @@
 # Component Creator dialog class
 
 """ server creator widget """
-import os
 import sys
 
 from PyQt5.QtCore import Qt
 from PyQt5.QtWidgets import QDialog, QTableWidgetItem, QMessageBox
-from PyQt5 import uic
+
+from .UiLoader import UiForm
 
 import logging
 # message logger
 logger = logging.getLogger("nxsdesigner")
 
-_formclass, _baseclass = uic.loadUiType(
-    os.path.join(os.path.dirname(os.path.abspath(__file__)),
-                 "ui", "creatordlg.ui"))
+_formclass = UiForm("creatordlg")
 
-_stdformclass, _stdbaseclass = uic.loadUiType(
-    os.path.join(os.path.dirname(os.path.abspath(__file__)),
-                 "ui", "stdcreatordlg.ui"))
+_stdformclass = UiForm("stdcreatordlg")
 
 if sys.version_info > (3,):
     unicode = str
@@ -22,7 +22,6 @@
 """ Provides datasource widget data"""
 
 import os
-import copy
 import sys
 
 from PyQt5.QtCore import (QModelIndex, QFileInfo, QFile,
@@ -31,8 +30,8 @@ from PyQt5.QtWidgets import (QApplication, QFileDialog, QMessageBox,
                              QWidget)
 from PyQt5.QtXml import (QDomDocument)
 
-from .NodeDlg import NodeDlg
 from .DomTools import DomTools
+from .ElementData import DataSourceData
 from . import DataSourceDlg
 from .DataSourceMethods import DataSourceMethods
 
@@ -44,27 +43,16 @@ if sys.version_info > (3,):
     unicode = str
 
 
-# class with datasource variables
-class Variables(object):
-    pass
-
-
 # dialog defining datasource
-class CommonDataSource(object):
+class CommonDataSource(DataSourceData):
 
     # constructor
     def __init__(self, parent):
 
-        # data source type
-        self.dataSourceType = 'CLIENT'
-        # attribute doc
-        self.doc = u''
-
         # datasource dialog
-        self.dialog = NodeDlg(parent)
+        self.dialog = None
 
-        # datasource name
-        self.dataSourceName = u''
+        super(CommonDataSource, self).__init__()
 
         # external save method
         self.externalSave = None
@@ -84,51 +72,47 @@ class CommonDataSource(object):
         # if datasource in the component tree
         self.tree = False
 
-        # datasource variables
-        self.var = {}
-
-        # creates variables dynamically
-        self.clear()
-
-    # clears the datasource content
-    # \brief It sets the datasource variables to default values
-    def clear(self):
-        for ds, cl in DataSourceDlg.dsTypes.items():
-            self.var[ds] = Variables()
-            for vr in cl.var.keys():
-                setattr(self.var[ds], vr, cl.var[vr])
-
-    # provides the state of the datasource dialog
-    # \returns state of the datasource in tuple
-    def getState(self):
-        state = [self.dataSourceType,
-                 self.dataSourceName,
-                 self.doc]
-
-        for ds, cl in DataSourceDlg.dsTypes.items():
-            for vr in cl.var.keys():
-                vv = getattr(self.var[ds], vr)
-                state.append(
-                    copy.copy(vv)
-                    if ((type(vv) is list) or (type(vv) is dict)) else vv)
-        return tuple(state)
-
-    # sets the state of the datasource dialog
-    # \brief note that ids, applied and tree are not in the state
-    # \param state state datasource written in tuple
-    def setState(self, state):
-
-        cnt = 3
-        (self.dataSourceType, self.dataSourceName, self.doc) = state[:cnt]
-
-        for ds, cl in DataSourceDlg.dsTypes.items():
-            for vr in cl.var.keys():
-                setattr(
-                    self.var[ds], vr, copy.copy(state[cnt])
-                    if ((type(state[cnt]) is list)
-                        or (type(state[cnt]) is dict))
-                    else state[cnt])
-                cnt += 1
+    # provides datasource types
+    # \returns dictionary with type : class with variables
+    def _types(self):
+        return DataSourceDlg.dsTypes
+
+    # provides the implementation of user datasource type
+    # \returns datasource implementation or None
+    def __userImp(self):
+        cl = DataSourceDlg.dsTypes.get(self.dataSourceType)
+        if cl is None or hasattr(cl, "data"):
+            return None
+        return DataSourceDlg.sharedDialog().imp[self.dataSourceType]
+
+    # reads variables of the datasource type from the DOM node
+    # \brief User datasource types are read by the shared dialog
+    # \param node datasource DOM node
+    # \returns list of warnings
+    def _readTypeNode(self, node):
+        imp = self.__userImp()
+        if imp is None:
+            cl = DataSourceDlg.dsTypes.get(self.dataSourceType)
+            return cl.data.readNode(node, self.var[self.dataSourceType]) \
+                if cl is not None else []
+        imp.main.node = node
+        imp.setFromNode(self)
+        return []
+
+    # creates DOM nodes of the datasource type
+    # \brief User datasource nodes are created by the shared dialog
+    # \param root root node
+    # \param elem datasource node
+    def _writeTypeNode(self, root, elem):
+        imp = self.__userImp()
+        if imp is None:
+            cl = DataSourceDlg.dsTypes.get(self.dataSourceType)
+            if cl is not None:
+                cl.data.writeNode(
+                    self.var[self.dataSourceType], root, elem)
+        else:
+            imp.main.root = root
+            imp.createNodes(self, root, elem)
 
 
 # dialog defining datasource
@@ -142,11 +126,11 @@ class DataSource(CommonDataSource):
         # dialog parent
         self.parent = parent
 
-        # datasource dialog
-        self.dialog = DataSourceDlg.CommonDataSourceDlg(self, parent)
+        # datasource dialog created when the datasource is shown
+        self.dialog = None
 
         # datasource methods
-        self.__methods = DataSourceMethods(self.dialog, self, self.parent)
+        self.__methods = DataSourceMethods(None, self, self.parent)
 
         # datasource directory
         self.directory = ""
@@ -174,16 +158,21 @@ class DataSource(CommonDataSource):
             xml = unicode(self.document.toString(0))
             dss = set(DomTools.findElements(xml, "datasources"))
         self.datasources = list(dss)
+        if hasattr(self.parent, "elementChanged"):
+            self.parent.elementChanged(self)
 
     # creates dialog
-    # \brief It creates dialog, its GUI , updates Nodes and Form
+    # \brief It creates dialog, its GUI , updates Nodes and Form.
+    #        Nodes are recreated only if the datasource has no DOM node
     def createDialog(self):
         self.dialog = DataSourceDlg.CommonDataSourceDlg(self, self.parent)
         self.__methods.setDialog(self.dialog)
         self.createGUI()
+        self.reconnectSaveAction()
 
         self.updateForm()
-        self.updateNode()
+        if not self.__methods.node or not self.__methods.root:
+            self.updateNode()
 
     # clears the datasource content
     # \brief It sets the datasource variables to default values
@@ -215,8 +204,10 @@ class DataSource(CommonDataSource):
         if not self.dataSourceName:
             # datasource name
             self.dataSourceName = self.name
-            self.dialog.ui.nameLineEdit.setText(self.name)
-            self.dialog.imp['CLIENT'].ui.cRecNameLineEdit.setText(self.name)
+            if self.dialog and hasattr(self.dialog.ui, "nameLineEdit"):
+                self.dialog.ui.nameLineEdit.setText(self.name)
+                self.dialog.imp['CLIENT'].ui.cRecNameLineEdit.setText(
+                    self.name)
         if directory:
             self.directory = unicode(directory)
 
@@ -267,7 +258,8 @@ class DataSource(CommonDataSource):
                 QMessageBox.warning(self.parent, "Cannot open the file",
                                     "Cannot open the file: %s" % (filename))
             try:
-                self.createGUI()
+                if self.dialog:
+                    self.createGUI()
 
             except Exception as e:
                 QMessageBox.warning(self.parent, "dialog not created",
@@ -328,9 +320,6 @@ class DataSource(CommonDataSource):
         self.root = self.document
         if not self.document.setContent(self.repair(xml)):
             raise ValueError("could not parse XML")
-        else:
-            if self.dialog and hasattr(self.dialog, "root"):
-                self.dialog.root = self.document
 
         ds = DomTools.getFirstElement(self.document, "datasource")
         if ds:
@@ -340,9 +329,10 @@ class DataSource(CommonDataSource):
             else:
                 self.savedXML = self.document.toString(0)
         try:
-            self.createGUI()
+            if self.dialog:
+                self.createGUI()
         except Exception as e:
-            QMessageBox.warning(self, "dialog not created",
+            QMessageBox.warning(self.parent, "dialog not created",
                                 "Problems in creating a dialog %s :\n\n%s"
                                 % (self.name, unicode(e)))
         self.fetchElements()
@@ -409,14 +399,12 @@ class DataSource(CommonDataSource):
     # gets the current root
     # \returns the current root
     def __getroot(self):
-        if self.dialog and hasattr(self.dialog, "root"):
-            return self.dialog.root
+        return self.__methods.root
 
     # sets the current root
     # \param root value to be set
     def __setroot(self, root):
-        if self.dialog and hasattr(self.dialog, "root"):
-            self.dialog.root = root
+        self.__methods.root = root
 
     # attribute value
     root = property(__getroot, __setroot)
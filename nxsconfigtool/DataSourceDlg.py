@@ -24,18 +24,14 @@
 from PyQt5.QtCore import QModelIndex, pyqtSlot
 from PyQt5.QtWidgets import QApplication
 
+from .UiLoader import UiForm
 from .NodeDlg import NodeDlg
 from .DataSources import ClientSource, TangoSource, DBSource, PyEvalSource
 from .DataSourceMethods import DataSourceMethods
-from PyQt5 import uic
-
-import os
 
 
 # from .ui.ui_datasourcedlg import Ui_DataSourceDlg
-_formclass, _baseclass = uic.loadUiType(
-    os.path.join(os.path.dirname(os.path.abspath(__file__)),
-                 "ui", "datasourcedlg.ui"))
+_formclass = UiForm("datasourcedlg")
 
 
 # available datasources
@@ -154,6 +150,22 @@ class CommonDataSourceDlg(NodeDlg):
         super(CommonDataSourceDlg, self).reject()
 
 
+# datasource dialog shared by datasources without their own dialogs
+_sharedDialog = None
+
+
+# provides the datasource dialog shared by datasources without dialogs
+# \brief Its datasource implementations read and create DOM nodes.
+#        The dialog is created on the first call and its GUI is not set up
+# \returns CommonDataSourceDlg instance
+def sharedDialog():
+    global _sharedDialog
+    if _sharedDialog is None \
+            or set(_sharedDialog.imp.keys()) != set(dsTypes.keys()):
+        _sharedDialog = CommonDataSourceDlg(None)
+    return _sharedDialog
+
+
 # dialog defining separate datasource
 class DataSourceDlg(CommonDataSourceDlg):
 
@@ -199,6 +211,16 @@ class DataSourceDlg(CommonDataSourceDlg):
         if hasattr(self, "_DataSourceDlg__methods") and self.__methods:
             return self.__methods.setFromNode(node)
 
+    # provides the state of the datasource dialog
+    # \returns state of the datasource in tuple
+    def getState(self):
+        return self.datasource.getState()
+
+    # sets the state of the datasource dialog
+    # \param state datasource state written in tuple
+    def setState(self, state):
+        self.datasource.setState(state)
+
     # accepts input text strings
     # \brief It copies the parameters and accept the dialog
     def apply(self):
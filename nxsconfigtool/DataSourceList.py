@@ -68,7 +68,6 @@ class DataSourceList(ElementList):
         dlg = DataSource(self)
         dlg.directory = self.directory
         dlg.name = name
-        dlg.createGUI()
         return dlg
 
     # replaces name special characters by underscore
@@ -57,18 +57,65 @@ class DataSourceMethods(object):
         # qt parent
         self.__parent = parent
 
+        # DOM node of the datasource without its dialog
+        self.__node = None
+        # DOM root of the datasource without its dialog
+        self.__root = None
+
     # clears the dialog
-    # \brief It sets dialog to None
+    # \brief It sets dialog to None. The DOM node and root of
+    #        the previous dialog are kept for the new one
+    # \param dialog datasource dialog
     def setDialog(self, dialog=None):
+        if self.__dialog is not None:
+            self.__node = self.__dialog.node
+            self.__root = self.__dialog.root
+        if dialog is not None:
+            if dialog.node is None:
+                dialog.node = self.__node
+            if dialog.root is None:
+                dialog.root = self.__root
         self.__dialog = dialog
 
     # creates a new dialog
     def createDialog(self):
         if self.__datasource.dialog:
-            self.__dialog = self.__datasource.dialog
+            self.setDialog(self.__datasource.dialog)
         else:
             self.__datasource.createDialog()
 
+    # gets the current DOM node
+    # \returns DOM node of the dialog or of the datasource without dialog
+    def __getNode(self):
+        return self.__dialog.node if self.__dialog else self.__node
+
+    # sets the current DOM node
+    # \param node DOM node
+    def __setNode(self, node):
+        if self.__dialog:
+            self.__dialog.node = node
+        else:
+            self.__node = node
+
+    # DOM node
+    node = property(__getNode, __setNode)
+
+    # gets the current DOM root
+    # \returns DOM root of the dialog or of the datasource without dialog
+    def __getRoot(self):
+        return self.__dialog.root if self.__dialog else self.__root
+
+    # sets the current DOM root
+    # \param root DOM root
+    def __setRoot(self, root):
+        if self.__dialog:
+            self.__dialog.root = root
+        else:
+            self.__root = root
+
+    # DOM root
+    root = property(__getRoot, __setRoot)
+
     # rejects the changes
     # \brief It asks for the cancellation  and reject the changes
     def close(self):
@@ -90,8 +137,10 @@ class DataSourceMethods(object):
     # updates the datasource self.__dialog
     # \brief It sets the form local variables
     def updateForm(self):
-        if not self.__dialog or not self.__datasource:
+        if not self.__datasource:
             raise ParameterError("updateForm parameters not defined")
+        if not self.__dialog:
+            return
 
         if self.__datasource.doc is not None:
             self.__dialog.ui.docTextEdit.setText(self.__datasource.doc)
@@ -161,32 +210,13 @@ class DataSourceMethods(object):
     # sets the form from the DOM node
     # \param node DOM node
     def setFromNode(self, node=None):
-        if not self.__dialog:
-            self.createDialog()
         if node:
-            # defined in NodeDlg class
-            self.__dialog.node = node
-            if self.__dialog:
-                self.__dialog.node = node
-        if not self.__dialog.node \
-                or not hasattr(self.__dialog.node, "attributes"):
+            self.node = node
+        if not self.node or not hasattr(self.node, "attributes"):
             return
-        attributeMap = self.__dialog.node.attributes()
-
-        value = attributeMap.namedItem("type").nodeValue() \
-            if attributeMap.contains("type") else ""
-        self.__datasource.dataSourceType = unicode(value)
-
-        if attributeMap.contains("name"):
-            self.__datasource.dataSourceName = \
-                attributeMap.namedItem("name").nodeValue()
-
-        if value in self.__dialog.imp.keys():
-            self.__dialog.imp[str(value)].setFromNode(self.__datasource)
-
-        doc = self.__dialog.node.firstChildElement(str("doc"))
-        text = DomTools.getText(doc)
-        self.__datasource.doc = unicode(text).strip() if text else ""
+        for warning in self.__datasource.readNode(self.node):
+            QMessageBox.warning(self.__dialog or self.__parent,
+                                "Internal error", warning)
 
     # accepts input text strings
     # \brief It copies the parameters and accept the self.__dialog
@@ -246,46 +276,24 @@ class DataSourceMethods(object):
         return True
 
     def __createDOMNodes(self, root):
-        newDs = root.createElement(str("datasource"))
-        elem = newDs.toElement()
-#        attributeMap = self.__datasource.newDs.attributes()
-        elem.setAttribute(str("type"),
-                          str(self.__datasource.dataSourceType))
-        if self.__datasource.dataSourceName:
-            elem.setAttribute(str("name"),
-                              str(self.__datasource.dataSourceName))
-        else:
-            logger.info("name not defined")
-
-        if self.__datasource.dataSourceType in self.__dialog.imp.keys():
-            self.__dialog.imp[str(self.__datasource.dataSourceType)
-                              ].createNodes(self.__datasource, root, elem)
-
-        if self.__datasource.doc:
-            newDoc = root.createElement(str("doc"))
-            newText = root.createTextNode(str(self.__datasource.doc))
-            newDoc.appendChild(newText)
-            elem.appendChild(newDoc)
-        return elem
+        return self.__datasource.writeNode(root)
 
     # creates datasource node
     # \param external True if it should be create on a local DOM root,
     #        i.e. in component tree
     # \returns created DOM node
     def createNodes(self, external=False):
-        if not self.__dialog:
-            self.createDialog()
         if external:
             root = QDomDocument()
         else:
-            if not self.__dialog.root or not self.__dialog.node:
+            if not self.root or not self.node:
                 self.createHeader()
-            root = self.__dialog.root
+            root = self.root
 
         elem = self.__createDOMNodes(root)
 
-        if external and hasattr(self.__dialog.root, "importNode"):
-            rootDs = self.__dialog.root.importNode(elem, True)
+        if external and hasattr(self.root, "importNode"):
+            rootDs = self.root.importNode(elem, True)
         else:
             rootDs = elem
         return rootDs
@@ -293,26 +301,23 @@ class DataSourceMethods(object):
     # updates the Node
     # \brief It sets node from the self.__dialog variables
     def updateNode(self, index=QModelIndex()):
-        if not self.__dialog:
-            self.createDialog()
-
         newDs = self.createNodes(self.__datasource.tree)
-        oldDs = self.__dialog.node
+        oldDs = self.node
 
         if hasattr(index, "parent"):
             parent = index.parent()
         else:
             parent = QModelIndex()
 
-        self.__dialog.node = self.__dialog.node.parentNode()
+        self.node = self.node.parentNode()
         if self.__datasource.tree:
-            if self.__dialog.view is not None \
+            if self.__dialog and self.__dialog.view is not None \
                     and self.__dialog.view.model() is not None:
                 DomTools.replaceNode(oldDs, newDs, parent,
                                      self.__dialog.view.model())
         else:
-            self.__dialog.node.replaceChild(newDs, oldDs)
-        self.__dialog.node = newDs
+            self.node.replaceChild(newDs, oldDs)
+        self.node = newDs
 
     # reconnects save actions
     # \brief It reconnects the save action
@@ -384,7 +389,15 @@ class DataSourceMethods(object):
     def connectExternalActions(self, externalApply=None, externalSave=None,
                                externalClose=None, externalStore=None):
         if not self.__dialog:
-            self.createDialog()
+            if self.__datasource.externalSave is None:
+                self.__datasource.externalSave = externalSave
+            if self.__datasource.externalStore is None:
+                self.__datasource.externalStore = externalStore
+            if self.__datasource.externalClose is None:
+                self.__datasource.externalClose = externalClose
+            if self.__datasource.externalApply is None:
+                self.__datasource.externalApply = externalApply
+            return
         if externalSave and self.__datasource.externalSave is None:
             try:
                 self.__dialog.ui.savePushButton.clicked.disconnect(
@@ -449,23 +462,20 @@ class DataSourceMethods(object):
     # creates the new empty header
     # \brief It clean the DOM tree and put into it xml and definition nodes
     def createHeader(self):
-        if not self.__dialog:
-            self.createDialog()
         if hasattr(self.__dialog, "view") and self.__dialog.view:
             self.__dialog.view.setModel(None)
         self.__datasource.document = QDomDocument()
         # defined in NodeDlg class
-        self.__dialog.root = self.__datasource.document
-        processing = self.__dialog.root.createProcessingInstruction(
+        self.root = self.__datasource.document
+        processing = self.root.createProcessingInstruction(
             "xml", "version='1.0'")
-        self.__dialog.root.appendChild(processing)
-
-        definition = self.__dialog.root.createElement(str("definition"))
-        self.__dialog.root.appendChild(definition)
-        self.__dialog.node = self.__dialog.root.createElement(
-            str("datasource"))
-        definition.appendChild(self.__dialog.node)
-        return self.__dialog.node
+        self.root.appendChild(processing)
+
+        definition = self.root.createElement(str("definition"))
+        self.root.appendChild(definition)
+        self.node = self.root.createElement(str("datasource"))
+        definition.appendChild(self.node)
+        return self.node
 
     # copies the datasource to the clipboard
     # \brief It copies the current datasource to the clipboard
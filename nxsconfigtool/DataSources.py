@@ -24,9 +24,6 @@
 from PyQt5.QtCore import (Qt, QRegExp)
 from PyQt5.QtGui import (QFontMetrics, QSyntaxHighlighter)
 from PyQt5.QtWidgets import (QMessageBox, QTableWidgetItem)
-from PyQt5.QtXml import (QDomDocument)
-from PyQt5 import uic
-import os
 import sys
 
 # from .ui.ui_clientdsdlg import Ui_ClientDsDlg
@@ -34,23 +31,16 @@ import sys
 # from .ui.ui_tangodsdlg import Ui_TangoDsDlg
 # from .ui.ui_pyevaldsdlg import Ui_PyEvalDsDlg
 
-from .DomTools import DomTools
+from .UiLoader import UiForm
+from .ElementData import ClientData, DBData, TangoData, PyEvalData
 
-_clientformclass, _clientbaseclass = uic.loadUiType(
-    os.path.join(os.path.dirname(os.path.abspath(__file__)),
-                 "ui", "clientdsdlg.ui"))
+_clientformclass = UiForm("clientdsdlg")
 
-_dbformclass, _dbbaseclass = uic.loadUiType(
-    os.path.join(os.path.dirname(os.path.abspath(__file__)),
-                 "ui", "dbdsdlg.ui"))
+_dbformclass = UiForm("dbdsdlg")
 
-_tangoformclass, _tangobaseclass = uic.loadUiType(
-    os.path.join(os.path.dirname(os.path.abspath(__file__)),
-                 "ui", "tangodsdlg.ui"))
+_tangoformclass = UiForm("tangodsdlg")
 
-_pyevalformclass, _pyevalbaseclass = uic.loadUiType(
-    os.path.join(os.path.dirname(os.path.abspath(__file__)),
-                 "ui", "pyevaldsdlg.ui"))
+_pyevalformclass = UiForm("pyevaldsdlg")
 
 if sys.version_info > (3,):
     unicode = str
@@ -215,10 +205,10 @@ class PyEvalHighlighter(QSyntaxHighlighter):
 class ClientSource(object):
     # allowed subitems
     subItems = ["record", "doc"]
+    # data without GUI
+    data = ClientData
     # variables
-    var = {
-        # client record name
-        "recordName": u''}
+    var = ClientData.var
 
     # constructor
     # \param main datasource dialog
@@ -273,15 +263,9 @@ class ClientSource(object):
     # sets the form from the DOM node
     # \param datasource class
     def setFromNode(self, datasource):
-        record = self.main.node.firstChildElement(str("record"))
-        if record.nodeName() != "record":
-            QMessageBox.warning(self.main, "Internal error",
-                                "Missing <record> tag")
-        else:
-            attributeMap = record.attributes()
-            datasource.var['CLIENT'].recordName = unicode(
-                attributeMap.namedItem("name").nodeValue()
-                if attributeMap.contains("name") else "")
+        for warning in ClientData.readNode(
+                self.main.node, datasource.var['CLIENT']):
+            QMessageBox.warning(self.main, "Internal error", warning)
 
     # copies parameters from form to datasource instance
     # \param datasource class
@@ -300,27 +284,17 @@ class ClientSource(object):
     # \param root root node
     # \param elem datasource node
     def createNodes(self, datasource, root, elem):
-        record = root.createElement(str("record"))
-        record.setAttribute(
-            str("name"), str(datasource.var['CLIENT'].recordName))
-        elem.appendChild(record)
+        ClientData.writeNode(datasource.var['CLIENT'], root, elem)
 
 
 # DB dialog impementation
 class DBSource(object):
     # allowed subitems
     subItems = ["query", "database", "doc"]
+    # data without GUI
+    data = DBData
     # variables
-    var = {
-        # database type
-        'dbtype': 'MYSQL',
-        # database format
-        'dataFormat': 'SCALAR',
-        # database query
-        'query': "",
-        # database parameters
-        'parameters': {}
-    }
+    var = DBData.var
 
     # constructor
     # \param main datasource dialog
@@ -335,18 +309,6 @@ class DBSource(object):
         # database parameters
         self.dbParam = {}
 
-        # parameter map for xml tags
-        self.__dbmap = {
-            "dbname": "DB name",
-            "hostname": "DB host",
-            "port": "DB port",
-            "user": "DB user",
-            "passwd": "DB password",
-            "mycnf": "Mysql cnf",
-            "mode": "Oracle mode"
-        }
-        self.__idbmap = dict(zip(self.__dbmap.values(), self.__dbmap.keys()))
-
     # clears widget parameters
     def clear(self):
         self.dbParam = {}
@@ -574,45 +536,10 @@ class DBSource(object):
     # sets the form from the DOM node
     # \param datasource class
     def setFromNode(self, datasource):
-        database = self.main.node.firstChildElement(str("database"))
-        if database.nodeName() != "database":
-            QMessageBox.warning(self.main, "Internal error",
-                                "Missing <database> tag")
-        else:
-            attributeMap = database.attributes()
-
-            for i in range(attributeMap.count()):
-                name = unicode(attributeMap.item(i).nodeName())
-                if name == 'dbtype':
-                    datasource.var['DB'].dbtype = unicode(
-                        attributeMap.item(i).nodeValue())
-                elif name in self.__dbmap:
-                    datasource.var['DB'].parameters[self.__dbmap[name]] = \
-                        unicode(attributeMap.item(i).nodeValue())
-                    self.dbParam[self.__dbmap[name]] = unicode(
-                        attributeMap.item(i).nodeValue())
-
-        if not datasource.var['DB'].dbtype:
-            datasource.var['DB'].dbtype = 'MYSQL'
-        text = unicode(DomTools.getText(database))
-        datasource.var['DB'].parameters['Oracle DSN'] = unicode(text).strip() \
-            if text else ""
-        self.dbParam['Oracle DSN'] = unicode(text).strip() \
-            if text else ""
-
-        query = self.main.node.firstChildElement(str("query"))
-        if query.nodeName() != "query":
-            QMessageBox.warning(self.main, "Internal error",
-                                "Missing <query> tag")
-        else:
-            attributeMap = query.attributes()
-
-            datasource.var['DB'].dataFormat = unicode(
-                attributeMap.namedItem("format").nodeValue()
-                if attributeMap.contains("format") else "SCALAR")
-
-        text = unicode(DomTools.getText(query))
-        datasource.var['DB'].query = unicode(text).strip() if text else ""
+        for warning in DBData.readNode(
+                self.main.node, datasource.var['DB']):
+            QMessageBox.warning(self.main, "Internal error", warning)
+        self.dbParam.update(datasource.var['DB'].parameters)
 
     # copies parameters from form to datasource instance
     # \param datasource class
@@ -638,27 +565,7 @@ class DBSource(object):
     # \param root root node
     # \param elem datasource node
     def createNodes(self, datasource, root, elem):
-        db = root.createElement(str("database"))
-        db.setAttribute(
-            str("dbtype"), str(datasource.var['DB'].dbtype))
-        for par in datasource.var['DB'].parameters.keys():
-            if par == 'Oracle DSN':
-                newText = root.createTextNode(
-                    str(datasource.var['DB'].parameters[par]))
-                db.appendChild(newText)
-            else:
-                db.setAttribute(str(self.__idbmap[par]),
-                                str(datasource.var['DB'].parameters[par]))
-        elem.appendChild(db)
-
-        query = root.createElement(str("query"))
-        query.setAttribute(str("format"),
-                           str(datasource.var['DB'].dataFormat))
-        if datasource.var['DB'].query:
-            newText = root.createTextNode(str(datasource.var['DB'].query))
-            query.appendChild(newText)
-
-        elem.appendChild(query)
+        DBData.writeNode(datasource.var['DB'], root, elem)
 
 
 # TANGO dialog impementation
@@ -666,23 +573,10 @@ class TangoSource(object):
     # allowed subitems
     subItems = ["device", "record", "doc"]
 
+    # data without GUI
+    data = TangoData
     # variables
-    var = {
-        # Tango device name
-        'deviceName': u'',
-        # Tango member name
-        'memberName': u'',
-        # Tango member name
-        'memberType': u'',
-        # Tango host name
-        'host': u'',
-        # Tango host name
-        'port': u'',
-        # encoding for DevEncoded Tango types
-        'encoding': u'',
-        # group for Tango DataSources
-        'group': u''
-    }
+    var = TangoData.var
 
     # \param main datasource dialog
     def __init__(self, main):
@@ -786,40 +680,9 @@ class TangoSource(object):
     # sets the form from the DOM node
     # \param datasource class
     def setFromNode(self, datasource):
-        record = self.main.node.firstChildElement(str("record"))
-        if record.nodeName() != "record":
-            QMessageBox.warning(self.main, "Internal error",
-                                "Missing <record> tag")
-        else:
-            attributeMap = record.attributes()
-            datasource.var['TANGO'].memberName = unicode(
-                attributeMap.namedItem("name").nodeValue()
-                if attributeMap.contains("name") else "")
-
-        device = self.main.node.firstChildElement(str("device"))
-        if device.nodeName() != "device":
-            QMessageBox.warning(self.main, "Internal error",
-                                "Missing <device> tag")
-        else:
-            attributeMap = device.attributes()
-            datasource.var['TANGO'].deviceName = unicode(
-                attributeMap.namedItem("name").nodeValue()
-                if attributeMap.contains("name") else "")
-            datasource.var['TANGO'].memberType = unicode(
-                attributeMap.namedItem("member").nodeValue()
-                if attributeMap.contains("member") else "attribute")
-            datasource.var['TANGO'].host = unicode(
-                attributeMap.namedItem("hostname").nodeValue()
-                if attributeMap.contains("hostname") else "")
-            datasource.var['TANGO'].port = unicode(
-                attributeMap.namedItem("port").nodeValue()
-                if attributeMap.contains("port") else "")
-            datasource.var['TANGO'].encoding = unicode(
-                attributeMap.namedItem("encoding").nodeValue()
-                if attributeMap.contains("encoding") else "")
-            datasource.var['TANGO'].group = unicode(
-                attributeMap.namedItem("group").nodeValue()
-                if attributeMap.contains("group") else "")
+        for warning in TangoData.readNode(
+                self.main.node, datasource.var['TANGO']):
+            QMessageBox.warning(self.main, "Internal error", warning)
 
     # copies parameters from form to datasource instance
     # \param datasource class
@@ -851,29 +714,7 @@ class TangoSource(object):
     # \param root root node
     # \param elem datasource node
     def createNodes(self, datasource, root, elem):
-        record = root.createElement(str("record"))
-        record.setAttribute(str("name"),
-                            str(datasource.var['TANGO'].memberName))
-        elem.appendChild(record)
-
-        device = root.createElement(str("device"))
-        device.setAttribute(str("name"),
-                            str(datasource.var['TANGO'].deviceName))
-        device.setAttribute(str("member"),
-                            str(datasource.var['TANGO'].memberType))
-        if datasource.var['TANGO'].host:
-            device.setAttribute(str("hostname"),
-                                str(datasource.var['TANGO'].host))
-        if datasource.var['TANGO'].port:
-            device.setAttribute(str("port"),
-                                str(datasource.var['TANGO'].port))
-        if datasource.var['TANGO'].encoding:
-            device.setAttribute(str("encoding"),
-                                str(datasource.var['TANGO'].encoding))
-        if datasource.var['TANGO'].group:
-            device.setAttribute(str("group"),
-                                str(datasource.var['TANGO'].group))
-        elem.appendChild(device)
+        TangoData.writeNode(datasource.var['TANGO'], root, elem)
 
 
 # PYEVAL dialog impementation
@@ -881,17 +722,10 @@ class PyEvalSource(object):
     # allowed subitems
     subItems = ["datasource", "result", "doc"]
 
+    # data without GUI
+    data = PyEvalData
     # variables
-    var = {
-        # pyeval result variable
-        'result': "ds.result",
-        # pyeval datasource variables
-        'input': "",
-        # pyeval python script
-        'script': "",
-        # pyeval datasources
-        'dataSources': {}
-    }
+    var = PyEvalData.var
 
     # \param main datasource dialog
     def __init__(self, main):
@@ -946,40 +780,7 @@ class PyEvalSource(object):
     # sets the form from the DOM node
     # \param datasource class
     def setFromNode(self, datasource):
-        res = self.main.node.firstChildElement(str("result"))
-        text = DomTools.getText(res)
-        while len(text) > 0 and text[0] == '\n':
-            text = text[1:]
-        datasource.var['PYEVAL'].script = unicode(text) if text else ""
-        attributeMap = res.attributes()
-        datasource.var['PYEVAL'].result = unicode(
-            "ds." + attributeMap.namedItem("name").nodeValue()
-            if attributeMap.contains("name") else "")
-
-        ds = DomTools.getText(self.main.node)
-        dslist = unicode(ds).strip().split() \
-            if unicode(ds).strip() else []
-        datasource.var['PYEVAL'].dataSources = {}
-        child = self.main.node.firstChildElement(
-            str("datasource"))
-        while not child.isNull():
-            if child.nodeName() == 'datasource':
-                attributeMap = child.attributes()
-                name = unicode(
-                    attributeMap.namedItem("name").nodeValue()
-                    if attributeMap.contains("name") else "")
-                if name.strip():
-                    dslist.append(name.strip())
-                    doc = QDomDocument()
-                    doc.appendChild(
-                        doc.importNode(child, True))
-                    datasource.var['PYEVAL'].dataSources[name] = unicode(
-                        doc.toString(0))
-                    child = child.nextSiblingElement("datasource")
-
-        datasource.var['PYEVAL'].input = " ".join(
-            "ds." + (d[13:] if (len(d) > 13 and d[:13] == "$datasources.")
-                     else d) for d in dslist)
+        PyEvalData.readNode(self.main.node, datasource.var['PYEVAL'])
 
     # copies parameters from form to datasource instance
     # \param datasource class
@@ -1003,45 +804,7 @@ class PyEvalSource(object):
     # \param root root node
     # \param elem datasource node
     def createNodes(self, datasource, root, elem):
-        res = root.createElement(str("result"))
-        rn = str(datasource.var['PYEVAL'].result).strip()
-        if rn:
-            res.setAttribute(
-                str("name"),
-                str(rn[3:] if (len(rn) > 3 and rn[:3] == 'ds.') else rn))
-        if datasource.var['PYEVAL'].script:
-            script = root.createTextNode(
-                str(
-                    datasource.var['PYEVAL'].script if (
-                        len(datasource.var['PYEVAL'].script) > 0 and
-                        datasource.var['PYEVAL'].script[0] == '\n') else (
-                            "\n" + datasource.var['PYEVAL'].script))
-                .replace("\t", "    "))
-            res.appendChild(script)
-        elem.appendChild(res)
-        if datasource.var['PYEVAL'].input:
-            dslist = unicode(datasource.var['PYEVAL'].input).split()
-            newds = ""
-            for d in dslist:
-                name = d[3:] if (len(d) > 3 and d[:3] == 'ds.') else d
-                if name in datasource.var['PYEVAL'].dataSources.keys():
-                    document = QDomDocument()
-                    if not document.setContent(
-                            datasource.var['PYEVAL'].dataSources[name]):
-                        raise ValueError("could not parse XML")
-                    else:
-                        if self.main and hasattr(self.main, "root"):
-
-                            dsnode = DomTools.getFirstElement(
-                                document, "datasource")
-                            child = root.importNode(dsnode, True)
-                            elem.appendChild(child)
-
-                else:
-                    newds = "\n ".join([newds, "$datasources." + name])
-
-            newText = root.createTextNode(str(newds))
-            elem.appendChild(newText)
+        PyEvalData.writeNode(datasource.var['PYEVAL'], root, elem)
 
 
 if __name__ == "__main__":
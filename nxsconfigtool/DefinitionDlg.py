@@ -22,14 +22,13 @@
 """ definition widget """
 
 import copy
-import os
 import sys
 
 from PyQt5.QtCore import (Qt, QModelIndex)
 from PyQt5.QtWidgets import (QMessageBox, QTableWidgetItem)
-from PyQt5 import uic
 
 # from .ui.ui_definitiondlg import Ui_DefinitionDlg
+from .UiLoader import UiForm
 from .AttributeDlg import AttributeDlg
 from .NodeDlg import NodeDlg
 from .DomTools import DomTools
@@ -39,9 +38,7 @@ import logging
 logger = logging.getLogger("nxsdesigner")
 
 
-_formclass, _baseclass = uic.loadUiType(
-    os.path.join(os.path.dirname(os.path.abspath(__file__)),
-                 "ui", "definitiondlg.ui"))
+_formclass = UiForm("definitiondlg")
 
 if sys.version_info > (3,):
     unicode = str
@@ -0,0 +1,163 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2017 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+# \package nxsconfigtool nexdatas
+# \file DependencyGraph.py
+# dependencies between components and datasources
+
+""" dependencies between components and datasources """
+
+from collections import Counter
+
+
+# graph of references between components and datasources
+# \brief Nodes are (kind, name) tuples with kind "components" or
+#        "datasources". Edges are added by owners, i.e. list elements,
+#        so elements with the same name are counted separately. Registered
+#        providers are synchronized before each query
+class DependencyGraph(object):
+
+    # constructor
+    def __init__(self):
+        # (node, dependencies) of owners
+        self.__owners = {}
+        # number of owners defining the node
+        self.__defined = Counter()
+        # dependencies of nodes, i.e. {node: Counter(dependencies)}
+        self.__dependencies = {}
+        # users of nodes, i.e. {node: Counter(users)}
+        self.__users = {}
+        # objects with syncDependencies() method
+        self.__providers = []
+
+    # registers the provider which updates the graph before queries
+    # \param provider object with syncDependencies() method
+    def register(self, provider):
+        if provider not in self.__providers:
+            self.__providers.append(provider)
+
+    # unregisters the provider
+    # \param provider object with syncDependencies() method
+    def unregister(self, provider):
+        if provider in self.__providers:
+            self.__providers.remove(provider)
+
+    # synchronizes the registered providers
+    def sync(self):
+        for provider in self.__providers:
+            provider.syncDependencies()
+
+    # adds or subtracts edges of the node
+    # \param node (kind, name) tuple
+    # \param dependencies list of (kind, name) tuples
+    # \param sign 1 to add or -1 to subtract
+    def __change(self, node, dependencies, sign):
+        self.__defined[node] += sign
+        if self.__defined[node] <= 0:
+            del self.__defined[node]
+        for dep in dependencies:
+            for source, target, edges in [
+                    (node, dep, self.__dependencies),
+                    (dep, node, self.__users)]:
+                counter = edges.setdefault(source, Counter())
+                counter[target] += sign
+                if counter[target] <= 0:
+                    del counter[target]
+                    if not counter:
+                        del edges[source]
+
+    # sets the node and dependencies defined by the owner
+    # \param owner owner id, e.g. id of the list element
+    # \param node (kind, name) tuple
+    # \param dependencies list of (kind, name) tuples
+    def update(self, owner, node, dependencies):
+        self.remove(owner)
+        dependencies = set(dependencies)
+        self.__owners[owner] = (node, dependencies)
+        self.__change(node, dependencies, 1)
+
+    # removes the node and dependencies defined by the owner
+    # \param owner owner id, e.g. id of the list element
+    def remove(self, owner):
+        if owner in self.__owners:
+            node, dependencies = self.__owners.pop(owner)
+            self.__change(node, dependencies, -1)
+
+    # removes all nodes and dependencies
+    def clear(self):
+        self.__owners = {}
+        self.__defined = Counter()
+        self.__dependencies = {}
+        self.__users = {}
+
+    # checks if the node is defined by any owner
+    # \param node (kind, name) tuple
+    # \returns True if the node is defined
+    def isDefined(self, node):
+        self.sync()
+        return node in self.__defined
+
+    # provides direct dependencies of the node
+    # \param node (kind, name) tuple
+    # \returns set of (kind, name) tuples
+    def dependencies(self, node):
+        self.sync()
+        return set(self.__dependencies.get(node, ()))
+
+    # provides nodes which refer directly to the given node
+    # \param node (kind, name) tuple
+    # \returns set of (kind, name) tuples
+    def users(self, node):
+        self.sync()
+        return set(self.__users.get(node, ()))
+
+    # provides transitive dependencies or users of the node
+    # \param node (kind, name) tuple
+    # \param reverse if users are followed instead of dependencies
+    # \returns set of (kind, name) tuples without the node itself
+    def closure(self, node, reverse=False):
+        self.sync()
+        edges = self.__users if reverse else self.__dependencies
+        found = set()
+        stack = [node]
+        while stack:
+            for target in edges.get(stack.pop(), ()):
+                if target not in found:
+                    found.add(target)
+                    stack.append(target)
+        found.discard(node)
+        return found
+
+    # provides defined nodes which are not referred by any node
+    # \param kind node kind, all kinds if None
+    # \returns set of (kind, name) tuples
+    def orphans(self, kind=None):
+        self.sync()
+        return set(
+            node for node in self.__defined
+            if (kind is None or node[0] == kind)
+            and node not in self.__users)
+
+    # provides referred nodes which are not defined by any owner
+    # \param kind node kind, all kinds if None
+    # \returns set of (kind, name) tuples
+    def missing(self, kind=None):
+        self.sync()
+        return set(
+            node for node in self.__users
+            if (kind is None or node[0] == kind)
+            and node not in self.__defined)
@@ -23,18 +23,16 @@
 
 from PyQt5.QtCore import (Qt, )
 from PyQt5.QtWidgets import (QTableWidgetItem, QMessageBox, QDialog)
-from PyQt5 import uic
 
-import os
+from .UiLoader import UiForm
+
 import sys
 
 import logging
 # message logger
 logger = logging.getLogger("nxsdesigner")
 
-_formclass, _baseclass = uic.loadUiType(
-    os.path.join(os.path.dirname(os.path.abspath(__file__)),
-                 "ui", "dimensionsdlg.ui"))
+_formclass = UiForm("dimensionsdlg")
 
 if sys.version_info > (3,):
     unicode = str
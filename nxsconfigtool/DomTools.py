@@ -21,34 +21,64 @@
 
 """  DOM parser and tree view tools"""
 
+from PyQt5.QtCore import (QByteArray, QIODevice, QTextStream)
 from PyQt5.QtXml import QDomNode
 import re
+import sys
+from collections import Counter
+
+if sys.version_info > (3,):
+    unicode = str
 
 
 # abstract node dialog
 class DomTools(object):
 
+    # pattern of $datasources and $components references, the name is the
+    #  first word following the label
+    _references = re.compile(r"\$(datasources|components)\.(?=\W*(\w+))")
+
     # provides a list of elements from the given text
     # \param text give text
     # \param label element label
     # \returns list of element names from the given text
     @classmethod
-    def findElements(self, text, label):
-        variables = []
-        index = text.find("$%s." % label)
-        while index != -1:
-            try:
-                subc = re.finditer(
-                    r"[\w]+",
-                    text[(index + len(label) + 2):]
-                ).next().group(0)
-            except Exception:
-                subc = ""
-            name = subc.strip() if subc else ""
-            if name:
-                variables.append(name)
-            index = text.find("$%s." % label, index + 1)
-        return variables
+    def findElements(cls, text, label):
+        if label in ("datasources", "components"):
+            return [name for lb, name in cls._references.findall(text)
+                    if lb == label]
+        return re.findall(
+            r"\$%s\.(?=\W*(\w+))" % re.escape(label), text)
+
+    # counts $datasources and $components references in the given text
+    # \param text give text
+    # \returns Counter with (label, name) : number of references
+    @classmethod
+    def findReferences(cls, text):
+        return Counter(cls._references.findall(text))
+
+    # counts $datasources and $components references of the node
+    #  and of its children
+    # \brief Values of the node and of its attributes are scanned directly,
+    #        children which are not in the loaded list are serialized
+    # \param node DOM node
+    # \param loaded Counters of the first children which are already known
+    # \returns Counter with (label, name) : number of references
+    @classmethod
+    def nodeReferences(cls, node, loaded=None):
+        references = cls.findReferences(unicode(node.nodeValue() or ""))
+        attrs = node.attributes()
+        for i in range(attrs.count()):
+            references.update(
+                cls.findReferences(unicode(attrs.item(i).nodeValue())))
+        loaded = loaded or []
+        for counter in loaded:
+            references.update(counter)
+        children = node.childNodes()
+        for i in range(len(loaded), children.count()):
+            references.update(
+                cls.findReferences(cls.toString(children.item(i))))
+        return references
 
     # provides row number of the given node
     # \param child child item
@@ -123,6 +153,11 @@ class DomTools(object):
             if j == 0 and text:
                 textNode = root.createTextNode(str(text))
                 cls.appendNode(textNode, index, model)
+            elif hasattr(model, "touch"):
+                if hasattr(index, "isValid") and index.isValid():
+                    model.touch(index, index)
+                else:
+                    model.touch()
 
     # removes node
     # \param node DOM node to remove
@@ -197,6 +232,93 @@ class DomTools(object):
             else:
                 model.appendItem(newElement, parent)
 
+    # serializes the given node
+    # \param node DOM node
+    # \returns XML string of the node without indentation
+    @classmethod
+    def toString(cls, node):
+        data = QByteArray()
+        stream = QTextStream(data, QIODevice.WriteOnly)
+        stream.setCodec("UTF-8")
+        node.save(stream, 0)
+        stream.flush()
+        return bytes(data).decode("utf-8")
+
+    # provides serialized children of the given node
+    # \param node DOM node
+    # \param start row of the first child
+    # \param count number of children, all following children if None
+    # \returns list of (isText, string) tuples with data of text nodes
+    #          and XML of other nodes
+    @classmethod
+    def getChildTexts(cls, node, start=0, count=None):
+        texts = []
+        children = node.childNodes()
+        end = children.count() if count is None \
+            else min(start + count, children.count())
+        for i in range(start, end):
+            child = children.item(i)
+            if child.nodeType() == QDomNode.TextNode:
+                texts.append((True, unicode(child.toText().data())))
+            else:
+                texts.append((False, cls.toString(child)))
+        return texts
+
+    # provides attributes of the given node
+    # \param node DOM node
+    # \returns dictionary with name : value of attributes
+    @classmethod
+    def getAttributes(cls, node):
+        attributes = {}
+        attrs = node.attributes()
+        for i in range(attrs.count()):
+            attr = attrs.item(i)
+            attributes[unicode(attr.nodeName())] = unicode(attr.nodeValue())
+        return attributes
+
+    # finds the smallest difference between two DOM trees
+    # \brief It descends while exactly one child differs
+    # \param oldNode root of the old tree
+    # \param newNode root of the new tree
+    # \returns (path, start, old, new) tuple where path is a list of
+    #          child rows of the changed node. If start is None old and new
+    #          are dictionaries with attributes of the changed node,
+    #          otherwise they are lists of child texts, see getChildTexts(),
+    #          replaced from the start row
+    @classmethod
+    def diffNodes(cls, oldNode, newNode):
+        path = []
+        while True:
+            old = cls.getChildTexts(oldNode)
+            new = cls.getChildTexts(newNode)
+            if old == new:
+                return (path, None, cls.getAttributes(oldNode),
+                        cls.getAttributes(newNode))
+            size = min(len(old), len(new))
+            start = 0
+            while start < size and old[start] == new[start]:
+                start += 1
+            end = 0
+            while end < size - start and old[-1 - end] == new[-1 - end]:
+                end += 1
+            old = old[start:len(old) - end]
+            new = new[start:len(new) - end]
+            if len(old) != 1 or len(new) != 1 or old[0][0] or new[0][0]:
+                return (path, start, old, new)
+            oldChild = oldNode.childNodes().item(start)
+            newChild = newNode.childNodes().item(start)
+            if oldChild.nodeType() != QDomNode.ElementNode \
+                    or newChild.nodeType() != QDomNode.ElementNode \
+                    or oldChild.nodeName() != newChild.nodeName() \
+                    or (cls.getAttributes(oldChild)
+                        != cls.getAttributes(newChild)
+                        and cls.getChildTexts(oldChild)
+                        != cls.getChildTexts(newChild)):
+                return (path, start, old, new)
+            path.append(start)
+            oldNode = oldChild
+            newNode = newChild
+
     # provides the first element in the tree with the given name
     # \param node DOM node
     # \param name child name
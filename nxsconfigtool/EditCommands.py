@@ -239,7 +239,8 @@ class DataSourceCut(QUndoCommand):
                 self._ds.instance.copyToClipboard()
                 self._ds.instance.clear()
                 self._ds.instance.updateForm()
-                self._ds.instance.dialog.show()
+                if self._ds.instance.dialog:
+                    self._ds.instance.dialog.show()
             else:
                 self.receiver.sourceList.elements[
                     self._ds.id].instance.setState(self._newstate)
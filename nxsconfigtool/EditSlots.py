@@ -21,8 +21,11 @@
 
 """ Edit slots """
 
+import sys
+
 from PyQt5.QtGui import QKeySequence
 from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import (QInputDialog, QMessageBox)
 
 
 from .EditCommands import (
@@ -36,6 +39,9 @@ from .EditCommands import (
     ComponentTakeDataSource
 )
 
+if sys.version_info > (3,):
+    unicode = str
+
 
 # stack with the application commands
 class EditSlots(object):
@@ -47,6 +53,8 @@ class EditSlots(object):
         self.main = main
         # command stack
         self.undoStack = main.undoStack
+        # the last structural query
+        self.__query = ""
 
         # action data
         self.actions = {
@@ -80,9 +88,69 @@ class EditSlots(object):
             "actionPasteDataSource": [
                 "Paste DataSource", "dsourcePaste",
                 QKeySequence(Qt.CTRL + Qt.SHIFT + Qt.Key_Insert),
-                "paste", "Paste the data source"]
+                "paste", "Paste the data source"],
+            "actionFindNodes": [
+                "&Find Nodes...", "findNodes",
+                "Ctrl+Alt+F", "forward",
+                "Find component and datasource nodes"]
         }
 
+    # find nodes action
+    # \brief It finds component and datasource nodes matching
+    #        a structural query and shows the chosen one
+    def findNodes(self):
+        query, ok = QInputDialog.getText(
+            self.main, "Find Nodes",
+            "Query, e.g. //field[.//device[@name='p09/mca/1']]",
+            text=self.__query)
+        if not ok or not unicode(query).strip():
+            return
+        self.__query = unicode(query)
+        hits = []
+        try:
+            for elementList in [self.main.componentList,
+                                self.main.sourceList]:
+                hits.extend((elementList, ide, path) for ide, path
+                            in elementList.findNodes(self.__query))
+        except ValueError as e:
+            QMessageBox.warning(self.main, "Find Nodes", unicode(e))
+            return
+        if not hits:
+            QMessageBox.information(
+                self.main, "Find Nodes", "No nodes found")
+            return
+        labels = [
+            "%s. %s [%s]: /%s" % (
+                i + 1, elementList.elements[ide].name, elementList.clName,
+                "/".join("%s[%s]" % (name, pos + 1) for pos, name in path))
+            for i, (elementList, ide, path) in enumerate(hits)]
+        label, ok = QInputDialog.getItem(
+            self.main, "Find Nodes", "%s nodes found" % len(hits),
+            labels, 0, False)
+        if ok:
+            self.showNode(*hits[labels.index(unicode(label))])
+
+    # shows the element node
+    # \brief It selects the element in its list, opens it and
+    #        selects the component node
+    # \param elementList list of the element
+    # \param ide element id
+    # \param path path represented as a list with elements:
+    #        (position among sibling elements, node name)
+    def showNode(self, elementList, ide, path):
+        elementList.populateElements(ide)
+        current = elementList.currentListElement()
+        if current is None or current.id != ide:
+            elementList.ui.filterLineEdit.clear()
+            elementList.populateElements(ide)
+        if elementList is self.main.componentList:
+            self.componentEdit()
+            instance = elementList.elements[ide].instance
+            if instance is not None and hasattr(instance, "showElementPath"):
+                instance.showElementPath(path)
+        else:
+            self.dsourceEdit()
+
     # take datasources
     # \brief It takes datasources from the current component
     def componentTakeDataSources(self):
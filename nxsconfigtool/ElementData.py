@@ -0,0 +1,668 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2017 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+# \package nxsconfigtool nexdatas
+# \file ElementData.py
+# data of components and datasources without GUI
+
+""" data of components and datasources without GUI """
+
+import copy
+import sys
+
+from PyQt5.QtXml import QDomDocument
+
+from .DomTools import DomTools
+from .Merger import Merger
+
+import logging
+# message logger
+logger = logging.getLogger("nxsdesigner")
+
+if sys.version_info > (3,):
+    unicode = str
+
+
+# class with datasource variables
+class Variables(object):
+    pass
+
+
+# provides the attribute value of the DOM node
+# \param attributeMap attributes of the DOM node
+# \param name attribute name
+# \param default default value
+# \returns attribute value
+def _attribute(attributeMap, name, default=""):
+    return unicode(attributeMap.namedItem(name).nodeValue()
+                   if attributeMap.contains(name) else default)
+
+
+# CLIENT datasource data
+class ClientData(object):
+    # variables
+    var = {
+        # client record name
+        "recordName": u''}
+
+    # reads variables from the DOM node
+    # \param node datasource DOM node
+    # \param variables datasource type variables
+    # \returns list of warnings
+    @classmethod
+    def readNode(cls, node, variables):
+        record = node.firstChildElement(str("record"))
+        if record.nodeName() != "record":
+            return ["Missing <record> tag"]
+        variables.recordName = _attribute(record.attributes(), "name")
+        return []
+
+    # creates DOM nodes from variables
+    # \param variables datasource type variables
+    # \param root root node
+    # \param elem datasource node
+    @classmethod
+    def writeNode(cls, variables, root, elem):
+        record = root.createElement(str("record"))
+        record.setAttribute(str("name"), str(variables.recordName))
+        elem.appendChild(record)
+
+    # validates variables
+    # \param variables datasource type variables
+    # \returns list of errors
+    @classmethod
+    def validate(cls, variables):
+        return [] if variables.recordName else ["Empty record name"]
+
+
+# DB datasource data
+class DBData(object):
+    # variables
+    var = {
+        # database type
+        'dbtype': 'MYSQL',
+        # database format
+        'dataFormat': 'SCALAR',
+        # database query
+        'query': "",
+        # database parameters
+        'parameters': {}
+    }
+
+    # parameter map for xml tags
+    dbmap = {
+        "dbname": "DB name",
+        "hostname": "DB host",
+        "port": "DB port",
+        "user": "DB user",
+        "passwd": "DB password",
+        "mycnf": "Mysql cnf",
+        "mode": "Oracle mode"
+    }
+
+    # xml tags of parameters
+    idbmap = dict(zip(dbmap.values(), dbmap.keys()))
+
+    # reads variables from the DOM node
+    # \param node datasource DOM node
+    # \param variables datasource type variables
+    # \returns list of warnings
+    @classmethod
+    def readNode(cls, node, variables):
+        warnings = []
+        variables.parameters = {}
+        database = node.firstChildElement(str("database"))
+        if database.nodeName() != "database":
+            warnings.append("Missing <database> tag")
+        else:
+            attributeMap = database.attributes()
+            for i in range(attributeMap.count()):
+                name = unicode(attributeMap.item(i).nodeName())
+                if name == 'dbtype':
+                    variables.dbtype = unicode(
+                        attributeMap.item(i).nodeValue())
+                elif name in cls.dbmap:
+                    variables.parameters[cls.dbmap[name]] = \
+                        unicode(attributeMap.item(i).nodeValue())
+
+        if not variables.dbtype:
+            variables.dbtype = 'MYSQL'
+        text = unicode(DomTools.getText(database))
+        variables.parameters['Oracle DSN'] = unicode(text).strip() \
+            if text else ""
+
+        query = node.firstChildElement(str("query"))
+        if query.nodeName() != "query":
+            warnings.append("Missing <query> tag")
+        else:
+            variables.dataFormat = _attribute(
+                query.attributes(), "format", "SCALAR")
+
+        text = unicode(DomTools.getText(query))
+        variables.query = unicode(text).strip() if text else ""
+        return warnings
+
+    # creates DOM nodes from variables
+    # \param variables datasource type variables
+    # \param root root node
+    # \param elem datasource node
+    @classmethod
+    def writeNode(cls, variables, root, elem):
+        db = root.createElement(str("database"))
+        db.setAttribute(str("dbtype"), str(variables.dbtype))
+        for par in variables.parameters.keys():
+            if par == 'Oracle DSN':
+                newText = root.createTextNode(
+                    str(variables.parameters[par]))
+                db.appendChild(newText)
+            else:
+                db.setAttribute(str(cls.idbmap[par]),
+                                str(variables.parameters[par]))
+        elem.appendChild(db)
+
+        query = root.createElement(str("query"))
+        query.setAttribute(str("format"), str(variables.dataFormat))
+        if variables.query:
+            newText = root.createTextNode(str(variables.query))
+            query.appendChild(newText)
+
+        elem.appendChild(query)
+
+    # validates variables
+    # \param variables datasource type variables
+    # \returns list of errors
+    @classmethod
+    def validate(cls, variables):
+        errors = [] if variables.query else ["Empty query"]
+        errors.extend("Unknown parameter: %s" % par
+                      for par in variables.parameters.keys()
+                      if par != 'Oracle DSN' and par not in cls.idbmap)
+        return errors
+
+
+# TANGO datasource data
+class TangoData(object):
+    # variables
+    var = {
+        # Tango device name
+        'deviceName': u'',
+        # Tango member name
+        'memberName': u'',
+        # Tango member name
+        'memberType': u'',
+        # Tango host name
+        'host': u'',
+        # Tango host name
+        'port': u'',
+        # encoding for DevEncoded Tango types
+        'encoding': u'',
+        # group for Tango DataSources
+        'group': u''
+    }
+
+    # reads variables from the DOM node
+    # \param node datasource DOM node
+    # \param variables datasource type variables
+    # \returns list of warnings
+    @classmethod
+    def readNode(cls, node, variables):
+        warnings = []
+        record = node.firstChildElement(str("record"))
+        if record.nodeName() != "record":
+            warnings.append("Missing <record> tag")
+        else:
+            variables.memberName = _attribute(record.attributes(), "name")
+
+        device = node.firstChildElement(str("device"))
+        if device.nodeName() != "device":
+            warnings.append("Missing <device> tag")
+        else:
+            attributeMap = device.attributes()
+            variables.deviceName = _attribute(attributeMap, "name")
+            variables.memberType = _attribute(
+                attributeMap, "member", "attribute")
+            variables.host = _attribute(attributeMap, "hostname")
+            variables.port = _attribute(attributeMap, "port")
+            variables.encoding = _attribute(attributeMap, "encoding")
+            variables.group = _attribute(attributeMap, "group")
+        return warnings
+
+    # creates DOM nodes from variables
+    # \param variables datasource type variables
+    # \param root root node
+    # \param elem datasource node
+    @classmethod
+    def writeNode(cls, variables, root, elem):
+        record = root.createElement(str("record"))
+        record.setAttribute(str("name"), str(variables.memberName))
+        elem.appendChild(record)
+
+        device = root.createElement(str("device"))
+        device.setAttribute(str("name"), str(variables.deviceName))
+        device.setAttribute(str("member"), str(variables.memberType))
+        if variables.host:
+            device.setAttribute(str("hostname"), str(variables.host))
+        if variables.port:
+            device.setAttribute(str("port"), str(variables.port))
+        if variables.encoding:
+            device.setAttribute(str("encoding"), str(variables.encoding))
+        if variables.group:
+            device.setAttribute(str("group"), str(variables.group))
+        elem.appendChild(device)
+
+    # validates variables
+    # \param variables datasource type variables
+    # \returns list of errors
+    @classmethod
+    def validate(cls, variables):
+        errors = []
+        if not variables.deviceName:
+            errors.append("Empty device name")
+        if not variables.memberName:
+            errors.append("Empty member name")
+        return errors
+
+
+# PYEVAL datasource data
+class PyEvalData(object):
+    # variables
+    var = {
+        # pyeval result variable
+        'result': "ds.result",
+        # pyeval datasource variables
+        'input': "",
+        # pyeval python script
+        'script': "",
+        # pyeval datasources
+        'dataSources': {}
+    }
+
+    # reads variables from the DOM node
+    # \param node datasource DOM node
+    # \param variables datasource type variables
+    # \returns list of warnings
+    @classmethod
+    def readNode(cls, node, variables):
+        res = node.firstChildElement(str("result"))
+        text = DomTools.getText(res)
+        while len(text) > 0 and text[0] == '\n':
+            text = text[1:]
+        variables.script = unicode(text) if text else ""
+        attributeMap = res.attributes()
+        variables.result = unicode(
+            "ds." + attributeMap.namedItem("name").nodeValue()
+            if attributeMap.contains("name") else "")
+
+        ds = DomTools.getText(node)
+        dslist = unicode(ds).strip().split() \
+            if unicode(ds).strip() else []
+        variables.dataSources = {}
+        child = node.firstChildElement(str("datasource"))
+        while not child.isNull():
+            name = _attribute(child.attributes(), "name")
+            if name.strip():
+                dslist.append(name.strip())
+                doc = QDomDocument()
+                doc.appendChild(doc.importNode(child, True))
+                variables.dataSources[name] = unicode(doc.toString(0))
+            child = child.nextSiblingElement("datasource")
+
+        variables.input = " ".join(
+            "ds." + (d[13:] if (len(d) > 13 and d[:13] == "$datasources.")
+                     else d) for d in dslist)
+        return []
+
+    # creates DOM nodes from variables
+    # \param variables datasource type variables
+    # \param root root node
+    # \param elem datasource node
+    @classmethod
+    def writeNode(cls, variables, root, elem):
+        res = root.createElement(str("result"))
+        rn = str(variables.result).strip()
+        if rn:
+            res.setAttribute(
+                str("name"),
+                str(rn[3:] if (len(rn) > 3 and rn[:3] == 'ds.') else rn))
+        if variables.script:
+            script = root.createTextNode(
+                str(variables.script if variables.script[0] == '\n'
+                    else ("\n" + variables.script)).replace("\t", "    "))
+            res.appendChild(script)
+        elem.appendChild(res)
+        if variables.input:
+            dslist = unicode(variables.input).split()
+            newds = ""
+            for d in dslist:
+                name = d[3:] if (len(d) > 3 and d[:3] == 'ds.') else d
+                if name in variables.dataSources.keys():
+                    document = QDomDocument()
+                    if not document.setContent(variables.dataSources[name]):
+                        raise ValueError("could not parse XML")
+                    dsnode = DomTools.getFirstElement(document, "datasource")
+                    elem.appendChild(root.importNode(dsnode, True))
+                else:
+                    newds = "\n ".join([newds, "$datasources." + name])
+
+            newText = root.createTextNode(str(newds))
+            elem.appendChild(newText)
+
+    # validates variables
+    # \param variables datasource type variables
+    # \returns list of errors
+    @classmethod
+    def validate(cls, variables):
+        return [] if variables.script else ["Empty script"]
+
+
+# available datasource data types
+dataTypes = {'CLIENT': ClientData,
+             'TANGO': TangoData,
+             'DB': DBData,
+             'PYEVAL': PyEvalData
+             }
+
+
+# datasource data
+class DataSourceData(object):
+
+    # constructor
+    def __init__(self):
+
+        # data source type
+        self.dataSourceType = 'CLIENT'
+        # attribute doc
+        self.doc = u''
+
+        # datasource name
+        self.dataSourceName = u''
+
+        # datasource variables
+        self.var = {}
+
+        # creates variables dynamically
+        self.clear()
+
+    # provides datasource types
+    # \returns dictionary with type : class with variables
+    def _types(self):
+        return dataTypes
+
+    # clears the datasource content
+    # \brief It sets the datasource variables to default values
+    def clear(self):
+        for ds, cl in self._types().items():
+            self.var[ds] = Variables()
+            for vr in cl.var.keys():
+                vv = cl.var[vr]
+                setattr(self.var[ds], vr, copy.copy(vv)
+                        if ((type(vv) is list) or (type(vv) is dict)) else vv)
+
+    # provides the state of the datasource dialog
+    # \returns state of the datasource in tuple
+    def getState(self):
+        state = [self.dataSourceType,
+                 self.dataSourceName,
+                 self.doc]
+
+        for ds, cl in self._types().items():
+            for vr in cl.var.keys():
+                vv = getattr(self.var[ds], vr)
+                state.append(
+                    copy.copy(vv)
+                    if ((type(vv) is list) or (type(vv) is dict)) else vv)
+        return tuple(state)
+
+    # sets the state of the datasource dialog
+    # \brief note that ids, applied and tree are not in the state
+    # \param state state datasource written in tuple
+    def setState(self, state):
+
+        cnt = 3
+        (self.dataSourceType, self.dataSourceName, self.doc) = state[:cnt]
+
+        for ds, cl in self._types().items():
+            for vr in cl.var.keys():
+                setattr(
+                    self.var[ds], vr, copy.copy(state[cnt])
+                    if ((type(state[cnt]) is list)
+                        or (type(state[cnt]) is dict))
+                    else state[cnt])
+                cnt += 1
+
+    # reads variables of the datasource type from the DOM node
+    # \param node datasource DOM node
+    # \returns list of warnings
+    def _readTypeNode(self, node):
+        cl = dataTypes.get(self.dataSourceType)
+        if cl is None:
+            return []
+        return cl.readNode(node, self.var[self.dataSourceType])
+
+    # creates DOM nodes of the datasource type
+    # \param root root node
+    # \param elem datasource node
+    def _writeTypeNode(self, root, elem):
+        cl = dataTypes.get(self.dataSourceType)
+        if cl is not None:
+            cl.writeNode(self.var[self.dataSourceType], root, elem)
+
+    # reads the datasource from the DOM node
+    # \param node datasource DOM node
+    # \returns list of warnings
+    def readNode(self, node):
+        attributeMap = node.attributes()
+        self.dataSourceType = _attribute(attributeMap, "type")
+        if attributeMap.contains("name"):
+            self.dataSourceName = _attribute(attributeMap, "name")
+
+        warnings = self._readTypeNode(node)
+
+        doc = node.firstChildElement(str("doc"))
+        text = DomTools.getText(doc)
+        self.doc = unicode(text).strip() if text else ""
+        return warnings
+
+    # creates the datasource DOM node
+    # \param root root node
+    # \returns created DOM node
+    def writeNode(self, root):
+        elem = root.createElement(str("datasource"))
+        elem.setAttribute(str("type"), str(self.dataSourceType))
+        if self.dataSourceName:
+            elem.setAttribute(str("name"), str(self.dataSourceName))
+        else:
+            logger.info("name not defined")
+
+        self._writeTypeNode(root, elem)
+
+        if self.doc:
+            newDoc = root.createElement(str("doc"))
+            newText = root.createTextNode(str(self.doc))
+            newDoc.appendChild(newText)
+            elem.appendChild(newDoc)
+        return elem
+
+    # reads the datasource from the xml string
+    # \param xml xml string with the first datasource tag
+    # \returns list of warnings
+    def fromXML(self, xml):
+        document = QDomDocument()
+        if not document.setContent(xml)[0]:
+            raise ValueError("could not parse XML")
+        node = DomTools.getFirstElement(document, "datasource")
+        if not node:
+            raise ValueError("missing <datasource> tag")
+        return self.readNode(node)
+
+    # provides the datasource xml string
+    # \param indent number of added spaces during pretty printing
+    # \returns xml string
+    def toXML(self, indent=0):
+        document = QDomDocument()
+        document.appendChild(document.createProcessingInstruction(
+            "xml", "version='1.0'"))
+        definition = document.createElement(str("definition"))
+        document.appendChild(definition)
+        definition.appendChild(self.writeNode(document))
+        return unicode(document.toString(indent))
+
+    # validates the datasource
+    # \returns list of errors
+    def validate(self):
+        errors = []
+        if not self.dataSourceName:
+            errors.append("Empty datasource name")
+        cl = self._types().get(self.dataSourceType)
+        if cl is None:
+            errors.append("Unknown datasource type: %s" % self.dataSourceType)
+        elif hasattr(cl, "validate"):
+            errors.extend(cl.validate(self.var[self.dataSourceType]))
+        return errors
+
+    # provides differences to the other datasource
+    # \brief Only variables of the datasource types are compared
+    # \param other datasource data
+    # \returns list of (variable, value, other value) tuples
+    def diff(self, other):
+        values = [("type", self.dataSourceType, other.dataSourceType),
+                  ("name", self.dataSourceName, other.dataSourceName),
+                  ("doc", self.doc, other.doc)]
+        for ds in sorted(set([self.dataSourceType, other.dataSourceType])):
+            cl = self._types().get(ds)
+            if cl is None or ds not in other.var:
+                continue
+            for vr in sorted(cl.var.keys()):
+                values.append(("%s.%s" % (ds, vr),
+                               getattr(self.var[ds], vr),
+                               getattr(other.var[ds], vr)))
+        return [value for value in values if value[1] != value[2]]
+
+
+# parses the component xml string
+# \brief Processing instructions and top comments are removed
+# \param xml xml string or io device
+# \returns DOM document
+def parseComponent(xml):
+    document = QDomDocument()
+    if not document.setContent(xml)[0]:
+        raise ValueError("could not parse XML")
+    children = document.childNodes()
+    j = 0
+    for _ in range(children.count()):
+        ch = children.item(j)
+        if unicode(ch.nodeName()).strip() in \
+                ['xml', 'xml-stylesheet', "#comment"]:
+            document.removeChild(ch)
+        else:
+            j += 1
+    return document
+
+
+# provides the component xml string
+# \param document DOM document of the component
+# \param indent number of added spaces during pretty printing
+# \returns xml string with the xml processing instruction
+def componentXML(document, indent=0):
+    processing = document.createProcessingInstruction(
+        "xml", "version='1.0'")
+    document.insertBefore(processing, document.firstChild())
+    string = unicode(document.toString(indent))
+    document.removeChild(processing)
+    return string
+
+
+# component data
+class ComponentData(object):
+
+    # constructor
+    # \param xml xml string
+    def __init__(self, xml=None):
+        # DOM document
+        self.document = None
+        if xml is not None:
+            self.fromXML(xml)
+
+    # reads the component from the xml string
+    # \param xml xml string
+    def fromXML(self, xml):
+        self.document = parseComponent(xml)
+
+    # provides the component xml string
+    # \param indent number of added spaces during pretty printing
+    # \returns xml string
+    def toXML(self, indent=0):
+        if self.document is None:
+            return None
+        return componentXML(self.document, indent)
+
+    # provides the state for pickling
+    # \returns xml string
+    def __getstate__(self):
+        return {"xml": self.toXML()}
+
+    # sets the state from pickling
+    # \param state dictionary with xml string
+    def __setstate__(self, state):
+        self.document = None
+        if state["xml"] is not None:
+            self.fromXML(state["xml"])
+
+    # provides datasources defined in the component
+    # \returns list of datasource data
+    def dataSources(self):
+        datasources = []
+        if self.document is None:
+            return datasources
+        nodes = self.document.elementsByTagName("datasource")
+        for i in range(nodes.count()):
+            ds = DataSourceData()
+            ds.readNode(nodes.item(i))
+            datasources.append(ds)
+        return datasources
+
+    # validates the component
+    # \brief It runs merger rules on a copy of the document
+    #        and validates datasources defined in the component
+    # \returns list of errors
+    def validate(self):
+        if self.document is None:
+            return ["Empty component"]
+        errors = []
+        document = self.document.cloneNode(True).toDocument()
+        merger = Merger(document)
+        merger.run()
+        if merger.exception is not None:
+            errors.append(unicode(merger.exception).strip())
+        for ds in self.dataSources():
+            errors.extend("%s: %s" % (ds.dataSourceName or "datasource", er)
+                          for er in ds.validate() if er !=
+                          "Empty datasource name")
+        return errors
+
+    # provides the difference to the other component
+    # \param other component data
+    # \returns None if components are equal or
+    #          (path, start, old, new) tuple, see DomTools.diffNodes()
+    def diff(self, other):
+        if self.toXML() == other.toXML():
+            return None
+        return DomTools.diffNodes(self.document, other.document)
+
+
+if __name__ == "__main__":
+    pass
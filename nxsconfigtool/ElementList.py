@@ -23,27 +23,100 @@
 import os
 import sys
 
-from PyQt5.QtCore import (Qt, )
-from PyQt5.QtWidgets import (QWidget, QMenu, QMessageBox, QListWidgetItem,
-                             QProgressDialog)
-from PyQt5 import uic
+from PyQt5.QtCore import (Qt, QTimer, QModelIndex)
+from PyQt5.QtWidgets import (QWidget, QMenu, QMessageBox, QProgressDialog,
+                             QAbstractItemView)
 
 # from .ui.ui_elementlist import Ui_ElementList
+from .UiLoader import UiForm
 from .LabeledObject import LabeledObject
+from .FileLoader import FileLoader
+from .DependencyGraph import DependencyGraph
+from .ElementListModel import ElementListModel, ElementFilterModel
+from .SearchIndex import SearchIndex
+from .StructureIndex import StructureIndex
 
 
 import logging
 # message logger
 logger = logging.getLogger("nxsdesigner")
 
-_formclass, _baseclass = uic.loadUiType(
-    os.path.join(os.path.dirname(os.path.abspath(__file__)),
-                 "ui", "elementlist.ui"))
+_formclass = UiForm("elementlist")
 
 if sys.version_info > (3,):
     unicode = str
 
 
+# dictionary of list elements which reports changed keys
+class ElementDict(dict):
+
+    # constructor
+    # \param elements initial elements
+    # \param changed function called with a changed key
+    def __init__(self, elements=None, changed=None):
+        dict.__init__(self, elements or {})
+        # function called with a changed key
+        self.changed = changed
+
+    # reports the changed key
+    # \param key element key
+    def __report(self, key):
+        if self.changed is not None:
+            self.changed(key)
+
+    # sets the element
+    # \param key element key
+    # \param value element
+    def __setitem__(self, key, value):
+        dict.__setitem__(self, key, value)
+        self.__report(key)
+
+    # removes the element
+    # \param key element key
+    def __delitem__(self, key):
+        dict.__delitem__(self, key)
+        self.__report(key)
+
+    # removes the element
+    # \param key element key
+    # \param args default value
+    # \returns removed element
+    def pop(self, key, *args):
+        value = dict.pop(self, key, *args)
+        self.__report(key)
+        return value
+
+    # removes an element
+    # \returns (key, element) tuple
+    def popitem(self):
+        key, value = dict.popitem(self)
+        self.__report(key)
+        return key, value
+
+    # sets the element if it is missing
+    # \param key element key
+    # \param value default element
+    # \returns the element
+    def setdefault(self, key, value=None):
+        if key not in self:
+            self[key] = value
+        return self[key]
+
+    # updates elements
+    # \param args dictionary or (key, element) pairs
+    # \param kwargs elements
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    # removes all elements
+    def clear(self):
+        keys = list(self.keys())
+        dict.clear(self)
+        for key in keys:
+            self.__report(key)
+
+
 # dialog defining a group tag
 class ElementList(QWidget):
 
@@ -55,8 +128,38 @@ class ElementList(QWidget):
         # directory from which components are loaded by default
         self.directory = directory
 
+        # ids of elements which dependencies have to be updated
+        self.__changed = set()
+        # dependencies between list elements
+        self.dependencies = DependencyGraph()
+        self.dependencies.register(self)
+
         # group elements
-        self.elements = {}
+        self.__elements = ElementDict(changed=self.__elementChanged)
+        # model of the element list view
+        self.model = ElementListModel(self.__elements, self)
+
+        # ids of elements which have to be reindexed
+        self.__unindexed = set()
+        # index of element names and contents
+        self.search = SearchIndex()
+        # content tokens of element files, i.e. path : ((size, mtime), tokens)
+        self._fileTokens = {}
+        # content tokens of element instances,
+        #  i.e. id : (instance, revision key, tokens)
+        self._instanceTokens = {}
+        # filter query
+        self.__query = ""
+        # if element contents are searched
+        self.__searchContent = False
+        # model of the element list view showing filtered elements
+        self.filterModel = ElementFilterModel(self)
+        self.filterModel.setSourceModel(self.model)
+
+        # ids of elements which have to be parsed for structural search
+        self.__unparsed = set()
+        # structural index of element documents
+        self.structure = StructureIndex()
 
         # actions
         self._actions = []
@@ -74,6 +177,221 @@ class ElementList(QWidget):
         self.extention = ".xml"
         # excluded extention
         self.disextention = None
+        # if instances should be created on the first access
+        self.lazy = False
+        # if files should be read in background by a pool of workers
+        self.background = False
+        # number of elements added to the list at once
+        self.batchSize = 20
+
+        # background file loader
+        self._fileLoader = None
+        # timer fetching elements read in background
+        self._loadTimer = None
+
+    # provides the list elements
+    # \returns dictionary with id : labeled object
+    def __getElements(self):
+        return self.__elements
+
+    # sets the list elements
+    # \param elements dictionary with id : labeled object
+    def __setElements(self, elements):
+        self.__markChanged(self.__elements.keys())
+        self.__elements = ElementDict(elements, self.__elementChanged)
+        self.__markChanged(self.__elements.keys())
+        self.model.setElements(self.__elements)
+        self.__refilter()
+
+    # the list elements
+    elements = property(__getElements, __setElements,
+                        doc='list elements')
+
+    # marks elements to be updated in the dependencies and search indexes
+    # \param ides element ids
+    def __markChanged(self, ides):
+        for ide in ides:
+            self.__changed.add(ide)
+            self.__unindexed.add(ide)
+            self.__unparsed.add(ide)
+
+    # updates the changed element in the dependencies and the list model
+    # \param ide element id
+    def __elementChanged(self, ide):
+        self.__markChanged([ide])
+        self.__updateMatch(ide)
+        self.model.updateElement(ide)
+
+    # sets the dependency graph shared with other lists
+    # \param dependencies DependencyGraph instance
+    def setDependencies(self, dependencies):
+        self.dependencies.unregister(self)
+        self.dependencies = dependencies
+        self.dependencies.register(self)
+        self.__changed.update(self.__elements.keys())
+
+    # marks dependencies of the element instance as changed
+    # \brief It is called by element instances when their references
+    #        are fetched
+    # \param instance element instance
+    def elementChanged(self, instance):
+        ide = getattr(instance, "id", None)
+        if ide in self.__elements:
+            self.__markChanged([ide])
+            self.__updateMatch(ide)
+
+    # provides the element name and its references
+    # \param el labeled object of the element
+    # \returns (name, list of (kind, name) tuples) tuple
+    def _elementReferences(self, el):
+        instance = el.loadedInstance() \
+            if hasattr(el, "loadedInstance") else el.instance
+        if instance is None:
+            return el.name, []
+        return (getattr(instance, "name", None) or el.name,
+                [("components", name) for name in
+                 getattr(instance, "components", None) or []] +
+                [("datasources", name) for name in
+                 getattr(instance, "datasources", None) or []])
+
+    # updates the dependency graph with the changed elements
+    def syncDependencies(self):
+        while self.__changed:
+            ide = self.__changed.pop()
+            el = self.__elements.get(ide)
+            if el is None:
+                self.dependencies.remove((self.name, ide))
+            else:
+                name, references = self._elementReferences(el)
+                self.dependencies.update(
+                    (self.name, ide), (self.name, name), references)
+
+    # provides content tokens of the element
+    # \brief Not loaded elements are tokenized from their files and
+    #        instances are serialized only when their revision changes
+    # \param el labeled object of the element
+    # \returns set of content tokens
+    def _elementContents(self, el):
+        instance = el.loadedInstance() \
+            if hasattr(el, "loadedInstance") else el.instance
+        if instance is not None:
+            if not hasattr(instance, "get"):
+                return set()
+            key = instance.revisionKey() \
+                if hasattr(instance, "revisionKey") else None
+            cached = self._instanceTokens.get(el.id)
+            if key is not None and cached is not None \
+                    and cached[0] is instance and cached[1] == key:
+                return cached[2]
+            tokens = SearchIndex.tokenizeXML(instance.get())
+            if key is not None:
+                self._instanceTokens[el.id] = (instance, key, tokens)
+            return tokens
+        if not getattr(el, "fileInfo", None) or not el.fileInfo[0]:
+            return set()
+        fpath, size, mtime = el.fileInfo
+        if fpath in self._fileTokens \
+                and self._fileTokens[fpath][0] == (size, mtime):
+            return self._fileTokens[fpath][1]
+        try:
+            with open(fpath) as fl:
+                tokens = SearchIndex.tokenizeXML(fl.read())
+        except Exception:
+            return set()
+        self._fileTokens[fpath] = ((size, mtime), tokens)
+        return tokens
+
+    # updates the search index of the element
+    # \param ide element id
+    def __index(self, ide):
+        self.__unindexed.discard(ide)
+        el = self.__elements.get(ide)
+        if el is None:
+            self.search.remove(ide)
+            self._instanceTokens.pop(ide, None)
+        else:
+            self.search.update(
+                ide, el.name,
+                self._elementContents(el) if self.__searchContent else None)
+
+    # updates the search index with the changed elements
+    def syncSearch(self):
+        while self.__unindexed:
+            self.__index(next(iter(self.__unindexed)))
+
+    # updates the filter match of the changed element
+    # \brief The element is reindexed at once only if the filter is set
+    # \param ide element id
+    def __updateMatch(self, ide):
+        if self.filterModel.matches() is None:
+            return
+        self.__index(ide)
+        self.filterModel.setMatch(
+            ide,
+            ide in self.__elements and self.search.match(
+                ide, self.__query, self.__searchContent),
+            ide in self.__elements and self.model.row(ide) >= 0)
+
+    # filters the list elements
+    # \brief Elements are shown if each query word is a prefix of
+    #        a word of their names or, optionally, their contents
+    # \param query query string, all elements are shown if it is empty
+    # \param content if element contents are searched, the current
+    #        setting if None
+    def filterElements(self, query, content=None):
+        query = unicode(query or "")
+        if content is not None and bool(content) != self.__searchContent:
+            self.__searchContent = bool(content)
+            self.__unindexed.update(self.__elements.keys())
+        self.__query = query
+        self.__refilter()
+
+    # applies the filter query to the list elements
+    def __refilter(self):
+        if not self.__query.strip():
+            if self.filterModel.matches() is not None:
+                self.filterModel.setMatches(None)
+            return
+        self.syncSearch()
+        self.filterModel.setMatches(
+            self.search.search(self.__query, self.__searchContent) or set())
+
+    # provides the XML of the element
+    # \brief Not loaded elements are read from their files
+    # \param el labeled object of the element
+    # \returns XML string or None
+    def _elementXML(self, el):
+        instance = el.loadedInstance() \
+            if hasattr(el, "loadedInstance") else el.instance
+        if instance is not None:
+            return instance.get() if hasattr(instance, "get") else None
+        if not getattr(el, "fileInfo", None) or not el.fileInfo[0]:
+            return None
+        try:
+            with open(el.fileInfo[0], "rb") as fl:
+                return fl.read().decode("utf-8")
+        except Exception:
+            return None
+
+    # updates the structural index with the changed elements
+    def syncStructure(self):
+        while self.__unparsed:
+            ide = self.__unparsed.pop()
+            el = self.__elements.get(ide)
+            self.structure.update(
+                ide, self._elementXML(el) if el is not None else None)
+
+    # finds element nodes matching the structural query
+    # \param query query text, see StructureIndex.Query
+    # \returns list of (element id, path) tuples sorted by element names
+    #          where path is a list of (position among sibling elements,
+    #          tag) tuples
+    # \throws ValueError if the query is not valid
+    def findNodes(self, query):
+        self.syncStructure()
+        return sorted(
+            self.structure.search(query),
+            key=lambda hit: (self.__elements[hit[0]].name, hit[0], hit[1]))
 
     #  creates GUI
     # \brief It calls setupUi and  connects signals and slots
@@ -81,8 +399,14 @@ class ElementList(QWidget):
 
         self.ui.setupUi(self)
         self.ui.elementTabWidget.setTabText(0, self.title)
-        self.ui.elementListWidget.setEditTriggers(
-            self.ui.elementListWidget.SelectedClicked)
+        self.ui.elementListView.setModel(self.filterModel)
+        self.ui.elementListView.setEditTriggers(
+            QAbstractItemView.SelectedClicked)
+        self.ui.filterLineEdit.textChanged.connect(
+            lambda text: self.filterElements(text))
+        self.ui.contentCheckBox.toggled.connect(
+            lambda checked: self.filterElements(
+                self.ui.filterLineEdit.text(), checked))
 
         self.populateElements()
 
@@ -103,13 +427,13 @@ class ElementList(QWidget):
                             submenu.addAction(saction)
             else:
                 menu.addAction(action)
-        menu.exec_(self.ui.elementListWidget.viewport().mapToGlobal(position))
+        menu.exec_(self.ui.elementListView.viewport().mapToGlobal(position))
 
     # sets context menu actions for the element list
     # \param actions tuple with actions
     def setActions(self, actions):
-        self.ui.elementListWidget.setContextMenuPolicy(Qt.CustomContextMenu)
-        self.ui.elementListWidget.customContextMenuRequested.connect(
+        self.ui.elementListView.setContextMenuPolicy(Qt.CustomContextMenu)
+        self.ui.elementListView.customContextMenuRequested.connect(
             self._openMenu)
         self._actions = actions
 
@@ -123,17 +447,17 @@ class ElementList(QWidget):
     # takes a name of the current element
     # \returns name of the current element
     def currentListElement(self):
-        item = self.ui.elementListWidget.currentItem()
-        if item is not None \
-           and item.data(Qt.UserRole) \
+        index = self.ui.elementListView.currentIndex()
+        if index.isValid() \
+           and index.data(Qt.UserRole) \
            in self.elements.keys():
-            return self.elements[item.data(Qt.UserRole)]
+            return self.elements[index.data(Qt.UserRole)]
         else:
             return None
 
     # sets focus into element list
     def setItemFocus(self):
-        self.ui.elementListWidget.setFocus()
+        self.ui.elementListView.setFocus()
 
     # removes the current element
     #  \brief It removes the current element asking before about it
@@ -175,60 +499,57 @@ class ElementList(QWidget):
                     self.elements[ide].name = unicode(item.text())
                 else:
                     self.elements[ide].name = name
+                self.__elementChanged(ide)
                 self.populateElements()
                 return old, oname
         return None, None
 
     # fills in the element list
+    # \brief It updates the row of the selected element, repaints
+    #        the rows and sets the current element
     # \param selectedElement selected element
     # \param edit flag if edit the selected item
     def populateElements(self, selectedElement=None, edit=False):
-        selected = None
-        self.ui.elementListWidget.clear()
-
-        slist = [(self.elements[key].name, key)
-                 for key in self.elements.keys()]
-        slist.sort()
-
-        for name, el in slist:
-            item = QListWidgetItem(str("%s" % name))
-            item.setData(Qt.UserRole, (self.elements[el].id))
-            item.setFlags(item.flags() | Qt.ItemIsEditable)
-            dirty = False
-            if hasattr(self.elements[el], "isDirty") \
-                    and self.elements[el].isDirty():
-                dirty = True
-            if self.elements[el].instance is not None:
-                if hasattr(self.elements[el].instance, "isDirty") \
-                        and self.elements[el].instance.isDirty():
-                    dirty = True
+        view = self.ui.elementListView
+        if selectedElement is not None:
+            self.__elementChanged(selectedElement)
+            el = self.elements.get(selectedElement)
+            if el is not None:
+                self.__updateTitle(el)
+        else:
+            for el in self.elements.values():
+                self.__updateTitle(el)
+        self.model.refresh()
+
+        row = self.model.row(selectedElement) \
+            if selectedElement is not None else -1
+        index = self.filterModel.mapFromSource(self.model.index(row, 0)) \
+            if row >= 0 else QModelIndex()
+        if not index.isValid():
+            view.setCurrentIndex(QModelIndex())
+            return
+        view.setCurrentIndex(index)
+        view.scrollTo(index)
+        if edit:
+            view.edit(index)
+
+    # updates the window title of the element dialog
+    # \param el labeled object of the element
+    def __updateTitle(self, el):
+        instance = el.loadedInstance() \
+            if hasattr(el, "loadedInstance") else el.instance
+        if instance is None or getattr(instance, "dialog", None) is None:
+            return
+        dirty = self.model.isDirty(el.id)
+        try:
             if dirty:
-                item.setForeground(Qt.red)
+                instance.dialog.\
+                    setWindowTitle("%s [%s]*" % (el.name, self.clName))
             else:
-                item.setForeground(Qt.black)
-
-            self.ui.elementListWidget.addItem(item)
-            if selectedElement is not None \
-                    and selectedElement == self.elements[el].id:
-                selected = item
-
-            if self.elements[el].instance is not None \
-                    and self.elements[el].instance.dialog is not None:
-                try:
-                    if dirty:
-                        self.elements[el].instance.dialog.\
-                            setWindowTitle("%s [%s]*" % (name, self.clName))
-                    else:
-                        self.elements[el].instance.dialog.\
-                            setWindowTitle("%s [%s]" % (name, self.clName))
-                except Exception:
-                    self.elements[el].instance.dialog = None
-
-        if selected is not None:
-            selected.setSelected(True)
-            self.ui.elementListWidget.setCurrentItem(selected)
-            if edit:
-                self.ui.elementListWidget.editItem(selected)
+                instance.dialog.\
+                    setWindowTitle("%s [%s]" % (el.name, self.clName))
+        except Exception:
+            instance.dialog = None
 
     # sets the elements
     # \param elements dictionary with the elements, i.e. name:xml
@@ -237,6 +558,7 @@ class ElementList(QWidget):
     # \param new logical variableset to True if element is not saved
     def setList(self, elements, externalActions=None,
                 itemActions=None, new=False):
+        self.stopLoading()
         if not os.path.isdir(self.directory):
             try:
                 if os.path.exists(os.path.join(os.getcwd(), self.name)):
@@ -335,6 +657,15 @@ class ElementList(QWidget):
             except Exception:
                 return
 
+        if self.background:
+            self._startLoading(dirList, externalActions, itemActions)
+            return
+
+        if self.lazy:
+            for fname in dirList:
+                self._addLazyElement(fname, externalActions, itemActions)
+            return
+
         progress = QProgressDialog(
             "Loading %s elements" % self.clName,
             "", 0, len(dirList), self)
@@ -343,26 +674,141 @@ class ElementList(QWidget):
         progress.setCancelButton(None)
         progress.forceShow()
         for i in range(len(dirList)):
-            fname = dirList[i]
-            name = self.nameFromFile(fname)
-            dlg = self.createElement(name)
-            dlg.load()
-            if hasattr(dlg, "addContextMenu"):
-                dlg.addContextMenu(itemActions)
-
-            actions = externalActions if externalActions else {}
-            if hasattr(dlg, "connectExternalActions"):
-                dlg.connectExternalActions(**actions)
-
-            el = LabeledObject(name, dlg)
-            self.elements[id(el)] = el
-            if el.instance is not None:
-                el.instance.id = el.id
-            logger.info("loading %s" % name)
+            el = self._addLazyElement(
+                dirList[i], externalActions, itemActions)
+            el.load()
             progress.setValue(i)
         progress.setValue(len(dirList))
         progress.close()
 
+    # starts reading of the element files in background
+    # \param dirList list of file names
+    # \param externalActions dictionary with external actions
+    # \param itemActions actions of the context menu
+    def _startLoading(self, dirList, externalActions=None, itemActions=None):
+        self.stopLoading()
+        self._fileLoader = FileLoader(processes=True, keepText=not self.lazy,
+                                      parse=self._fileParser())
+        self._fileLoader.start(
+            [os.path.join(self.directory, fname) for fname in dirList])
+        self._loadTimer = QTimer(self)
+        self._loadTimer.timeout.connect(
+            lambda: self._fetchLoaded(externalActions, itemActions))
+        self._loadTimer.start(20)
+
+    # provides the function parsing element files in background
+    # \brief Its data are passed to the element instead of the file content
+    # \returns picklable function of the file content or None
+    def _fileParser(self):
+        return None
+
+    # adds a batch of elements read in background to the list
+    # \param externalActions dictionary with external actions
+    # \param itemActions actions of the context menu
+    def _fetchLoaded(self, externalActions=None, itemActions=None):
+        if self._fileLoader is None:
+            return
+        results = self._fileLoader.fetch(self.batchSize)
+        for result in results:
+            el = self._addLazyElement(
+                os.path.basename(result["path"]),
+                externalActions, itemActions, result)
+            if not self.lazy:
+                el.load()
+        if results:
+            current = self.currentListElement()
+            self.populateElements(current.id if current else None)
+        if self._fileLoader.finished():
+            logger.info("%s elements loaded" % len(self.elements))
+            self.stopLoading()
+
+    # checks if elements are read in background
+    # \returns True if reading is not finished
+    def isLoading(self):
+        return self._fileLoader is not None
+
+    # stops reading of the element files in background
+    def stopLoading(self):
+        if self._loadTimer is not None:
+            self._loadTimer.stop()
+            self._loadTimer = None
+        if self._fileLoader is not None:
+            self._fileLoader.cancel()
+            self._fileLoader = None
+
+    # adds a list item which instance is loaded on the first access
+    # \param fname file name
+    # \param externalActions dictionary with external actions
+    # \param itemActions actions of the context menu
+    # \param prefetched dictionary with the file read in background
+    # \returns new labeled object
+    def _addLazyElement(self, fname, externalActions=None, itemActions=None,
+                        prefetched=None):
+        name = self.nameFromFile(fname)
+        fpath = os.path.join(self.directory, fname)
+        text = None
+        data = None
+        if prefetched:
+            fileInfo = (fpath, prefetched["size"], prefetched["mtime"])
+            if not prefetched["error"]:
+                text = prefetched["text"]
+                data = prefetched.get("data")
+                self._fileTokens[fpath] = (
+                    fileInfo[1:], set(prefetched.get("tokens", ())))
+        else:
+            try:
+                fstat = os.stat(fpath)
+                fileInfo = (fpath, fstat.st_size, fstat.st_mtime)
+            except Exception:
+                fileInfo = (fpath, None, None)
+        el = LabeledObject(
+            name, None,
+            loader=lambda obj: self._loadElement(
+                obj, externalActions, itemActions, text, data),
+            fileInfo=fileInfo)
+        if prefetched:
+            self._prefetched(el, prefetched)
+        self.elements[el.id] = el
+        return el
+
+    # stores information of the file read in background
+    # \param el labeled object of the element
+    # \param prefetched dictionary with the file read in background
+    def _prefetched(self, el, prefetched):
+        pass
+
+    # creates the element instance and loads it from its file
+    # \param el labeled object of the element
+    # \param externalActions dictionary with external actions
+    # \param itemActions actions of the context menu
+    # \param text prefetched content of the element file
+    # \param data data of the element file parsed in background
+    # \returns element instance
+    def _loadElement(self, el, externalActions=None, itemActions=None,
+                     text=None, data=None):
+        dlg = self.createElement(el.savedName)
+        loaded = False
+        if data is not None and hasattr(dlg, "setCompact"):
+            loaded = dlg.setCompact(data)
+        if not loaded and text is not None:
+            try:
+                dlg.set(text)
+                loaded = True
+            except Exception:
+                pass
+        if not loaded:
+            dlg.load()
+        if hasattr(dlg, "addContextMenu"):
+            dlg.addContextMenu(itemActions)
+
+        actions = externalActions if externalActions else {}
+        if hasattr(dlg, "connectExternalActions"):
+            dlg.connectExternalActions(**actions)
+        dlg.id = el.id
+        self.__markChanged([el.id])
+        logger.info("loading %s" % el.savedName)
+        return dlg
+
 
 if __name__ == "__main__":
     import sys
@@ -0,0 +1,250 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2017 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+# \package nxsconfigtool nexdatas
+# \file ElementListModel.py
+# model of the element list
+
+""" model of the element list """
+
+import bisect
+import sys
+
+from PyQt5.QtCore import (QAbstractListModel, QModelIndex, Qt, pyqtSignal,
+                          QSortFilterProxyModel)
+from PyQt5.QtGui import QColor
+
+if sys.version_info > (3,):
+    unicode = str
+
+
+# model of the element list sorted by element names
+# \brief The model keeps a sorted list of (name, id) keys, changed
+#        elements are moved, inserted or removed row by row
+class ElementListModel(QAbstractListModel):
+
+    # emitted with a new name when the user edits an element name
+    nameEdited = pyqtSignal(str)
+
+    # constructor
+    # \param elements dictionary with id : labeled object
+    # \param parent parent object
+    def __init__(self, elements=None, parent=None):
+        super(ElementListModel, self).__init__(parent)
+        # dictionary with id : labeled object
+        self.__elements = {}
+        # sorted list of (name, id) keys
+        self.__keys = []
+        # names of the listed elements, i.e. id : name
+        self.__names = {}
+        # dirty flags of the shown rows, i.e. id : flag
+        self.__dirty = {}
+        self.setElements(elements if elements is not None else {})
+
+    # sets the elements
+    # \param elements dictionary with id : labeled object
+    def setElements(self, elements):
+        self.beginResetModel()
+        self.__elements = elements
+        self.__dirty = {}
+        self.__names = dict(
+            (ide, el.name) for ide, el in elements.items())
+        self.__keys = sorted(
+            (name, ide) for ide, name in self.__names.items())
+        self.endResetModel()
+
+    # provides number of the model rows
+    # \param parent parent index
+    # \returns number of the listed elements
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.__keys)
+
+    # provides the row of the element
+    # \param ide element id
+    # \returns row number or -1 if the element is not listed
+    def row(self, ide):
+        if ide not in self.__names:
+            return -1
+        return bisect.bisect_left(self.__keys, (self.__names[ide], ide))
+
+    # provides the element id of the row
+    # \param row row number
+    # \returns element id
+    def elementId(self, row):
+        return self.__keys[row][1]
+
+    # provides read access to the model data
+    # \param index of the model item
+    # \param role access type of the data
+    # \returns data defined for the given index and role
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.__keys):
+            return None
+        name, ide = self.__keys[index.row()]
+        if role in [Qt.DisplayRole, Qt.EditRole]:
+            return unicode(name)
+        if role == Qt.UserRole:
+            return ide
+        if role == Qt.ForegroundRole:
+            dirty = self.isDirty(ide)
+            self.__dirty[ide] = dirty
+            return QColor(Qt.red) if dirty else QColor(Qt.black)
+        return None
+
+    # checks if the element or its loaded instance is not saved
+    # \param ide element id
+    # \returns True if the element is not saved
+    def isDirty(self, ide):
+        el = self.__elements.get(ide)
+        if el is None:
+            return False
+        if hasattr(el, "isDirty") and el.isDirty():
+            return True
+        instance = el.loadedInstance() \
+            if hasattr(el, "loadedInstance") else el.instance
+        return bool(instance is not None and hasattr(instance, "isDirty")
+                    and instance.isDirty())
+
+    # provides flag of the model item
+    # \param index of the model item
+    # \returns item flags
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemIsEnabled
+        return Qt.ItemFlags(Qt.ItemIsEnabled | Qt.ItemIsSelectable |
+                            Qt.ItemIsEditable)
+
+    # reports the edited element name
+    # \brief The name is changed by the nameEdited signal receiver
+    # \param index of the model item
+    # \param value new name
+    # \param role access type of the data
+    # \returns True if the name was reported
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or role != Qt.EditRole:
+            return False
+        self.nameEdited.emit(unicode(value))
+        return True
+
+    # updates the row of the element
+    # \brief The element is inserted, moved or removed according to
+    #        its current name and presence in the elements
+    # \param ide element id
+    def updateElement(self, ide):
+        el = self.__elements.get(ide)
+        old = self.__names.get(ide)
+        if el is None:
+            if old is not None:
+                row = self.row(ide)
+                self.beginRemoveRows(QModelIndex(), row, row)
+                self.__keys.pop(row)
+                self.__names.pop(ide)
+                self.__dirty.pop(ide, None)
+                self.endRemoveRows()
+            return
+        key = (el.name, ide)
+        if old is None:
+            row = bisect.bisect_left(self.__keys, key)
+            self.beginInsertRows(QModelIndex(), row, row)
+            self.__keys.insert(row, key)
+            self.__names[ide] = el.name
+            self.endInsertRows()
+            return
+        row = self.row(ide)
+        if old != el.name:
+            self.__keys.pop(row)
+            new = bisect.bisect_left(self.__keys, key)
+            self.__keys.insert(row, (old, ide))
+            if new != row:
+                self.beginMoveRows(QModelIndex(), row, row, QModelIndex(),
+                                   new if new < row else new + 1)
+                self.__keys.pop(row)
+                self.__keys.insert(new, key)
+                self.__names[ide] = el.name
+                self.endMoveRows()
+                row = new
+            else:
+                self.__keys[row] = key
+                self.__names[ide] = el.name
+        index = self.index(row, 0)
+        self.dataChanged.emit(index, index)
+
+    # updates rows which dirtiness changed since they were shown
+    # \brief Rows which were not shown yet are skipped
+    # \param ides element ids to check, all shown elements if None
+    def refresh(self, ides=None):
+        for ide in list(self.__dirty if ides is None else ides):
+            shown = self.__dirty.get(ide)
+            if shown is None or self.isDirty(ide) == shown:
+                continue
+            self.__dirty.pop(ide)
+            row = self.row(ide)
+            if row >= 0:
+                index = self.index(row, 0)
+                self.dataChanged.emit(index, index)
+
+
+# proxy model showing only elements matching the list filter
+# \brief Rows are filtered by a set of matching element ids, e.g. found
+#        by SearchIndex. The filter is not re-evaluated on data changes
+#        so repainting the source model stays cheap
+class ElementFilterModel(QSortFilterProxyModel):
+
+    # constructor
+    # \param parent parent object
+    def __init__(self, parent=None):
+        super(ElementFilterModel, self).__init__(parent)
+        self.setDynamicSortFilter(False)
+        # set of matching element ids or None if all elements are shown
+        self.__matches = None
+
+    # provides the matching element ids
+    # \returns set of element ids or None if all elements are shown
+    def matches(self):
+        return self.__matches
+
+    # sets the matching element ids
+    # \param matches set of element ids or None to show all elements
+    def setMatches(self, matches):
+        self.__matches = set(matches) if matches is not None else None
+        self.invalidateFilter()
+
+    # sets if the element matches the filter
+    # \param ide element id
+    # \param match True if the element matches
+    # \param listed if the element is already in the source model,
+    #        then its row is shown or hidden
+    def setMatch(self, ide, match, listed=True):
+        if self.__matches is None or (ide in self.__matches) == match:
+            return
+        if match:
+            self.__matches.add(ide)
+        else:
+            self.__matches.discard(ide)
+        if listed:
+            self.invalidateFilter()
+
+    # checks if the source row is shown
+    # \param row source row
+    # \param parent source parent index
+    # \returns True if the row is shown
+    def filterAcceptsRow(self, row, parent):
+        if self.__matches is None:
+            return True
+        return self.sourceModel().elementId(row) in self.__matches
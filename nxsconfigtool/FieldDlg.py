@@ -25,11 +25,10 @@ import copy
 
 from PyQt5.QtWidgets import (QMessageBox, QTableWidgetItem)
 from PyQt5.QtCore import (Qt, QModelIndex)
-from PyQt5 import uic
 
-import os
 import sys
 
+from .UiLoader import UiForm
 from .AttributeDlg import AttributeDlg
 from .DimensionsDlg import DimensionsDlg
 from .NodeDlg import NodeDlg
@@ -39,9 +38,7 @@ import logging
 # message logger
 logger = logging.getLogger("nxsdesigner")
 
-_formclass, _baseclass = uic.loadUiType(
-    os.path.join(os.path.dirname(os.path.abspath(__file__)),
-                 "ui", "fielddlg.ui"))
+_formclass = UiForm("fielddlg")
 
 if sys.version_info > (3,):
     unicode = str
@@ -168,6 +165,7 @@ class FieldDlg(NodeDlg):
             self.__attributes[unicode(at)] = self.attributes[(unicode(at))]
 
         self.populateAttributes()
+        self.__updateUi()
 
     #  creates GUI
     # \brief It calls setupUi and  connects signals and slots
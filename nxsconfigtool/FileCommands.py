@@ -164,6 +164,7 @@ class DataSourceOpen(QUndoCommand):
 
                 self.receiver.sourceList.addElement(self._ds, False)
 
+                self._dsEdit.createDialog()
                 self._dsEdit.dialog.setWindowTitle(
                     "%s [DataSource]" % self._ds.name)
 
@@ -305,6 +306,9 @@ class ComponentSaveAll(QUndoCommand):
         for i in range(len(keys)):
             icp = keys[i]
             cp = self.receiver.componentList.elements[icp]
+            if hasattr(cp, "isLoaded") and not cp.isLoaded():
+                # not loaded components are unchanged
+                continue
             if cp.instance is None:
                 #                self._cpEdit = FieldWg()
                 cpEdit = Component(self.receiver.componentList)
@@ -458,6 +462,9 @@ class DataSourceSaveAll(QUndoCommand):
         for i in range(len(keys)):
             ids = keys[i]
             ds = self.receiver.sourceList.elements[ids]
+            if hasattr(ds, "isLoaded") and not ds.isLoaded():
+                # not loaded datasources are unchanged
+                continue
             if ds.instance is None:
                 dsEdit = DataSource.DataSource(self.receiver.sourceList)
                 dsEdit.id = ds.id
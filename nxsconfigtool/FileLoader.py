@@ -0,0 +1,226 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2017 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+# \package nxsconfigtool nexdatas
+# \file FileLoader.py
+# background reader of component and datasource files
+
+""" background reader of component and datasource files """
+
+import os
+import sys
+import functools
+import multiprocessing
+import multiprocessing.pool
+
+from .CompactTree import CompactTree
+from .DomTools import DomTools
+from .ElementData import parseComponent
+from .SearchIndex import SearchIndex
+
+import logging
+# message logger
+logger = logging.getLogger("nxsdesigner")
+
+if sys.version_info > (3,):
+    unicode = str
+
+
+# finds element references in the given text
+# \param text xml text
+# \returns (datasources, components) tuple with lists of names
+def findReferences(text):
+    references = DomTools.findReferences(text)
+    return (sorted(name for label, name in references
+                   if label == "datasources"),
+            sorted(name for label, name in references
+                   if label == "components"))
+
+
+# parses the component file into a compact tree
+# \brief It can be run in a worker thread or process
+# \param text xml text
+# \returns compact tree
+def compactComponent(text):
+    tree = CompactTree(parseComponent(text))
+    tree.setSourceOrder(text)
+    return tree
+
+
+# reads and pre-parses the given file
+# \brief It can be run in a worker thread or process. The XML is parsed
+#        only by the given parser, otherwise by the GUI when the element
+#        is opened
+# \param path file path
+# \param keepText if the file content should be returned
+# \param parse function creating data from the file content, e.g.
+#        compactComponent, which is returned instead of the content
+# \returns dictionary with path, size, mtime, text, data, error,
+#          datasources, components and search tokens of the file
+def readFile(path, keepText=True, parse=None):
+    result = {"path": path, "size": None, "mtime": None, "text": None,
+              "data": None, "error": None, "datasources": [],
+              "components": [], "tokens": []}
+    try:
+        fstat = os.stat(path)
+        result["size"] = fstat.st_size
+        result["mtime"] = fstat.st_mtime
+        with open(path, "rb") as fl:
+            data = fl.read()
+        text = data.decode("utf-8")
+        result["datasources"], result["components"] = findReferences(text)
+        result["tokens"] = sorted(SearchIndex.tokenizeXML(text))
+    except Exception as e:
+        result["error"] = unicode(e)
+        return result
+    if parse is not None:
+        try:
+            result["data"] = parse(text)
+        except Exception:
+            pass
+    if keepText and result["data"] is None:
+        result["text"] = text
+    return result
+
+
+# reads and pre-parses the given files
+# \param paths list of file paths
+# \param keepText if the file contents should be returned
+# \param parse function creating data from the file contents
+# \returns list of dictionaries returned by readFile
+def readFiles(paths, keepText=True, parse=None):
+    return [readFile(path, keepText, parse) for path in paths]
+
+
+# reader of files in a pool of workers
+class FileLoader(object):
+
+    # constructor
+    # \param workers number of workers, the cpu count if None
+    # \param processes if worker processes should be used
+    # \param keepText if the file contents should be returned
+    # \param parse function creating data from the file contents
+    #        in the workers, it has to be picklable for worker processes
+    def __init__(self, workers=None, processes=False, keepText=True,
+                 parse=None):
+        # number of workers
+        self.workers = workers or multiprocessing.cpu_count()
+        # if worker processes should be used
+        self.processes = processes
+        # if the file contents should be returned
+        self.keepText = keepText
+        # function creating data from the file contents
+        self.parse = parse
+        # worker pool
+        self.__pool = None
+        # result iterator
+        self.__results = None
+        # results read but not fetched yet
+        self.__buffer = []
+        # number of files to read
+        self.__total = 0
+        # number of fetched results
+        self.__fetched = 0
+
+    # creates the worker pool
+    # \returns worker pool
+    def __createPool(self):
+        if self.processes:
+            try:
+                if hasattr(multiprocessing, "get_context"):
+                    return multiprocessing.get_context("spawn").Pool(
+                        self.workers)
+                return multiprocessing.Pool(self.workers)
+            except Exception as e:
+                logger.warning(
+                    "worker processes cannot be started: %s" % unicode(e))
+        return multiprocessing.pool.ThreadPool(self.workers)
+
+    # starts reading the given files
+    # \param paths list of file paths
+    def start(self, paths):
+        self.cancel()
+        self.__total = len(paths)
+        self.__fetched = 0
+        if not paths:
+            return
+        self.__pool = self.__createPool()
+        size = max(1, min(16, len(paths) // (4 * self.workers)))
+        self.__results = self.__pool.imap_unordered(
+            functools.partial(readFiles, keepText=self.keepText,
+                              parse=self.parse),
+            [paths[i:i + size] for i in range(0, len(paths), size)])
+        self.__pool.close()
+
+    # provides results which are already read
+    # \param maxItems maximal number of results, all if None
+    # \param timeout time in seconds to wait for the first result
+    # \returns list of result dictionaries
+    def fetch(self, maxItems=None, timeout=0):
+        results = []
+        while not self.finished() \
+                and (maxItems is None or len(results) < maxItems):
+            if not self.__buffer:
+                try:
+                    self.__buffer = self.__results.next(
+                        timeout if not results else 0)
+                except multiprocessing.TimeoutError:
+                    break
+                except StopIteration:
+                    self.__fetched = self.__total
+                    break
+            size = len(self.__buffer) if maxItems is None \
+                else min(len(self.__buffer), maxItems - len(results))
+            results.extend(self.__buffer[:size])
+            self.__buffer = self.__buffer[size:]
+            self.__fetched += size
+        if self.finished():
+            self.__release()
+        return results
+
+    # provides all results waiting for the workers
+    # \returns list of result dictionaries
+    def fetchAll(self):
+        results = []
+        while not self.finished():
+            results.extend(self.fetch(timeout=None))
+        return results
+
+    # checks if all results were fetched
+    # \returns True if all results were fetched
+    def finished(self):
+        return self.__fetched >= self.__total
+
+    # provides the loading progress
+    # \returns (fetched, total) tuple
+    def progress(self):
+        return self.__fetched, self.__total
+
+    # stops reading of files
+    def cancel(self):
+        if self.__pool is not None:
+            self.__pool.terminate()
+        self.__total = self.__fetched
+        self.__release()
+
+    # releases the worker pool
+    def __release(self):
+        if self.__pool is not None:
+            self.__pool.join()
+        self.__pool = None
+        self.__results = None
+        self.__buffer = []
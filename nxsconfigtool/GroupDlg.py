@@ -22,14 +22,13 @@
 """ group widget """
 
 import copy
-import os
 import sys
 
 from PyQt5.QtCore import (Qt, QModelIndex)
 from PyQt5.QtWidgets import (QMessageBox, QTableWidgetItem, QCompleter)
-from PyQt5 import uic
 
 # from .ui.ui_groupdlg import Ui_GroupDlg
+from .UiLoader import UiForm
 from .AttributeDlg import AttributeDlg
 from .NodeDlg import NodeDlg
 from .DomTools import DomTools
@@ -38,9 +37,7 @@ import logging
 # message logger
 logger = logging.getLogger("nxsdesigner")
 
-_formclass, _baseclass = uic.loadUiType(
-    os.path.join(os.path.dirname(os.path.abspath(__file__)),
-                 "ui", "groupdlg.ui"))
+_formclass = UiForm("groupdlg")
 
 if sys.version_info > (3,):
     unicode = str
@@ -145,6 +142,7 @@ class GroupDlg(NodeDlg):
             self.__attributes[unicode(at)] = self.attributes[(unicode(at))]
 
         self.populateAttributes()
+        self.__updateUi()
 
     #  creates GUI
     # \brief It calls setupUi and  connects signals and slots
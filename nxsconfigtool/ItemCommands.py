@@ -49,9 +49,12 @@ class ComponentItemCommand(QUndoCommand):
         self._index = None
         self._newstate = None
         self._subwindow = None
+        # if the command can change the whole component
+        self._wholeComponent = False
 
     # helps to construct the execute component item command as a pre-executor
-    # \brief It stores the old states of the current component
+    # \brief It stores the old state of the component part which
+    #        the command can change
     def preExecute(self):
         if self._cp is None:
             self.receiver.updateComponentListItem()
@@ -59,7 +62,11 @@ class ComponentItemCommand(QUndoCommand):
         if self._cp is not None:
             if self._oldstate is None and hasattr(self._cp, "instance") \
                     and hasattr(self._cp.instance, "setState"):
-                self._oldstate = self._cp.instance.getState()
+                if hasattr(self._cp.instance, "getScopeState"):
+                    self._oldstate = self._cp.instance.getScopeState(
+                        self._wholeComponent)
+                else:
+                    self._oldstate = self._cp.instance.getState()
                 self._index = self._cp.instance.currentIndex()
 
             else:
@@ -73,7 +80,9 @@ class ComponentItemCommand(QUndoCommand):
                 "Please select one of the components")
 
     # helps to construct the execute component item command as a post-executor
-    # \brief It stores the new states of the current component
+    # \brief It stores the new states of the current component, both states
+    #        keep only the changed part of the component which is computed
+    #        from the part stored by preExecute()
     def postExecute(self):
         if self._cp is not None:
             if self._cp.instance is None:
@@ -87,7 +96,12 @@ class ComponentItemCommand(QUndoCommand):
 
             if self._newstate is None and hasattr(
                     self._cp.instance, "getState"):
-                self._newstate = self._cp.instance.getState()
+                if self._oldstate is not None and hasattr(
+                        self._cp.instance, "getStateDelta"):
+                    self._oldstate, self._newstate = \
+                        self._cp.instance.getStateDelta(self._oldstate)
+                else:
+                    self._newstate = self._cp.instance.getState()
             else:
                 if hasattr(
                     self.receiver.componentList.elements[
@@ -186,6 +200,7 @@ class ComponentClear(ComponentItemCommand):
     # \param parent command parent
     def __init__(self, receiver, parent=None):
         ComponentItemCommand.__init__(self, receiver, parent)
+        self._wholeComponent = True
 
     # executes the command
     # \brief It clears the whole current component
@@ -453,6 +468,7 @@ class ComponentMerge(ComponentItemCommand):
     # \param parent command parent
     def __init__(self, receiver, parent=None):
         ComponentItemCommand.__init__(self, receiver, parent)
+        self._wholeComponent = True
 
     # executes the command
     # \brief It merges the current component
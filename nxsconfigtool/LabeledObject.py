@@ -27,16 +27,59 @@ class LabeledObject(object):
     # constructor
     # \param name item name
     # \param instance instance related to the item
-    def __init__(self, name, instance):
+    # \param loader callable creating the instance on the first access,
+    #        it takes the labeled object as an argument
+    # \param fileInfo (path, size, mtime) tuple of the related file
+    def __init__(self, name, instance, loader=None, fileInfo=None):
         # item name
         self.name = name
         # saved item name
         self.savedName = name
         # item instance
-        self.instance = instance
+        self._instance = instance
+        # instance loader
+        self._loader = loader if instance is None else None
+        # (path, size, mtime) of the related file
+        self.fileInfo = fileInfo
         # item id
         self.id = id(self)
 
+    # provides the item instance
+    # \brief It materializes the instance on the first access
+    #        if the instance loader is set
+    # \returns item instance
+    def __getInstance(self):
+        if self._loader is not None:
+            loader = self._loader
+            self._loader = None
+            self._instance = loader(self)
+        return self._instance
+
+    # sets the item instance
+    # \param instance item instance
+    def __setInstance(self, instance):
+        self._loader = None
+        self._instance = instance
+
+    # the item instance
+    instance = property(__getInstance, __setInstance,
+                        doc='item instance')
+
+    # checks if the instance is already materialized
+    # \returns True if the instance does not wait for loading
+    def isLoaded(self):
+        return self._loader is None
+
+    # provides the instance without materializing it
+    # \returns item instance or None if it is not loaded yet
+    def loadedInstance(self):
+        return self._instance if self._loader is None else None
+
+    # materializes the instance
+    # \returns item instance
+    def load(self):
+        return self.instance
+
     # checks if the name is not saved
     # returns False if the name is not saved
     def isDirty(self):
@@ -0,0 +1,406 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2017 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+# \package nxsconfigtool nexdatas
+# \file LazyDocument.py
+# component document built by a streaming parser
+
+""" component document built by a streaming parser """
+
+import re
+import sys
+import itertools
+import xml.parsers.expat as expat
+from collections import Counter
+
+from PyQt5.QtXml import QDomDocument
+
+from .DomTools import DomTools
+from .ElementData import parseComponent, componentXML
+
+if sys.version_info > (3,):
+    unicode = str
+
+
+# pattern of the start tag with attributes
+_startTag = re.compile(
+    br"<[^\s/>]+(?:\s+[^\s=]+\s*=\s*(?:\"[^\"]*\"|'[^']*'))*\s*>")
+
+# encodings of the source which can be split into byte ranges
+_encodings = ["utf-8", "utf8", "us-ascii", "ascii", "iso-8859-1", "latin-1",
+              "latin1"]
+
+
+# builder of DOM nodes from a part of the component source
+# \brief It creates the same nodes as QDomDocument.setContent() followed by
+#        parseComponent(), i.e. without whitespace-only text
+#        and without the top level comments
+class _Builder(object):
+
+    # constructor
+    # \param lazy lazy document
+    # \param parent the document or the element of the parsed source part
+    # \param offset position of the parsed source part
+    # \param levels number of levels built below the parent, all if None
+    def __init__(self, lazy, parent, offset, levels):
+        # lazy document
+        self.__lazy = lazy
+        # DOM document
+        self.__document = lazy.document
+        # position of the parsed source part
+        self.__offset = offset
+        # level of the parent
+        self.__top = 0 if isinstance(parent, QDomDocument) else 1
+        # the last built level
+        self.__last = None if levels is None else self.__top + levels
+        # level of the current element
+        self.__level = 0
+        # parents of the built nodes
+        self.__stack = [parent]
+        # buffered text
+        self.__text = []
+        # if the buffered text is a CDATA section
+        self.__cdata = False
+        # [element, start, has child nodes, text] list of the open element
+        #  on the last built level
+        self.__current = None
+
+        # expat parser
+        self.parser = expat.ParserCreate(lazy.encoding)
+        self.parser.ordered_attributes = True
+        self.parser.StartElementHandler = self.__start
+        self.parser.EndElementHandler = self.__end
+        self.parser.CharacterDataHandler = self.__characters
+        self.parser.CommentHandler = self.__comment
+        self.parser.ProcessingInstructionHandler = self.__processing
+        self.parser.StartCdataSectionHandler = self.__startCdata
+        self.parser.EndCdataSectionHandler = self.__endCdata
+        self.parser.XmlDeclHandler = self.__declaration
+        self.parser.StartDoctypeDeclHandler = self.__doctype
+
+    # appends the buffered text to the current parent
+    def __flush(self):
+        if not self.__text:
+            return
+        text = "".join(self.__text)
+        self.__text = []
+        if self.__cdata:
+            self.__stack[-1].appendChild(
+                self.__document.createCDATASection(text))
+        elif text.strip():
+            self.__stack[-1].appendChild(
+                self.__document.createTextNode(text))
+
+    # starts the element
+    # \param name tag name
+    # \param attributes list with attribute names and values
+    def __start(self, name, attributes):
+        self.__level += 1
+        if self.__current is not None:
+            self.__current[2] = True
+            return
+        if self.__level <= self.__top:
+            return
+        self.__flush()
+        element = self.__document.createElement(name)
+        for i in range(0, len(attributes), 2):
+            element.setAttribute(attributes[i], attributes[i + 1])
+        self.__stack[-1].appendChild(element)
+        if self.__last is not None and self.__level >= self.__last:
+            self.__current = [
+                element, self.__offset + self.parser.CurrentByteIndex,
+                False, []]
+        else:
+            self.__stack.append(element)
+
+    # ends the element
+    # \param name tag name
+    def __end(self, name):
+        level = self.__level
+        self.__level -= 1
+        current = self.__current
+        if current is not None:
+            if level > self.__last:
+                return
+            self.__current = None
+            element, start, nodes, text = current
+            if nodes:
+                self.__lazy._addPending(
+                    element, start,
+                    self.__offset + self.parser.CurrentByteIndex)
+            else:
+                text = "".join(text)
+                if text.strip():
+                    element.appendChild(self.__document.createTextNode(text))
+            return
+        self.__flush()
+        if level > self.__top:
+            self.__stack.pop()
+
+    # adds the character data
+    # \param data character data
+    def __characters(self, data):
+        if self.__current is not None:
+            if self.__level == self.__last:
+                self.__current[3].append(data)
+            return
+        self.__text.append(data)
+
+    # adds the comment
+    # \param data comment text
+    def __comment(self, data):
+        if self.__current is not None:
+            self.__current[2] = True
+        elif self.__level:
+            self.__flush()
+            self.__stack[-1].appendChild(self.__document.createComment(data))
+
+    # adds the processing instruction
+    # \param target target of the processing instruction
+    # \param data data of the processing instruction
+    def __processing(self, target, data):
+        if self.__current is not None:
+            self.__current[2] = True
+        elif self.__level or target.strip() != 'xml-stylesheet':
+            self.__flush()
+            self.__stack[-1].appendChild(
+                self.__document.createProcessingInstruction(target, data))
+
+    # starts the CDATA section
+    def __startCdata(self):
+        if self.__current is not None:
+            self.__current[2] = True
+            return
+        self.__flush()
+        self.__cdata = True
+
+    # ends the CDATA section
+    def __endCdata(self):
+        if self.__current is not None:
+            return
+        if not self.__text:
+            self.__text.append("")
+        self.__flush()
+        self.__cdata = False
+
+    # checks the encoding of the xml declaration
+    # \param version xml version
+    # \param encoding declared encoding
+    # \param standalone standalone flag
+    # \throws ValueError if the encoding is not supported
+    def __declaration(self, version, encoding, standalone):
+        if encoding and self.__lazy.encoding is None:
+            if encoding.lower() not in _encodings:
+                raise ValueError("unsupported encoding: %s" % encoding)
+            self.__lazy.encoding = encoding
+
+    # rejects the document type declaration
+    # \throws ValueError as entities of the declaration cannot be
+    #         expanded in the parts of the source
+    def __doctype(self, *args):
+        raise ValueError("document type declarations are not supported")
+
+
+# component document built by a streaming parser
+# \brief Only the top levels of the document are created on loading,
+#        subtrees below are marked by a processing instruction and
+#        created from their source when they are needed
+class LazyDocument(object):
+
+    # target of processing instructions which mark pending subtrees
+    target = "nxsdesigner-pending"
+    # pattern of the serialized marker of the pending subtree
+    __marker = re.compile(r"\n<\?%s (\d+)\?>\n *(?=</)" % target)
+
+    # constructor
+    # \param source XML string or bytes
+    # \param depth number of tree levels built on loading
+    # \param chunkSize size of source chunks passed to the parser
+    def __init__(self, source, depth=3, chunkSize=1048576):
+        # if the source is a string
+        self.__unicode = isinstance(source, unicode)
+        # encoding of the source, None if it is detected by the parser
+        self.encoding = "utf-8" if self.__unicode else None
+        # source bytes
+        self.__source = bytes(
+            source.encode("utf-8") if self.__unicode else source)
+        # number of tree levels built on loading
+        self.depth = depth
+        # size of source chunks passed to the parser
+        self.chunkSize = chunkSize
+        # component DOM document
+        self.document = QDomDocument()
+        # if the document was changed after loading
+        self.modified = False
+        # pending subtrees,
+        #  i.e. id : (start, end tag start, end, processing instruction)
+        self.__pending = {}
+        # references of pending subtrees, i.e. id : Counter
+        self.__references = {}
+        # generator of pending subtree ids
+        self.__ids = itertools.count()
+
+    # builds the top levels of the document
+    # \brief The source is parsed chunk by chunk. Elements on the last
+    #        built level keep their subtrees pending
+    # \returns DOM document
+    # \throws ValueError if the source is not valid or not supported
+    def load(self):
+        if self.__source[:2] in (b"\xff\xfe", b"\xfe\xff"):
+            raise ValueError("unsupported encoding: UTF-16")
+        builder = _Builder(self, self.document, 0, self.depth)
+        try:
+            for start in range(0, len(self.__source), self.chunkSize):
+                builder.parser.Parse(
+                    self.__source[start:start + self.chunkSize], False)
+            builder.parser.Parse(b"", True)
+        except expat.ExpatError as e:
+            raise ValueError("could not parse XML: %s" % e)
+        return self.document
+
+    # marks the subtree of the element as pending
+    # \param element DOM element
+    # \param start position of the element in the source
+    # \param close position of the element end tag in the source
+    def _addPending(self, element, start, close):
+        ide = next(self.__ids)
+        end = self.__source.find(b">", close) + 1
+        pi = self.document.createProcessingInstruction(
+            self.target, str(ide))
+        element.appendChild(pi)
+        self.__pending[ide] = (start, close, end, pi)
+
+    # provides number of pending subtrees
+    # \returns number of pending subtrees
+    def pendingCount(self):
+        return len(self.__pending)
+
+    # checks if the subtree of the node is pending
+    # \param node DOM node
+    # \returns True if children of the node are not created
+    def isPending(self, node):
+        child = node.firstChild()
+        return child.isProcessingInstruction() \
+            and child.nodeName() == self.target
+
+    # provides the id of the pending subtree of the node
+    # \param node DOM node
+    # \returns id of the pending subtree or None
+    def __pendingId(self, node):
+        child = node.firstChild()
+        if child.isProcessingInstruction() \
+                and child.nodeName() == self.target:
+            ide = int(child.nodeValue())
+            if ide in self.__pending:
+                return ide
+
+    # finds pending subtrees within the node subtree
+    # \brief Only the created nodes of the subtree are visited and
+    #        the pending subtrees are looked up by ids of their markers
+    # \param node DOM node, the document if None
+    # \param levels number of levels below the node which are searched,
+    #        all if None
+    # \returns list of (id, depth) tuples where depth is the distance
+    #          between the node and the element with the pending subtree
+    def __find(self, node, levels=None):
+        found = []
+        stack = [(self.document if node is None else node, 0)]
+        while stack:
+            parent, depth = stack.pop()
+            ide = self.__pendingId(parent)
+            if ide is not None:
+                found.append((ide, depth))
+            elif levels is None or depth + 1 < levels:
+                child = parent.firstChild()
+                while not child.isNull():
+                    if child.isElement():
+                        stack.append((child, depth + 1))
+                    child = child.nextSibling()
+        return found
+
+    # creates pending subtrees within the node subtree
+    # \param node DOM node, the document if None
+    # \param levels number of levels below the node which have to be
+    #        created, all if None
+    # \returns True if any subtree was created
+    def materialize(self, node=None, levels=None):
+        created = False
+        for ide, depth in self.__find(node, levels):
+            if levels is None or depth < levels:
+                self.__build(ide, None if levels is None else levels - depth)
+                created = True
+        return created
+
+    # creates the pending subtree
+    # \param ide id of the pending subtree
+    # \param levels number of levels created below its element, all if None
+    def __build(self, ide, levels):
+        start, _, end, pi = self.__pending.pop(ide)
+        self.__references.pop(ide, None)
+        element = pi.parentNode()
+        element.removeChild(pi)
+        builder = _Builder(self, element, start, levels)
+        builder.parser.Parse(self.__source[start:end], True)
+
+    # counts $datasources and $components references in pending subtrees
+    # \param node DOM node, the document if None
+    # \returns Counter with (label, name) : number of references
+    def references(self, node=None):
+        references = Counter()
+        for ide, _ in self.__find(node):
+            if ide not in self.__references:
+                start, _, end, _ = self.__pending[ide]
+                content = _startTag.match(self.__source, start).end()
+                self.__references[ide] = DomTools.findReferences(
+                    self.__source[content:end].decode(
+                        self.encoding or "utf-8", "replace"))
+            references.update(self.__references[ide])
+        return references
+
+    # provides XML of the document
+    # \brief The created nodes are serialized and contents of
+    #        the untouched pending subtrees are copied from their byte
+    #        ranges in the source
+    # \param indent number of added spaces during pretty printing
+    # \returns xml string with the xml processing instruction
+    def toXML(self, indent=0):
+        xml = componentXML(self.document, indent)
+        if not self.__pending:
+            return xml
+        return self.__marker.sub(self.__content, xml)
+
+    # provides the source content of the pending subtree
+    # \param match match of the pending subtree marker
+    # \returns content string between the element tags
+    def __content(self, match):
+        entry = self.__pending.get(int(match.group(1)))
+        if entry is None:
+            return match.group(0)
+        start, close = entry[:2]
+        return self.__source[
+            _startTag.match(self.__source, start).end():close].decode(
+                self.encoding or "utf-8")
+
+    # provides the source XML in the form of the saved XML
+    # \brief The source is parsed into a temporary DOM document. It is
+    #        needed only for the saved XML of the changed document
+    # \param indent number of added spaces during pretty printing
+    # \returns xml string with the xml processing instruction
+    def sourceXML(self, indent=0):
+        return componentXML(parseComponent(
+            self.__source.decode("utf-8") if self.__unicode
+            else self.__source), indent)
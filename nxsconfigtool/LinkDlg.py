@@ -21,13 +21,12 @@
 
 """ link widget """
 
-import os
 import sys
 
 from PyQt5.QtCore import (QModelIndex)
 from PyQt5.QtWidgets import (QMessageBox)
-from PyQt5 import uic
 
+from .UiLoader import UiForm
 from .NodeDlg import NodeDlg
 from .Errors import CharacterError
 from .DomTools import DomTools
@@ -36,9 +35,7 @@ import logging
 # message logger
 logger = logging.getLogger("nxsdesigner")
 
-_formclass, _baseclass = uic.loadUiType(
-    os.path.join(os.path.dirname(os.path.abspath(__file__)),
-                 "ui", "linkdlg.ui"))
+_formclass = UiForm("linkdlg")
 
 if sys.version_info > (3,):
     unicode = str
@@ -75,6 +72,7 @@ class LinkDlg(NodeDlg):
 
         if self.target is not None:
             self.ui.targetLineEdit.setText(self.target)
+        self._updateUi()
 
     #  creates GUI
     # \brief It calls setupUi and  connects signals and slots
@@ -21,6 +21,8 @@
 
 """ List slots """
 
+import sys
+
 from PyQt5.QtGui import QKeySequence
 
 from .ListCommands import (
@@ -38,6 +40,9 @@ from .EditCommands import (
     DataSourceEdit
 )
 
+if sys.version_info > (3,):
+    unicode = str
+
 
 # stack with the application commands
 class ListSlots(object):
@@ -75,16 +80,16 @@ class ListSlots(object):
         # task data
         self.tasks = [
             ["dsourceChanged",
-             self.main.sourceList.ui.elementListWidget,
-             "itemChanged"],
+             self.main.sourceList.model,
+             "nameEdited"],
             ["componentChanged",
-             self.main.componentList.ui.elementListWidget,
-             "itemChanged"],
+             self.main.componentList.model,
+             "nameEdited"],
             ["componentRowChanged",
-             self.main.componentList.ui.elementListWidget,
+             self.main.componentList.ui.elementListView.selectionModel(),
              "currentRowChanged"],
             ["dsourceRowChanged",
-             self.main.sourceList.ui.elementListWidget,
+             self.main.sourceList.ui.elementListView.selectionModel(),
              "currentRowChanged"]
         ]
 
@@ -119,21 +124,21 @@ class ListSlots(object):
         self.undoStack.push(cmd)
 
     # component change action
-    # \param item new selected item on the component list
-    def componentChanged(self, item):
+    # \param name new name of the current component
+    def componentChanged(self, name):
         cmd = ComponentEdit(self.main)
         cmd.redo()
         cmd = ComponentListChanged(self.main)
-        cmd.item = item
+        cmd.name = unicode(name)
         self.undoStack.push(cmd)
 
     # datasource change action
-    # \param item new selected item ond the datasource list
-    def dsourceChanged(self, item):
+    # \param name new name of the current datasource
+    def dsourceChanged(self, name):
         cmd = DataSourceEdit(self.main)
         cmd.redo()
         cmd = DataSourceListChanged(self.main)
-        cmd.item = item
+        cmd.name = unicode(name)
         self.undoStack.push(cmd)
 
     # component row change action
@@ -30,12 +30,12 @@ from PyQt5.QtGui import (
     QIcon,
     QTextCursor)
 from PyQt5.QtWidgets import (
-    QFrame, QUndoGroup, QUndoStack,
+    QFrame, QUndoGroup,
     QMainWindow, QMessageBox, QLabel)
-from PyQt5 import uic
 
 # from .ui.ui_mainwindow import Ui_MainWindow
 
+from .UiLoader import UiForm
 from .DataSourceList import DataSourceList
 from .ComponentList import ComponentList
 from .DataSourceDlg import CommonDataSourceDlg
@@ -51,6 +51,10 @@ from .WindowsSlots import WindowsSlots
 from .Logger import LogStream, LogActions
 
 from .ConfigurationServer import (ConfigurationServer, PYTANGO_AVAILABLE)
+from .AsyncServer import AsyncServer
+from .ServerWatcher import ServerWatcher
+from .ServerCache import ServerCache
+from .UndoStack import (UndoStack, formatSize)
 from .ComponentCreator import (NXSTOOLS_AVAILABLE)
 
 import logging
@@ -58,9 +62,7 @@ import logging
 # message logger
 logger = logging.getLogger("nxsdesigner")
 
-_formclass, _baseclass = uic.loadUiType(
-    os.path.join(os.path.dirname(os.path.abspath(__file__)),
-                 "ui", "mainwindow.ui"))
+_formclass = UiForm("mainwindow")
 
 if sys.version_info > (3,):
     unicode = str
@@ -81,11 +83,19 @@ class MainWindow(QMainWindow):
     # \param datasources datasource directory
     # \param server configuration server
     # \param parent parent widget
+    # \param lazy if element instances are created on the first access
+    # \param background if element files are read in background
+    # \param compact if documents of not open components are kept
+    #        in compact trees
+    # \param offline if the last known state of the configuration server
+    #        is opened from the local cache
     def __init__(self, components=None, datasources=None,
-                 server=None, parent=None):
+                 server=None, parent=None, lazy=False, background=False,
+                 offline=False, compact=False):
         super(MainWindow, self).__init__(parent)
-        logger.debug("PARAMETERS: %s %s %s %s",
-                     components, datasources, server, parent)
+        logger.debug("PARAMETERS: %s %s %s %s %s %s %s %s",
+                     components, datasources, server, parent, lazy,
+                     background, offline, compact)
 
         # component tree menu under mouse cursor
         self.contextMenuActions = None
@@ -107,6 +117,8 @@ class MainWindow(QMainWindow):
         self.componentList = None
         # component directory label
         self.cpDirLabel = None
+        # undo history label
+        self.undoLabel = None
 
         # stack with used commands
         self.undoStack = None
@@ -118,6 +130,15 @@ class MainWindow(QMainWindow):
 
         # configuration server
         self.configServer = None
+        # asynchronous client of the configuration server
+        self.asyncServer = None
+        # watcher of the asynchronous server operations
+        self.serverWatcher = None
+        # time in seconds to wait for the running server operation
+        #  when the application is closed
+        self.serverTimeout = 5
+        # local cache of the configuration server elements
+        self.serverCache = ServerCache()
 
         # online.xml file name
         self.onlineFile = None
@@ -137,6 +158,12 @@ class MainWindow(QMainWindow):
             components)
 
         self.createGUI(dsDirectory, cpDirectory)
+        self.sourceList.setDependencies(self.componentList.dependencies)
+        self.sourceList.lazy = lazy
+        self.componentList.lazy = lazy
+        self.sourceList.background = background
+        self.componentList.background = background
+        self.componentList.compact = compact
         self.createActions()
 
         if self.componentList:
@@ -144,8 +171,12 @@ class MainWindow(QMainWindow):
         if self.sourceList:
             self.sourceList.setActions(self.dsourceListMenuActions)
 
-        self.loadDataSources()
-        self.loadComponents()
+        if PYTANGO_AVAILABLE:
+            self.setupServer(settings, server)
+
+        if not offline or not self.loadCachedServer(settings, server):
+            self.loadDataSources()
+            self.loadComponents()
 
         mgeo = settings.value("MainWindow/Geometry")
         if mgeo is not None:
@@ -154,9 +185,6 @@ class MainWindow(QMainWindow):
         if mst is not None:
             self.restoreState(mst)
 
-        if PYTANGO_AVAILABLE:
-            self.setupServer(settings, server)
-
         status = self.createStatusBar()
         status.showMessage("Ready", 5000)
         self.setWindowTitle("NXS Component Designer")
@@ -169,10 +197,12 @@ class MainWindow(QMainWindow):
         datasources = []
         message = ""
         if ds and ds.name:
-            if ds and ds.name and ds.instance:
-                name = ds.instance.name
-                components = self.componentList.dataSourceComponents(name)
-                datasources = ds.instance.datasources
+            name = ds.name
+            instance = ds.loadedInstance()
+            if instance:
+                name = instance.name
+                datasources = instance.datasources
+            components = self.componentList.dataSourceComponents(name)
             message = "datasource '%s' " % name
             if name != ds.name:
                 message += "('%s')" % (ds.name)
@@ -195,10 +225,12 @@ class MainWindow(QMainWindow):
         datasources = []
         message = ""
         if cp and cp.name:
-            if cp and cp.name and cp.instance:
-                name = cp.instance.name
-                components = cp.instance.components
-                datasources = cp.instance.datasources
+            name = cp.name
+            instance = cp.loadedInstance()
+            if instance:
+                name = instance.name
+                components = instance.components
+                datasources = instance.datasources
             message = "component '%s' " % name
             if name != cp.name:
                 message += "('%s')" % (cp.name)
@@ -295,19 +327,50 @@ class MainWindow(QMainWindow):
     # \param server user's server
     def setupServer(self, settings, server=None):
 
-        self.configServer = ConfigurationServer()
+        self.configServer = self.__createServer(settings, server)
+        self.configServer.cache = self.serverCache
+        self.asyncServer = AsyncServer(self.configServer)
+        self.serverWatcher = ServerWatcher(self)
+        if not server:
+            self.onlineFile = unicode(
+                settings.value("Online/filename"))
+
+    # creates configuration server
+    # \param settings application QSettings object
+    # \param server user's server
+    # \returns configuration server
+    @classmethod
+    def __createServer(cls, settings, server=None):
+        cserver = ConfigurationServer()
         if server:
-            self.configServer.setServer(server)
+            cserver.setServer(server)
         else:
-            self.configServer.device = unicode(
+            cserver.device = unicode(
                 settings.value("ConfigServer/device"))
-            self.configServer.host = unicode(
+            cserver.host = unicode(
                 settings.value("ConfigServer/host"))
-            self.onlineFile = unicode(
-                settings.value("Online/filename"))
             port = str(settings.value("ConfigServer/port") or "")
             if port:
-                self.configServer.port = int(port)
+                cserver.port = int(port)
+        return cserver
+
+    # loads the last known state of the configuration server
+    # \brief It sets the component and datasource lists from the local cache
+    # \param settings application QSettings object
+    # \param server user's server
+    # \returns True if cached elements were found
+    def loadCachedServer(self, settings, server=None):
+        cserver = self.configServer or self.__createServer(settings, server)
+        device = cserver.getDeviceName()
+        datasources = self.serverCache.load(device, "datasources")
+        components = self.serverCache.load(device, "components")
+        if not datasources and not components:
+            logger.warning("No cached elements of %s" % device)
+            return False
+        logger.info("Opening cached elements of %s" % device)
+        self.setDataSources(datasources)
+        self.setComponents(components)
+        return True
 
     # updates directories in status bar
     def updateStatusBar(self):
@@ -323,11 +386,22 @@ class MainWindow(QMainWindow):
         self.cpDirLabel.setFrameStyle(QFrame.Panel | QFrame.Sunken)
         self.dsDirLabel = QLabel("DS: %s" % (self.sourceList.directory))
         self.dsDirLabel.setFrameStyle(QFrame.Panel | QFrame.Sunken)
+        self.undoLabel = QLabel("")
+        self.undoLabel.setFrameStyle(QFrame.Panel | QFrame.Sunken)
         status.addWidget(QLabel(""), 4)
         status.addWidget(self.cpDirLabel, 4)
         status.addWidget(self.dsDirLabel, 4)
+        status.addWidget(self.undoLabel, 1)
+        self.undoStack.memoryChanged.connect(self.updateUndoLabel)
+        self.updateUndoLabel(*self.undoStack.usage())
         return status
 
+    # updates the undo history label
+    # \param count number of commands in the undo history
+    # \param size estimated size of the commands in bytes
+    def updateUndoLabel(self, count, size):
+        self.undoLabel.setText("Undo: %s (%s)" % (count, formatSize(size)))
+
     # creates action
     # \param action the action instance
     # \param text string shown in menu
@@ -394,7 +468,12 @@ class MainWindow(QMainWindow):
     # \brief It creates actions and sets the command pool and stack
     def createActions(self):
         self.undoGroup = QUndoGroup(self)
-        self.undoStack = QUndoStack(self)
+        settings = QSettings()
+        self.undoStack = UndoStack(
+            self,
+            int(settings.value("UndoStack/maxCommands", 500)),
+            int(settings.value("UndoStack/maxBytes", 64 * 1024 * 1024)),
+            self)
 
         self.__createUndoRedoActions()
 
@@ -438,16 +517,9 @@ class MainWindow(QMainWindow):
             tip="Go to the component list", checkable=True)
 
         # Signals
-        # self.connect(self.componentList.ui.elementListWidget,
-        #              SIGNAL("itemDoubleClicked(QListWidgetItem*)"),
-        #              self.slots["Edit"].componentEdit)
-        self.componentList.ui.elementListWidget.itemDoubleClicked.connect(
+        self.componentList.ui.elementListView.doubleClicked.connect(
             self.slots["Edit"].componentEdit)
-
-        # self.connect(self.sourceList.ui.elementListWidget,
-        #              SIGNAL("itemDoubleClicked(QListWidgetItem*)"),
-        #              self.slots["Edit"].dsourceEdit)
-        self.sourceList.ui.elementListWidget.itemDoubleClicked.connect(
+        self.sourceList.ui.elementListView.doubleClicked.connect(
             self.slots["Edit"].dsourceEdit)
 
         # Component context menu
@@ -555,9 +627,9 @@ class MainWindow(QMainWindow):
         for k in elementList.elements.keys():
             cp = elementList.elements[k]
             if (hasattr(cp, "isDirty") and cp.isDirty()) or \
-                    (hasattr(cp, "instance")
-                     and hasattr(cp.instance, "isDirty")
-                     and cp.instance.isDirty()):
+                    (hasattr(cp, "loadedInstance")
+                     and hasattr(cp.loadedInstance(), "isDirty")
+                     and cp.loadedInstance().isDirty()):
                 if status != QMessageBox.YesToAll \
                         and status != QMessageBox.NoToAll:
                     status = QMessageBox.question(
@@ -620,6 +692,12 @@ class MainWindow(QMainWindow):
         settings.setValue(
             "Components/directory",
             (os.path.abspath(self.componentList.directory)))
+        settings.setValue(
+            "UndoStack/maxCommands",
+            (self.undoStack.undoLimit()))
+        settings.setValue(
+            "UndoStack/maxBytes",
+            (self.undoStack.maxBytes))
 
         if self.configServer:
             settings.setValue("ConfigServer/device",
@@ -632,7 +710,17 @@ class MainWindow(QMainWindow):
                               (self.configServer.port))
             settings.setValue("Online/filename",
                               (self.onlineFile))
-            self.configServer.close()
+            if not self.asyncServer or self.asyncServer.shutdown(
+                    timeout=self.serverTimeout):
+                self.configServer.close()
+            else:
+                logger.warning(
+                    "%s is not responding" %
+                    self.configServer.getDeviceName())
+        try:
+            self.serverCache.prune()
+        except Exception as e:
+            logger.warning("cannot prune cache: %s" % unicode(e))
 
     # stores the setting before finishing the application
     # \param event Qt event
@@ -651,6 +739,8 @@ class MainWindow(QMainWindow):
             event.ignore()
             return
 
+        self.componentList.stopLoading()
+        self.sourceList.stopLoading()
         self.__storeSettings()
         self.ui.mdi.closeAllSubWindows()
 
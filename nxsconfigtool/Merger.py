@@ -22,6 +22,7 @@
 """ merger of different configuration trees """
 
 import sys
+import bisect
 
 from PyQt5.QtXml import QDomNode
 
@@ -123,36 +124,50 @@ class Merger(QThread):
     # \param node the given DOM node
     # \returns string with node ancestors in the tree
     def _getAncestors(self, node):
-        res = ""
-        attr = node.attributes()
-
-        name = attr.namedItem("name").nodeValue() \
-            if attr.contains("name") else ""
-
-        if node.parentNode().nodeName() != '#document':
-            res = self._getAncestors(node.parentNode())
-        res += "/" + unicode(node.nodeName())
-        if name:
-            res += ":" + name
+        res = []
+        while True:
+            attr = node.attributes()
+            name = attr.namedItem("name").nodeValue() \
+                if attr.contains("name") else ""
+            res.append(unicode(node.nodeName()) +
+                       ((":" + name) if name else ""))
+            parent = node.parentNode()
+            if parent.isNull() or parent.nodeName() == '#document':
+                break
+            node = parent
+        return "".join("/" + nd for nd in reversed(res))
+
+    # provides attributes of the given node element
+    # \param elem node element
+    # \returns dictionary with attribute names and values
+    @classmethod
+    def _getAttributes(cls, elem):
+        attr = elem.attributes()
+        res = {}
+        for i in range(attr.count()):
+            at = attr.item(i)
+            res[unicode(at.nodeName())] = unicode(at.nodeValue())
         return res
 
     # checks if the given node elements are mergeable
     # \param elem1 first node element
     # \param elem2 secound node element
+    # \param attr1 attribute dictionary of the first element
+    # \param attr2 attribute dictionary of the second element
     # \returns True if the given elements are mergeable
-    def _areMergeable(self, elem1, elem2):
+    def _areMergeable(self, elem1, elem2, attr1=None, attr2=None):
         if elem1.nodeName() != elem2.nodeName():
             return False
         tagName = unicode(elem1.nodeName())
-        attr1 = elem1.attributes()
-        attr2 = elem2.attributes()
+        if attr1 is None:
+            attr1 = self._getAttributes(elem1)
+        if attr2 is None:
+            attr2 = self._getAttributes(elem2)
         status = True
         tags = []
 
-        name1 = attr1.namedItem("name").nodeValue() \
-            if attr1.contains("name") else ""
-        name2 = attr2.namedItem("name").nodeValue() \
-            if attr1.contains("name") else ""
+        name1 = attr1.get("name", "")
+        name2 = attr2.get("name", "")
 
         if name1 != name2 and name1 and name2:
             if tagName in self._singles:
@@ -161,16 +176,11 @@ class Merger(QThread):
                     [elem1, elem2])
             return False
 
-        for i1 in range(attr1.count()):
-            at1 = attr1.item(i1)
-            for i2 in range(attr2.count()):
-                at2 = attr2.item(i2)
-                if at1.nodeName() == at2.nodeName() and \
-                        at1.nodeValue() != at2.nodeValue():
-                    status = False
-                    tags.append((unicode(self._getAncestors(at1)),
-                                 unicode(at1.nodeValue()),
-                                 unicode(at2.nodeValue())))
+        for key, value in attr1.items():
+            if key in attr2 and value != attr2[key]:
+                status = False
+                tags.append((self._getAncestors(elem1) + "/" + key,
+                             value, attr2[key]))
 
         if not status and (tagName in self._singles
                            or (name1 and name1 == name2)):
@@ -246,30 +256,76 @@ class Merger(QThread):
                                if unicode(name1).strip() else " ")
                         raise IncompatibleNodeError(message, [elem1])
 
+    # provides the next sibling which can be merged with the given element
+    # \param position position of the last checked sibling
+    # \param tagName tag name of the element
+    # \param attr attribute dictionary of the element
+    # \param bucket (all, unnamed, named) tuple with sorted positions of
+    #        siblings with the element tag name
+    # \returns position of the next candidate or None
+    def _nextCandidate(self, position, tagName, attr, bucket):
+        allPos, unnamed, named = bucket
+        name = attr.get("name", "")
+        if tagName in self._singles or not name:
+            lists = [allPos]
+        else:
+            lists = [named.get(name, []), unnamed]
+        res = None
+        for lst in lists:
+            index = bisect.bisect_right(lst, position)
+            if index < len(lst) and (res is None or lst[index] < res):
+                res = lst[index]
+        return res
+
+    # merges mergeable children of the given DOM node
+    # \brief Children are bucketed by tag and name attribute so only
+    #        candidate pairs are compared, in the document order
+    # \param node the given DOM node
+    def _mergeSiblings(self, node):
+        elems = []
+        child = node.firstChild()
+        while not child.isNull():
+            if child.isElement():
+                elems.append(child.toElement())
+            child = child.nextSibling()
+        if len(elems) < 2:
+            return
+
+        tags = [unicode(elem.nodeName()) for elem in elems]
+        attrs = [self._getAttributes(elem) for elem in elems]
+        buckets = {}
+        for i, tag in enumerate(tags):
+            bucket = buckets.setdefault(tag, ([], [], {}))
+            bucket[0].append(i)
+            name = attrs[i].get("name", "")
+            if name:
+                bucket[2].setdefault(name, []).append(i)
+            else:
+                bucket[1].append(i)
+
+        merged = set()
+        for i in range(len(elems)):
+            if i in merged or len(buckets[tags[i]][0]) < 2:
+                continue
+            j = i
+            while self.running:
+                j = self._nextCandidate(j, tags[i], attrs[i], buckets[tags[i]])
+                if j is None:
+                    break
+                if j in merged:
+                    continue
+                if self._areMergeable(elems[i], elems[j], attrs[i], attrs[j]):
+                    self._mergeNodes(elems[i], elems[j])
+                    attrs[i].update(attrs[j])
+                    merged.add(j)
+
     # merge all children of the given DOM node
     # \param node the given DOM node
     def _mergeChildren(self, node):
         if node:
             self._hasAttributes(node)
 
-            children = node.childNodes()
-            nchildren = children.count()
-            c1 = 0
-            while c1 < nchildren:
-                child1 = children.item(c1)
-                elem1 = child1.toElement()
-                c2 = c1 + 1
-                while c2 < nchildren:
-                    child2 = children.item(c2)
-                    if child1 != child2:
-                        elem2 = child2.toElement()
-                        if elem1 is not None and elem2 is not None:
-                            if self._areMergeable(elem1, elem2):
-                                self._mergeNodes(elem1, elem2)
-                                nchildren -= 1
-                                c2 -= 1
-                    c2 += 1
-                c1 += 1
+            self._mergeSiblings(node)
 
             child = node.firstChild()
             elem = node.toElement()
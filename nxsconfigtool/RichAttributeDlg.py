@@ -22,12 +22,11 @@
 """ attribute widget """
 
 import copy
-import os
 
 from PyQt5.QtCore import (QModelIndex)
 from PyQt5.QtWidgets import QMessageBox
-from PyQt5 import uic
 
+from .UiLoader import UiForm
 from .NodeDlg import NodeDlg
 from .DimensionsDlg import DimensionsDlg
 from .Errors import CharacterError
@@ -38,9 +37,7 @@ import sys
 # message logger
 logger = logging.getLogger("nxsdesigner")
 
-_formclass, _baseclass = uic.loadUiType(
-    os.path.join(os.path.dirname(os.path.abspath(__file__)),
-                 "ui", "richattributedlg.ui"))
+_formclass = UiForm("richattributedlg")
 
 if sys.version_info > (3,):
     unicode = str
@@ -149,6 +146,7 @@ class RichAttributeDlg(NodeDlg):
         self._dimensions = []
         for dm in self.dimensions:
             self._dimensions.append(dm)
+        self._updateUi()
 
     #  creates GUI
     # \brief It calls setupUi and  connects signals and slots
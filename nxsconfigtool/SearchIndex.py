@@ -0,0 +1,188 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2017 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+# \package nxsconfigtool nexdatas
+# \file SearchIndex.py
+# inverted index of element names and contents
+
+""" inverted index of element names and contents """
+
+import bisect
+import re
+import sys
+
+if sys.version_info > (3,):
+    unicode = str
+
+
+# pattern of attribute values and texts in XML
+_xmlValues = re.compile(r"=\s*\"([^\"]*)\"|=\s*'([^']*)'|>([^<]+)<")
+
+
+# inverted index of tokens
+# \brief Tokens are kept sorted so all tokens with a given prefix
+#        are found by bisection. New tokens are merged into the sorted
+#        list by one sort before the next lookup
+class TokenIndex(object):
+
+    # constructor
+    def __init__(self):
+        # token : set of element ids
+        self.__ids = {}
+        # sorted tokens
+        self.__tokens = []
+        # new tokens which are not in the sorted tokens yet
+        self.__pending = []
+
+    # merges the new tokens into the sorted tokens
+    def __sort(self):
+        if self.__pending:
+            self.__tokens.extend(self.__pending)
+            self.__tokens.sort()
+            self.__pending = []
+
+    # adds the element tokens
+    # \param ide element id
+    # \param tokens set of tokens
+    def add(self, ide, tokens):
+        for token in tokens:
+            if token not in self.__ids:
+                self.__ids[token] = set()
+                self.__pending.append(token)
+            self.__ids[token].add(ide)
+
+    # removes the element tokens
+    # \param ide element id
+    # \param tokens set of tokens
+    def remove(self, ide, tokens):
+        for token in tokens:
+            ids = self.__ids.get(token)
+            if ids is None:
+                continue
+            ids.discard(ide)
+            if not ids:
+                del self.__ids[token]
+                self.__sort()
+                self.__tokens.pop(bisect.bisect_left(self.__tokens, token))
+
+    # finds elements with a token starting with the prefix
+    # \param prefix token prefix
+    # \returns set of element ids
+    def find(self, prefix):
+        self.__sort()
+        found = set()
+        tokens = self.__tokens
+        for i in range(bisect.bisect_left(tokens, prefix), len(tokens)):
+            if not tokens[i].startswith(prefix):
+                break
+            found.update(self.__ids[tokens[i]])
+        return found
+
+
+# inverted index of element names and contents
+class SearchIndex(object):
+
+    # constructor
+    def __init__(self):
+        # index of name tokens
+        self.__names = TokenIndex()
+        # index of content tokens
+        self.__contents = TokenIndex()
+        # element id : (name tokens, content tokens)
+        self.__tokens = {}
+
+    # splits the text into lower case tokens
+    # \brief Words are also split on underscores
+    # \param text given text
+    # \returns set of tokens
+    @classmethod
+    def tokenize(cls, text):
+        tokens = set()
+        for word in re.findall(r"\w+", unicode(text or "").lower()):
+            tokens.add(word)
+            tokens.update(part for part in word.split("_") if part)
+        return tokens
+
+    # provides tokens of attribute values and texts of the XML
+    # \param xml XML string
+    # \returns set of tokens
+    @classmethod
+    def tokenizeXML(cls, xml):
+        tokens = set()
+        for values in _xmlValues.findall(unicode(xml or "")):
+            for value in values:
+                if value:
+                    tokens.update(cls.tokenize(value))
+        return tokens
+
+    # sets the element name and content tokens
+    # \param ide element id
+    # \param name element name
+    # \param contents set of content tokens, e.g. provided by tokenizeXML
+    def update(self, ide, name, contents=None):
+        self.remove(ide)
+        names = self.tokenize(name)
+        contents = set(contents or ())
+        self.__tokens[ide] = (names, contents)
+        self.__names.add(ide, names)
+        self.__contents.add(ide, contents)
+
+    # removes the element
+    # \param ide element id
+    def remove(self, ide):
+        if ide in self.__tokens:
+            names, contents = self.__tokens.pop(ide)
+            self.__names.remove(ide, names)
+            self.__contents.remove(ide, contents)
+
+    # checks if the element is indexed
+    # \param ide element id
+    # \returns True if the element is indexed
+    def contains(self, ide):
+        return ide in self.__tokens
+
+    # finds elements matching all query words
+    # \brief Each query word has to be a prefix of a name token or,
+    #        if contents are searched, of a content token
+    # \param query query string
+    # \param content if contents are searched
+    # \returns set of element ids or None for an empty query
+    def search(self, query, content=False):
+        words = re.findall(r"\w+", unicode(query or "").lower())
+        if not words:
+            return None
+        found = None
+        for word in words:
+            ids = self.__names.find(word)
+            if content:
+                ids |= self.__contents.find(word)
+            found = ids if found is None else found & ids
+            if not found:
+                break
+        return found
+
+    # checks if the element matches all query words
+    # \param ide element id
+    # \param query query string
+    # \param content if contents are searched
+    # \returns True if the element matches
+    def match(self, ide, query, content=False):
+        words = re.findall(r"\w+", unicode(query or "").lower())
+        names, contents = self.__tokens.get(ide, (set(), set()))
+        tokens = names | contents if content else names
+        return all(any(token.startswith(word) for token in tokens)
+                   for word in words)
@@ -0,0 +1,224 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2017 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+# \package nxsconfigtool nexdatas
+# \file ServerCache.py
+# local cache of configuration server elements
+
+""" local cache of configuration server elements """
+
+import io
+import os
+import re
+import sys
+import json
+import time
+import hashlib
+import threading
+
+import logging
+# message logger
+logger = logging.getLogger("nxsdesigner")
+
+if sys.version_info > (3,):
+    unicode = str
+
+
+# provides the default cache directory
+# \returns directory path
+def defaultDirectory():
+    base = os.environ.get("XDG_CACHE_HOME") or \
+        os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "nxsdesigner")
+
+
+# content-addressed cache of configuration server elements
+# \brief Element contents are stored once per content hash in the objects
+#        directory, an index file of each device keeps the content hash
+#        and the caching time of its components and datasources. Changed
+#        indices are written only by flush()
+class ServerCache(object):
+
+    # constructor
+    # \param directory cache directory, the default one if None
+    def __init__(self, directory=None):
+        # cache directory
+        self.directory = directory or defaultDirectory()
+        # loaded indices, i.e. {device: {kind: {name: entry}}}
+        self.__indices = {}
+        # devices with indices which are not written yet
+        self.__dirty = set()
+        # lock of the indices
+        self.__lock = threading.RLock()
+
+    # provides content hash of the given xml
+    # \param xml XML string
+    # \returns hash string
+    @classmethod
+    def hash(cls, xml):
+        return hashlib.md5(unicode(xml).encode("utf-8")).hexdigest()
+
+    # provides the index file of the device
+    # \param device device name
+    # \returns file path
+    def __indexPath(self, device):
+        name = re.sub(r"[^\w.-]", "_", unicode(device))
+        return os.path.join(self.directory, "devices", "%s.json" % name)
+
+    # provides the file of the given content
+    # \param chash content hash
+    # \returns file path
+    def __objectPath(self, chash):
+        return os.path.join(
+            self.directory, "objects", chash[:2], "%s.xml" % chash)
+
+    # reads the index file
+    # \param path file path
+    # \returns dictionary with {kind: {name: entry}}
+    @classmethod
+    def __read(cls, path):
+        if os.path.isfile(path):
+            try:
+                with io.open(path, "r", encoding="utf-8") as fl:
+                    return json.load(fl)
+            except Exception as e:
+                logger.warning("cannot read cache index %s: %s" % (path, e))
+        return {}
+
+    # provides the loaded index of the device
+    # \param device device name
+    # \returns dictionary with {kind: {name: entry}}
+    def __index(self, device):
+        if device not in self.__indices:
+            self.__indices[device] = self.__read(self.__indexPath(device))
+        return self.__indices[device]
+
+    # writes the index of the device
+    # \param device device name
+    def __write(self, device):
+        path = self.__indexPath(device)
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        tmp = "%s.tmp" % path
+        with io.open(tmp, "w", encoding="utf-8") as fl:
+            fl.write(unicode(json.dumps(self.__indices[device])))
+        os.rename(tmp, path)
+
+    # provides cache entries of the device
+    # \param device device name
+    # \param kind element kind, i.e. components or datasources
+    # \returns dictionary with name : {"hash": hash, "time": fetch time}
+    def entries(self, device, kind):
+        with self.__lock:
+            return dict(self.__index(device).get(kind, {}))
+
+    # reads the cached element contents
+    # \param device device name
+    # \param kind element kind, i.e. components or datasources
+    # \param names element names, all cached elements if None
+    # \returns dictionary with names : xml of readable elements
+    def load(self, device, kind, names=None):
+        entries = self.entries(device, kind)
+        if names is None:
+            names = entries.keys()
+        elements = {}
+        for name in names:
+            entry = entries.get(name)
+            if not entry:
+                continue
+            try:
+                with io.open(self.__objectPath(entry["hash"]), "r",
+                             encoding="utf-8") as fl:
+                    elements[name] = fl.read()
+            except Exception as e:
+                logger.debug("cached %s %s: %s" % (kind, name, e))
+        return elements
+
+    # stores the element contents
+    # \brief Entries with unchanged contents are kept as they are
+    # \param device device name
+    # \param kind element kind, i.e. components or datasources
+    # \param elements dictionary with names : xml of elements
+    # \param names all element names of the device, the entries of other
+    #        elements are removed, no entry is removed if None
+    def update(self, device, kind, elements, names=None):
+        now = time.time()
+        with self.__lock:
+            index = self.__index(device).setdefault(kind, {})
+            size = len(index)
+            changed = False
+            for name, xml in elements.items():
+                if not xml:
+                    changed = index.pop(name, None) is not None or changed
+                    continue
+                chash = self.hash(xml)
+                if index.get(name, {}).get("hash") == chash:
+                    continue
+                changed = True
+                path = self.__objectPath(chash)
+                if not os.path.isfile(path):
+                    if not os.path.isdir(os.path.dirname(path)):
+                        os.makedirs(os.path.dirname(path))
+                    with io.open(path, "w", encoding="utf-8") as fl:
+                        fl.write(unicode(xml))
+                index[name] = {"hash": chash, "time": now}
+            if names is not None:
+                for name in set(index.keys()) - set(names):
+                    index.pop(name)
+            if changed or len(index) != size:
+                self.__dirty.add(device)
+
+    # removes the element entries
+    # \param device device name
+    # \param kind element kind, i.e. components or datasources
+    # \param names element names
+    def remove(self, device, kind, names):
+        with self.__lock:
+            index = self.__index(device).setdefault(kind, {})
+            for name in names:
+                if index.pop(name, None) is not None:
+                    self.__dirty.add(device)
+
+    # writes the changed indices
+    def flush(self):
+        with self.__lock:
+            while self.__dirty:
+                self.__write(self.__dirty.pop())
+
+    # removes contents which are not referred by any device
+    # \returns number of removed files
+    def prune(self):
+        removed = 0
+        with self.__lock:
+            self.flush()
+            used = set()
+            ddir = os.path.join(self.directory, "devices")
+            if os.path.isdir(ddir):
+                for fname in os.listdir(ddir):
+                    if fname.endswith(".json"):
+                        index = self.__read(os.path.join(ddir, fname))
+                        for entries in index.values():
+                            used.update(
+                                entry["hash"] for entry in entries.values())
+            odir = os.path.join(self.directory, "objects")
+            if os.path.isdir(odir):
+                for sub in os.listdir(odir):
+                    for fname in os.listdir(os.path.join(odir, sub)):
+                        if fname[:-4] not in used:
+                            os.remove(os.path.join(odir, sub, fname))
+                            removed += 1
+        return removed
@@ -33,6 +33,7 @@ from .ComponentCreator import (
     StdComponentCreator, ComponentCreator, DataSourceCreator)
 from .LabeledObject import LabeledObject
 
+import functools
 import logging
 import sys
 # message logger
@@ -42,6 +43,69 @@ if sys.version_info > (3,):
     unicode = str
 
 
+# connects to the configuration server and calls its method
+# \brief It is executed in the worker thread of the asynchronous client
+# \param server configuration server
+# \param name method name
+# \param args method arguments
+# \returns the method result
+def _connectAndCall(server, name, *args):
+    with server.lock:
+        server.connect()
+        return getattr(server, name)(*args)
+
+
+# connects to the configuration server, calls its method and provides
+#  the mandatory components
+# \brief It is executed in the worker thread of the asynchronous client
+# \param server configuration server
+# \param name method name, only the mandatory components are fetched
+#        if None
+# \param args method arguments
+# \returns list of the mandatory components
+def _callAndGetMandatory(server, name, *args):
+    with server.lock:
+        server.connect()
+        if name:
+            getattr(server, name)(*args)
+        return server.getMandatory()
+
+
+# submits the server function to the asynchronous client
+# \param receiver main window
+# \param slot function called in the GUI thread with the done future
+# \param function function called in the worker thread with
+#        the configuration server and the given arguments
+# \param args function arguments
+# \returns future of the function result
+def _submit(receiver, slot, function, *args):
+    future = receiver.asyncServer.submit(
+        function, receiver.configServer, *args)
+    receiver.serverWatcher.watch(future, slot)
+    return future
+
+
+# marks the element as stored when its store operation is done
+# \brief It is called in the GUI thread
+# \param receiver main window
+# \param elementList list of the element
+# \param el labeled object of the element
+# \param xml stored XML of the element
+# \param title title of the error message
+# \param future future of the store operation
+def _stored(receiver, elementList, el, xml, title, future):
+    if future.cancelled():
+        return
+    receiver.disableServer(not receiver.configServer.connected)
+    try:
+        future.result()
+        el.instance.savedXML = xml
+        el.savedName = el.name
+    except Exception as e:
+        QMessageBox.warning(receiver, title, unicode(e))
+    elementList.populateElements(el.id)
+
+
 # Command which performs connection to the configuration server
 class ServerConnect(QUndoCommand):
 
@@ -65,11 +129,13 @@ class ServerConnect(QUndoCommand):
                 if self._state is None:
                     self.receiver.configServer.open()
                     self._state = self.receiver.configServer.getState()
+                    if self.receiver.configServer.connected:
+                        self.receiver.disableServer(False)
                 else:
                     self.receiver.configServer.setState(self._state)
-                    self.receiver.configServer.connect()
-                if self.receiver.configServer.connected:
-                    self.receiver.disableServer(False)
+                    self.receiver.serverWatcher.watch(
+                        self.receiver.asyncServer.call("connect"),
+                        self.__connected)
             except Exception as e:
                 QMessageBox.warning(
                     self.receiver,
@@ -78,16 +144,33 @@ class ServerConnect(QUndoCommand):
 
         logger.debug("EXEC serverConnect")
 
+    # enables the server actions
+    # \brief It is called in the GUI thread when the connecting is done
+    # \param future future of the connect operation
+    def __connected(self, future):
+        if future.cancelled():
+            return
+        try:
+            future.result()
+            self.receiver.disableServer(False)
+        except Exception as e:
+            QMessageBox.warning(
+                self.receiver,
+                "Error in connecting to Configuration Server",
+                unicode(e))
+
     # unexecutes the command
     # \brief It undo connection to the configuration server,
     #        i.e. it close the connection to the server
     def undo(self):
         if self.receiver.configServer:
             try:
-                self.receiver.configServer.close()
+                self.receiver.asyncServer.cancelAll()
+                self.receiver.disableServer(True)
+                self.receiver.serverWatcher.watch(
+                    self.receiver.asyncServer.call("close"), self.__closed)
                 if self._oldstate is None:
                     self.receiver.configServer.setState(self._oldstate)
-                self.receiver.disableServer(True)
             except Exception as e:
                 QMessageBox.warning(
                     self.receiver,
@@ -96,6 +179,20 @@ class ServerConnect(QUndoCommand):
 
         logger.debug("UNDO serverConnect")
 
+    # reports errors of closing
+    # \brief It is called in the GUI thread when the closing is done
+    # \param future future of the close operation
+    def __closed(self, future):
+        if future.cancelled():
+            return
+        try:
+            future.result()
+        except Exception as e:
+            QMessageBox.warning(
+                self.receiver,
+                "Error in Closing Configuration Server Connection",
+                unicode(e))
+
 
 # Command which performs connection to the configuration server
 class ServerCPCreate(QUndoCommand):
@@ -162,9 +259,10 @@ class ServerCPCreate(QUndoCommand):
             "%s [Component]" % cp.name)
 
         if action == "STORE":
-            self.receiver.configServer.storeComponent(name, xml)
-            cpEdit.savedXML = cp.instance.get()
-            cp.savedName = cp.name
+            _submit(self.receiver, functools.partial(
+                _stored, self.receiver, self.receiver.componentList, cp,
+                cp.instance.get(), "Error in storing the component"),
+                _connectAndCall, "storeComponent", name, xml)
         elif action == "SAVE":
             cp.instance.merge(False)
             if cp.instance.save():
@@ -201,13 +299,15 @@ class ServerCPCreate(QUndoCommand):
         ds.name = dsEdit.name
         ds.instance = dsEdit
         self.receiver.sourceList.addElement(ds, False)
+        dsEdit.createDialog()
         dsEdit.dialog.setWindowTitle(
             "%s [DataSource]" % ds.name)
 
         if action == "STORE":
-            self.receiver.configServer.storeDataSource(name, xml)
-            ds.instance.savedXML = ds.instance.get()
-            ds.savedName = ds.name
+            _submit(self.receiver, functools.partial(
+                _stored, self.receiver, self.receiver.sourceList, ds,
+                ds.instance.get(), "Error in datasource storing"),
+                _connectAndCall, "storeDataSource", name, xml)
         elif action == "SAVE":
             if ds.instance.save():
                 ds.savedName = ds.name
@@ -298,9 +398,10 @@ class ServerSCPCreate(QUndoCommand):
             "%s [Component]" % cp.name)
 
         if action == "STORE":
-            self.receiver.configServer.storeComponent(name, xml)
-            cpEdit.savedXML = cp.instance.get()
-            cp.savedName = cp.name
+            _submit(self.receiver, functools.partial(
+                _stored, self.receiver, self.receiver.componentList, cp,
+                cp.instance.get(), "Error in storing the component"),
+                _connectAndCall, "storeComponent", name, xml)
         elif action == "SAVE":
             cp.instance.merge(False)
             if cp.instance.save():
@@ -337,13 +438,15 @@ class ServerSCPCreate(QUndoCommand):
         ds.name = dsEdit.name
         ds.instance = dsEdit
         self.receiver.sourceList.addElement(ds, False)
+        dsEdit.createDialog()
         dsEdit.dialog.setWindowTitle(
             "%s [DataSource]" % ds.name)
 
         if action == "STORE":
-            self.receiver.configServer.storeDataSource(name, xml)
-            ds.instance.savedXML = ds.instance.get()
-            ds.savedName = ds.name
+            _submit(self.receiver, functools.partial(
+                _stored, self.receiver, self.receiver.sourceList, ds,
+                ds.instance.get(), "Error in datasource storing"),
+                _connectAndCall, "storeDataSource", name, xml)
         elif action == "SAVE":
             if ds.instance.save():
                 ds.savedName = ds.name
@@ -441,13 +544,15 @@ class ServerDSCreate(QUndoCommand):
         ds.name = dsEdit.name
         ds.instance = dsEdit
         self.receiver.sourceList.addElement(ds, False)
+        dsEdit.createDialog()
         dsEdit.dialog.setWindowTitle(
             "%s [DataSource]" % ds.name)
 
         if action == "STORE":
-            self.receiver.configServer.storeDataSource(name, xml)
-            ds.instance.savedXML = ds.instance.get()
-            ds.savedName = ds.name
+            _submit(self.receiver, functools.partial(
+                _stored, self.receiver, self.receiver.sourceList, ds,
+                ds.instance.get(), "Error in datasource storing"),
+                _connectAndCall, "storeDataSource", name, xml)
         elif action == "SAVE":
             if ds.instance.save():
                 ds.savedName = ds.name
@@ -486,6 +591,8 @@ class ServerFetchComponents(QUndoCommand):
         QUndoCommand.__init__(self, parent)
         # main window
         self.receiver = receiver
+        # names of the fetched elements already in the list
+        self.__names = set()
 
     # executes the command
     # \brief It fetches the components from the configuration server
@@ -514,29 +621,67 @@ class ServerFetchComponents(QUndoCommand):
         self.receiver.componentList.elements = {}
 
         if self.receiver.configServer:
-            try:
-                if not self.receiver.configServer.connected:
-                    QMessageBox.information(
-                        self.receiver,
-                        "Connecting to Configuration Server",
-                        "Connecting to %s on %s:%s" % (
-                            self.receiver.configServer.device,
-                            self.receiver.configServer.host,
-                            self.receiver.configServer.port
-                        )
-                    )
-
-                self.receiver.configServer.connect()
-                self.receiver.disableServer(False)
-                cdict = self.receiver.configServer.fetchComponents()
-                self.receiver.setComponents(cdict)
-            except Exception as e:
-                QMessageBox.warning(
+            if not self.receiver.configServer.connected:
+                QMessageBox.information(
                     self.receiver,
-                    "Error in fetching components", unicode(e))
+                    "Connecting to Configuration Server",
+                    "Connecting to %s on %s:%s" % (
+                        self.receiver.configServer.device,
+                        self.receiver.configServer.host,
+                        self.receiver.configServer.port
+                    )
+                )
+            self.receiver.statusBar().showMessage(
+                "Fetching components from %s" %
+                self.receiver.configServer.getDeviceName())
+            watcher = self.receiver.serverWatcher
+            self.__names = set()
+            future = self.receiver.asyncServer.submit(
+                _connectAndCall, self.receiver.configServer,
+                "fetchComponents",
+                lambda elements: watcher.post(
+                    lambda: self.__arrived(future, elements)))
+            watcher.watch(future, self.__fetched, "fetchComponents")
 
         logger.debug("EXEC serverFetchComponents")
 
+    # adds the components fetched so far to the list
+    # \brief It is called in the GUI thread for each fetched chunk
+    # \param future future of the fetch operation
+    # \param elements dictionary with names : xml of components
+    def __arrived(self, future, elements):
+        if future.cancelled():
+            return
+        elements = dict((name, xml) for name, xml in elements.items()
+                        if name not in self.__names)
+        if elements:
+            self.__names.update(elements.keys())
+            self.receiver.setComponents(elements)
+            self.receiver.statusBar().showMessage(
+                "Fetched %s components from %s" % (
+                    len(self.__names),
+                    self.receiver.configServer.getDeviceName()))
+
+    # sets the fetched components
+    # \brief It is called in the GUI thread when the fetch is done
+    # \param future future of the fetch operation
+    def __fetched(self, future):
+        self.receiver.statusBar().clearMessage()
+        if future.cancelled():
+            return
+        self.receiver.disableServer(
+            not self.receiver.configServer.connected)
+        try:
+            cdict = future.result()
+            rest = dict((name, xml) for name, xml in cdict.items()
+                        if name not in self.__names)
+            if rest or not self.__names:
+                self.receiver.setComponents(rest)
+        except Exception as e:
+            QMessageBox.warning(
+                self.receiver,
+                "Error in fetching components", unicode(e))
+
     # unexecutes the command
     # \brief It does nothing
     def undo(self):
@@ -625,12 +770,11 @@ class ServerStoreComponent(QUndoCommand):
                             QMessageBox.Yes) == QMessageBox.No:
                         raise Exception("Server not connected")
 
-                self.receiver.configServer.connect()
-                self.receiver.disableServer(False)
-                self.receiver.configServer.storeComponent(
+                _submit(self.receiver, functools.partial(
+                    _stored, self.receiver, self.receiver.componentList,
+                    self._cp, xml, "Error in storing the component"),
+                    _connectAndCall, "storeComponent",
                     self._cpEdit.name, xml)
-                self._cpEdit.savedXML = xml
-                self._cp.savedName = self._cp.name
             except Exception as e:
                 QMessageBox.warning(self.receiver,
                                     "Error in storing the component",
@@ -683,12 +827,8 @@ class ServerDeleteComponent(QUndoCommand):
                         )
                     )
 
-                self.receiver.configServer.connect()
-                self.receiver.disableServer(False)
-                self.receiver.configServer.deleteComponent(self._cp.name)
-                self._cp.savedName = ""
-                if hasattr(self._cp, "instance"):
-                    self._cp.instance.savedXML = ""
+                _submit(self.receiver, self.__deleted,
+                        _connectAndCall, "deleteComponent", self._cp.name)
             except Exception as e:
                 QMessageBox.warning(
                     self.receiver, "Error in deleting the component",
@@ -699,6 +839,25 @@ class ServerDeleteComponent(QUndoCommand):
 
         logger.debug("EXEC serverDeleteComponent")
 
+    # marks the component as not stored
+    # \brief It is called in the GUI thread when the deleting is done
+    # \param future future of the delete operation
+    def __deleted(self, future):
+        if future.cancelled():
+            return
+        self.receiver.disableServer(
+            not self.receiver.configServer.connected)
+        try:
+            future.result()
+            self._cp.savedName = ""
+            if hasattr(self._cp, "instance"):
+                self._cp.instance.savedXML = ""
+        except Exception as e:
+            QMessageBox.warning(
+                self.receiver, "Error in deleting the component",
+                unicode(e))
+        self.receiver.componentList.populateElements(self._cp.id)
+
     # unexecutes the command
     # \brief It populates only the component list
     def undo(self):
@@ -741,11 +900,8 @@ class ServerSetMandatoryComponent(QUndoCommand):
                         )
                     )
 
-                self.receiver.configServer.connect()
-                self.receiver.disableServer(False)
-                self.receiver.configServer.setMandatory(self._cp.name)
-                mandatory = self.receiver.configServer.getMandatory()
-                logger.info("Mandatory Components: \n %s" % str(mandatory))
+                _submit(self.receiver, self.__changed,
+                        _callAndGetMandatory, "setMandatory", self._cp.name)
             except Exception as e:
                 QMessageBox.warning(
                     self.receiver,
@@ -753,6 +909,23 @@ class ServerSetMandatoryComponent(QUndoCommand):
                     unicode(e))
         logger.debug("EXEC serverSetMandatoryComponent")
 
+    # logs the mandatory components
+    # \brief It is called in the GUI thread when the setting is done
+    # \param future future of the operation
+    def __changed(self, future):
+        if future.cancelled():
+            return
+        self.receiver.disableServer(
+            not self.receiver.configServer.connected)
+        try:
+            mandatory = future.result()
+            logger.info("Mandatory Components: \n %s" % str(mandatory))
+        except Exception as e:
+            QMessageBox.warning(
+                self.receiver,
+                "Error in setting the component as mandatory",
+                unicode(e))
+
 
 # Command which fetches a list of the mandatory components from
 #  the configuration server
@@ -782,20 +955,33 @@ class ServerGetMandatoryComponents(QUndoCommand):
                     )
                 )
 
-            self.receiver.configServer.connect()
-            self.receiver.disableServer(False)
-            mandatory = self.receiver.configServer.getMandatory()
+            _submit(self.receiver, self.__fetched, _callAndGetMandatory, None)
+        except Exception as e:
+            QMessageBox.warning(
+                self.receiver,
+                "Error in getting the mandatory components",
+                unicode(e))
+        logger.debug("EXEC serverGetMandatoryComponent")
+
+    # shows the mandatory components
+    # \brief It is called in the GUI thread when the fetching is done
+    # \param future future of the operation
+    def __fetched(self, future):
+        if future.cancelled():
+            return
+        self.receiver.disableServer(
+            not self.receiver.configServer.connected)
+        try:
+            mandatory = future.result()
             logger.info("Mandatory Components: \n %s" % str(mandatory))
             QMessageBox.information(
                 self.receiver, "Mandatory",
                 "Mandatory Components: \n %s" % unicode(mandatory))
-
         except Exception as e:
             QMessageBox.warning(
                 self.receiver,
                 "Error in getting the mandatory components",
                 unicode(e))
-        logger.debug("EXEC serverGetMandatoryComponent")
 
 
 # Command which sets on the configuration server the current component
@@ -831,12 +1017,9 @@ class ServerUnsetMandatoryComponent(QUndoCommand):
                         )
                     )
 
-                self.receiver.configServer.connect()
-                self.receiver.disableServer(False)
-                self.receiver.configServer.unsetMandatory(
-                    self._cp.name)
-                mandatory = self.receiver.configServer.getMandatory()
-                logger.info("Mandatory Components: \n %s" % str(mandatory))
+                _submit(self.receiver, self.__changed,
+                        _callAndGetMandatory, "unsetMandatory",
+                        self._cp.name)
             except Exception as e:
                 QMessageBox.warning(
                     self.receiver,
@@ -844,6 +1027,23 @@ class ServerUnsetMandatoryComponent(QUndoCommand):
                     unicode(e))
         logger.debug("EXEC serverUnsetMandatoryComponent")
 
+    # logs the mandatory components
+    # \brief It is called in the GUI thread when the unsetting is done
+    # \param future future of the operation
+    def __changed(self, future):
+        if future.cancelled():
+            return
+        self.receiver.disableServer(
+            not self.receiver.configServer.connected)
+        try:
+            mandatory = future.result()
+            logger.info("Mandatory Components: \n %s" % str(mandatory))
+        except Exception as e:
+            QMessageBox.warning(
+                self.receiver,
+                "Error in setting the component as mandatory",
+                unicode(e))
+
     # unexecutes the command
     # \brief It does nothing
     def undo(self):
@@ -859,6 +1059,8 @@ class ServerFetchDataSources(QUndoCommand):
         QUndoCommand.__init__(self, parent)
         # main window
         self.receiver = receiver
+        # names of the fetched elements already in the list
+        self.__names = set()
 
     # executes the command
     # \brief It fetches the datasources from the configuration server
@@ -887,28 +1089,67 @@ class ServerFetchDataSources(QUndoCommand):
         self.receiver.sourceList.elements = {}
 
         if self.receiver.configServer:
-            try:
-                if not self.receiver.configServer.connected:
-                    QMessageBox.information(
-                        self.receiver,
-                        "Connecting to Configuration Server",
-                        "Connecting to %s on %s:%s" % (
-                            self.receiver.configServer.device,
-                            self.receiver.configServer.host,
-                            self.receiver.configServer.port
-                        )
-                    )
-                self.receiver.configServer.connect()
-                self.receiver.disableServer(False)
-                cdict = self.receiver.configServer.fetchDataSources()
-                self.receiver.setDataSources(cdict)
-            except Exception as e:
-                QMessageBox.warning(
+            if not self.receiver.configServer.connected:
+                QMessageBox.information(
                     self.receiver,
-                    "Error in fetching datasources", unicode(e))
+                    "Connecting to Configuration Server",
+                    "Connecting to %s on %s:%s" % (
+                        self.receiver.configServer.device,
+                        self.receiver.configServer.host,
+                        self.receiver.configServer.port
+                    )
+                )
+            self.receiver.statusBar().showMessage(
+                "Fetching datasources from %s" %
+                self.receiver.configServer.getDeviceName())
+            watcher = self.receiver.serverWatcher
+            self.__names = set()
+            future = self.receiver.asyncServer.submit(
+                _connectAndCall, self.receiver.configServer,
+                "fetchDataSources",
+                lambda elements: watcher.post(
+                    lambda: self.__arrived(future, elements)))
+            watcher.watch(future, self.__fetched, "fetchDataSources")
 
         logger.debug("EXEC serverFetchDataSources")
 
+    # adds the datasources fetched so far to the list
+    # \brief It is called in the GUI thread for each fetched chunk
+    # \param future future of the fetch operation
+    # \param elements dictionary with names : xml of datasources
+    def __arrived(self, future, elements):
+        if future.cancelled():
+            return
+        elements = dict((name, xml) for name, xml in elements.items()
+                        if name not in self.__names)
+        if elements:
+            self.__names.update(elements.keys())
+            self.receiver.setDataSources(elements)
+            self.receiver.statusBar().showMessage(
+                "Fetched %s datasources from %s" % (
+                    len(self.__names),
+                    self.receiver.configServer.getDeviceName()))
+
+    # sets the fetched datasources
+    # \brief It is called in the GUI thread when the fetch is done
+    # \param future future of the fetch operation
+    def __fetched(self, future):
+        self.receiver.statusBar().clearMessage()
+        if future.cancelled():
+            return
+        self.receiver.disableServer(
+            not self.receiver.configServer.connected)
+        try:
+            cdict = future.result()
+            rest = dict((name, xml) for name, xml in cdict.items()
+                        if name not in self.__names)
+            if rest or not self.__names:
+                self.receiver.setDataSources(rest)
+        except Exception as e:
+            QMessageBox.warning(
+                self.receiver,
+                "Error in fetching datasources", unicode(e))
+
     # unexecutes the command
     # \brief It does nothing
     def undo(self):
@@ -951,16 +1192,14 @@ class ServerStoreDataSource(QUndoCommand):
                             QMessageBox.Yes) == QMessageBox.No:
                         raise Exception("Server not connected")
 
-                self.receiver.configServer.connect()
-                self.receiver.disableServer(False)
                 if self._ds.instance.name:
-                    self.receiver.configServer.storeDataSource(
-                        self._ds.instance.dataSourceName, xml)
+                    name = self._ds.instance.dataSourceName
                 else:
-                    self.receiver.configServer.storeDataSource(
-                        self._ds.instance.name, xml)
-                self._ds.instance.savedXML = xml
-                self._ds.savedName = self._ds.name
+                    name = self._ds.instance.name
+                _submit(self.receiver, functools.partial(
+                    _stored, self.receiver, self.receiver.sourceList,
+                    self._ds, xml, "Error in datasource storing"),
+                    _connectAndCall, "storeDataSource", name, xml)
             except Exception as e:
                 QMessageBox.warning(
                     self.receiver,
@@ -1005,7 +1244,6 @@ class ServerDeleteDataSource(QUndoCommand):
         if self._ds is not None:
             try:
                 if hasattr(self._ds, "instance"):
-                    self._ds.instance.savedXML = ""
                     name = self._ds.instance.dataSourceName
                     if name is None:
                         name = ""
@@ -1020,10 +1258,8 @@ class ServerDeleteDataSource(QUndoCommand):
                             )
                         )
 
-                    self.receiver.configServer.connect()
-                    self.receiver.disableServer(False)
-                    self.receiver.configServer.deleteDataSource(name)
-                    self._ds.savedName = ""
+                    _submit(self.receiver, self.__deleted,
+                            _connectAndCall, "deleteDataSource", name)
 
             except Exception as e:
                 QMessageBox.warning(
@@ -1037,6 +1273,24 @@ class ServerDeleteDataSource(QUndoCommand):
             self.receiver.sourceList.populateElements()
         logger.debug("EXEC serverDeleteDataSource")
 
+    # marks the datasource as not stored
+    # \brief It is called in the GUI thread when the deleting is done
+    # \param future future of the delete operation
+    def __deleted(self, future):
+        if future.cancelled():
+            return
+        self.receiver.disableServer(
+            not self.receiver.configServer.connected)
+        try:
+            future.result()
+            self._ds.instance.savedXML = ""
+            self._ds.savedName = ""
+        except Exception as e:
+            QMessageBox.warning(
+                self.receiver,
+                "Error in datasource deleting", unicode(e))
+        self.receiver.sourceList.populateElements(self._ds.id)
+
     # unexecutes the command
     # \brief It populates the datasource list
     def undo(self):
@@ -1061,25 +1315,34 @@ class ServerClose(QUndoCommand):
         self._state = None
 
     # executes the command
-    # \brief It closes connection to the configuration server
+    # \brief It closes connection to the configuration server. Pending
+    #        operations are cancelled and the connection is closed by
+    #        the worker thread after the running operation
     def redo(self):
         if self.receiver.configServer:
-            self.receiver.configServer.close()
-
-        if self.receiver.configServer:
-            try:
-                if self._state is None:
-                    self._state = self.receiver.configServer.getState()
-                self.receiver.configServer.close()
-                self.receiver.disableServer(True)
-            except Exception as e:
-                QMessageBox.warning(
-                    self.receiver,
-                    "Error in closing connection to Configuration Server",
-                    unicode(e))
+            if self._state is None:
+                self._state = self.receiver.configServer.getState()
+            self.receiver.asyncServer.cancelAll()
+            self.receiver.disableServer(True)
+            self.receiver.serverWatcher.watch(
+                self.receiver.asyncServer.call("close"), self.__closed)
 
         logger.debug("EXEC serverClose")
 
+    # reports errors of closing
+    # \brief It is called in the GUI thread when the closing is done
+    # \param future future of the close operation
+    def __closed(self, future):
+        if future.cancelled():
+            return
+        try:
+            future.result()
+        except Exception as e:
+            QMessageBox.warning(
+                self.receiver,
+                "Error in closing connection to Configuration Server",
+                unicode(e))
+
     # unexecutes the command
     # \brief It reopen the connection to the configuration server
     def undo(self):
@@ -1087,10 +1350,12 @@ class ServerClose(QUndoCommand):
             try:
                 if self._state is None:
                     self.receiver.configServer.open()
+                    self.receiver.disableServer(False)
                 else:
                     self.receiver.configServer.setState(self._state)
-                    self.receiver.configServer.connect()
-                self.receiver.disableServer(False)
+                    self.receiver.serverWatcher.watch(
+                        self.receiver.asyncServer.call("connect"),
+                        self.__connected)
             except Exception as e:
                 QMessageBox.warning(
                     self.receiver,
@@ -1098,6 +1363,21 @@ class ServerClose(QUndoCommand):
                     unicode(e))
         logger.debug("UNDO serverClose")
 
+    # enables the server actions
+    # \brief It is called in the GUI thread when the connecting is done
+    # \param future future of the connect operation
+    def __connected(self, future):
+        if future.cancelled():
+            return
+        try:
+            future.result()
+            self.receiver.disableServer(False)
+        except Exception as e:
+            QMessageBox.warning(
+                self.receiver,
+                "Error in connecting to Configuration Server",
+                unicode(e))
+
 
 # Command which saves all components in the file
 class ServerStoreAllComponents(QUndoCommand):
@@ -1110,6 +1390,7 @@ class ServerStoreAllComponents(QUndoCommand):
         # main window
         self.receiver = receiver
         self._subwindow = None
+        self._cp = None
 
     # executes the command
     # \brief It saves all components in the file
@@ -1118,12 +1399,15 @@ class ServerStoreAllComponents(QUndoCommand):
         keys = list(self.receiver.componentList.elements.keys())
         progress = QProgressDialog(
             "Storing Component elements",
-            "", 0, len(keys), self.receiver.componentList)
+            "", 0, 2 * len(keys), self.receiver.componentList)
         progress.setWindowTitle("Store All Components")
         progress.setWindowModality(Qt.WindowModal)
         progress.setCancelButton(None)
         progress.show()
 
+        failures = {}
+        elements = []
+        cp = None
         for i in range(len(keys)):
             icp = keys[i]
             cp = self.receiver.componentList.elements[icp]
@@ -1142,37 +1426,73 @@ class ServerStoreAllComponents(QUndoCommand):
 
             try:
                 cp.instance.merge(False)
-                xml = cp.instance.get()
-                if not self.receiver.configServer.connected:
-                    QMessageBox.information(
-                        self.receiver,
-                        "Connecting to Configuration Server",
-                        "Connecting to %s on %s:%s" % (
-                            self.receiver.configServer.device,
-                            self.receiver.configServer.host,
-                            self.receiver.configServer.port
-                        )
-                    )
-                self.receiver.configServer.connect()
-                self.receiver.disableServer(False)
-                self.receiver.configServer.storeComponent(
-                    cp.instance.name, xml)
-                cp.instance.savedXML = xml
-                cp.savedName = cp.name
+                elements.append((cp, cp.instance.name, cp.instance.get()))
             except Exception as e:
-                QMessageBox.warning(
-                    self.receiver, "Error in storing the component",
-                    unicode(e))
+                failures[cp.instance.name] = unicode(e)
             progress.setValue(i)
-        progress.setValue(len(keys))
-        progress.close()
-        if hasattr(cp, "id"):
-            self.receiver.componentList.populateElements(cp.id)
+
+        self._cp = cp
+        if elements:
+            if not self.receiver.configServer.connected:
+                QMessageBox.information(
+                    self.receiver,
+                    "Connecting to Configuration Server",
+                    "Connecting to %s on %s:%s" % (
+                        self.receiver.configServer.device,
+                        self.receiver.configServer.host,
+                        self.receiver.configServer.port
+                    )
+                )
+            watcher = self.receiver.serverWatcher
+            offset = len(keys)
+            self.receiver.serverWatcher.watch(
+                self.receiver.asyncServer.submit(
+                    _connectAndCall, self.receiver.configServer,
+                    "storeComponents",
+                    [(name, xml) for _, name, xml in elements],
+                    lambda i: watcher.post(
+                        lambda: progress.setValue(offset + i))),
+                lambda future: self.__stored(
+                    future, elements, failures, progress))
         else:
-            self.receiver.componentList.populateElements()
+            self.__stored(None, elements, failures, progress)
 
         logger.debug("EXEC componentStoreAll")
 
+    # updates the stored components
+    # \brief It is called in the GUI thread when the storing is done
+    # \param future future of the store operation or None
+    # \param elements list of (element, name, xml) tuples
+    # \param failures dictionary with name : error
+    # \param progress progress dialog
+    def __stored(self, future, elements, failures, progress):
+        if future is not None and not future.cancelled():
+            self.receiver.disableServer(
+                not self.receiver.configServer.connected)
+            try:
+                stored, skipped, errors = future.result()
+                failures.update(errors)
+                logger.info("stored components: %s, unchanged: %s" % (
+                    len(stored), len(skipped)))
+                for el, name, xml in elements:
+                    if name not in errors:
+                        el.instance.savedXML = xml
+                        el.savedName = el.name
+            except Exception as e:
+                for _, name, _ in elements:
+                    failures[name] = unicode(e)
+        progress.setValue(progress.maximum())
+        progress.close()
+        if failures:
+            QMessageBox.warning(
+                self.receiver, "Error in storing the components",
+                "\n".join("%s: %s" % (name, failures[name])
+                          for name in sorted(failures)))
+        if hasattr(self._cp, "id"):
+            self.receiver.componentList.populateElements(self._cp.id)
+        else:
+            self.receiver.componentList.populateElements()
+
     # unexecutes the command
     # \brief It does nothing
     def undo(self):
@@ -1197,12 +1517,14 @@ class ServerStoreAllDataSources(QUndoCommand):
         keys = list(self.receiver.sourceList.elements.keys())
         progress = QProgressDialog(
             "Storing DataSource elements",
-            "", 0, len(keys), self.receiver.sourceList)
+            "", 0, 2 * len(keys), self.receiver.sourceList)
         progress.setWindowTitle("Store All DataSources")
         progress.setWindowModality(Qt.WindowModal)
         progress.setCancelButton(None)
         progress.show()
 
+        failures = {}
+        elements = []
         for i in range(len(keys)):
             ids = keys[i]
             ds = self.receiver.sourceList.elements[ids]
@@ -1215,44 +1537,78 @@ class ServerStoreAllDataSources(QUndoCommand):
                 ds.instance = dsEdit
             logger.debug("Store %s" % ds.instance.name)
 
+            if ds.instance.name:
+                name = ds.instance.dataSourceName
+            else:
+                name = ds.instance.name
             try:
-                xml = ds.instance.get()
-                if not self.receiver.configServer.connected:
-                    QMessageBox.information(
-                        self.receiver,
-                        "Connecting to Configuration Server",
-                        "Connecting to %s on %s:%s" % (
-                            self.receiver.configServer.device,
-                            self.receiver.configServer.host,
-                            self.receiver.configServer.port
-                        )
-                    )
-                self.receiver.configServer.connect()
-                self.receiver.disableServer(False)
-                if ds.instance.name:
-                    self.receiver.configServer.storeDataSource(
-                        ds.instance.dataSourceName, xml)
-                else:
-                    self.receiver.configServer.storeDataSource(
-                        ds.instance.name, xml)
-                ds.instance.savedXML = xml
-                ds.savedName = ds.name
+                elements.append((ds, name, ds.instance.get()))
             except Exception as e:
-                QMessageBox.warning(
-                    self.receiver, "Error in datasource storing",
-                    unicode(e))
-
+                failures[name] = unicode(e)
             progress.setValue(i)
-        progress.setValue(len(keys))
+
+        if elements:
+            if not self.receiver.configServer.connected:
+                QMessageBox.information(
+                    self.receiver,
+                    "Connecting to Configuration Server",
+                    "Connecting to %s on %s:%s" % (
+                        self.receiver.configServer.device,
+                        self.receiver.configServer.host,
+                        self.receiver.configServer.port
+                    )
+                )
+            watcher = self.receiver.serverWatcher
+            offset = len(keys)
+            self.receiver.serverWatcher.watch(
+                self.receiver.asyncServer.submit(
+                    _connectAndCall, self.receiver.configServer,
+                    "storeDataSources",
+                    [(name, xml) for _, name, xml in elements],
+                    lambda i: watcher.post(
+                        lambda: progress.setValue(offset + i))),
+                lambda future: self.__stored(
+                    future, elements, failures, progress))
+        else:
+            self.__stored(None, elements, failures, progress)
+
+        logger.debug("EXEC dsourceStoreAll")
+
+    # updates the stored datasources
+    # \brief It is called in the GUI thread when the storing is done
+    # \param future future of the store operation or None
+    # \param elements list of (element, name, xml) tuples
+    # \param failures dictionary with name : error
+    # \param progress progress dialog
+    def __stored(self, future, elements, failures, progress):
+        if future is not None and not future.cancelled():
+            self.receiver.disableServer(
+                not self.receiver.configServer.connected)
+            try:
+                stored, skipped, errors = future.result()
+                failures.update(errors)
+                logger.info("stored datasources: %s, unchanged: %s" % (
+                    len(stored), len(skipped)))
+                for el, name, xml in elements:
+                    if name not in errors:
+                        el.instance.savedXML = xml
+                        el.savedName = el.name
+            except Exception as e:
+                for _, name, _ in elements:
+                    failures[name] = unicode(e)
+        progress.setValue(progress.maximum())
         progress.close()
+        if failures:
+            QMessageBox.warning(
+                self.receiver, "Error in datasource storing",
+                "\n".join("%s: %s" % (name, failures[name])
+                          for name in sorted(failures)))
         ds = self.receiver.sourceList.currentListElement()
         if hasattr(ds, "id"):
             self.receiver.sourceList.populateElements(ds.id)
         else:
             self.receiver.sourceList.populateElements()
 
-        logger.debug("EXEC dsourceStoreAll")
-
     # executes the command
     # \brief It does nothing
     def undo(self):
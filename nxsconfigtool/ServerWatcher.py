@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2017 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+# \package nxsconfigtool nexdatas
+# \file ServerWatcher.py
+# bridge between the asynchronous server client and the Qt event loop
+
+""" bridge between the asynchronous server client and the Qt event loop """
+
+from PyQt5.QtCore import (QObject, Qt, pyqtSignal)
+
+import logging
+# message logger
+logger = logging.getLogger("nxsdesigner")
+
+
+# watcher calling Qt slots when server operations are done
+# \brief The done callbacks of futures are called in the worker thread,
+#        the queued signals deliver them to the GUI thread
+class ServerWatcher(QObject):
+
+    # emitted with the done future
+    finished = pyqtSignal(object)
+
+    # emitted with a function to call in the GUI thread
+    posted = pyqtSignal(object)
+
+    # constructor
+    # \param parent parent object
+    def __init__(self, parent=None):
+        QObject.__init__(self, parent)
+        # watched futures, i.e. {id(future): (future, slot)}
+        self.__watched = {}
+        # futures of tagged operations, i.e. {tag: future}
+        self.__tags = {}
+        self.finished.connect(self.__finish, Qt.QueuedConnection)
+        self.posted.connect(self.__call, Qt.QueuedConnection)
+
+    # watches the given future
+    # \param future future of the server operation
+    # \param slot function called in the GUI thread with the done future
+    # \param tag operation tag, the previous not finished operation
+    #        with the same tag is cancelled
+    def watch(self, future, slot, tag=None):
+        if tag is not None:
+            self.cancel(tag)
+            self.__tags[tag] = future
+        self.__watched[id(future)] = (future, slot)
+        future.addDoneCallback(self.finished.emit)
+
+    # cancels the operation with the given tag
+    # \param tag operation tag
+    def cancel(self, tag):
+        future = self.__tags.pop(tag, None)
+        if future is not None:
+            future.cancel()
+
+    # checks if any watched operation is not finished
+    # \param tag operation tag, all operations if None
+    # \returns True if the operation is not finished
+    def busy(self, tag=None):
+        if tag is None:
+            return bool(self.__watched)
+        return tag in self.__tags
+
+    # calls the given function in the GUI thread
+    # \brief It can be called from the worker thread
+    # \param function function without arguments
+    def post(self, function):
+        self.posted.emit(function)
+
+    # calls the slot of the done future
+    # \param future the done future
+    def __finish(self, future):
+        _, slot = self.__watched.pop(id(future), (None, None))
+        for tag, tfuture in list(self.__tags.items()):
+            if tfuture is future:
+                self.__tags.pop(tag)
+        if slot is not None:
+            try:
+                slot(future)
+            except Exception as e:
+                logger.warning("server slot error: %s" % e)
+
+    # calls the posted function
+    # \param function function without arguments
+    def __call(self, function):
+        function()
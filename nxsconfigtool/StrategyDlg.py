@@ -21,13 +21,12 @@
 
 """ strategy widget """
 
-import os
 import sys
 
 from PyQt5.QtCore import (QModelIndex)
-from PyQt5 import uic
 
 # from .ui.ui_strategydlg import Ui_StrategyDlg
+from .UiLoader import UiForm
 from .NodeDlg import NodeDlg
 from .DomTools import DomTools
 
@@ -35,9 +34,7 @@ import logging
 # message logger
 logger = logging.getLogger("nxsdesigner")
 
-_formclass, _baseclass = uic.loadUiType(
-    os.path.join(os.path.dirname(os.path.abspath(__file__)),
-                 "ui", "strategydlg.ui"))
+_formclass = UiForm("strategydlg")
 
 if sys.version_info > (3,):
     unicode = str
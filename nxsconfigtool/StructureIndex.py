@@ -0,0 +1,387 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2017 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+# \package nxsconfigtool nexdatas
+# \file StructureIndex.py
+# structural search in element documents
+
+""" structural search in element documents """
+
+import re
+import sys
+import xml.etree.ElementTree as et
+
+if sys.version_info > (3,):
+    unicode = str
+
+
+# tokens of structural queries
+_queryTokens = re.compile(
+    r"\s*(?:(//|/|\[|\]|\(|\)|,|!=|=|@|\*|\.)"
+    r"|'([^']*)'|\"([^\"]*)\"|([A-Za-z_][\w\-]*(?::[\w\-]+)?))")
+
+
+# structural query, i.e. a subset of XPath
+# \brief Supported are steps with tag names or *, separated by / for
+#        children or // for descendants, and predicates [@attr],
+#        [@attr='value'], [@attr!='value'], [text()='value'],
+#        [contains(@attr, 'value')], [contains(text(), 'value')]
+#        and relative paths like [.//device[@name='p09/mca/1']]
+#        joined by 'and'. Queries not starting with / match anywhere
+class Query(object):
+
+    # constructor
+    # \param text query text
+    # \throws ValueError if the query is not valid
+    def __init__(self, text):
+        # query text
+        self.text = unicode(text or "")
+        # query tokens
+        self.__tokens = []
+        # current token position
+        self.__pos = 0
+        for match in _queryTokens.finditer(self.text):
+            if match.group(1):
+                self.__tokens.append(("op", match.group(1)))
+            elif match.group(4):
+                self.__tokens.append(("name", match.group(4)))
+            elif match.group(2) is not None or match.group(3) is not None:
+                self.__tokens.append(
+                    ("literal", match.group(2)
+                     if match.group(2) is not None else match.group(3)))
+        if re.sub(_queryTokens, "", self.text).strip():
+            raise ValueError("Invalid characters in query: %s" % self.text)
+        # list of (axis, tag, predicates) tuples
+        self.steps = self.__path(True)
+        if self.__pos < len(self.__tokens):
+            raise ValueError("Unexpected '%s' in query: %s" % (
+                self.__tokens[self.__pos][1], self.text))
+
+    # provides the current token
+    # \returns (kind, value) tuple or (None, None) at the end
+    def __peek(self):
+        if self.__pos < len(self.__tokens):
+            return self.__tokens[self.__pos]
+        return None, None
+
+    # takes the current token
+    # \param kind expected token kind
+    # \param value expected token value
+    # \returns token value
+    def __take(self, kind=None, value=None):
+        tkind, tvalue = self.__peek()
+        if tkind is None or (kind and tkind != kind) \
+                or (value and tvalue != value):
+            raise ValueError("Expected '%s' in query: %s" % (
+                value or kind, self.text))
+        self.__pos += 1
+        return tvalue
+
+    # parses a location path
+    # \param absolute if the path is not relative to a context node
+    # \returns list of (axis, tag, predicates) tuples
+    def __path(self, absolute):
+        steps = []
+        kind, value = self.__peek()
+        if not absolute and (kind, value) == ("op", "."):
+            self.__take()
+            kind, value = self.__peek()
+            axis = "descendant" if value == "//" else "child"
+            self.__take("op")
+        elif value in ["/", "//"]:
+            axis = "descendant" if value == "//" else "child"
+            self.__take()
+        else:
+            axis = "descendant" if absolute else "child"
+        while True:
+            steps.append(self.__step(axis))
+            kind, value = self.__peek()
+            if (kind, value) not in [("op", "/"), ("op", "//")]:
+                return steps
+            axis = "descendant" if value == "//" else "child"
+            self.__take()
+
+    # parses a location step
+    # \param axis step axis, i.e. child or descendant
+    # \returns (axis, tag, predicates) tuple
+    def __step(self, axis):
+        kind, value = self.__peek()
+        if (kind, value) == ("op", "*"):
+            tag = self.__take()
+        else:
+            tag = self.__take("name")
+        predicates = []
+        while self.__peek() == ("op", "["):
+            self.__take()
+            predicates.append(self.__predicate())
+            while self.__peek() == ("name", "and"):
+                self.__take()
+                predicates.append(self.__predicate())
+            self.__take("op", "]")
+        return axis, tag, predicates
+
+    # parses an operand, i.e. @attribute or text()
+    # \returns ("attr", name) or ("text", None) tuple
+    def __operand(self):
+        if self.__peek() == ("op", "@"):
+            self.__take()
+            return "attr", self.__take("name")
+        self.__take("name", "text")
+        self.__take("op", "(")
+        self.__take("op", ")")
+        return "text", None
+
+    # parses a predicate
+    # \returns (kind, name, operator, value) or ("path", steps) tuple
+    def __predicate(self):
+        kind, value = self.__peek()
+        if (kind, value) == ("name", "contains"):
+            self.__take()
+            self.__take("op", "(")
+            operand, name = self.__operand()
+            self.__take("op", ",")
+            literal = self.__take("literal")
+            self.__take("op", ")")
+            return operand, name, "contains", literal
+        if (kind, value) == ("op", "@") or (
+                (kind, value) == ("name", "text")
+                and self.__tokens[self.__pos + 1:self.__pos + 2] ==
+                [("op", "(")]):
+            operand, name = self.__operand()
+            kind, value = self.__peek()
+            if (kind, value) in [("op", "="), ("op", "!=")]:
+                self.__take()
+                return operand, name, value, self.__take("literal")
+            if operand == "text":
+                raise ValueError(
+                    "Expected '=' after text() in query: %s" % self.text)
+            return operand, name, None, None
+        return "path", self.__path(False)
+
+
+# index of a single element document
+# \brief Elements are kept in flat lists indexed by their document order
+#        and looked up by tag and by (attribute, value)
+class DocumentIndex(object):
+
+    # constructor
+    # \param xml XML string
+    # \throws et.ParseError if the XML is not valid
+    def __init__(self, xml):
+        # element tags
+        self.tags = []
+        # element attributes
+        self.attributes = []
+        # element texts
+        self.texts = []
+        # parent element numbers, -1 for the root
+        self.parents = []
+        # positions of elements among their sibling elements
+        self.positions = []
+        # children element numbers
+        self.children = []
+        # tag : element numbers
+        self.byTag = {}
+        # (attribute, value) : element numbers
+        self.byValue = {}
+
+        if isinstance(xml, unicode):
+            xml = xml.encode("utf-8")
+        self.__add(et.fromstring(xml), -1, 0)
+
+    # adds the element and its descendants
+    # \param element ElementTree element
+    # \param parent parent element number
+    # \param position position among the sibling elements
+    def __add(self, element, parent, position):
+        number = len(self.tags)
+        self.tags.append(element.tag)
+        self.attributes.append(dict(element.attrib))
+        self.texts.append((element.text or "").strip())
+        self.parents.append(parent)
+        self.positions.append(position)
+        self.children.append([])
+        if parent >= 0:
+            self.children[parent].append(number)
+        self.byTag.setdefault(element.tag, []).append(number)
+        for name, value in element.attrib.items():
+            self.byValue.setdefault((name, value), []).append(number)
+        for pos, child in enumerate(
+                ch for ch in element if isinstance(ch.tag, str)):
+            self.__add(child, number, pos)
+
+    # provides the path of the element
+    # \param number element number
+    # \returns list of (position among sibling elements, tag) tuples
+    def path(self, number):
+        path = []
+        while number >= 0:
+            path.insert(0, (self.positions[number], self.tags[number]))
+            number = self.parents[number]
+        return path
+
+    # checks the predicate
+    # \param number element number
+    # \param predicate predicate tuple of Query
+    # \returns True if the predicate holds
+    def __check(self, number, predicate):
+        if predicate[0] == "path":
+            return bool(self.__descend([number], predicate[1]))
+        kind, name, operator, value = predicate
+        if kind == "attr":
+            current = self.attributes[number].get(name)
+            if current is None:
+                return False
+        else:
+            current = self.texts[number]
+        if operator is None:
+            return True
+        if operator == "=":
+            return current == value
+        if operator == "!=":
+            return current != value
+        return value in current
+
+    # checks if the element matches the step tag and predicates
+    # \param number element number
+    # \param step (axis, tag, predicates) tuple
+    # \returns True if the element matches
+    def __match(self, number, step):
+        return (step[1] == "*" or self.tags[number] == step[1]) \
+            and all(self.__check(number, pred) for pred in step[2])
+
+    # provides all descendants of the element
+    # \param number element number
+    # \returns list of element numbers
+    def __descendants(self, number):
+        found = []
+        stack = list(reversed(self.children[number]))
+        while stack:
+            child = stack.pop()
+            found.append(child)
+            stack.extend(reversed(self.children[child]))
+        return found
+
+    # follows the relative path from the given elements
+    # \param numbers context element numbers
+    # \param steps list of (axis, tag, predicates) tuples
+    # \returns list of found element numbers
+    def __descend(self, numbers, steps):
+        for step in steps:
+            found = []
+            for number in numbers:
+                candidates = self.children[number] if step[0] == "child" \
+                    else self.__descendants(number)
+                found.extend(ch for ch in candidates
+                             if self.__match(ch, step))
+            numbers = found
+            if not numbers:
+                break
+        return numbers
+
+    # checks if ancestors of the element match the preceding steps
+    # \param number element number matching the step
+    # \param steps list of (axis, tag, predicates) tuples
+    # \param index index of the step
+    # \returns True if the ancestors match
+    def __ascend(self, number, steps, index):
+        axis = steps[index][0]
+        parent = self.parents[number]
+        if index == 0:
+            return axis == "descendant" or parent < 0
+        while parent >= 0:
+            if self.__match(parent, steps[index - 1]) \
+                    and self.__ascend(parent, steps, index - 1):
+                return True
+            if axis == "child":
+                return False
+            parent = self.parents[parent]
+        return False
+
+    # finds elements matching the query
+    # \param query Query instance
+    # \returns list of element numbers in document order
+    def find(self, query):
+        last = query.steps[-1]
+        candidates = None
+        for pred in last[2]:
+            if pred[0] == "attr" and pred[2] == "=":
+                candidates = self.byValue.get((pred[1], pred[3]), [])
+                break
+        if candidates is None:
+            candidates = range(len(self.tags)) if last[1] == "*" \
+                else self.byTag.get(last[1], [])
+        return [number for number in candidates
+                if self.__match(number, last)
+                and self.__ascend(number, query.steps, len(query.steps) - 1)]
+
+
+# structural index of element documents
+class StructureIndex(object):
+
+    # constructor
+    def __init__(self):
+        # key : DocumentIndex or None if the document is not valid
+        self.__documents = {}
+
+    # sets the document
+    # \param key document key, e.g. element id
+    # \param xml XML string or None to remove the document
+    def update(self, key, xml):
+        if xml is None:
+            self.remove(key)
+            return
+        try:
+            self.__documents[key] = DocumentIndex(xml)
+        except Exception:
+            self.__documents[key] = None
+
+    # removes the document
+    # \param key document key
+    def remove(self, key):
+        self.__documents.pop(key, None)
+
+    # removes all documents
+    def clear(self):
+        self.__documents = {}
+
+    # checks if the document is indexed
+    # \param key document key
+    # \returns True if the document is indexed
+    def contains(self, key):
+        return key in self.__documents
+
+    # provides the document index
+    # \param key document key
+    # \returns DocumentIndex or None
+    def document(self, key):
+        return self.__documents.get(key)
+
+    # finds elements matching the query
+    # \param query query text or Query instance
+    # \returns list of (key, path) tuples where path is a list of
+    #          (position among sibling elements, tag) tuples
+    # \throws ValueError if the query is not valid
+    def search(self, query):
+        if not isinstance(query, Query):
+            query = Query(query)
+        found = []
+        for key, document in self.__documents.items():
+            if document is not None:
+                found.extend((key, document.path(number))
+                             for number in document.find(query))
+        return found
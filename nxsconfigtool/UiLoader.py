@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2017 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+# \package nxsconfigtool nexdatas
+# \file UiLoader.py
+# loader of forms defined in ui files
+
+""" loader of forms defined in ui files """
+
+import importlib
+import os
+
+import logging
+# message logger
+logger = logging.getLogger("nxsdesigner")
+
+
+# directory with ui files
+UIDIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ui")
+
+# loaded form classes, i.e. ui file name : form class
+_forms = {}
+
+
+# provides the form class precompiled by setup.py build
+# \brief The form module is skipped if it is older than its ui file
+# \param name ui file name without extension
+# \returns form class or None
+def _precompiledForm(name):
+    path = os.path.join(UIDIR, "ui_%s.py" % name)
+    try:
+        if os.path.getmtime(path) < os.path.getmtime(
+                os.path.join(UIDIR, "%s.ui" % name)):
+            return None
+        module = importlib.import_module(
+            "%s.ui.ui_%s" % (__name__.rpartition(".")[0], name))
+    except Exception:
+        return None
+    for key, value in vars(module).items():
+        if key.startswith("Ui_") and isinstance(value, type):
+            return value
+
+
+# provides the form class compiled from the ui file
+# \param name ui file name without extension
+# \returns form class
+def _compiledForm(name):
+    from PyQt5 import uic
+    logger.debug("compiling %s.ui" % name)
+    return uic.loadUiType(os.path.join(UIDIR, "%s.ui" % name))[0]
+
+
+# provides the form class of the ui file
+# \brief The form is loaded on the first call only
+# \param name ui file name without extension
+# \returns form class
+def formClass(name):
+    if name not in _forms:
+        _forms[name] = _precompiledForm(name) or _compiledForm(name)
+    return _forms[name]
+
+
+# form class which is loaded on the first instantiation
+class UiForm(object):
+
+    # constructor
+    # \param name ui file name without extension
+    def __init__(self, name):
+        # ui file name without extension
+        self.name = name
+
+    # creates the form
+    # \returns form instance
+    def __call__(self):
+        return formClass(self.name)()
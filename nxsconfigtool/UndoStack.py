@@ -0,0 +1,174 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2017 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+# \package nxsconfigtool nexdatas
+# \file UndoStack.py
+# undo stack with limited history
+
+""" undo stack with limited history """
+
+import sys
+
+from PyQt5.QtCore import (QObject, pyqtSignal)
+from PyQt5.QtWidgets import QUndoStack
+
+from .LabeledObject import LabeledObject
+
+import logging
+# message logger
+logger = logging.getLogger("nxsdesigner")
+
+if sys.version_info > (3,):
+    unicode = str
+
+
+# provides a human readable size
+# \param size size in bytes
+# \returns size string
+def formatSize(size):
+    for unit in ["B", "kB", "MB"]:
+        if size < 1024:
+            return "%.0f %s" % (size, unit) if unit == "B" \
+                else "%.1f %s" % (size, unit)
+        size /= 1024.
+    return "%.1f GB" % size
+
+
+# undo stack with the history limited by a number of commands
+#  and by their estimated memory
+# \brief Commands exceeding the memory budget are released, i.e. their
+#        references are dropped and Qt removes them from the stack without
+#        executing when they are reached by undo
+class UndoStack(QUndoStack):
+
+    # emitted with a number of commands and their estimated size in bytes
+    memoryChanged = pyqtSignal(int, object)
+
+    # constructor
+    # \param receiver main window with component and datasource lists
+    # \param maxCommands maximal number of commands, no limit if 0
+    # \param maxBytes maximal estimated size of commands, no limit if 0
+    # \param parent parent object
+    def __init__(self, receiver=None, maxCommands=0, maxBytes=0,
+                 parent=None):
+        QUndoStack.__init__(self, parent)
+        # main window with component and datasource lists
+        self.receiver = receiver
+        # maximal estimated size of commands in bytes, no limit if 0
+        self.maxBytes = maxBytes
+        # number of commands and their estimated size in bytes
+        self.__usage = (0, 0)
+        if maxCommands:
+            self.setUndoLimit(maxCommands)
+        self.indexChanged.connect(self.__update)
+
+    # provides the memory used by the undo history
+    # \returns (number of commands, estimated size in bytes) tuple
+    def usage(self):
+        return self.__usage
+
+    # releases the command
+    # \brief It drops all references of the command and marks it obsolete
+    # \param command undo command
+    @classmethod
+    def release(cls, command):
+        command.setObsolete(True)
+        command.__dict__.clear()
+
+    # provides instances of the component and datasource lists
+    # \returns set with ids of the listed labeled objects
+    def __listed(self):
+        listed = set()
+        for name in ["componentList", "sourceList"]:
+            elements = getattr(
+                getattr(self.receiver, name, None), "elements", None) or {}
+            listed.update(id(el) for el in elements.values())
+        return listed
+
+    # estimates memory used by the given value
+    # \param value estimated value
+    # \param listed ids of objects kept by the lists
+    # \param seen ids of already estimated objects
+    # \param depth depth of nested containers
+    # \returns size in bytes
+    @classmethod
+    def _estimate(cls, value, listed, seen, depth=0):
+        if id(value) in seen or depth > 16:
+            return 0
+        seen.add(id(value))
+        size = sys.getsizeof(value, 64)
+        if isinstance(value, (list, tuple, set, frozenset)):
+            size += sum(cls._estimate(item, listed, seen, depth + 1)
+                        for item in value)
+        elif isinstance(value, dict):
+            size += sum(cls._estimate(key, listed, seen, depth + 1) +
+                        cls._estimate(item, listed, seen, depth + 1)
+                        for key, item in value.items())
+        elif isinstance(value, LabeledObject) and id(value) not in listed:
+            document = getattr(value.loadedInstance(), "document", None)
+            if hasattr(document, "toString"):
+                size += 2 * len(document.toString(0))
+        return size
+
+    # estimates memory used by the command
+    # \brief Objects which are also kept by the component and datasource
+    #        lists or which are Qt objects are not counted
+    # \param command undo command
+    # \param listed ids of objects kept by the lists
+    # \returns size in bytes
+    def estimate(self, command, listed=None):
+        if listed is None:
+            listed = self.__listed()
+        seen = set()
+        size = sys.getsizeof(command)
+        for name, value in command.__dict__.items():
+            if name != "receiver" and not isinstance(value, QObject):
+                size += self._estimate(value, listed, seen)
+        return size
+
+    # updates the memory usage and releases the oldest commands
+    #  exceeding the budget
+    # \param index index of the current command
+    def __update(self, index=None):
+        index = self.index()
+        if index > 0 and self.command(index - 1).isObsolete():
+            self.undo()
+            return
+        listed = None
+        sizes = []
+        for i in range(self.count()):
+            command = self.command(i)
+            if command.isObsolete():
+                continue
+            if not hasattr(command, "_undoSize"):
+                if listed is None:
+                    listed = self.__listed()
+                command._undoSize = self.estimate(command, listed)
+            sizes.append((i, command, command._undoSize))
+        total = sum(size for _, _, size in sizes)
+        released = 0
+        if self.maxBytes:
+            for i, command, size in sizes:
+                if total <= self.maxBytes or i >= index - 1:
+                    break
+                self.release(command)
+                total -= size
+                released += 1
+        if released:
+            logger.debug("released %s undo commands" % released)
+        self.__usage = (len(sizes) - released, total)
+        self.memoryChanged.emit(*self.__usage)
@@ -135,12 +135,12 @@ class WindowsSlots(object):
     # restores all windows
     # \brief It restores all windows in MDI
     def gotoComponentList(self):
-        self.main.componentList.ui.elementListWidget.setFocus()
+        self.main.componentList.ui.elementListView.setFocus()
 
     # restores all windows
     # \brief It restores all windows in MDI
     def gotoDataSourceList(self):
-        self.main.sourceList.ui.elementListWidget.setFocus()
+        self.main.sourceList.ui.elementListView.setFocus()
 
     # activates the next subwindow
     def activateNextSubWindow(self):
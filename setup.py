@@ -85,11 +85,40 @@ class toolBuild(build_py):
             sys.stderr.write("Error: Cannot build  %s\n" % (rccfile))
             sys.stderr.flush()
 
+    @classmethod
+    def makeui(cls, ufile, path):
+        """  creates the python form modules
+
+        :param ufile: ui file name
+        :param path:  ui file path
+        """
+        from PyQt5 import uic
+        uifile = os.path.join(path, "%s.ui" % ufile)
+        pyfile = os.path.join(path, "ui_%s.py" % ufile)
+
+        try:
+            with open(pyfile, "w") as fl:
+                uic.compileUi(uifile, fl)
+            print("Built: %s -> %s" % (uifile, pyfile))
+        except Exception as e:
+            sys.stderr.write("Error: Cannot build  %s: %s\n" % (pyfile, e))
+            sys.stderr.flush()
+
     def run(self):
         """ runner
 
         :\brief: It is running during building
         """
+        try:
+            ufiles = [(ufile[:-3], UIDIR) for ufile
+                      in os.listdir(UIDIR) if ufile.endswith('.ui')]
+            for ui in ufiles:
+                if not ui[0] in (".", ".."):
+                    self.makeui(ui[0], ui[1])
+        except ImportError:
+            sys.stderr.write("No PyQt5 uic to build .ui files\n")
+            sys.stderr.flush()
+
         try:
             qfiles = [(qfile[:-4], QRCDIR) for qfile
                       in os.listdir(QRCDIR) if qfile.endswith('.qrc')]
@@ -121,6 +150,12 @@ class toolClean(clean):
         for fl in cfiles:
             os.remove(str(fl))
 
+        ufiles = [os.path.join(UIDIR, ufile) for ufile
+                  in os.listdir(UIDIR)
+                  if ufile.startswith('ui_') and ufile.endswith('.py')]
+        for fl in ufiles:
+            os.remove(str(fl))
+
         if get_platform()[:3] == 'win':
             for script in SCRIPTS:
                 if os.path.exists(script + ".pyw"):
@@ -181,7 +216,7 @@ SETUPDATA = dict(
     url="https://github.com/nexdatas/nxsdesigner/",
     install_requires=install_requires,
     platforms=["Linux", "Windows", "MacOS"],
-    packages=[TOOL, QRCDIR],
+    packages=[TOOL, UIDIR, QRCDIR],
     package_data=package_data,
     scripts=get_scripts(SCRIPTS),
     zip_safe=False,
@@ -0,0 +1,290 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2017 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+# \package test nexdatas
+# \file AsyncServerTest.py
+# unittests for the asynchronous configuration server client
+#
+import unittest
+import sys
+import time
+import threading
+
+from nxsconfigtool.AsyncServer import (
+    AsyncServer, Future, CancelledError, TimeoutError)
+from nxsconfigtool.ConfigurationServer import ConfigurationServer
+
+
+# local fake of the configuration server device
+class FakeDevice(object):
+
+    # constructor
+    def __init__(self):
+        # stored components
+        self.components = {"cp1": "<definition/>", "cp2": "<group/>"}
+        # stored datasources
+        self.datasources = {"ds1": "<datasource/>"}
+        # XML string attribute
+        self.XMLString = ""
+        # event blocking the commands
+        self.gate = threading.Event()
+        self.gate.set()
+        # executed commands
+        self.commands = []
+        # names of elements which cannot be fetched
+        self.broken = set()
+
+    # executes the command
+    # \param command command name
+    # \param argin command argument
+    # \returns command result
+    def command_inout(self, command, argin=None):
+        self.gate.wait()
+        self.commands.append(command)
+        if command == "AvailableComponents":
+            return sorted(self.components.keys())
+        elif command == "AvailableDataSources":
+            return sorted(self.datasources.keys())
+        elif command == "Components":
+            self.check(argin)
+            return [self.components[name] for name in argin]
+        elif command == "DataSources":
+            self.check(argin)
+            return [self.datasources[name] for name in argin]
+        elif command == "StoreComponent":
+            self.components[argin] = self.XMLString
+        elif command == "MandatoryComponents":
+            raise Exception("Device is not responding")
+
+    # checks if the elements can be fetched
+    # \param names element names
+    def check(self, names):
+        broken = self.broken.intersection(names)
+        if broken:
+            raise Exception("Cannot fetch %s" % sorted(broken))
+
+
+# local fake of the device connection manager
+class FakeManager(object):
+
+    # constructor
+    def __init__(self):
+        # names of closed devices
+        self.closed = []
+
+    # closes the device connection
+    # \param name device name
+    def close(self, name):
+        self.closed.append(name)
+
+
+# test fixture
+class AsyncServerTest(unittest.TestCase):
+
+    # constructor
+    # \param methodName name of the test method
+    def __init__(self, methodName):
+        unittest.TestCase.__init__(self, methodName)
+
+    # test starter
+    # \brief Common set up
+    def setUp(self):
+        print("\nsetting up...")
+        self.device = FakeDevice()
+        self.server = ConfigurationServer()
+        self.server._proxy = self.device
+        self.server.connected = True
+        self.client = AsyncServer(self.server)
+
+    # test closer
+    # \brief Common tear down
+    def tearDown(self):
+        print("tearing down ...")
+        self.device.gate.set()
+        self.client.shutdown()
+
+    def test_future(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        done = []
+        future = Future(lambda a, b=1: a + b, (2,), {"b": 3})
+        self.assertTrue(not future.done())
+        self.assertRaises(TimeoutError, future.result, 0.01)
+        future.addDoneCallback(done.append)
+        future.run()
+        self.assertTrue(future.done())
+        self.assertEqual(future.result(), 5)
+        self.assertEqual(future.exception(), None)
+        self.assertEqual(done, [future])
+        future.addDoneCallback(done.append)
+        self.assertEqual(done, [future, future])
+        self.assertTrue(not future.cancel())
+
+        future = Future(lambda: 1)
+        self.assertTrue(future.cancel())
+        future.run()
+        self.assertTrue(future.cancelled())
+        self.assertRaises(CancelledError, future.result)
+
+    def test_fetch(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        cps = self.client.fetchComponents()
+        dss = self.client.fetchDataSources()
+        self.assertEqual(cps.result(5), self.device.components)
+        self.assertEqual(dss.result(5), self.device.datasources)
+        self.assertTrue(self.server.isStored(
+            "components", "cp1", "<definition/>"))
+        self.assertEqual(self.client.pending(), 0)
+
+    def test_fetch_chunks(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        chunks = []
+        self.device.components = dict(
+            ("cp%s" % i, "<definition>%s</definition>" % i)
+            for i in range(100))
+        self.device.broken = set(["cp13", "cp77"])
+        self.server.chunkSize = 8
+        cps = self.client.fetchComponents(chunks.append)
+        result = cps.result(5)
+        self.assertEqual(len(result), 100)
+        self.assertEqual(result["cp13"], "")
+        self.assertEqual(result["cp77"], "")
+        self.assertEqual(result["cp14"], "<definition>14</definition>")
+        self.assertTrue(len(chunks) > 1)
+        self.assertTrue(max(len(chunk) for chunk in chunks) <= 8)
+        streamed = {}
+        for chunk in chunks:
+            streamed.update(chunk)
+        self.assertEqual(streamed, result)
+        self.assertTrue(not self.server.isStored("components", "cp13", ""))
+
+        chunks = []
+        self.device.broken = set()
+        dss = self.client.fetchDataSources(chunks.append)
+        self.assertEqual(dss.result(5), self.device.datasources)
+        self.assertEqual(chunks, [self.device.datasources])
+
+    def test_store(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        future = self.client.storeComponents(
+            [("cp3", "<definition/>"), ("cp4", "<group/>")])
+        self.assertEqual(future.result(5), (["cp3", "cp4"], [], {}))
+        self.assertEqual(self.device.components["cp4"], "<group/>")
+
+        future = self.client.getMandatory()
+        self.assertTrue(isinstance(future.exception(5), Exception))
+        self.assertRaises(Exception, future.result)
+
+    def test_nonblocking(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        done = []
+        self.device.gate.clear()
+        first = self.client.fetchComponents()
+        second = self.client.fetchDataSources()
+        second.addDoneCallback(done.append)
+        self.assertTrue(not first.done())
+        self.assertEqual(self.client.pending(), 2)
+
+        self.assertTrue(second.cancel())
+        self.assertTrue(second.cancelled())
+        self.assertEqual(done, [second])
+        self.assertEqual(self.client.pending(), 1)
+
+        self.device.gate.set()
+        self.assertEqual(first.result(5), self.device.components)
+        self.assertTrue("AvailableDataSources" not in self.device.commands)
+
+    def test_cancel_running(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        done = threading.Event()
+        self.device.gate.clear()
+        future = self.client.fetchComponents()
+        future.addDoneCallback(lambda ft: done.set())
+        while not future.running():
+            time.sleep(0.001)
+        self.client.cancelAll()
+        self.assertTrue(future.cancelled())
+        self.assertTrue(not done.is_set())
+        self.device.gate.set()
+        self.assertTrue(done.wait(5))
+        self.assertRaises(CancelledError, future.result)
+
+    def test_wait(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        self.assertTrue(self.client.wait(0))
+        self.device.gate.clear()
+        future = self.client.fetchComponents()
+        while not future.running():
+            time.sleep(0.001)
+        self.client.cancelAll()
+        self.assertTrue(not self.client.wait(0.01))
+        self.assertEqual(self.client.pending(), 1)
+        self.device.gate.set()
+        self.assertTrue(self.client.wait(5))
+        self.assertEqual(self.client.pending(), 0)
+
+    def test_shutdown(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        self.assertTrue(self.client.shutdown(timeout=1))
+        self.device.gate.clear()
+        future = self.client.fetchComponents()
+        while not future.running():
+            time.sleep(0.001)
+        self.assertTrue(not self.client.shutdown(timeout=0.01))
+        self.assertTrue(future.cancelled())
+        self.device.gate.set()
+        self.assertTrue(self.client.wait(5))
+
+    def test_lock(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        closed = threading.Event()
+        self.server.manager = FakeManager()
+        self.device.gate.clear()
+        future = self.client.fetchComponents()
+        while not future.running():
+            time.sleep(0.001)
+        thread = threading.Thread(
+            target=lambda: (self.server.close(), closed.set()))
+        thread.start()
+        self.assertTrue(not closed.wait(0.05))
+        self.assertTrue(self.server.connected)
+        self.device.gate.set()
+        self.assertTrue(closed.wait(5))
+        thread.join()
+        self.assertEqual(future.result(5), self.device.components)
+        self.assertTrue(not self.server.connected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,200 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2017 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+# \package test nexdatas
+# \file BatchProcessorTest.py
+# unittests for headless merging and validation of components
+#
+import unittest
+import os
+import sys
+import io
+import json
+import shutil
+import tempfile
+
+from nxsconfigtool import BatchProcessor
+from nxsconfigtool.ElementData import parseComponent
+
+# Qt application
+app = None
+
+
+# test fixture
+class BatchProcessorTest(unittest.TestCase):
+
+    # constructor
+    # \param methodName name of the test method
+    def __init__(self, methodName):
+        unittest.TestCase.__init__(self, methodName)
+
+        # component files, i.e. name : xml
+        self.files = {
+            "valid.xml":
+            '<definition><group type="NXentry" name="entry">'
+            '<field name="a" type="NX_INT"/></group></definition>',
+            "merged.xml":
+            '<definition><group type="NXentry" name="entry">'
+            '<field name="a" type="NX_INT"/><field name="b"/>'
+            '<field name="a" units="mm"/></group></definition>',
+            "conflict.xml":
+            '<definition><group type="NXentry" name="entry">'
+            '<field name="a" type="NX_INT"/>'
+            '<field name="a" type="NX_FLOAT"/></group></definition>',
+            "broken.xml": '<definition><group>',
+            "source.ds.xml":
+            '<definition><datasource type="CLIENT" name="s">'
+            '<record name="r"/></datasource></definition>',
+        }
+        # temporary component directory
+        self.directory = None
+
+    # test starter
+    # \brief Common set up
+    def setUp(self):
+        print("\nsetting up...")
+        self.directory = tempfile.mkdtemp()
+        for name, xml in self.files.items():
+            with io.open(os.path.join(self.directory, name), "w",
+                         encoding="utf-8") as fl:
+                fl.write(xml)
+
+    # test closer
+    # \brief Common tear down
+    def tearDown(self):
+        print("tearing down ...")
+        shutil.rmtree(self.directory)
+
+    # reads the component file
+    # \param name file name
+    # \returns xml string
+    def read(self, name):
+        with io.open(os.path.join(self.directory, name), "r",
+                     encoding="utf-8") as fl:
+            return fl.read()
+
+    # runs the batch mode
+    # \param mode batch mode
+    # \param processes number of worker processes
+    # \returns (exit status, report) tuple
+    def main(self, mode, processes=1):
+        stream = io.StringIO()
+        status = BatchProcessor.main(mode, self.directory, processes, stream)
+        return status, json.loads(stream.getvalue())
+
+    # checks the report of the component directory
+    # \param report report dictionary
+    # \param mode batch mode
+    def checkReport(self, report, mode):
+        self.assertEqual(
+            sorted(report.keys()),
+            ["changed", "directory", "errors", "files", "mode", "total"])
+        self.assertEqual(report["mode"], mode)
+        self.assertEqual(report["directory"], self.directory)
+        self.assertEqual(report["total"], 4)
+        self.assertEqual(report["changed"], 1)
+        self.assertEqual(report["errors"], 2)
+        files = dict((os.path.basename(res["file"]), res)
+                     for res in report["files"])
+        self.assertEqual(
+            [os.path.basename(res["file"]) for res in report["files"]],
+            ["broken.xml", "conflict.xml", "merged.xml", "valid.xml"])
+        for res in report["files"]:
+            self.assertEqual(sorted(res.keys()),
+                             ["changed", "errors", "file", "status"])
+        self.assertEqual(files["valid.xml"]["status"], "ok")
+        self.assertEqual(files["valid.xml"]["changed"], False)
+        self.assertEqual(files["valid.xml"]["errors"], [])
+        self.assertEqual(files["merged.xml"]["status"], "ok")
+        self.assertEqual(files["merged.xml"]["changed"], True)
+        self.assertEqual(files["conflict.xml"]["status"], "error")
+        self.assertEqual(len(files["conflict.xml"]["errors"]), 1)
+        self.assertTrue("Incompatible" in files["conflict.xml"]["errors"][0])
+        self.assertEqual(files["broken.xml"]["status"], "error")
+        self.assertEqual(files["broken.xml"]["errors"],
+                         ["could not parse XML"])
+
+    # validate test
+    # \brief It tests that the validation reports errors without writing
+    def test_validate(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        for processes in [1, 2]:
+            status, report = self.main("validate", processes)
+            self.assertEqual(status, 1)
+            self.checkReport(report, "validate")
+            for name, xml in self.files.items():
+                self.assertEqual(self.read(name), xml)
+
+    # merge test
+    # \brief It tests that merged components are written
+    def test_merge(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        status, report = self.main("merge", 2)
+        self.assertEqual(status, 1)
+        self.checkReport(report, "merge")
+        for name in ["valid.xml", "conflict.xml", "broken.xml",
+                     "source.ds.xml"]:
+            self.assertEqual(self.read(name), self.files[name])
+        merged = self.read("merged.xml")
+        self.assertTrue(merged.startswith("<?xml version='1.0'?>\n"))
+        fields = parseComponent(merged).elementsByTagName("field")
+        self.assertEqual(fields.count(), 2)
+        self.assertEqual(fields.item(0).toElement().attribute("name"), "a")
+        self.assertEqual(fields.item(0).toElement().attribute("type"),
+                         "NX_INT")
+        self.assertEqual(fields.item(0).toElement().attribute("units"), "mm")
+        self.assertEqual(fields.item(1).toElement().attribute("name"), "b")
+
+        status, report = self.main("merge")
+        self.assertEqual(report["changed"], 0)
+        self.assertEqual(report["errors"], 2)
+
+        for name in ["conflict.xml", "broken.xml"]:
+            os.remove(os.path.join(self.directory, name))
+        status, report = self.main("validate")
+        self.assertEqual(status, 0)
+        self.assertEqual((report["total"], report["errors"]), (2, 0))
+
+    # error test
+    # \brief It tests not valid modes and directories
+    def test_errors(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        status, report = self.main("check")
+        self.assertEqual(status, 1)
+        self.assertEqual(report["total"], 0)
+        self.assertTrue("unknown batch mode" in report["message"])
+
+        self.directory, directory = \
+            os.path.join(self.directory, "missing"), self.directory
+        try:
+            status, report = self.main("validate")
+        finally:
+            self.directory = directory
+        self.assertEqual(status, 1)
+        self.assertEqual(report["errors"], 1)
+        self.assertEqual(report["files"], [])
+        self.assertTrue(report["message"])
+
+
+if __name__ == '__main__':
+    unittest.main()
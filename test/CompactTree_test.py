@@ -0,0 +1,227 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2017 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+# \package test nexdatas
+# \file CompactTreeTest.py
+# unittests for compact trees of component documents
+#
+import unittest
+import sys
+import gc
+import pickle
+
+from PyQt5.QtXml import QDomDocument
+
+from nxsconfigtool.CompactTree import CompactTree
+from nxsconfigtool.DomTools import DomTools
+from nxsconfigtool.ElementData import parseComponent, componentXML
+
+# Qt application
+app = None
+
+
+# test fixture
+class CompactTreeTest(unittest.TestCase):
+
+    # constructor
+    # \param methodName name of the test method
+    def __init__(self, methodName):
+        unittest.TestCase.__init__(self, methodName)
+
+        # component XML
+        self.xml = "<?xml version='1.0'?><!-- top -->" \
+            "<definition><!-- comment -->" \
+            "<group type='NXentry' name='entry'>text &amp; more" \
+            "<![CDATA[<raw>]]><field name='a' units='1&gt;'> 1.0 </field>" \
+            "<field name='b' type='NX_CHAR'><?pi data?><doc>d\xf3c</doc>" \
+            "</field><field name='c' type='NX_CHAR'>$datasources.ds1" \
+            "<strategy mode='STEP'/></field><field name='d'>" \
+            "<datasource type='CLIENT' name='ds2'><record name='r'/>" \
+            "</datasource>$components.cp1 $datasources.ds1</field>" \
+            "<attribute name='e' type='$datasources.ds3'/>" \
+            "</group></definition>"
+
+    # test starter
+    # \brief Common set up
+    def setUp(self):
+        print("\nsetting up...")
+
+    # test closer
+    # \brief Common tear down
+    def tearDown(self):
+        print("tearing down ...")
+
+    # conversion test
+    # \brief It tests if created documents are equal to the original ones
+    def test_document(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        document = parseComponent(self.xml)
+        tree = CompactTree(document)
+        self.assertEqual(len(tree), 20)
+        self.assertEqual(tree.sourceXML(), componentXML(document))
+        self.assertEqual(tree.sourceXML(2), componentXML(document, 2))
+        copy = tree.toDocument()
+        self.assertTrue(isinstance(copy, QDomDocument))
+        self.assertEqual(copy.toString(0), document.toString(0))
+        self.assertEqual(CompactTree(copy).sourceXML(), tree.sourceXML())
+
+        definition = tree.children()
+        self.assertEqual(len(definition), 1)
+        self.assertEqual(tree.parents[definition[0]], 0)
+        children = tree.children(definition[0])
+        self.assertEqual(
+            [CompactTree.table.strings[tree.names[child]]
+             if tree.names[child] >= 0 else None for child in children],
+            [None, "group"])
+        self.assertEqual(len(tree.children(children[1])), 7)
+        self.assertEqual(tree.children(len(tree) - 1), [])
+
+        self.assertEqual(tree.references(), {
+            ("datasources", "ds1"): 2, ("datasources", "ds3"): 1,
+            ("components", "cp1"): 1})
+        self.assertEqual(tree.references(),
+                         DomTools.findReferences(document.toString(0)))
+
+    # serialization test
+    # \brief It tests if special characters are written as by QDom
+    def test_sourceXML(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        document = QDomDocument()
+        definition = document.createElement("definition")
+        document.appendChild(definition)
+        definition.setAttribute("name", 'a"b\n\t\r<c>&]]>')
+        definition.appendChild(document.createTextNode('t"\r<>&]]>'))
+        group = document.createElement("group")
+        definition.appendChild(group)
+        group.appendChild(document.createComment("comment-"))
+        group.appendChild(document.createProcessingInstruction("pi", "d"))
+        group.appendChild(document.createElement("field"))
+        group.appendChild(document.createCDATASection("<raw>"))
+        tree = CompactTree(document)
+        for indent in range(4):
+            self.assertEqual(tree.sourceXML(indent),
+                             componentXML(document, indent))
+        self.assertEqual(CompactTree(QDomDocument()).sourceXML(),
+                         componentXML(QDomDocument()))
+
+    # string table test
+    # \brief It tests if strings are shared by all trees and released
+    #        with the last tree
+    def test_strings(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        gc.collect()
+        table = CompactTree.table
+        start = len(table)
+        tree = CompactTree(parseComponent(self.xml))
+        size = len(table)
+        self.assertTrue(size > start)
+        other = CompactTree(parseComponent(self.xml))
+        self.assertEqual(len(table), size)
+        self.assertEqual(tree.names, other.names)
+        self.assertEqual(tree.attributes, other.attributes)
+        ide = table.ids["NX_CHAR"]
+        self.assertEqual(table.strings[ide], "NX_CHAR")
+        self.assertEqual(list(tree.attributes).count(ide), 2)
+
+        del tree
+        self.assertEqual(len(table), size)
+        self.assertEqual(table.strings[ide], "NX_CHAR")
+        del other
+        self.assertEqual(len(table), start)
+        self.assertTrue("NX_CHAR" not in table.ids)
+        self.assertEqual(table.strings[ide], None)
+
+        tree = CompactTree(parseComponent(self.xml))
+        self.assertEqual(len(table), size)
+        self.assertEqual(len(table.strings), size + len(table.free))
+        self.assertEqual(tree.sourceXML(),
+                         componentXML(parseComponent(self.xml)))
+
+    # pickling test
+    # \brief It tests if trees are restored with strings of the table and
+    #        with attributes in the order of this process
+    def test_pickle(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        gc.collect()
+        start = len(CompactTree.table)
+        document = parseComponent(self.xml)
+        tree = CompactTree(document)
+        copy = pickle.loads(pickle.dumps(tree, 2))
+        self.assertEqual(copy.sourceXML(), componentXML(document))
+        self.assertEqual(copy.attributes, tree.attributes)
+        self.assertEqual(copy.references(), tree.references())
+
+        state = tree.__getstate__()
+        self.assertTrue(isinstance(state["strings"], list))
+
+        size = len(CompactTree.table)
+        del copy
+        self.assertEqual(len(CompactTree.table), size)
+        self.assertTrue(tree.setSourceOrder(self.xml))
+        copy = pickle.loads(pickle.dumps(tree, 2))
+        self.assertEqual(copy.sourceXML(), componentXML(document))
+        del copy
+        self.assertTrue(not tree.setSourceOrder("<definition/>"))
+        self.assertTrue(not tree.setSourceOrder("<definition>"))
+        del tree
+        self.assertEqual(len(CompactTree.table), start)
+
+        names = ["n%s" % i for i in range(12)]
+        for source in [names, names[::-1]]:
+            xml = "<definition><group %s/></definition>" % " ".join(
+                "%s='%s'" % (name, i) for i, name in enumerate(source))
+            other = CompactTree(parseComponent(xml))
+            self.assertTrue(other.setSourceOrder(xml))
+            state = other.__getstate__()
+            self.assertEqual(
+                [state["strings"][ide]
+                 for ide in state["attributes"][::2]], source)
+            copy = CompactTree.__new__(CompactTree)
+            copy.__setstate__(state)
+            self.assertEqual(copy.sourceXML(),
+                             componentXML(parseComponent(xml)))
+            self.assertEqual(copy.attributes, other.attributes)
+            del other
+        del copy
+        self.assertEqual(len(CompactTree.table), start)
+
+    # error test
+    # \brief It tests not supported nodes
+    def test_errors(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        document = QDomDocument()
+        definition = document.createElement("definition")
+        document.appendChild(definition)
+        definition.appendChild(document.createEntityReference("e"))
+        self.assertRaises(ValueError, CompactTree, document)
+        self.assertEqual(len(CompactTree(QDomDocument())), 1)
+        self.assertEqual(CompactTree(QDomDocument()).toDocument().toString(),
+                         "")
+
+
+if __name__ == '__main__':
+    unittest.main()
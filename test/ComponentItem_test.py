@@ -572,6 +572,52 @@ class ComponentItemTest(unittest.TestCase):
                     ks.child(g).node.nodeName(), "grandkid%s" % g)
                 self.assertEqual(ks.child(g).parent, ks)
 
+    # row number test
+    # \brief It tests cached row numbers after removing and inserting
+    def test_rows(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+        doc = QDomDocument()
+        qdn = doc.createElement("definition")
+        doc.appendChild(qdn)
+        nkids = self.__rnd.randint(5, 50)
+        for n in range(nkids):
+            qdn.appendChild(doc.createElement("kid%s" % n))
+
+        ci = ComponentItem(qdn)
+        self.assertEqual(ci.row, 0)
+        last = ci.child(nkids - 1)
+        self.assertEqual(last.row, nkids - 1)
+        self.assertEqual(ci.index(last), nkids - 1)
+        self.assertTrue(not hasattr(ci, "__dict__"))
+
+        rmvd = self.__rnd.randint(0, nkids - 2)
+        qdn.removeChild(ci.child(rmvd).node)
+        self.assertTrue(ci.removeChildren(rmvd, 1))
+        for k in range(nkids - 1):
+            self.assertEqual(ci.child(k).row, k)
+            self.assertEqual(ci.child(k).childNumber(), k)
+            self.assertEqual(ci.index(ci.child(k)), k)
+        self.assertEqual(last.childNumber(), nkids - 2)
+
+        for insd in [self.__rnd.randint(0, nkids - 2), nkids - 1]:
+            if insd < nkids - 1:
+                qdn.insertBefore(doc.createElement("new"),
+                                 ci.child(insd).node)
+            else:
+                qdn.appendChild(doc.createElement("new"))
+            self.assertTrue(ci.insertChildren(insd, 1))
+            self.assertEqual(ci.child(insd).node.nodeName(), "new")
+            for k in range(nkids):
+                self.assertEqual(ci.child(k).childNumber(), k)
+                self.assertEqual(ci.child(k).node, qdn.childNodes().item(k))
+            self.assertEqual(last.childNumber(),
+                             nkids - 1 if insd < nkids - 1 else nkids - 2)
+            node = ci.child(insd).node
+            self.assertTrue(ci.removeChildren(insd, 1))
+            qdn.removeChild(node)
+            self.assertEqual(last.childNumber(), nkids - 2)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1235,6 +1235,90 @@ class ComponentModelTest(unittest.TestCase):
                 ks.child(0).node.toText().data(), '\nText\n %s\n' % k)
             self.assertEqual(ks.child(0).parent, ks)
 
+    def test_revision(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        doc = QDomDocument()
+        qdn = doc.createElement("definition")
+        doc.appendChild(qdn)
+        for n in range(3):
+            qdn.appendChild(doc.createElement("kid%s" % n))
+
+        cm = ComponentModel(doc, False)
+        cm2 = ComponentModel(doc, False)
+        self.assertTrue(isinstance(cm.revision, int))
+        self.assertNotEqual(cm.revision, cm2.revision)
+
+        di = cm.index(0, 0, cm.rootIndex)
+        revs = [cm.revision]
+
+        cm.touch()
+        self.assertTrue(cm.revision not in revs)
+        revs.append(cm.revision)
+
+        cm.dataChanged.emit(di, di)
+        self.assertTrue(cm.revision not in revs)
+        revs.append(cm.revision)
+
+        self.assertTrue(cm.insertItem(1, doc.createElement("new1"), di))
+        self.assertTrue(cm.revision not in revs)
+        revs.append(cm.revision)
+
+        self.assertTrue(cm.appendItem(doc.createElement("new2"), di))
+        self.assertTrue(cm.revision not in revs)
+        revs.append(cm.revision)
+
+        self.assertTrue(cm.removeItem(0, di))
+        self.assertTrue(cm.revision not in revs)
+        revs.append(cm.revision)
+
+        self.assertTrue(not cm.removeItem(0, QModelIndex()))
+        self.assertEqual(cm.revision, revs[-1])
+        cm.data(di)
+        cm.rowCount(di)
+        self.assertEqual(cm.revision, revs[-1])
+
+    # data cache test
+    # \brief It tests invalidation of the cached display data
+    def test_data_cache(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        doc = QDomDocument()
+        qdn = doc.createElement("definition")
+        doc.appendChild(qdn)
+        kid = doc.createElement("field")
+        kid.setAttribute("name", "kid")
+        kid.setAttribute("type", "NX_INT")
+        qdn.appendChild(kid)
+
+        cm = ComponentModel(doc, False)
+        di = cm.index(0, 0, cm.index(0, 0, QModelIndex()))
+        ki = cm.index(0, 1, di.parent())
+        self.assertEqual(cm.data(di), "field: kid")
+        self.assertEqual(cm.data(ki), "NX_INT  ")
+        self.assertTrue(di.internalPointer().display is not None)
+
+        kid.setAttribute("name", "kid2")
+        self.assertEqual(cm.data(di), "field: kid")
+        cm.dataChanged.emit(di, di)
+        self.assertEqual(cm.data(di), "field: kid2")
+
+        cm.setAttributeView(True)
+        self.assertEqual(
+            sorted(cm.data(ki).split()), ['name="kid2"', 'type="NX_INT"'])
+        cm.setAttributeView(False)
+        self.assertEqual(cm.data(ki), "NX_INT  ")
+
+        text = doc.createTextNode("\n12\n")
+        cm.appendItem(text, di)
+        ti = cm.index(0, 2, di)
+        self.assertEqual(cm.data(ti), " 12 ")
+        text.setData("13")
+        cm.touch()
+        self.assertEqual(cm.data(ti), "13")
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,481 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2017 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+# \package test nexdatas
+# \file ComponentTest.py
+# unittests for component undo states
+#
+import unittest
+import sys
+import zlib
+
+from PyQt5.QtWidgets import QApplication, QTreeView
+from PyQt5.QtXml import QDomDocument
+
+from nxsconfigtool.Component import Component
+from nxsconfigtool.ComponentModel import ComponentModel
+from nxsconfigtool.ComponentList import ComponentList
+from nxsconfigtool.ElementData import parseComponent, componentXML
+from nxsconfigtool.NodeDlg import NodeDlg
+
+# Qt application
+app = None
+
+
+# test fixture
+class ComponentTest(unittest.TestCase):
+
+    # constructor
+    # \param methodName name of the test method
+    def __init__(self, methodName):
+        unittest.TestCase.__init__(self, methodName)
+
+        # component XML
+        self.xml = '<definition><group type="NXentry" name="entry">' \
+            '<field name="a" type="NX_INT">1</field>' \
+            '<field name="b" type="NX_INT">2</field>' \
+            '</group>%s</definition>' % "".join(
+                '<group type="NXcollection" name="c%s">'
+                '<field name="d" type="NX_CHAR">%s</field></group>' % (i, i)
+                for i in range(20))
+
+    # test starter
+    # \brief Common set up
+    def setUp(self):
+        print("\nsetting up...")
+
+    # test closer
+    # \brief Common tear down
+    def tearDown(self):
+        print("tearing down ...")
+
+    # creates the component with the given XML
+    # \param xml XML string
+    # \returns component
+    def component(self, xml):
+        cp = Component()
+        cp.document = QDomDocument()
+        self.assertTrue(cp.document.setContent(xml))
+        return cp
+
+    # changes the component document and checks its states
+    # \param cp component
+    # \param change function changing the component document
+    # \param full if the whole document is compared
+    # \returns (old, new) tuple of states
+    def checkDelta(self, cp, change, full=True):
+        xml = cp.document.toString(0)
+        scopeState = cp.getScopeState(full)
+        change(cp.document)
+        changed = cp.document.toString(0)
+        old, new = cp.getStateDelta(scopeState)
+        self.assertTrue(isinstance(old[0][0], tuple))
+        self.assertTrue(isinstance(new[0][0], tuple))
+        self.assertTrue(len(repr(old[0][0])) < len(xml))
+
+        self.assertTrue(cp._applyDelta(old[0][0]))
+        self.assertEqual(cp.document.toString(0), xml)
+        self.assertTrue(not cp._applyDelta(old[0][0]))
+        self.assertTrue(cp._applyDelta(new[0][0]))
+        self.assertEqual(cp.document.toString(0), changed)
+        self.assertTrue(cp._applyDelta(old[0][0]))
+        self.assertEqual(cp.document.toString(0), xml)
+        return old, new
+
+    # provides the snapshot XML of the state
+    # \param state component state
+    # \returns (rows, xml string) tuple
+    @classmethod
+    def snapshot(cls, state):
+        rows, data = state[0][1]
+        return rows, zlib.decompress(data).decode("utf-8")
+
+    # changes the text of the second field
+    # \param document DOM document
+    @classmethod
+    def changeText(cls, document):
+        field = document.elementsByTagName("field").item(1)
+        field.firstChild().toText().setData("3")
+
+    # renames the group
+    # \param document DOM document
+    @classmethod
+    def renameGroup(cls, document):
+        document.elementsByTagName("group").item(0).toElement().setAttribute(
+            "name", "scan")
+
+    # removes the first field and adds a link
+    # \param document DOM document
+    @classmethod
+    def replaceField(cls, document):
+        group = document.elementsByTagName("group").item(0)
+        group.removeChild(group.firstChild())
+        link = document.createElement("link")
+        link.setAttribute("name", "data")
+        group.appendChild(link)
+
+    def test_delta(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        for change in [self.changeText, self.renameGroup, self.replaceField]:
+            self.checkDelta(self.component(self.xml), change)
+
+    def test_delta_model(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        for change in [self.changeText, self.renameGroup, self.replaceField]:
+            cp = self.component(self.xml)
+            cp.view = QTreeView()
+            cp.dialog = cp.view
+            model = ComponentModel(cp.document, False)
+            cp.view.setModel(model)
+            revision = model.revision
+            self.checkDelta(cp, change)
+            self.assertTrue(model.revision > revision)
+            group = model.index(0, 0, model.index(0, 0, model.rootIndex))
+            self.assertEqual(model.rowCount(group), 2)
+            self.assertEqual(
+                model.rowCount(model.index(0, 0, model.rootIndex)), 21)
+            self.assertEqual(
+                group.internalPointer().node.firstChild(),
+                model.index(0, 0, group).internalPointer().node)
+
+    def test_delta_full(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        cp = self.component(self.xml)
+        xml = cp.document.toString(0)
+        scopeState = cp.getScopeState(True)
+        self.assertEqual(scopeState[0][0], [])
+        cp.document.firstChild().toElement().setTagName("group")
+        changed = cp.document.toString(0)
+        old, new = cp.getStateDelta(scopeState)
+        self.assertEqual(old[0][0], None)
+        self.assertEqual(new[0][0], None)
+        self.assertEqual(self.snapshot(old), ([], xml))
+        self.assertEqual(self.snapshot(new), ([], changed))
+        cp.setState(old)
+        self.assertEqual(cp.document.toString(0), xml)
+        cp.setState(new)
+        self.assertEqual(cp.document.toString(0), changed)
+
+        cp = self.component(self.xml)
+        old, new = cp.getStateDelta(cp.getScopeState())
+        self.assertEqual(old[0][0], ([], None, {}, {}))
+        self.assertEqual(old[1], None)
+        self.assertTrue(cp._applyDelta(old[0][0]))
+
+    def test_delta_scope(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        cp = self.component(self.xml)
+        cp.createGUI()
+        model = cp.view.model()
+        group = model.index(0, 0, model.index(0, 0, model.rootIndex))
+        cp.view.setCurrentIndex(model.index(1, 0, group))
+        scopeState = cp.getScopeState()
+        self.assertEqual(scopeState[0][0], [0, 0])
+        self.assertEqual(scopeState[1], [(0, "definition"), (0, "group"),
+                                         (1, "field")])
+        self.assertEqual(cp.getScopeState(True)[0][0], [])
+
+        group.internalPointer().node.toElement().setAttribute("units", "m")
+        old, new = self.checkDelta(cp, self.changeText, False)
+        self.assertEqual(old[0][0][0], [0, 0, 1])
+        rows, xml = self.snapshot(old)
+        self.assertEqual(rows, [0, 0])
+        self.assertTrue(xml.startswith("<group "))
+        self.assertTrue(">2</field>" in xml and "c0" not in xml)
+        rows, xml = self.snapshot(new)
+        self.assertEqual(rows, [0, 0])
+        self.assertTrue(">3</field>" in xml and "c0" not in xml)
+
+    def test_delta_fallback(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        cp = self.component(self.xml)
+        cp.createGUI()
+        model = cp.view.model()
+        group = model.index(0, 0, model.index(0, 0, model.rootIndex))
+        cp.view.setCurrentIndex(model.index(1, 0, group))
+        xml = cp.document.toString(0)
+        scopeState = cp.getScopeState()
+        self.changeText(cp.document)
+        old, new = cp.getStateDelta(scopeState)
+
+        field = cp.document.elementsByTagName("field").item(1)
+        field.firstChild().toText().setData("4")
+        collection = cp.document.elementsByTagName("group").item(1)
+        collection.toElement().setAttribute("name", "scan")
+        self.assertTrue(not cp._applyDelta(old[0][0]))
+        cp.setState(old)
+        self.assertEqual(
+            cp.document.toString(0),
+            xml.replace('name="c0"', 'name="scan"'))
+        group = model.index(0, 0, model.index(0, 0, model.rootIndex))
+        self.assertEqual(model.rowCount(group), 2)
+        self.assertEqual(
+            group.internalPointer().node,
+            cp.document.elementsByTagName("group").item(0))
+        self.assertEqual(
+            model.index(1, 0, group).internalPointer().node,
+            cp.document.elementsByTagName("field").item(1))
+
+        cp.setState(new)
+        self.assertEqual(
+            cp.document.elementsByTagName("field").item(1).toElement().text(),
+            "3")
+
+    def test_fetchElements(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        xml = '<definition><group type="NXentry" name="entry">' \
+            '<field name="a">$datasources.ds1</field>' \
+            '<field name="b">$components.cp1 $datasources.ds2</field>' \
+            '</group></definition>'
+        cp = self.component(xml)
+        cp.fetchElements()
+        self.assertEqual(sorted(cp.datasources), ["ds1", "ds2"])
+        self.assertEqual(cp.components, ["cp1"])
+
+        cp.view = QTreeView()
+        model = ComponentModel(cp.document, False)
+        cp.view.setModel(model)
+        cp.fetchElements()
+        self.assertEqual(sorted(cp.datasources), ["ds1", "ds2"])
+        self.assertEqual(cp.components, ["cp1"])
+
+        group = model.index(0, 0, model.index(0, 0, model.rootIndex))
+        field = model.index(0, 0, group)
+        model.removeItem(1, group)
+        cp.fetchElements()
+        self.assertEqual(cp.datasources, ["ds1"])
+        self.assertEqual(cp.components, [])
+
+        text = model.index(0, 0, field).internalPointer().node
+        text.setNodeValue("$datasources.ds3")
+        cp.fetchElements()
+        self.assertEqual(cp.datasources, ["ds1"])
+        model.dataChanged.emit(field, field)
+        cp.fetchElements()
+        self.assertEqual(cp.datasources, ["ds3"])
+
+        node = cp.document.createElement("field")
+        node.appendChild(cp.document.createTextNode("$components.cp2"))
+        model.appendItem(node, group)
+        cp.fetchElements()
+        self.assertEqual(cp.datasources, ["ds3"])
+        self.assertEqual(cp.components, ["cp2"])
+
+    def test_showElementPath(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        xml = '<definition><!-- c --><group type="NXentry" name="entry">' \
+            'text<field name="a"/><!-- c --><field name="b"/>' \
+            '</group></definition>'
+        cp = self.component(xml)
+        paths = []
+        cp._selectItem = paths.append
+        self.assertTrue(cp.showElementPath(
+            [(0, "definition"), (0, "group"), (1, "field")]))
+        self.assertEqual(
+            paths, [[(0, "definition"), (1, "group"), (3, "field")]])
+        self.assertTrue(not cp.showElementPath(
+            [(0, "definition"), (0, "group"), (2, "field")]))
+        self.assertTrue(not cp.showElementPath(
+            [(0, "definition"), (0, "field")]))
+        self.assertEqual(len(paths), 1)
+
+    def test_tagClicked(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        xml = '<definition><group type="NXentry" name="entry">' \
+            '<field name="a" units="mm">' \
+            '<strategy mode="STEP" canfail="true"/>' \
+            '<datasource type="CLIENT" name="ds1">' \
+            '<record name="r1"/></datasource></field>' \
+            '<field name="b"><strategy mode="INIT"/>' \
+            '<datasource type="CLIENT"><record name="r2"/>' \
+            '</datasource></field>' \
+            '</group></definition>'
+        cp = self.component(xml)
+        cp.createGUI()
+        model = cp.view.model()
+        group = model.index(0, 0, model.index(0, 0, model.rootIndex))
+        fields = [model.index(row, 0, group) for row in range(2)]
+
+        cp.tagClicked(fields[0])
+        widget = cp.dialog.ui.widget
+        self.assertEqual(widget.name, "a")
+        self.assertEqual(widget.ui.unitsLineEdit.text(), "mm")
+        cp.tagClicked(fields[1])
+        self.assertTrue(cp.dialog.ui.widget is widget)
+        self.assertEqual(widget.name, "b")
+        self.assertEqual(widget.ui.nameLineEdit.text(), "b")
+        self.assertEqual(widget.ui.unitsLineEdit.text(), "")
+        self.assertTrue(widget.ui.applyPushButton.isEnabled())
+
+        strategies = [model.index(0, 0, field) for field in fields]
+        cp.tagClicked(strategies[0])
+        strategy = cp.dialog.ui.widget
+        self.assertTrue(strategy is not widget)
+        self.assertTrue(strategy.canfail)
+        self.assertTrue(strategy.ui.canFailCheckBox.isChecked())
+        cp.tagClicked(strategies[1])
+        self.assertTrue(cp.dialog.ui.widget is strategy)
+        self.assertEqual(strategy.mode, "INIT")
+        self.assertTrue(not strategy.canfail)
+        self.assertTrue(not strategy.ui.canFailCheckBox.isChecked())
+
+        datasources = [model.index(1, 0, field) for field in fields]
+        cp.tagClicked(datasources[0])
+        datasource = cp.dialog.ui.widget
+        self.assertEqual(datasource.datasource.dataSourceName, "ds1")
+        cp.tagClicked(datasources[1])
+        self.assertTrue(cp.dialog.ui.widget is datasource)
+        self.assertTrue(not datasource.datasource.dataSourceName)
+        self.assertEqual(datasource.ui.nameLineEdit.text(), "")
+        self.assertEqual(
+            datasource.datasource.var["CLIENT"].recordName, "r2")
+
+        cp._hideFrame()
+        self.assertTrue(not isinstance(cp.dialog.ui.widget, NodeDlg))
+        cp.tagClicked(fields[0])
+        self.assertTrue(cp.dialog.ui.widget is widget)
+        self.assertEqual(widget.ui.nameLineEdit.text(), "a")
+
+    def test_stream(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        xml = '<definition><group type="NXentry" name="entry">' \
+            '<group type="NXinstrument" name="instrument">' \
+            '<field name="a" units="mm"><strategy mode="STEP"/>' \
+            '<doc>$datasources.ds1</doc>' \
+            '<datasource type="CLIENT" name="ds1">' \
+            '<record name="r1"/></datasource></field>' \
+            '<field name="b">$datasources.ds2</field>' \
+            '</group></group></definition>'
+        saved = Component()
+        saved.set(xml)
+
+        cp = Component()
+        cp.streamSize = 0
+        cp.streamDepth = 2
+        cp.createGUI()
+        cp.set(xml)
+        self.assertTrue(not cp.isDirty())
+        self.assertEqual(componentXML(parseComponent(cp.get())), saved.get())
+        self.assertEqual(cp.savedXML, cp.get())
+        self.assertEqual(sorted(saved.datasources), ["ds1", "ds2"])
+        self.assertEqual(sorted(cp.datasources), ["ds1", "ds2"])
+
+        model = cp.view.model()
+        entry = model.index(0, 0, model.index(0, 0, model.rootIndex))
+        self.assertTrue(model.hasChildren(entry))
+        node = entry.internalPointer().node
+        self.assertEqual(node.firstChild().nodeName(), "nxsdesigner-pending")
+        self.assertEqual(model.rowCount(entry), 1)
+        instrument = model.index(0, 0, entry)
+        self.assertTrue(model.hasChildren(instrument))
+        self.assertEqual(
+            instrument.internalPointer().node.firstChild().nodeName(),
+            "nxsdesigner-pending")
+        self.assertEqual(model.references(), {
+            ("datasources", "ds1"): 1, ("datasources", "ds2"): 1})
+
+        cp.tagClicked(instrument)
+        field = model.index(0, 0, instrument)
+        self.assertEqual(model.rowCount(field), 3)
+        cp.tagClicked(field)
+        self.assertEqual(cp.dialog.ui.widget.ui.unitsLineEdit.text(), "mm")
+        self.assertTrue(not cp.isDirty())
+        self.assertEqual(model.references(), {
+            ("datasources", "ds1"): 1, ("datasources", "ds2"): 1})
+
+        self.assertEqual(cp.document.toString(0), saved.document.toString(0))
+        self.assertEqual(cp.get(), saved.get())
+        self.assertTrue(not cp.isDirty())
+        field.internalPointer().node.toElement().setAttribute("units", "m")
+        model.dataChanged.emit(field, field)
+        self.assertTrue(cp.isDirty())
+
+    def test_compact(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        xml = '<definition><group type="NXentry" name="entry">' \
+            '<field name="a" units="mm">$datasources.ds1</field>' \
+            '<field name="b">$components.cp1</field>' \
+            '</group></definition>'
+        cpList = ComponentList("components")
+        cpList.compact = True
+        cp = cpList.createElement("cp")
+        self.assertTrue(cp.dialog is None)
+        cp.set(xml)
+        saved = Component()
+        saved.set(xml)
+        self.assertTrue(cp.view is None)
+        self.assertTrue(not cp.compact())
+        self.assertTrue(not cp.isDirty())
+        self.assertEqual(cp.get(), saved.get())
+        self.assertEqual(cp.datasources, ["ds1"])
+        self.assertEqual(cp.components, ["cp1"])
+
+        cp.createGUI()
+        self.assertTrue(not cp.compact())
+        model = cp.view.model()
+        entry = model.index(0, 0, model.index(0, 0, model.rootIndex))
+        self.assertEqual(model.rowCount(entry), 2)
+        self.assertTrue(not cp.isDirty())
+        self.assertEqual(cp.savedXML, saved.savedXML)
+        field = model.index(0, 0, entry)
+        field.internalPointer().node.toElement().setAttribute("units", "m")
+        model.dataChanged.emit(field, field)
+        self.assertTrue(cp.isDirty())
+        changed = cp.get()
+
+        cp.dialog.close()
+        self.assertTrue(cp.dialog is None)
+        self.assertTrue(cp.view is None)
+        self.assertTrue(cp.isDirty())
+        self.assertEqual(cp.get(), changed)
+        self.assertEqual(cp.savedXML, saved.savedXML)
+        self.assertEqual(cp.document.toString(0), QDomDocument(
+            parseComponent(changed)).toString(0))
+        self.assertTrue(cp.compact())
+        key = cp.revisionKey()
+        self.assertTrue(key is not None)
+        self.assertEqual(cp.revisionKey(), key)
+        cp.savedXML = cp.get()
+        self.assertTrue(not cp.isDirty())
+        cp.document = saved.document
+        self.assertTrue(cp.isDirty())
+        self.assertTrue(cp.revisionKey() != key)
+
+
+if __name__ == '__main__':
+    app = QApplication([])
+    unittest.main()
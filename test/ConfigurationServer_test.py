@@ -0,0 +1,251 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2017 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+# \package test nexdatas
+# \file ConfigurationServerTest.py
+# unittests for storing elements on the configuration server
+#
+import unittest
+import sys
+
+from nxsconfigtool.ConfigurationServer import (
+    ConfigurationServer, ChunkScheduler)
+
+
+# local fake of the configuration server device
+class FakeDevice(object):
+
+    # constructor
+    def __init__(self):
+        # stored components
+        self.components = {"cp1": "<definition/>", "cp2": "<group/>"}
+        # stored datasources
+        self.datasources = {"ds1": "<datasource/>"}
+        # XML string attribute
+        self.XMLString = ""
+        # executed (command, argument) tuples
+        self.commands = []
+        # names of elements which cannot be stored
+        self.broken = set()
+
+    # executes the command
+    # \param command command name
+    # \param argin command argument
+    # \returns command result
+    def command_inout(self, command, argin=None):
+        self.commands.append((command, argin))
+        if command == "AvailableComponents":
+            return sorted(self.components.keys())
+        elif command == "AvailableDataSources":
+            return sorted(self.datasources.keys())
+        elif command == "Components":
+            return [self.components[name] for name in argin]
+        elif command == "DataSources":
+            return [self.datasources[name] for name in argin]
+        elif command in ["StoreComponent", "StoreDataSource"]:
+            if argin in self.broken:
+                raise Exception("Cannot store %s" % argin)
+            elements = self.components if command == "StoreComponent" \
+                else self.datasources
+            elements[argin] = self.XMLString
+
+    # provides names of the stored elements
+    # \param command store command
+    # \returns list of element names
+    def stored(self, command):
+        return [argin for cmd, argin in self.commands if cmd == command]
+
+
+# test fixture
+class ConfigurationServerTest(unittest.TestCase):
+
+    # constructor
+    # \param methodName name of the test method
+    def __init__(self, methodName):
+        unittest.TestCase.__init__(self, methodName)
+
+    # test starter
+    # \brief Common set up
+    def setUp(self):
+        print("\nsetting up...")
+        self.device = FakeDevice()
+        self.server = ConfigurationServer()
+        self.server._proxy = self.device
+        self.server.connected = True
+
+    # test closer
+    # \brief Common tear down
+    def tearDown(self):
+        print("tearing down ...")
+
+    # hash test
+    # \brief It tests if fetched and stored contents are recorded
+    def test_isStored(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        self.assertTrue(
+            not self.server.isStored("components", "cp1", "<definition/>"))
+        self.server.fetchComponents()
+        self.assertTrue(
+            self.server.isStored("components", "cp1", "<definition/>"))
+        self.assertTrue(self.server.isStored("components", "cp2", "<group/>"))
+        self.assertTrue(not self.server.isStored("components", "cp1", ""))
+        self.assertTrue(
+            not self.server.isStored("components", "cp2", "<definition/>"))
+        self.assertTrue(
+            not self.server.isStored("datasources", "cp1", "<definition/>"))
+
+        self.server.storeDataSource("ds2", "<datasource/>")
+        self.assertTrue(
+            self.server.isStored("datasources", "ds2", "<datasource/>"))
+        self.server.deleteDataSource("ds2")
+        self.assertTrue(
+            not self.server.isStored("datasources", "ds2", "<datasource/>"))
+
+    # store test
+    # \brief It tests if unchanged components are skipped and changed
+    #        ones are stored
+    def test_storeComponents(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        self.server.fetchComponents()
+        self.device.commands = []
+        counts = []
+        stored, skipped, failures = self.server.storeComponents(
+            [("cp1", "<definition/>"), ("cp2", "<group>1</group>"),
+             ("cp3", "<definition/>")], counts.append)
+        self.assertEqual(stored, ["cp2", "cp3"])
+        self.assertEqual(skipped, ["cp1"])
+        self.assertEqual(failures, {})
+        self.assertEqual(counts, [1, 2, 3])
+        self.assertEqual(self.device.stored("StoreComponent"), ["cp2", "cp3"])
+        self.assertEqual(self.device.components["cp2"], "<group>1</group>")
+        self.assertEqual(self.device.components["cp3"], "<definition/>")
+        self.assertTrue(
+            self.server.isStored("components", "cp2", "<group>1</group>"))
+        self.assertTrue(not self.server.isStored("components", "cp2",
+                                                 "<group/>"))
+        self.assertTrue(
+            self.server.isStored("components", "cp3", "<definition/>"))
+
+        self.device.commands = []
+        self.assertEqual(
+            self.server.storeComponents(
+                [("cp2", "<group>1</group>"), ("cp3", "<definition/>")]),
+            ([], ["cp2", "cp3"], {}))
+        self.assertEqual(self.device.commands, [])
+
+    # store test
+    # \brief It tests if a failing datasource does not stop the others
+    def test_storeDataSources(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        self.server.fetchDataSources()
+        self.device.broken = set(["ds2"])
+        stored, skipped, failures = self.server.storeDataSources(
+            [("ds1", "<datasource/>"), ("ds2", "<datasource>2</datasource>"),
+             ("ds3", "<datasource>3</datasource>")])
+        self.assertEqual(stored, ["ds3"])
+        self.assertEqual(skipped, ["ds1"])
+        self.assertEqual(list(failures.keys()), ["ds2"])
+        self.assertTrue("Cannot store ds2" in failures["ds2"])
+        self.assertEqual(self.device.stored("StoreDataSource"), ["ds2", "ds3"])
+        self.assertTrue("ds2" not in self.device.datasources)
+        self.assertEqual(self.device.datasources["ds3"],
+                         "<datasource>3</datasource>")
+        self.assertTrue(not self.server.isStored(
+            "datasources", "ds2", "<datasource>2</datasource>"))
+        self.assertTrue(self.server.isStored(
+            "datasources", "ds3", "<datasource>3</datasource>"))
+
+        self.device.broken = set()
+        self.assertEqual(
+            self.server.storeDataSources(
+                [("ds2", "<datasource>2</datasource>"),
+                 ("ds3", "<datasource>3</datasource>")]),
+            (["ds2"], ["ds3"], {}))
+
+    # scheduler test
+    # \brief It tests if chunk sizes follow latencies and failures
+    def test_chunkScheduler(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        names = ["cp%s" % i for i in range(100)]
+        scheduler = ChunkScheduler(names, 0, 16, 1.0)
+        self.assertEqual(scheduler.next(), ["cp0"])
+        scheduler.report(1, 0.1)
+        self.assertEqual(scheduler.next(), ["cp1", "cp2"])
+        scheduler.report(2, 0.1)
+        scheduler.report(4, 0.1)
+        scheduler.report(8, 0.1)
+        scheduler.report(16, 0.1)
+        self.assertEqual(scheduler.size, 16)
+        scheduler.report(16, 0.7)
+        self.assertEqual(scheduler.size, 16)
+        scheduler.report(16, 4.0)
+        self.assertEqual(scheduler.size, 4)
+        scheduler.report(4, 0.1, 3)
+        self.assertEqual(scheduler.size, 2)
+        scheduler.report(1, 0.1, 1)
+        self.assertEqual(scheduler.size, 1)
+
+        chunks = []
+        chunk = scheduler.next()
+        while chunk:
+            chunks.extend(chunk)
+            scheduler.report(len(chunk), 0.1)
+            chunk = scheduler.next()
+        self.assertEqual(chunks, names[3:])
+        self.assertEqual(scheduler.next(), [])
+
+    # chunk test
+    # \brief It tests if failing elements are isolated by bisection
+    def test_fetchChunks(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        self.device.components = dict(
+            ("cp%s" % i, "<definition>%s</definition>" % i)
+            for i in range(50))
+        names = sorted(self.device.components.keys())
+        self.assertEqual(
+            self.server._fetchChunk("Components", names[:4]),
+            (dict((name, self.device.components[name])
+                  for name in names[:4]), 0))
+        self.device.components.pop("cp3")
+        elements, failures = self.server._fetchChunk(
+            "Components", ["cp1", "cp2", "cp3", "cp4"])
+        self.assertEqual(elements["cp3"], "")
+        self.assertEqual(elements["cp4"], "<definition>4</definition>")
+        self.assertEqual(failures, 3)
+
+        chunks = []
+        self.server.chunkSize = 4
+        elements = self.server._fetchChunks("Components", names, chunks.append)
+        self.assertEqual(len(elements), 50)
+        self.assertEqual(elements["cp3"], "")
+        self.assertEqual(elements["cp7"], "<definition>7</definition>")
+        self.assertTrue(max(len(chunk) for chunk in chunks) <= 4)
+        self.assertEqual(sum(len(chunk) for chunk in chunks), 50)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2017 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+# \package test nexdatas
+# \file ConnectionManagerTest.py
+# unittests for persistent configuration server connections
+#
+import unittest
+import sys
+
+from nxsconfigtool.ConnectionManager import ConnectionManager
+
+
+# local fake of the configuration server device
+class FakeProxy(object):
+
+    # constructor
+    # \param name device name
+    # \param busy number of state checks returning RUNNING
+    def __init__(self, name, busy=0):
+        # device name
+        self.name = name
+        # number of state checks returning RUNNING
+        self.busy = busy
+        # device state
+        self.current = "ON"
+        # number of state checks
+        self.checks = 0
+        # executed commands
+        self.commands = []
+
+    # provides the device state
+    # \returns device state
+    def state(self):
+        self.checks += 1
+        if self.busy:
+            self.busy -= 1
+            return "RUNNING"
+        return self.current
+
+    # sets the device timeout
+    # \param millis timeout in milliseconds
+    def set_timeout_millis(self, millis):
+        self.commands.append("timeout")
+
+    # sets the data source
+    # \param source data source
+    def set_source(self, source):
+        self.commands.append("source")
+
+    # executes the command
+    # \param command command name
+    def command_inout(self, command):
+        self.commands.append(command)
+        self.current = "OPEN" if command == "Open" else "ON"
+
+
+# test fixture
+class ConnectionManagerTest(unittest.TestCase):
+
+    # constructor
+    # \param methodName name of the test method
+    def __init__(self, methodName):
+        unittest.TestCase.__init__(self, methodName)
+
+    # test starter
+    # \brief Common set up
+    def setUp(self):
+        print("\nsetting up...")
+        self.proxies = []
+        self.manager = ConnectionManager(
+            self.factory, timeout=0.2, delay=0.001, maxDelay=0.01)
+        self.manager.runningState = "RUNNING"
+        self.manager.openState = "OPEN"
+        self.manager.source = "DEV"
+
+    # test closer
+    # \brief Common tear down
+    def tearDown(self):
+        print("tearing down ...")
+
+    # creates a fake proxy
+    # \param name device name
+    # \returns fake proxy
+    def factory(self, name):
+        self.proxies.append(FakeProxy(name, 2))
+        return self.proxies[-1]
+
+    def test_reuse(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        proxy = self.manager.connect("a/b/c")
+        self.assertEqual(proxy.commands, ["timeout", "source", "Open"])
+        self.assertTrue(self.manager.isOpen("a/b/c"))
+        self.assertTrue(self.manager.connect("a/b/c") is proxy)
+        self.assertEqual(proxy.commands.count("Open"), 1)
+        self.assertEqual(len(self.proxies), 1)
+        metrics = self.manager.metrics("a/b/c")
+        self.assertEqual(metrics["connects"], 2)
+        self.assertEqual(metrics["reused"], 1)
+        self.assertEqual(metrics["attempts"], 4)
+
+        self.manager.close("a/b/c")
+        self.assertEqual(proxy.commands[-1], "Close")
+        self.assertTrue(not self.manager.isOpen("a/b/c"))
+        self.assertTrue(self.manager.connect("a/b/c") is proxy)
+        self.assertEqual(proxy.commands.count("Open"), 2)
+
+        self.manager.forget("a/b/c")
+        self.assertTrue(self.manager.connect("a/b/c") is not proxy)
+        self.assertEqual(len(self.proxies), 2)
+
+    def test_timeout(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        proxy = self.manager.proxy("x/y/z")
+        proxy.busy = 1000
+        self.assertRaises(Exception, self.manager.connect, "x/y/z")
+        self.assertTrue(proxy.checks < 100)
+        self.assertTrue("Open" not in proxy.commands)
+        metrics = self.manager.metrics("x/y/z")
+        self.assertEqual(metrics["failures"], 1)
+        self.assertTrue(metrics["last"] <= 0.3)
+        self.assertEqual(self.manager.metrics("q/q/q")["connects"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
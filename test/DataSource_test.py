@@ -432,6 +432,46 @@ class DataSourceTest(unittest.TestCase):
         self.assertEqual(form.methods.stack[-3], "updateNode")
         self.assertEqual(form.methods.stack[-4], "createGUI")
 
+    # shared dialog test
+    # \brief It tests datasources without their own dialogs
+    def test_sharedDialog(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+        xml = '<?xml version="1.0"?><definition>' \
+            '<datasource type="DB" name="db1">' \
+            '<database dbtype="PGSQL" dbname="tango"/>' \
+            '<query format="SPECTRUM">SELECT 1</query>' \
+            '<doc>first</doc></datasource></definition>'
+        form = DataSource()
+        other = DataSource()
+        self.assertEqual(form.dialog, None)
+        form.set(xml)
+        self.assertEqual(form.dialog, None)
+        self.assertTrue(not form.isDirty())
+        self.assertEqual(form.dataSourceType, 'DB')
+        self.assertEqual(form.dataSourceName, 'db1')
+        self.assertEqual(form.doc, 'first')
+        self.assertEqual(form.var['DB'].dbtype, 'PGSQL')
+        self.assertEqual(form.var['DB'].dataFormat, 'SPECTRUM')
+        self.assertEqual(form.var['DB'].query, 'SELECT 1')
+        self.assertEqual(form.var['DB'].parameters['DB name'], 'tango')
+        self.assertEqual(other.var['DB'].parameters, {})
+
+        form.dataSourceName = 'db2'
+        form.updateNode()
+        self.assertEqual(form.dialog, None)
+        self.assertTrue(form.isDirty())
+        self.assertTrue('name="db2"' in form.get())
+        self.assertTrue('SELECT 1' in form.get())
+
+        form.createDialog()
+        self.assertTrue(isinstance(form.dialog, CommonDataSourceDlg))
+        self.assertEqual(form.dialog.ui.nameLineEdit.text(), 'db2')
+        self.assertEqual(
+            form.dialog.imp['DB'].ui.dQueryLineEdit.text(), 'SELECT 1')
+        self.assertTrue('name="db2"' in form.get())
+        self.assertEqual(other.dialog, None)
+
 
 if __name__ == '__main__':
     if not app:
@@ -0,0 +1,160 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2017 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+# \package test nexdatas
+# \file DependencyGraphTest.py
+# unittests for dependencies between components and datasources
+#
+import unittest
+import sys
+
+from PyQt5.QtWidgets import QApplication
+
+from nxsconfigtool.DependencyGraph import DependencyGraph
+from nxsconfigtool.ComponentList import ComponentList
+from nxsconfigtool.DataSourceList import DataSourceList
+from nxsconfigtool.LabeledObject import LabeledObject
+
+# Qt application
+app = None
+
+
+# element instance with references
+class Instance(object):
+
+    # constructor
+    # \param name element name
+    # \param components referred components
+    # \param datasources referred datasources
+    def __init__(self, name, components=None, datasources=None):
+        # element id
+        self.id = None
+        # element name
+        self.name = name
+        # referred components
+        self.components = components or []
+        # referred datasources
+        self.datasources = datasources or []
+
+
+# test fixture
+class DependencyGraphTest(unittest.TestCase):
+
+    # test starter
+    # \brief Common set up
+    def setUp(self):
+        print("\nsetting up...")
+        if not QApplication.instance():
+            global app
+            app = QApplication([])
+
+    # test closer
+    # \brief Common tear down
+    def tearDown(self):
+        print("tearing down ...")
+
+    # graph test
+    # \brief It tests updating and queries of the graph
+    def test_graph(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        cp1 = ("components", "cp1")
+        cp2 = ("components", "cp2")
+        ds1 = ("datasources", "ds1")
+        ds2 = ("datasources", "ds2")
+        ds3 = ("datasources", "ds3")
+        graph = DependencyGraph()
+        graph.update(1, cp1, [cp2, ds1])
+        graph.update(2, cp2, [ds2, ds2])
+        graph.update(3, ds1, [])
+        graph.update(4, ds2, [ds3])
+        graph.update(5, ds3, [])
+
+        self.assertEqual(graph.dependencies(cp1), set([cp2, ds1]))
+        self.assertEqual(graph.users(ds2), set([cp2]))
+        self.assertEqual(graph.closure(cp1), set([cp2, ds1, ds2, ds3]))
+        self.assertEqual(graph.closure(ds3, True), set([ds2, cp2, cp1]))
+        self.assertEqual(graph.orphans(), set([cp1]))
+        self.assertEqual(graph.missing(), set())
+        self.assertTrue(graph.isDefined(ds1))
+
+        graph.update(2, cp2, [ds1])
+        self.assertEqual(graph.users(ds2), set())
+        self.assertEqual(graph.users(ds1), set([cp1, cp2]))
+        self.assertEqual(graph.orphans("datasources"), set([ds2]))
+
+        graph.update(6, cp2, [ds3])
+        self.assertEqual(graph.users(ds3), set([ds2, cp2]))
+        graph.remove(2)
+        self.assertEqual(graph.users(ds1), set([cp1]))
+        self.assertTrue(graph.isDefined(cp2))
+        graph.remove(6)
+        self.assertTrue(not graph.isDefined(cp2))
+        self.assertEqual(graph.missing("components"), set([cp2]))
+        graph.remove(6)
+
+        graph.clear()
+        self.assertEqual(graph.orphans(), set())
+        self.assertEqual(graph.users(ds1), set())
+
+    # list test
+    # \brief It tests the graph updated by element lists
+    def test_lists(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        cpl = ComponentList("components")
+        dsl = DataSourceList("datasources")
+        dsl.setDependencies(cpl.dependencies)
+        graph = cpl.dependencies
+
+        instances = [Instance("cp1", ["cp2"], ["ds1"]),
+                     Instance("cp2", [], ["ds1", "ds2"])]
+        for instance in instances:
+            el = LabeledObject(instance.name, instance)
+            instance.id = el.id
+            cpl.elements[el.id] = el
+        ds = Instance("ds1")
+        el = LabeledObject("ds1", ds)
+        ds.id = el.id
+        dsl.elements = {el.id: el}
+
+        self.assertEqual(sorted(cpl.dataSourceComponents("ds1")),
+                         ["cp1", "cp2"])
+        self.assertEqual(cpl.dataSourceComponents("ds2"), ["cp2"])
+        self.assertEqual(graph.orphans(), set([("components", "cp1")]))
+        self.assertEqual(graph.missing(), set([("datasources", "ds2")]))
+
+        instances[1].datasources = ["ds2"]
+        self.assertEqual(sorted(cpl.dataSourceComponents("ds1")),
+                         ["cp1", "cp2"])
+        cpl.elementChanged(instances[1])
+        self.assertEqual(cpl.dataSourceComponents("ds1"), ["cp1"])
+
+        cpl.elements.pop(instances[0].id)
+        self.assertEqual(cpl.dataSourceComponents("ds1"), [])
+        self.assertEqual(
+            graph.orphans(),
+            set([("components", "cp2"), ("datasources", "ds1")]))
+
+        cpl.elements = {}
+        self.assertEqual(graph.orphans(), set([("datasources", "ds1")]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -134,6 +134,52 @@ class DomToolsTest(unittest.TestCase):
             el = dts.getFirstElement(doc,  "kid%s" % k)
             self.assertEqual(el, kds[k])
 
+    def test_diffNodes(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        xml = '<definition><group type="NXentry" name="entry">' \
+            '<field name="a" type="NX_INT">1</field>' \
+            '<field name="b" type="NX_INT">2</field>' \
+            '</group></definition>'
+        old = QDomDocument()
+        self.assertTrue(old.setContent(xml))
+
+        new = QDomDocument()
+        self.assertTrue(new.setContent(xml.replace(">2<", ">3<")))
+        path, start, oldTexts, newTexts = DomTools.diffNodes(old, new)
+        self.assertEqual(path, [0, 0, 1])
+        self.assertEqual(start, 0)
+        self.assertEqual(oldTexts, [(True, "2")])
+        self.assertEqual(newTexts, [(True, "3")])
+
+        new = QDomDocument()
+        self.assertTrue(new.setContent(
+            xml.replace('name="entry"', 'name="scan"')))
+        self.assertEqual(
+            DomTools.diffNodes(old, new),
+            ([0, 0], None, {"type": "NXentry", "name": "entry"},
+             {"type": "NXentry", "name": "scan"}))
+
+        new = QDomDocument()
+        self.assertTrue(new.setContent(xml.replace(
+            '<field name="b"', '<link name="c"/><field name="b"')))
+        self.assertEqual(
+            DomTools.diffNodes(old, new),
+            ([0, 0], 1, [], [(False, '<link name="c"/>\n')]))
+
+        new = QDomDocument()
+        self.assertTrue(new.setContent(xml.replace(
+            '<field name="a" type="NX_INT">1</field>', '')))
+        path, start, oldTexts, newTexts = DomTools.diffNodes(old, new)
+        self.assertEqual((path, start, len(oldTexts), newTexts),
+                         ([0, 0], 0, 1, []))
+        self.assertEqual(DomTools.getChildTexts(
+            old.firstChild().firstChild(), 1, 5),
+            DomTools.getChildTexts(new.firstChild().firstChild()))
+
+        self.assertEqual(DomTools.diffNodes(old, old), ([], None, {}, {}))
+
     def test_getText(self):
         fun = sys._getframe().f_code.co_name
         print("Run: %s.%s() " % (self.__class__.__name__, fun))
@@ -1538,6 +1584,46 @@ class DomToolsTest(unittest.TestCase):
                 ks.child(0).node.toText().data(), '\nText\n %s\n' % k)
             self.assertEqual(ks.child(0).parent, ks)
 
+    # findElements test
+    # \brief It tests finding of $datasources and $components references
+    def test_findElements(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+        text = '<field>$datasources.ds1 $datasources. ds2</field>' \
+            '<attribute>$components.cp1$datasources.ds1</attribute>' \
+            '$var.entry'
+        self.assertEqual(DomTools.findElements(text, "datasources"),
+                         ["ds1", "ds2", "ds1"])
+        self.assertEqual(DomTools.findElements(text, "components"),
+                         ["cp1"])
+        self.assertEqual(DomTools.findElements(text, "var"), ["entry"])
+        self.assertEqual(DomTools.findElements("", "datasources"), [])
+        self.assertEqual(
+            dict(DomTools.findReferences(text)),
+            {("datasources", "ds1"): 2, ("datasources", "ds2"): 1,
+             ("components", "cp1"): 1})
+
+    # nodeReferences test
+    # \brief It tests counting references of the node subtree
+    def test_nodeReferences(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+        doc = QDomDocument()
+        self.assertTrue(doc.setContent(
+            '<group name="$components.cp1"><field>$datasources.ds1</field>'
+            '<field>$datasources.ds2</field></group>'))
+        group = doc.firstChild()
+        self.assertEqual(
+            dict(DomTools.nodeReferences(group)),
+            {("datasources", "ds1"): 1, ("datasources", "ds2"): 1,
+             ("components", "cp1"): 1})
+        loaded = [DomTools.nodeReferences(group.firstChild())]
+        loaded[0][("datasources", "ds3")] += 1
+        self.assertEqual(
+            dict(DomTools.nodeReferences(group, loaded)),
+            {("datasources", "ds1"): 1, ("datasources", "ds2"): 1,
+             ("datasources", "ds3"): 1, ("components", "cp1"): 1})
+
 
 if __name__ == '__main__':
     unittest.main()
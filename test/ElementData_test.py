@@ -0,0 +1,241 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2017 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+# \package test nexdatas
+# \file ElementDataTest.py
+# unittests for data of components and datasources without GUI
+#
+import unittest
+import sys
+import pickle
+import multiprocessing
+
+from nxsconfigtool.ElementData import (
+    DataSourceData, ComponentData, parseComponent, componentXML)
+
+# Qt application
+app = None
+
+
+# provides names of datasources defined in the component
+# \param xml component xml string
+# \returns list of datasource names
+def dataSourceNames(xml):
+    return [ds.dataSourceName for ds in ComponentData(xml).dataSources()]
+
+
+# test fixture
+class ElementDataTest(unittest.TestCase):
+
+    # constructor
+    # \param methodName name of the test method
+    def __init__(self, methodName):
+        unittest.TestCase.__init__(self, methodName)
+
+        # datasource XMLs
+        self.datasources = [
+            "<datasource type='CLIENT' name='c1'><record name='r1'/>"
+            "<doc>client</doc></datasource>",
+            "<datasource type='TANGO' name='t1'>"
+            "<device name='p09/motor/1' member='attribute' "
+            "hostname='haso' port='10000' group='g'/>"
+            "<record name='Position'/></datasource>",
+            "<datasource type='DB' name='d1'>"
+            "<database dbtype='PGSQL' dbname='tango' user='tu'>dsn"
+            "</database><query format='SPECTRUM'>SELECT 1</query>"
+            "</datasource>",
+            "<datasource type='PYEVAL' name='p1'>"
+            "<datasource type='CLIENT' name='inner'><record name='i'/>"
+            "</datasource>$datasources.other"
+            "<result name='res'>ds.res = ds.inner</result></datasource>"
+        ]
+        # component XML
+        self.xml = "<?xml version='1.0'?><!-- top -->" \
+            "<definition><group type='NXentry' name='entry'>" \
+            "<field name='a' type='NX_FLOAT'>%s</field>" \
+            "<field name='b'>%s</field></group></definition>" \
+            % (self.datasources[0], self.datasources[1])
+
+    # test starter
+    # \brief Common set up
+    def setUp(self):
+        print("\nsetting up...")
+
+    # test closer
+    # \brief Common tear down
+    def tearDown(self):
+        print("tearing down ...")
+
+    # datasource test
+    # \brief It tests reading and writing of datasources
+    def test_dataSource(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        ds = DataSourceData()
+        self.assertEqual(ds.dataSourceType, 'CLIENT')
+        self.assertEqual(ds.var['DB'].parameters, {})
+        self.assertTrue(
+            ds.var['DB'].parameters is not DataSourceData().var[
+                'DB'].parameters)
+
+        self.assertEqual(ds.fromXML(self.datasources[0]), [])
+        self.assertEqual(ds.dataSourceName, 'c1')
+        self.assertEqual(ds.var['CLIENT'].recordName, 'r1')
+        self.assertEqual(ds.doc, 'client')
+
+        self.assertEqual(ds.fromXML(self.datasources[1]), [])
+        self.assertEqual(ds.var['TANGO'].deviceName, 'p09/motor/1')
+        self.assertEqual(ds.var['TANGO'].memberName, 'Position')
+        self.assertEqual(ds.var['TANGO'].host, 'haso')
+        self.assertEqual(ds.var['TANGO'].group, 'g')
+        self.assertEqual(ds.var['TANGO'].encoding, '')
+        self.assertEqual(ds.doc, '')
+
+        self.assertEqual(ds.fromXML(self.datasources[2]), [])
+        self.assertEqual(ds.var['DB'].dbtype, 'PGSQL')
+        self.assertEqual(ds.var['DB'].dataFormat, 'SPECTRUM')
+        self.assertEqual(ds.var['DB'].query, 'SELECT 1')
+        self.assertEqual(ds.var['DB'].parameters,
+                         {'DB name': 'tango', 'DB user': 'tu',
+                          'Oracle DSN': 'dsn'})
+
+        self.assertEqual(ds.fromXML(self.datasources[3]), [])
+        self.assertEqual(ds.dataSourceName, 'p1')
+        self.assertEqual(ds.var['PYEVAL'].result, 'ds.res')
+        self.assertEqual(ds.var['PYEVAL'].script, 'ds.res = ds.inner')
+        self.assertEqual(ds.var['PYEVAL'].input, 'ds.other ds.inner')
+        self.assertEqual(list(ds.var['PYEVAL'].dataSources.keys()),
+                         ['inner'])
+
+        for xml in self.datasources:
+            ds = DataSourceData()
+            ds.fromXML(xml)
+            self.assertTrue(ds.toXML().startswith("<?xml"))
+            copy = DataSourceData()
+            self.assertEqual(copy.fromXML(ds.toXML(2)), [])
+            self.assertEqual(copy.getState(), ds.getState())
+            self.assertEqual(copy.diff(ds), [])
+            self.assertEqual(ds.validate(), [])
+            copy = pickle.loads(pickle.dumps(ds))
+            self.assertEqual(copy.getState(), ds.getState())
+
+        self.assertEqual(ds.fromXML("<datasource type='TANGO'/>"),
+                         ["Missing <record> tag", "Missing <device> tag"])
+        self.assertRaises(ValueError, ds.fromXML, "<definition/>")
+        self.assertRaises(ValueError, ds.fromXML, "<datasource")
+
+    # validation and diff test
+    # \brief It tests validation and differences of datasources
+    def test_validate_diff(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        ds = DataSourceData()
+        self.assertEqual(ds.validate(),
+                         ["Empty datasource name", "Empty record name"])
+        ds.dataSourceName = "ds"
+        ds.dataSourceType = "TANGO"
+        self.assertEqual(ds.validate(),
+                         ["Empty device name", "Empty member name"])
+        ds.dataSourceType = "DB"
+        ds.var['DB'].parameters['DB port'] = '1'
+        ds.var['DB'].parameters['size'] = '1'
+        self.assertEqual(ds.validate(),
+                         ["Empty query", "Unknown parameter: size"])
+        ds.dataSourceType = "PYEVAL"
+        self.assertEqual(ds.validate(), ["Empty script"])
+        ds.dataSourceType = "SQL"
+        self.assertEqual(ds.validate(), ["Unknown datasource type: SQL"])
+
+        ds1 = DataSourceData()
+        ds1.fromXML(self.datasources[1])
+        ds2 = DataSourceData()
+        ds2.fromXML(self.datasources[1])
+        ds2.var['TANGO'].port = '10001'
+        ds2.var['DB'].query = 'SELECT 2'
+        self.assertEqual(ds1.diff(ds2),
+                         [('TANGO.port', '10000', '10001')])
+        ds2.dataSourceType = 'DB'
+        self.assertEqual(ds1.diff(ds2),
+                         [('type', 'TANGO', 'DB'),
+                          ('DB.query', '', 'SELECT 2'),
+                          ('TANGO.port', '10000', '10001')])
+
+    # component test
+    # \brief It tests components without GUI
+    def test_component(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        document = parseComponent(self.xml)
+        self.assertEqual(document.firstChild().nodeName(), "definition")
+        self.assertEqual(document.childNodes().count(), 1)
+        xml = componentXML(document)
+        self.assertTrue(xml.startswith("<?xml version='1.0'?>\n<definition>"))
+        self.assertEqual(document.childNodes().count(), 1)
+        self.assertRaises(ValueError, parseComponent, "<definition")
+
+        cp = ComponentData(self.xml)
+        self.assertEqual(cp.toXML(), xml)
+        self.assertEqual(
+            [(ds.dataSourceName, ds.dataSourceType)
+             for ds in cp.dataSources()],
+            [('c1', 'CLIENT'), ('t1', 'TANGO')])
+        self.assertEqual(cp.validate(), [])
+        self.assertEqual(ComponentData().toXML(), None)
+        self.assertEqual(ComponentData().validate(), ["Empty component"])
+
+        other = pickle.loads(pickle.dumps(cp))
+        self.assertEqual(other.toXML(), xml)
+        self.assertEqual(cp.diff(other), None)
+        other.document.elementsByTagName("field").item(1).toElement(
+        ).setAttribute("units", "mm")
+        self.assertEqual(cp.diff(other),
+                         ([0, 0, 1], None, {'name': 'b'},
+                          {'name': 'b', 'units': 'mm'}))
+
+        bad = ComponentData(
+            "<definition><group type='NXentry' name='entry'>"
+            "<field name='a' type='NX_FLOAT'/><field name='a' type='NX_INT'/>"
+            "<field name='b'><datasource type='CLIENT' name='b'/></field>"
+            "</group></definition>")
+        errors = bad.validate()
+        self.assertEqual(len(errors), 2)
+        self.assertTrue("Incompatible" in errors[0])
+        self.assertEqual(errors[1], "b: Empty record name")
+        self.assertEqual(
+            len(bad.document.elementsByTagName("field").item(0)
+                .parentNode().childNodes()), 3)
+
+    # process pool test
+    # \brief It tests processing of components in worker processes
+    def test_pool(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        pool = multiprocessing.Pool(2)
+        try:
+            names = pool.map(dataSourceNames, [self.xml] * 4)
+        finally:
+            pool.close()
+            pool.join()
+        self.assertEqual(names, [['c1', 't1']] * 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2017 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+# \package test nexdatas
+# \file ElementListModelTest.py
+# unittests for the element list model
+#
+import unittest
+import sys
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QColor
+from PyQt5.QtWidgets import QApplication
+
+from nxsconfigtool.ElementListModel import ElementListModel
+from nxsconfigtool.ElementList import ElementList
+from nxsconfigtool.LabeledObject import LabeledObject
+
+# Qt application
+app = None
+
+
+# test fixture
+class ElementListModelTest(unittest.TestCase):
+
+    # test starter
+    # \brief Common set up
+    def setUp(self):
+        print("\nsetting up...")
+        if not QApplication.instance():
+            global app
+            app = QApplication([])
+
+    # test closer
+    # \brief Common tear down
+    def tearDown(self):
+        print("tearing down ...")
+
+    # provides names of the model rows
+    # \param model element list model
+    # \returns list of names
+    def names(self, model):
+        return [model.index(row, 0).data()
+                for row in range(model.rowCount())]
+
+    # model test
+    # \brief It tests row updates of the model
+    def test_model(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        els = [LabeledObject(name, None) for name in ["c", "a", "b"]]
+        elements = dict((el.id, el) for el in els)
+        model = ElementListModel(elements)
+        self.assertEqual(self.names(model), ["a", "b", "c"])
+        self.assertEqual(model.row(els[0].id), 2)
+        self.assertEqual(model.elementId(0), els[1].id)
+        self.assertEqual(model.index(0, 0).data(Qt.UserRole), els[1].id)
+        self.assertEqual(model.index(0, 0).data(Qt.ForegroundRole),
+                         QColor(Qt.black))
+
+        signals = []
+        model.rowsMoved.connect(lambda *args: signals.append("moved"))
+        model.rowsInserted.connect(lambda *args: signals.append("inserted"))
+        model.rowsRemoved.connect(lambda *args: signals.append("removed"))
+        model.modelReset.connect(lambda *args: signals.append("reset"))
+
+        els[1].name = "d"
+        model.updateElement(els[1].id)
+        self.assertEqual(self.names(model), ["b", "c", "d"])
+        self.assertEqual(model.index(2, 0).data(Qt.ForegroundRole),
+                         QColor(Qt.red))
+        els[1].name = "a"
+        model.updateElement(els[1].id)
+        self.assertEqual(self.names(model), ["a", "b", "c"])
+        els[2].name = "bb"
+        model.updateElement(els[2].id)
+        self.assertEqual(self.names(model), ["a", "bb", "c"])
+
+        el = LabeledObject("aa", None)
+        elements[el.id] = el
+        model.updateElement(el.id)
+        self.assertEqual(self.names(model), ["a", "aa", "bb", "c"])
+        elements.pop(els[0].id)
+        model.updateElement(els[0].id)
+        self.assertEqual(self.names(model), ["a", "aa", "bb"])
+        model.updateElement(els[0].id)
+        self.assertEqual(model.row(els[0].id), -1)
+        self.assertEqual(signals, ["moved", "moved", "inserted", "removed"])
+
+        edited = []
+        model.nameEdited.connect(edited.append)
+        self.assertTrue(model.setData(model.index(0, 0), "new"))
+        self.assertEqual(edited, ["new"])
+        self.assertEqual(self.names(model), ["a", "aa", "bb"])
+
+        changed = []
+        model.dataChanged.connect(
+            lambda first, last: changed.append((first.row(), last.row())))
+        for row in range(model.rowCount()):
+            model.index(row, 0).data(Qt.ForegroundRole)
+        model.refresh()
+        self.assertEqual(changed, [])
+        els[2].name = "b"
+        el.savedName = "ab"
+        model.refresh()
+        self.assertEqual(sorted(changed), [(1, 1), (2, 2)])
+        model.refresh()
+        self.assertEqual(len(changed), 2)
+        model.refresh([els[1].id])
+        self.assertEqual(len(changed), 2)
+
+    # list test
+    # \brief It tests the model updated by the element list
+    def test_list(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        elist = ElementList("elements")
+        elist.createGUI()
+        els = [LabeledObject(name, None) for name in ["c", "a", "b"]]
+        for el in els:
+            elist.elements[el.id] = el
+        self.assertEqual(self.names(elist.model), ["a", "b", "c"])
+
+        elist.populateElements(els[2].id)
+        self.assertEqual(elist.currentListElement(), els[2])
+        els[2].name = "e"
+        elist.populateElements(els[2].id)
+        self.assertEqual(self.names(elist.model), ["a", "c", "e"])
+        self.assertEqual(elist.currentListElement(), els[2])
+
+        elist.elements.pop(els[0].id)
+        self.assertEqual(self.names(elist.model), ["a", "e"])
+        elist.elements = {els[0].id: els[0]}
+        self.assertEqual(self.names(elist.model), ["c"])
+        elist.populateElements()
+        self.assertEqual(elist.currentListElement(), None)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,242 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2017 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+# \package test nexdatas
+# \file FileLoaderTest.py
+# unittests for the background file reader
+#
+import unittest
+import os
+import sys
+import shutil
+import tempfile
+import time
+
+from PyQt5.QtWidgets import QApplication
+
+from nxsconfigtool.CompactTree import CompactTree
+from nxsconfigtool.ComponentList import ComponentList
+from nxsconfigtool.ElementData import parseComponent, componentXML
+from nxsconfigtool.FileLoader import (
+    FileLoader, readFile, findReferences, compactComponent)
+
+# Qt application
+app = None
+
+
+# test fixture
+class FileLoaderTest(unittest.TestCase):
+
+    # constructor
+    # \param methodName name of the test method
+    def __init__(self, methodName):
+        unittest.TestCase.__init__(self, methodName)
+        # temporary directory
+        self.directory = None
+
+    # test starter
+    # \brief Common set up
+    def setUp(self):
+        print("\nsetting up...")
+        self.directory = tempfile.mkdtemp()
+
+    # test closer
+    # \brief Common tear down
+    def tearDown(self):
+        print("tearing down ...")
+        shutil.rmtree(self.directory)
+
+    # creates a file in the temporary directory
+    # \param name file name
+    # \param text file content
+    # \returns file path
+    def createFile(self, name, text):
+        path = os.path.join(self.directory, name)
+        with open(path, "w") as fl:
+            fl.write(text)
+        return path
+
+    def test_findReferences(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        self.assertEqual(findReferences(""), ([], []))
+        self.assertEqual(
+            findReferences(
+                "<field>$datasources.ds2 $datasources.ds1</field>"
+                "<group>$components.cp1</group>$datasources.ds2"),
+            (["ds1", "ds2"], ["cp1"]))
+        self.assertEqual(
+            findReferences("$datasources.  ds1 $components.$datasources.ds2"),
+            (["ds1", "ds2"], ["datasources"]))
+
+    def test_readFile(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        text = "<definition><field>$datasources.ds1</field></definition>"
+        path = self.createFile("cp1.xml", text)
+        res = readFile(path)
+        self.assertEqual(res["path"], path)
+        self.assertEqual(res["text"], text)
+        self.assertEqual(res["size"], len(text))
+        self.assertTrue(res["mtime"] is not None)
+        self.assertEqual(res["error"], None)
+        self.assertEqual(res["datasources"], ["ds1"])
+        self.assertEqual(res["components"], [])
+        self.assertEqual(res["tokens"], ["datasources", "ds1"])
+
+        res = readFile(path, keepText=False)
+        self.assertEqual(res["text"], None)
+        self.assertEqual(res["datasources"], ["ds1"])
+
+        path = self.createFile("cp2.xml", "<definition><field>")
+        res = readFile(path)
+        self.assertEqual(res["error"], None)
+        self.assertEqual(res["text"], "<definition><field>")
+
+        res = readFile(os.path.join(self.directory, "cp3.xml"))
+        self.assertTrue(res["error"])
+        self.assertEqual(res["size"], None)
+
+    def test_fetch(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        paths = [
+            self.createFile(
+                "cp%s.xml" % i,
+                "<definition><field>$datasources.ds%s</field></definition>"
+                % i)
+            for i in range(50)]
+
+        fl = FileLoader(workers=3)
+        self.assertTrue(fl.finished())
+        self.assertEqual(fl.fetch(), [])
+        fl.start(paths)
+        self.assertEqual(fl.progress(), (0, 50))
+        results = []
+        while not fl.finished():
+            batch = fl.fetch(7, timeout=None)
+            self.assertTrue(0 < len(batch) <= 7)
+            results.extend(batch)
+        self.assertEqual(fl.progress(), (50, 50))
+        self.assertEqual(sorted(res["path"] for res in results),
+                         sorted(paths))
+        for res in results:
+            name = os.path.basename(res["path"])[2:-4]
+            self.assertEqual(res["datasources"], ["ds%s" % name])
+
+        fl = FileLoader(workers=2, keepText=False)
+        fl.start(paths)
+        results = fl.fetchAll()
+        self.assertEqual(len(results), 50)
+        self.assertTrue(all(res["text"] is None for res in results))
+        self.assertTrue(fl.finished())
+
+        fl = FileLoader(workers=2, processes=True)
+        fl.start(paths)
+        results = fl.fetchAll()
+        self.assertEqual(sorted(res["path"] for res in results),
+                         sorted(paths))
+
+    def test_parse(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        text = "<definition><group name='entry' type='NXentry'>" \
+            "<field>$datasources.ds1</field></group></definition>"
+        path = self.createFile("cp1.xml", text)
+        res = readFile(path, parse=compactComponent)
+        self.assertEqual(res["text"], None)
+        self.assertTrue(isinstance(res["data"], CompactTree))
+        self.assertEqual(res["data"].sourceXML(),
+                         componentXML(parseComponent(text)))
+        self.assertEqual(res["datasources"], ["ds1"])
+
+        path = self.createFile("cp2.xml", "<definition><field>")
+        res = readFile(path, parse=compactComponent)
+        self.assertEqual(res["error"], None)
+        self.assertEqual(res["data"], None)
+        self.assertEqual(res["text"], "<definition><field>")
+
+        paths = [self.createFile("cp%s.xml" % i, text) for i in range(10)]
+        fl = FileLoader(workers=2, processes=True, parse=compactComponent)
+        fl.start(paths)
+        results = fl.fetchAll()
+        self.assertEqual(len(results), 10)
+        for res in results:
+            self.assertEqual(res["text"], None)
+            self.assertEqual(res["data"].sourceXML(),
+                             componentXML(parseComponent(text)))
+            self.assertEqual(res["data"].references(),
+                             {("datasources", "ds1"): 1})
+
+    def test_componentList(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        if not QApplication.instance():
+            global app
+            app = QApplication([])
+        texts = {}
+        for i in range(5):
+            texts["cp%s" % i] = "<definition><group name='entry%s'>" \
+                "<field>$datasources.ds%s</field></group></definition>" \
+                % (i, i)
+            self.createFile("cp%s.xml" % i, texts["cp%s" % i])
+        cpList = ComponentList(self.directory)
+        cpList.createGUI()
+        cpList.compact = True
+        cpList.background = True
+        self.assertTrue(cpList._fileParser() is compactComponent)
+        cpList.loadList()
+        end = time.time() + 10
+        while cpList.isLoading() and time.time() < end:
+            cpList._fetchLoaded()
+            time.sleep(0.01)
+        self.assertTrue(not cpList.isLoading())
+        self.assertEqual(len(cpList.elements), 5)
+        for el in cpList.elements.values():
+            cp = el.instance
+            self.assertTrue(cp.dialog is None)
+            self.assertTrue(not cp.isDirty())
+            self.assertEqual(cp.datasources, ["ds%s" % el.name[2:]])
+            self.assertEqual(cp.get(), componentXML(
+                parseComponent(texts[el.name])))
+            self.assertEqual(cp.savedXML, cp.get())
+            self.assertTrue(not cp.document.isNull())
+            self.assertTrue(not cp.isDirty())
+
+        cpList.lazy = True
+        self.assertEqual(cpList._fileParser(), None)
+
+    def test_cancel(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        paths = [self.createFile("cp%s.xml" % i, "<definition/>")
+                 for i in range(20)]
+        fl = FileLoader(workers=2)
+        fl.start(paths)
+        fl.cancel()
+        self.assertTrue(fl.finished())
+        self.assertEqual(fl.fetch(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -98,6 +98,44 @@ class LabeledObjectTest(unittest.TestCase):
         lo.name = newname
         self.assertTrue(not lo.isDirty())
 
+    def test_lazy(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        name = "name1"
+        instance = "my instance"
+        calls = []
+
+        def loader(obj):
+            calls.append(obj)
+            return instance
+
+        info = ("/tmp/name1.xml", 123, 1.5)
+        lo = LabeledObject(name, None, loader=loader, fileInfo=info)
+        self.assertEqual(lo.name, name)
+        self.assertEqual(lo.fileInfo, info)
+        self.assertTrue(not lo.isLoaded())
+        self.assertEqual(lo.loadedInstance(), None)
+        self.assertEqual(calls, [])
+
+        self.assertEqual(lo.instance, instance)
+        self.assertTrue(lo.isLoaded())
+        self.assertEqual(lo.loadedInstance(), instance)
+        self.assertEqual(lo.instance, instance)
+        self.assertEqual(lo.load(), instance)
+        self.assertEqual(calls, [lo])
+
+        lo = LabeledObject(name, None, loader=loader)
+        lo.instance = "other"
+        self.assertTrue(lo.isLoaded())
+        self.assertEqual(lo.instance, "other")
+        self.assertEqual(len(calls), 1)
+
+        lo = LabeledObject(name, instance, loader=loader)
+        self.assertTrue(lo.isLoaded())
+        self.assertEqual(lo.instance, instance)
+        self.assertEqual(len(calls), 1)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,172 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2017 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+# \package test nexdatas
+# \file LazyDocumentTest.py
+# unittests for component documents built by a streaming parser
+#
+import unittest
+import sys
+
+from nxsconfigtool.LazyDocument import LazyDocument
+from nxsconfigtool.ElementData import parseComponent, componentXML
+
+# Qt application
+app = None
+
+
+# test fixture
+class LazyDocumentTest(unittest.TestCase):
+
+    # constructor
+    # \param methodName name of the test method
+    def __init__(self, methodName):
+        unittest.TestCase.__init__(self, methodName)
+
+        # component XML
+        self.xml = "<?xml version='1.0' encoding='utf-8'?>\n" \
+            "<?xml-stylesheet href='nxs.xsl'?><!-- top -->\n" \
+            "<definition>\n  <!-- comment -->" \
+            "<group type='NXentry' name='entry'>text &amp; more" \
+            "<![CDATA[<raw>]]><field name='a' units='1&gt;'> 1.0 </field>" \
+            "<field name='b'><?pi data?><doc>d\xf3c</doc>\n</field>" \
+            "<group type='NXinstrument' name='instrument'>" \
+            "<field name='c'>$datasources.ds1<strategy mode='STEP'/>" \
+            "</field><field name='d'/><field>  </field>" \
+            "<group name='source'><field name='e'>" \
+            "<datasource type='CLIENT' name='ds2'><record name='r'/>" \
+            "</datasource>$components.cp1</field></group>" \
+            "</group></group></definition>"
+
+    # test starter
+    # \brief Common set up
+    def setUp(self):
+        print("\nsetting up...")
+
+    # test closer
+    # \brief Common tear down
+    def tearDown(self):
+        print("tearing down ...")
+
+    # loads the lazy document
+    # \param source XML string or bytes
+    # \param depth number of tree levels built on loading
+    # \param chunkSize size of source chunks passed to the parser
+    # \returns lazy document
+    def lazyDocument(self, source, depth, chunkSize=1048576):
+        lazy = LazyDocument(source, depth, chunkSize)
+        lazy.load()
+        return lazy
+
+    # load test
+    # \brief It tests if the created documents are equal to parsed ones
+    def test_load(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        xml = componentXML(parseComponent(self.xml))
+        for source in [self.xml, self.xml.encode("utf-8")]:
+            for depth in range(1, 8):
+                for chunkSize in [5, 64, 1048576]:
+                    lazy = self.lazyDocument(source, depth, chunkSize)
+                    self.assertTrue(not lazy.modified)
+                    self.assertTrue(
+                        lazy.pendingCount() > 0 if depth < 7
+                        else lazy.pendingCount() == 0)
+                    self.assertEqual(lazy.sourceXML(), xml)
+                    self.assertEqual(
+                        componentXML(parseComponent(lazy.toXML())), xml)
+                    self.assertEqual(
+                        componentXML(parseComponent(lazy.toXML(2))), xml)
+                    lazy.materialize()
+                    self.assertEqual(lazy.toXML(), xml)
+                    self.assertEqual(lazy.pendingCount(), 0)
+                    self.assertEqual(componentXML(lazy.document), xml)
+
+        lazy = self.lazyDocument(self.xml, 2)
+        self.assertEqual(lazy.pendingCount(), 1)
+        definition = lazy.document.documentElement()
+        self.assertEqual(definition.childNodes().count(), 2)
+        self.assertTrue(definition.firstChild().isComment())
+        entry = definition.lastChild()
+        self.assertTrue(not lazy.isPending(definition))
+        self.assertTrue(lazy.isPending(entry))
+        self.assertEqual(entry.childNodes().count(), 1)
+        self.assertEqual(entry.toElement().attribute("name"), "entry")
+
+    # materialize test
+    # \brief It tests creating of pending subtrees
+    def test_materialize(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        lazy = self.lazyDocument(self.xml, 2)
+        entry = lazy.document.documentElement().lastChild()
+        self.assertEqual(lazy.references(), {
+            ("datasources", "ds1"): 1, ("components", "cp1"): 1})
+        self.assertEqual(lazy.references(entry), lazy.references())
+
+        self.assertTrue(lazy.materialize(entry, 1))
+        self.assertTrue(not lazy.isPending(entry))
+        self.assertEqual(
+            [entry.childNodes().item(i).nodeName()
+             for i in range(entry.childNodes().count())],
+            ["#text", "#cdata-section", "field", "field", "group"])
+        self.assertEqual(entry.childNodes().item(2).firstChild().nodeValue(),
+                         " 1.0 ")
+        self.assertTrue(lazy.isPending(entry.childNodes().item(3)))
+        instrument = entry.lastChild()
+        self.assertTrue(lazy.isPending(instrument))
+        self.assertEqual(lazy.pendingCount(), 2)
+        self.assertTrue(not lazy.materialize(entry, 1))
+
+        self.assertTrue(lazy.materialize(entry, 3))
+        self.assertEqual(lazy.pendingCount(), 1)
+        self.assertEqual(componentXML(parseComponent(lazy.toXML())),
+                         componentXML(parseComponent(self.xml)))
+        source = instrument.lastChild()
+        self.assertTrue(lazy.isPending(source.firstChild()))
+        self.assertEqual(lazy.references(instrument),
+                         {("components", "cp1"): 1})
+        self.assertEqual(lazy.references(entry.childNodes().item(3)), {})
+
+        entry.removeChild(instrument)
+        self.assertEqual(lazy.references(), {})
+        self.assertTrue(not lazy.materialize())
+        self.assertTrue(lazy.materialize(instrument))
+        self.assertEqual(lazy.pendingCount(), 0)
+        self.assertEqual(
+            source.firstChild().firstChild().toElement().attribute("name"),
+            "ds2")
+
+    # error test
+    # \brief It tests not valid and not supported sources
+    def test_errors(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        for source in [
+                "", "<definition>", "<definition><group></definition>",
+                "<!DOCTYPE definition [<!ENTITY e 'x'>]>"
+                "<definition>&e;</definition>",
+                "<definition/>".encode("utf-16"),
+                b"<?xml version='1.0' encoding='cp1252'?><definition/>"]:
+            self.assertRaises(ValueError, self.lazyDocument, source, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
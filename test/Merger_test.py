@@ -0,0 +1,263 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2017 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+# \package test nexdatas
+# \file MergerTest.py
+# unittests for merging of component siblings
+#
+import unittest
+import os
+import sys
+import random
+import binascii
+import time
+
+from PyQt5.QtXml import QDomDocument
+
+from nxsconfigtool.Merger import Merger, IncompatibleNodeError
+
+# Qt application
+app = None
+
+
+# merger comparing all pairs of siblings as the merger did before
+#  the siblings were bucketed by tags and names
+class PairwiseMerger(Merger):
+
+    # merges mergeable children of the given DOM node
+    # \param node the given DOM node
+    def _mergeSiblings(self, node):
+        elems = []
+        child = node.firstChild()
+        while not child.isNull():
+            if child.isElement():
+                elems.append(child.toElement())
+            child = child.nextSibling()
+        i = 0
+        while i < len(elems):
+            j = i + 1
+            while j < len(elems):
+                if self._areMergeable(elems[i], elems[j]):
+                    self._mergeNodes(elems[i], elems[j])
+                    elems.pop(j)
+                else:
+                    j += 1
+            i += 1
+
+
+# test fixture
+class MergerTest(unittest.TestCase):
+
+    # constructor
+    # \param methodName name of the test method
+    def __init__(self, methodName):
+        unittest.TestCase.__init__(self, methodName)
+
+        try:
+            self.__seed = int(binascii.hexlify(os.urandom(16)), 16)
+        except NotImplementedError:
+            self.__seed = int(time.time() * 256)
+        self.__rnd = random.Random(self.__seed)
+
+    # test starter
+    # \brief Common set up
+    def setUp(self):
+        print("\nsetting up...")
+        print("SEED = %s" % self.__seed)
+
+    # test closer
+    # \brief Common tear down
+    def tearDown(self):
+        print("tearing down ...")
+
+    # merges the component
+    # \param xml component xml string
+    # \param merger merger class
+    # \returns (merged xml string, exception) tuple
+    def merge(self, xml, merger=Merger):
+        document = QDomDocument()
+        self.assertTrue(document.setContent(xml)[0])
+        mg = merger(document)
+        mg.run()
+        error, mg.exception = mg.exception, None
+        if error is not None:
+            error.__traceback__ = None
+        return document.toString(0), error
+
+    # checks if the merging fails
+    # \param xml component xml string
+    # \param message part of the expected error message
+    def checkError(self, xml, message):
+        _, error = self.merge(xml)
+        self.assertTrue(isinstance(error, IncompatibleNodeError))
+        self.assertTrue(message in error.value, error.value)
+        _, old = self.merge(xml, PairwiseMerger)
+        self.assertEqual(error.value, old.value)
+
+    # provides the element structure independent of the attribute order
+    # \param xml component xml string
+    # \returns list of (tag, sorted attributes, children) tuples
+    def structure(self, xml):
+        document = QDomDocument()
+        self.assertTrue(document.setContent(xml)[0])
+
+        def elements(node):
+            res = []
+            child = node.firstChild()
+            while not child.isNull():
+                if child.isElement():
+                    attrs = child.attributes()
+                    res.append((
+                        child.nodeName(),
+                        sorted((attrs.item(i).nodeName(),
+                                attrs.item(i).nodeValue())
+                               for i in range(attrs.count())),
+                        elements(child)))
+                child = child.nextSibling()
+            return res
+        return elements(document)
+
+    # creates the random component
+    # \returns component xml string
+    def randomComponent(self):
+        rnd = self.__rnd
+        fields = []
+        for _ in range(rnd.randint(0, 30)):
+            children = []
+            if rnd.random() < 0.3:
+                children.append('<strategy mode="%s"/>'
+                                % rnd.choice(["STEP", "STEP", "FINAL"]))
+            if rnd.random() < 0.3:
+                children.append('<doc>%s</doc>' % rnd.choice(["x", "y"]))
+            if rnd.random() < 0.2:
+                children.append(rnd.choice(["1", "2"]))
+            fields.append('<field%s%s>%s</field>' % (
+                ' name="%s"' % rnd.choice("abcdef")
+                if rnd.random() < 0.95 else "",
+                ' type="%s"' % rnd.choice(["NX_INT", "NX_INT", "NX_FLOAT"])
+                if rnd.random() < 0.3 else "",
+                "".join(children)))
+        groups = []
+        for _ in range(rnd.randint(1, 4)):
+            groups.append('<group type="NXentry"%s>%s</group>' % (
+                ' name="%s"' % rnd.choice(["e1", "e2"])
+                if rnd.random() < 0.7 else "",
+                "".join(rnd.sample(fields, rnd.randint(0, len(fields))))))
+        return "<definition>%s</definition>" % "".join(groups)
+
+    # named siblings test
+    # \brief It tests siblings with the same tag and different names
+    def test_names(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        xml, error = self.merge(
+            '<definition><group type="NXentry" name="entry">'
+            '<field name="a"><doc>1</doc></field>'
+            '<field name="b" type="NX_INT"/>'
+            '<field name="c"/>'
+            '<field name="a" units="mm"><strategy mode="STEP"/></field>'
+            '<field name="b"><doc>2</doc></field>'
+            '</group></definition>')
+        self.assertEqual(error, None)
+        document = QDomDocument()
+        document.setContent(xml)
+        fields = document.elementsByTagName("field")
+        self.assertEqual(
+            [fields.item(i).toElement().attribute("name")
+             for i in range(fields.count())], ["a", "b", "c"])
+        a = fields.item(0).toElement()
+        self.assertEqual(a.attribute("units"), "mm")
+        self.assertEqual(
+            [a.childNodes().item(i).nodeName()
+             for i in range(a.childNodes().count())], ["doc", "strategy"])
+        self.assertEqual(fields.item(1).toElement().attribute("type"),
+                         "NX_INT")
+        self.assertEqual(
+            fields.item(1).firstChild().toElement().text(), "2")
+
+    # unnamed siblings test
+    # \brief It tests merging of siblings without the name attribute
+    def test_unnamed(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        xml, error = self.merge(
+            '<definition><group type="NXentry" name="entry">'
+            '<field name="a"/></group>'
+            '<group type="NXdata"><field name="b"/></group>'
+            '<group type="NXentry"><field name="c"/></group>'
+            '<group type="NXentry" name="scan"><field name="d"/></group>'
+            '</definition>')
+        self.assertEqual(error, None)
+        self.assertEqual(self.structure(xml), [
+            ("definition", [], [
+                ("group", [("name", "entry"), ("type", "NXentry")], [
+                    ("field", [("name", "a")], []),
+                    ("field", [("name", "c")], [])]),
+                ("group", [("type", "NXdata")], [
+                    ("field", [("name", "b")], [])]),
+                ("group", [("name", "scan"), ("type", "NXentry")], [
+                    ("field", [("name", "d")], [])])])])
+
+    # error test
+    # \brief It tests conflicting attributes, strategies and texts
+    def test_errors(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        self.checkError(
+            '<definition><group type="NXentry" name="entry">'
+            '<field name="a" type="NX_INT"/><field name="b"/>'
+            '<field name="a" type="NX_FLOAT"/></group></definition>',
+            "/definition/group:entry/field:a/type")
+        self.checkError(
+            '<definition><group type="NXentry" name="entry">'
+            '<field name="a"><strategy mode="STEP"/>'
+            '<strategy mode="FINAL"/></field></group></definition>',
+            "Incompatible element attributes")
+        self.checkError(
+            '<definition><group type="NXentry" name="entry">'
+            '<field name="a">1</field><field name="a">2</field>'
+            '</group></definition>',
+            "element value")
+        self.checkError(
+            '<definition><group type="NXentry" name="entry">'
+            '<field name="a"><datasource type="CLIENT">'
+            '<record name="r1"/><record name="r2"/></datasource>'
+            '</field></group></definition>',
+            "Incompatible element attributes")
+
+    # comparison test
+    # \brief It tests if results and errors are equal to the ones of
+    #        the pairwise merging
+    def test_pairwise(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        for _ in range(200):
+            xml = self.randomComponent()
+            merged, error = self.merge(xml)
+            expected, old = self.merge(xml, PairwiseMerger)
+            self.assertEqual(merged, expected, xml)
+            self.assertEqual(type(error), type(old), xml)
+            if error is not None:
+                self.assertEqual(str(error), str(old), xml)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,239 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2017 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+# \package test nexdatas
+# \file SearchIndexTest.py
+# unittests for the search index of elements
+#
+import unittest
+import sys
+
+from PyQt5.QtWidgets import QApplication
+
+from nxsconfigtool.SearchIndex import SearchIndex, TokenIndex
+from nxsconfigtool.ElementList import ElementList
+from nxsconfigtool.LabeledObject import LabeledObject
+
+# Qt application
+app = None
+
+
+# element instance with XML content
+class Instance(object):
+
+    # constructor
+    # \param xml XML content
+    def __init__(self, xml):
+        # element id
+        self.id = None
+        # XML content
+        self.xml = xml
+        # revision key, None if modifications are not tracked
+        self.key = None
+        # number of get calls
+        self.calls = 0
+
+    # provides the XML content
+    # \returns XML string
+    def get(self):
+        self.calls += 1
+        return self.xml
+
+    # provides the revision key
+    # \returns revision key
+    def revisionKey(self):
+        return self.key
+
+
+# test fixture
+class SearchIndexTest(unittest.TestCase):
+
+    # test starter
+    # \brief Common set up
+    def setUp(self):
+        print("\nsetting up...")
+        if not QApplication.instance():
+            global app
+            app = QApplication([])
+
+    # test closer
+    # \brief Common tear down
+    def tearDown(self):
+        print("tearing down ...")
+
+    # provides names of the view rows
+    # \param model view model
+    # \returns list of names
+    def names(self, model):
+        return [model.index(row, 0).data()
+                for row in range(model.rowCount())]
+
+    # tokenize test
+    # \brief It tests splitting texts into tokens
+    def test_tokenize(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        self.assertEqual(SearchIndex.tokenize(None), set())
+        self.assertEqual(SearchIndex.tokenize("Pilatus_Exposure-time"),
+                         set(["pilatus_exposure", "pilatus", "exposure",
+                              "time"]))
+        self.assertEqual(
+            SearchIndex.tokenizeXML(
+                "<datasource type='TANGO' name=\"exp_c01\">"
+                "<device member=\"attribute\" name=\"p09/mot/1\"/>"
+                "<record name=\"Position\"/></datasource>"),
+            set(["tango", "exp_c01", "exp", "c01", "attribute", "p09",
+                 "mot", "1", "position"]))
+
+    # index test
+    # \brief It tests updating and queries of the index
+    def test_index(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        index = SearchIndex()
+        index.update(1, "pilatus_exposure", set(["tango", "p09"]))
+        index.update(2, "pilatus_frames", set(["client"]))
+        index.update(3, "mca_exposure")
+        self.assertEqual(index.search(""), None)
+        self.assertEqual(index.search("pil"), set([1, 2]))
+        self.assertEqual(index.search("EXPO"), set([1, 3]))
+        self.assertEqual(index.search("pil expo"), set([1]))
+        self.assertEqual(index.search("tan"), set())
+        self.assertEqual(index.search("tan", True), set([1]))
+        self.assertTrue(index.match(1, "pil tan", True))
+        self.assertTrue(not index.match(1, "pil tan"))
+
+        index.update(1, "mythen_exposure")
+        self.assertEqual(index.search("pil"), set([2]))
+        self.assertEqual(index.search("tan", True), set())
+        self.assertEqual(index.search("myth"), set([1]))
+        index.remove(2)
+        index.remove(2)
+        self.assertEqual(index.search("pil"), set())
+        self.assertTrue(not index.contains(2))
+        self.assertTrue(index.contains(3))
+
+    # token index test
+    # \brief It tests prefix lookups after adding and removing tokens
+    def test_tokenIndex(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        index = TokenIndex()
+        for ide in range(100):
+            index.add(ide, set(["t%03d" % ide, "even" if ide % 2 else "odd"]))
+        self.assertEqual(index.find("t00"), set(range(10)))
+        self.assertEqual(len(index.find("ev")), 50)
+        index.add(100, set(["t0000", "a"]))
+        index.remove(5, set(["t005", "even"]))
+        index.remove(100, set(["a"]))
+        self.assertEqual(index.find("t00"), set(range(10)) - set([5]) |
+                         set([100]))
+        self.assertEqual(index.find("a"), set())
+        index.add(5, set(["t005"]))
+        index.remove(5, set(["t005"]))
+        index.add(5, set(["t005"]))
+        self.assertEqual(index.find("t005"), set([5]))
+        self.assertEqual(len(index.find("ev")), 49)
+        self.assertEqual(index.find("t1"), set())
+
+    # revision test
+    # \brief It tests if contents are serialized only for new revisions
+    def test_revision(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        elist = ElementList("elements")
+        elist.createGUI()
+        view = elist.ui.elementListView.model()
+        el = LabeledObject("mca", Instance("<device name='p09/mca/1'/>"))
+        el.instance.id = el.id
+        el.instance.key = 1
+        elist.elements[el.id] = el
+        elist.filterElements("p09", True)
+        self.assertEqual(self.names(view), ["mca"])
+        self.assertEqual(el.instance.calls, 1)
+
+        el.name = "mca1"
+        elist.populateElements(el.id)
+        elist.elementChanged(el.instance)
+        self.assertEqual(self.names(view), ["mca1"])
+        self.assertEqual(el.instance.calls, 1)
+
+        el.instance.xml = "<device name='p10/mca/1'/>"
+        el.instance.key = 2
+        elist.elementChanged(el.instance)
+        self.assertEqual(self.names(view), [])
+        self.assertEqual(el.instance.calls, 2)
+
+        el.instance.key = None
+        elist.elementChanged(el.instance)
+        elist.elementChanged(el.instance)
+        self.assertEqual(el.instance.calls, 4)
+
+    # list test
+    # \brief It tests filtering of the element list
+    def test_list(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        elist = ElementList("elements")
+        elist.createGUI()
+        view = elist.ui.elementListView.model()
+        els = [LabeledObject(name, Instance(xml)) for name, xml in [
+            ("pilatus_exposure", "<field name='exposure_time'/>"),
+            ("pilatus_frames", "<record name='nb_frames'/>"),
+            ("mca", "<device name='p09/mca/1'/>")]]
+        for el in els:
+            el.instance.id = el.id
+            elist.elements[el.id] = el
+        self.assertEqual(len(self.names(view)), 3)
+
+        elist.ui.filterLineEdit.setText("pil")
+        self.assertEqual(self.names(view),
+                         ["pilatus_exposure", "pilatus_frames"])
+        elist.ui.filterLineEdit.setText("pil fra")
+        self.assertEqual(self.names(view), ["pilatus_frames"])
+        elist.ui.filterLineEdit.setText("p09")
+        self.assertEqual(self.names(view), [])
+        elist.ui.contentCheckBox.setChecked(True)
+        self.assertEqual(self.names(view), ["mca"])
+
+        el = LabeledObject("p09_motor", Instance("<group/>"))
+        el.instance.id = el.id
+        elist.elements[el.id] = el
+        self.assertEqual(self.names(view), ["mca", "p09_motor"])
+        els[2].instance.xml = "<device name='p10/mca/1'/>"
+        elist.elementChanged(els[2].instance)
+        self.assertEqual(self.names(view), ["p09_motor"])
+        els[1].name = "p09_frames"
+        elist.populateElements(els[1].id)
+        self.assertEqual(self.names(view), ["p09_frames", "p09_motor"])
+        self.assertEqual(elist.currentListElement(), els[1])
+        elist.elements.pop(el.id)
+        self.assertEqual(self.names(view), ["p09_frames"])
+
+        elist.populateElements(els[0].id)
+        self.assertEqual(elist.currentListElement(), None)
+        elist.ui.filterLineEdit.setText("")
+        self.assertEqual(len(self.names(view)), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
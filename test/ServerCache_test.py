@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2017 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+# \package test nexdatas
+# \file ServerCacheTest.py
+# unittests for the local cache of configuration server elements
+#
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+from nxsconfigtool.ServerCache import ServerCache
+from nxsconfigtool.ConfigurationServer import ConfigurationServer
+
+from AsyncServer_test import FakeDevice
+
+
+# test fixture
+class ServerCacheTest(unittest.TestCase):
+
+    # constructor
+    # \param methodName name of the test method
+    def __init__(self, methodName):
+        unittest.TestCase.__init__(self, methodName)
+
+    # test starter
+    # \brief Common set up
+    def setUp(self):
+        print("\nsetting up...")
+        self.directory = tempfile.mkdtemp()
+        self.cache = ServerCache(self.directory)
+
+    # test closer
+    # \brief Common tear down
+    def tearDown(self):
+        print("tearing down ...")
+        shutil.rmtree(self.directory)
+
+    def test_update(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        device = "haso:10000/p09/mcs/r228"
+        self.cache.update(device, "components",
+                          {"cp1": "<definition/>", "cp2": "<definition/>",
+                           "cp3": ""})
+        entries = self.cache.entries(device, "components")
+        self.assertEqual(sorted(entries.keys()), ["cp1", "cp2"])
+        self.assertEqual(entries["cp1"]["hash"], entries["cp2"]["hash"])
+        self.assertEqual(
+            len(os.listdir(os.path.join(self.directory, "objects"))), 1)
+
+        self.assertEqual(ServerCache(self.directory).entries(
+            device, "components"), {})
+        self.cache.flush()
+        self.assertEqual(
+            len(os.listdir(os.path.join(self.directory, "devices"))), 1)
+
+        cache = ServerCache(self.directory)
+        self.assertEqual(
+            cache.load(device, "components"),
+            {"cp1": "<definition/>", "cp2": "<definition/>"})
+        self.assertEqual(cache.load(device, "components", ["cp2", "cp4"]),
+                         {"cp2": "<definition/>"})
+        self.assertEqual(cache.load(device, "datasources"), {})
+        self.assertEqual(cache.load("other", "components"), {})
+
+        cache.update(device, "components", {"cp2": "<group/>"}, ["cp2"])
+        self.assertEqual(cache.load(device, "components"),
+                         {"cp2": "<group/>"})
+        self.assertEqual(cache.prune(), 1)
+        cache.remove(device, "components", ["cp2"])
+        self.assertEqual(cache.load(device, "components"), {})
+        self.assertEqual(cache.prune(), 1)
+
+    def test_fetch(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        device = FakeDevice()
+        server = ConfigurationServer()
+        server.device = "p09/mcs/r228"
+        server.cache = self.cache
+        server._proxy = device
+        server.connected = True
+
+        self.assertEqual(server.fetchComponents(), device.components)
+        self.assertEqual(device.commands.count("Components"), 1)
+
+        device.components["cp3"] = "<definition/>"
+        del device.components["cp1"]
+        self.assertEqual(server.fetchComponents(), device.components)
+        self.assertEqual(device.commands.count("Components"), 2)
+        self.assertEqual(
+            sorted(self.cache.entries("p09/mcs/r228", "components").keys()),
+            ["cp2", "cp3"])
+
+        self.assertEqual(
+            sorted(ServerCache(self.directory).entries(
+                "p09/mcs/r228", "components").keys()),
+            ["cp2", "cp3"])
+
+        path = os.path.join(self.directory, "devices", "p09_mcs_r228.json")
+        os.remove(path)
+        self.assertEqual(server.fetchComponents(), device.components)
+        self.assertTrue(not os.path.exists(path))
+
+        server.storeComponent("cp2", "<definition/>")
+        self.assertEqual(
+            self.cache.load("p09/mcs/r228", "components", ["cp2"]),
+            {"cp2": "<definition/>"})
+        self.assertTrue(not os.path.exists(path))
+        server.close()
+        self.assertTrue(os.path.exists(path))
+
+        server.connected = True
+        device.components["cp2"] = "<group/>"
+        self.assertEqual(server.fetchComponents()["cp2"], "<group/>")
+        self.assertEqual(
+            self.cache.load("p09/mcs/r228", "components", ["cp2"]),
+            {"cp2": "<group/>"})
+
+        device.components["cp2"] = "<definition/>"
+        commands = len(device.commands)
+        self.assertEqual(server.fetchComponents(), device.components)
+        self.assertEqual(device.commands[commands:],
+                         ["AvailableComponents", "Components"])
+        self.assertEqual(
+            self.cache.load("p09/mcs/r228", "components", ["cp2"]),
+            {"cp2": "<definition/>"})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,259 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2017 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+# \package test nexdatas
+# \file ServerCommandsTest.py
+# unittests for the configuration server commands
+#
+import unittest
+import sys
+import time
+import threading
+
+from PyQt5.QtWidgets import QApplication
+
+from nxsconfigtool.AsyncServer import AsyncServer
+from nxsconfigtool.ConfigurationServer import ConfigurationServer
+from nxsconfigtool.LabeledObject import LabeledObject
+from nxsconfigtool.ServerWatcher import ServerWatcher
+from nxsconfigtool.ServerCommands import (
+    ServerDeleteComponent, ServerSetMandatoryComponent, ServerClose)
+
+# Qt application
+app = None
+
+
+# local fake of the configuration server device
+class FakeDevice(object):
+
+    # constructor
+    def __init__(self):
+        # stored components
+        self.components = {"cp1": "<definition/>"}
+        # mandatory components
+        self.mandatory = []
+        # event blocking the commands
+        self.gate = threading.Event()
+        self.gate.set()
+
+    # executes the command
+    # \param command command name
+    # \param argin command argument
+    # \returns command result
+    def command_inout(self, command, argin=None):
+        self.gate.wait()
+        if command == "AvailableComponents":
+            return sorted(self.components.keys())
+        elif command == "Components":
+            return [self.components[name] for name in argin]
+        elif command == "DeleteComponent":
+            self.components.pop(argin)
+        elif command == "SetMandatoryComponents":
+            self.mandatory.extend(argin)
+        elif command == "MandatoryComponents":
+            return list(self.mandatory)
+
+
+# local fake of the device connection manager
+class FakeManager(object):
+
+    # constructor
+    # \param device fake device
+    def __init__(self, device):
+        # fake device
+        self.device = device
+
+    # opens the device connection
+    # \param name device name
+    # \returns fake device
+    def connect(self, name):
+        return self.device
+
+    # closes the device connection
+    # \param name device name
+    def close(self, name):
+        pass
+
+
+# local fake of the element instance
+class FakeInstance(object):
+
+    # constructor
+    def __init__(self):
+        # saved XML
+        self.savedXML = "<definition/>"
+
+
+# local fake of the element list
+class FakeList(object):
+
+    # constructor
+    # \param element current element
+    def __init__(self, element):
+        # current element
+        self.element = element
+        # ids of populated elements
+        self.populated = []
+
+    # provides the current element
+    # \returns current element
+    def currentListElement(self):
+        return self.element
+
+    # records the populated element
+    # \param selectedElement selected element
+    def populateElements(self, selectedElement=None):
+        self.populated.append(selectedElement)
+
+
+# local fake of the main window
+class FakeWindow(object):
+
+    # constructor
+    # \param server configuration server
+    # \param element current component
+    def __init__(self, server, element):
+        # configuration server
+        self.configServer = server
+        # asynchronous client
+        self.asyncServer = AsyncServer(server)
+        # watcher of the asynchronous operations
+        self.serverWatcher = ServerWatcher()
+        # component list
+        self.componentList = FakeList(element)
+        # disable statuses of the server actions
+        self.disabled = []
+
+    # records the status of the server actions
+    # \param status disable status
+    def disableServer(self, status):
+        self.disabled.append(status)
+
+
+# test fixture
+class ServerCommandsTest(unittest.TestCase):
+
+    # constructor
+    # \param methodName name of the test method
+    def __init__(self, methodName):
+        unittest.TestCase.__init__(self, methodName)
+
+    # test starter
+    # \brief Common set up
+    def setUp(self):
+        print("\nsetting up...")
+        if not QApplication.instance():
+            global app
+            app = QApplication([])
+        self.device = FakeDevice()
+        self.server = ConfigurationServer()
+        self.server.manager = FakeManager(self.device)
+        self.server.device = "test/cs/01"
+        self.server.connect()
+        self.element = LabeledObject("cp1", FakeInstance())
+        self.window = FakeWindow(self.server, self.element)
+
+    # test closer
+    # \brief Common tear down
+    def tearDown(self):
+        print("tearing down ...")
+        self.device.gate.set()
+        self.window.asyncServer.shutdown()
+
+    # processes events until the condition is fulfilled
+    # \param condition function without arguments
+    # \returns True if the condition is fulfilled
+    def waitFor(self, condition):
+        end = time.time() + 5
+        while not condition() and time.time() < end:
+            QApplication.processEvents()
+            time.sleep(0.001)
+        return condition()
+
+    # blocks the device with a running fetch
+    # \returns future of the fetch
+    def blockDevice(self):
+        self.device.gate.clear()
+        future = self.window.asyncServer.call("fetchComponents")
+        while not future.running():
+            time.sleep(0.001)
+        return future
+
+    # delete test
+    # \brief It tests if deleting does not wait for a running fetch
+    def test_delete(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        fetch = self.blockDevice()
+        start = time.time()
+        ServerDeleteComponent(self.window).redo()
+        self.assertTrue(time.time() - start < 1)
+        self.assertEqual(self.element.savedName, "cp1")
+        self.assertEqual(self.window.componentList.populated,
+                         [self.element.id])
+
+        self.device.gate.set()
+        self.assertTrue(self.waitFor(
+            lambda: len(self.window.componentList.populated) == 2))
+        self.assertEqual(fetch.result(5), {"cp1": "<definition/>"})
+        self.assertEqual(self.element.savedName, "")
+        self.assertEqual(self.element.instance.savedXML, "")
+        self.assertEqual(self.device.components, {})
+        self.assertEqual(self.window.disabled, [False])
+
+    # mandatory test
+    # \brief It tests if the mandatory component is set in the worker
+    def test_setMandatory(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        self.blockDevice()
+        ServerSetMandatoryComponent(self.window).redo()
+        self.assertEqual(self.device.mandatory, [])
+        self.device.gate.set()
+        self.assertTrue(self.waitFor(lambda: self.window.disabled))
+        self.assertEqual(self.device.mandatory, ["cp1"])
+
+    # close test
+    # \brief It tests if the connection is closed after the running
+    #        operation without blocking
+    def test_close(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        fetch = self.blockDevice()
+        start = time.time()
+        command = ServerClose(self.window)
+        command.redo()
+        self.assertTrue(time.time() - start < 1)
+        self.assertEqual(self.window.disabled, [True])
+        self.assertTrue(fetch.cancelled())
+        self.assertTrue(self.server.connected)
+
+        self.device.gate.set()
+        self.assertTrue(self.waitFor(lambda: not self.server.connected))
+        self.assertTrue(self.window.asyncServer.wait(5))
+
+        command.undo()
+        self.assertTrue(self.waitFor(lambda: len(self.window.disabled) == 2))
+        self.assertEqual(self.window.disabled, [True, False])
+        self.assertTrue(self.server.connected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,185 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2017 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+# \package test nexdatas
+# \file StructureIndexTest.py
+# unittests for the structural search in element documents
+#
+import unittest
+import os
+import sys
+import shutil
+import tempfile
+
+from PyQt5.QtWidgets import QApplication
+
+from nxsconfigtool.StructureIndex import StructureIndex, Query
+from nxsconfigtool.ElementList import ElementList
+from nxsconfigtool.LabeledObject import LabeledObject
+
+# Qt application
+app = None
+
+
+# element instance with XML content
+class Instance(object):
+
+    # constructor
+    # \param xml XML content
+    def __init__(self, xml):
+        # element id
+        self.id = None
+        # XML content
+        self.xml = xml
+
+    # provides the XML content
+    # \returns XML string
+    def get(self):
+        return self.xml
+
+
+# test fixture
+class StructureIndexTest(unittest.TestCase):
+
+    # constructor
+    # \param methodName name of the test method
+    def __init__(self, methodName):
+        unittest.TestCase.__init__(self, methodName)
+
+        # component XML
+        self.xml = "<definition><group type='NXentry' name='entry'>" \
+            "<field name='exp' type='NX_FLOAT'>" \
+            "<datasource type='TANGO' name='mca'>" \
+            "<device name='p09/mca/1' member='attribute'/>" \
+            "<record name='Data'/></datasource></field>" \
+            "<field name='time'>$datasources.timer</field>" \
+            "<!-- comment --><group type='NXdata' name='data'>" \
+            "<link name='exp'/></group></group></definition>"
+        # temporary directory
+        self.directory = None
+
+    # test starter
+    # \brief Common set up
+    def setUp(self):
+        print("\nsetting up...")
+        if not QApplication.instance():
+            global app
+            app = QApplication([])
+        self.directory = tempfile.mkdtemp()
+
+    # test closer
+    # \brief Common tear down
+    def tearDown(self):
+        print("tearing down ...")
+        shutil.rmtree(self.directory)
+
+    # query test
+    # \brief It tests parsing of queries
+    def test_query(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        self.assertEqual(Query("field").steps,
+                         [("descendant", "field", [])])
+        self.assertEqual(
+            Query("/definition//field[@name='a' and text()!='']").steps,
+            [("child", "definition", []),
+             ("descendant", "field",
+              [("attr", "name", "=", "a"), ("text", None, "!=", "")])])
+        self.assertEqual(
+            Query("*[contains(@name, \"x\")][./record]").steps,
+            [("descendant", "*",
+              [("attr", "name", "contains", "x"),
+               ("path", [("child", "record", [])])])])
+        for text in ["", "field[", "field]", "a b", "field[text()]",
+                     "field[@name=a]", "#"]:
+            self.assertRaises(ValueError, Query, text)
+
+    # search test
+    # \brief It tests structural search in documents
+    def test_search(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        index = StructureIndex()
+        index.update("cp", self.xml)
+        index.update("bad", "<definition>")
+        self.assertTrue(index.contains("bad"))
+        entry = [(0, "definition"), (0, "group")]
+        exp = entry + [(0, "field")]
+        time = entry + [(1, "field")]
+
+        for query, paths in [
+                ("field", [exp, time]),
+                ("/definition/group/field", [exp, time]),
+                ("/group", []),
+                ("//field[.//device[@name='p09/mca/1']]", [exp]),
+                ("field[datasource/device[@name='p09/mca/1']]", [exp]),
+                ("field[device]", []),
+                ("field[@type]", [exp]),
+                ("field[@name!='exp']", [time]),
+                ("*[@name='exp']", [exp, entry + [(2, "group"), (0, "link")]]),
+                ("group//link", [entry + [(2, "group"), (0, "link")]]),
+                ("definition/link", []),
+                ("field[contains(text(), 'datasources.')]", [time]),
+                ("datasource[@type='TANGO' and record[@name='Data']]",
+                 [exp + [(0, "datasource")]]),
+                ("definition/*/*", [exp, time, entry + [(2, "group")]])]:
+            self.assertEqual(index.search(query),
+                             [("cp", path) for path in paths])
+
+        index.update("cp", None)
+        self.assertEqual(index.search("field"), [])
+        self.assertTrue(not index.contains("cp"))
+        index.clear()
+        self.assertTrue(not index.contains("bad"))
+
+    # list test
+    # \brief It tests structural search in elements of the list
+    def test_list(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        path = os.path.join(self.directory, "cp2.xml")
+        with open(path, "w") as fl:
+            fl.write("<definition><field name='a'/></definition>")
+        elist = ElementList(self.directory)
+        cp1 = LabeledObject("cp1", Instance(self.xml))
+        cp1.instance.id = cp1.id
+        cp2 = LabeledObject("cp2", None, loader=lambda obj: None,
+                            fileInfo=(path, None, None))
+        elist.elements = {cp1.id: cp1, cp2.id: cp2}
+
+        self.assertEqual(
+            elist.findNodes("field[@name]"),
+            [(cp1.id, [(0, "definition"), (0, "group"), (0, "field")]),
+             (cp1.id, [(0, "definition"), (0, "group"), (1, "field")]),
+             (cp2.id, [(0, "definition"), (0, "field")])])
+        self.assertTrue(not cp2.isLoaded())
+
+        cp1.instance.xml = "<definition/>"
+        self.assertEqual(len(elist.findNodes("field")), 3)
+        elist.elementChanged(cp1.instance)
+        self.assertEqual(elist.findNodes("field"),
+                         [(cp2.id, [(0, "definition"), (0, "field")])])
+        elist.elements.pop(cp2.id)
+        self.assertEqual(elist.findNodes("field"), [])
+        self.assertRaises(ValueError, elist.findNodes, "field[")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2017 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+# \package test nexdatas
+# \file UiLoaderTest.py
+# unittests for the loader of ui forms
+#
+import unittest
+import sys
+
+from PyQt5.QtWidgets import QApplication, QDialog
+
+from nxsconfigtool import UiLoader
+from nxsconfigtool.UiLoader import UiForm, formClass
+
+# Qt application
+app = None
+
+
+# test fixture
+class UiLoaderTest(unittest.TestCase):
+
+    # test starter
+    # \brief Common set up
+    def setUp(self):
+        print("\nsetting up...")
+        if not QApplication.instance():
+            global app
+            app = QApplication([])
+
+    # test closer
+    # \brief Common tear down
+    def tearDown(self):
+        print("tearing down ...")
+
+    # form test
+    # \brief It tests loading forms on the first use
+    def test_form(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        UiLoader._forms.pop("linkdlg", None)
+        form = UiForm("linkdlg")
+        self.assertTrue("linkdlg" not in UiLoader._forms)
+        ui = form()
+        self.assertTrue("linkdlg" in UiLoader._forms)
+        self.assertTrue(isinstance(ui, formClass("linkdlg")))
+        self.assertTrue(formClass("linkdlg") is formClass("linkdlg"))
+
+        dialog = QDialog()
+        ui.setupUi(dialog)
+        self.assertTrue(hasattr(ui, "nameLineEdit"))
+        self.assertEqual(UiLoader._precompiledForm("unknown"), None)
+        self.assertRaises(Exception, formClass, "unknown")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,190 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2017 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+# \package test nexdatas
+# \file UndoStackTest.py
+# unittests for undo stack with limited history
+#
+import unittest
+
+from PyQt5.QtWidgets import QApplication, QUndoCommand
+
+from nxsconfigtool.UndoStack import (UndoStack, formatSize)
+from nxsconfigtool.LabeledObject import LabeledObject
+
+# Qt application
+app = None
+
+
+# values modified by commands
+class Values(object):
+
+    # constructor
+    def __init__(self):
+        # list of values
+        self.values = []
+
+
+# command keeping a value
+class ValueCommand(QUndoCommand):
+
+    # constructor
+    # \param values values modified by the command
+    # \param value value to append
+    def __init__(self, values, value):
+        QUndoCommand.__init__(self)
+        # values modified by the command
+        self.values = values
+        # value to append
+        self.value = value
+
+    # appends the value
+    def redo(self):
+        self.values.values.append(self.value)
+
+    # removes the value
+    def undo(self):
+        self.values.values.pop()
+
+
+# test fixture
+class UndoStackTest(unittest.TestCase):
+
+    # test starter
+    # \brief Common set up
+    def setUp(self):
+        print("\nsetting up...")
+        if not QApplication.instance():
+            global app
+            app = QApplication([])
+
+    # test closer
+    # \brief Common tear down
+    def tearDown(self):
+        print("tearing down ...")
+
+    # constructor test
+    # \brief It tests default settings
+    def test_constructor(self):
+        stack = UndoStack()
+        self.assertEqual(stack.undoLimit(), 0)
+        self.assertEqual(stack.maxBytes, 0)
+        self.assertEqual(stack.usage(), (0, 0))
+        self.assertEqual(stack.receiver, None)
+
+        stack = UndoStack(None, 10, 1000)
+        self.assertEqual(stack.undoLimit(), 10)
+        self.assertEqual(stack.maxBytes, 1000)
+
+    # formatSize test
+    def test_formatSize(self):
+        self.assertEqual(formatSize(10), "10 B")
+        self.assertEqual(formatSize(2048), "2.0 kB")
+        self.assertEqual(formatSize(3 * 1024 * 1024), "3.0 MB")
+        self.assertEqual(formatSize(5 * 1024 ** 3), "5.0 GB")
+
+    # count limit test
+    def test_maxCommands(self):
+        values = Values()
+        stack = UndoStack(None, 3)
+        for i in range(5):
+            stack.push(ValueCommand(values, i))
+        self.assertEqual(values.values, [0, 1, 2, 3, 4])
+        self.assertEqual(stack.count(), 3)
+        self.assertEqual(stack.usage()[0], 3)
+        while stack.canUndo():
+            stack.undo()
+        self.assertEqual(values.values, [0, 1])
+
+    # memory limit test
+    def test_maxBytes(self):
+        values = Values()
+        signals = []
+        stack = UndoStack()
+        stack.memoryChanged.connect(
+            lambda count, size: signals.append((count, size)))
+        command = ValueCommand(values, "x" * 10000)
+        stack.push(command)
+        single = stack.usage()[1]
+        self.assertTrue(single > 10000)
+        self.assertEqual(signals[-1], (1, single))
+
+        values = Values()
+        commands = [ValueCommand(values, "%s" % i * 10000) for i in range(5)]
+        stack = UndoStack(None, 0, int(2.5 * single))
+        for command in commands:
+            stack.push(command)
+        self.assertEqual(len(values.values), 5)
+        self.assertEqual(stack.usage()[0], 2)
+        self.assertTrue(stack.usage()[1] <= 2.5 * single)
+        for command in commands[:3]:
+            self.assertTrue(command.isObsolete())
+            self.assertEqual(command.__dict__, {})
+        for command in commands[3:]:
+            self.assertTrue(not command.isObsolete())
+
+        stack.undo()
+        stack.undo()
+        self.assertEqual(
+            values.values, ["0" * 10000, "1" * 10000, "2" * 10000])
+        self.assertTrue(not stack.canUndo())
+        self.assertEqual(stack.count(), 2)
+        self.assertEqual(stack.usage()[0], 2)
+
+    # the last command is kept test
+    def test_keepLast(self):
+        values = Values()
+        stack = UndoStack(None, 0, 10)
+        stack.push(ValueCommand(values, "x" * 1000))
+        stack.push(ValueCommand(values, "y" * 1000))
+        self.assertEqual(stack.usage()[0], 1)
+        stack.undo()
+        self.assertEqual(values.values, ["x" * 1000])
+        self.assertTrue(not stack.canUndo())
+
+    # estimate test
+    # \brief listed objects are not counted
+    def test_estimate(self):
+        class Receiver(object):
+            pass
+
+        class List(object):
+            pass
+
+        class Instance(object):
+            pass
+
+        class Document(object):
+            def toString(self, _):
+                return "x" * 100000
+
+        instance = Instance()
+        instance.document = Document()
+        obj = LabeledObject("name", instance)
+        receiver = Receiver()
+        receiver.componentList = List()
+        receiver.componentList.elements = {obj.id: obj}
+
+        stack = UndoStack(receiver)
+        command = ValueCommand(Values(), obj)
+        self.assertTrue(stack.estimate(command) < 100000)
+        receiver.componentList.elements = {}
+        self.assertTrue(stack.estimate(command) > 100000)
+
+
+if __name__ == '__main__':
+    unittest.main()
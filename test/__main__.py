@@ -37,10 +37,28 @@ import NodeDlg_test
 import ComponentItem_test
 import ComponentModel_test
 import DomTools_test
+import Component_test
 import RichAttributeDlg_test
 import LinkDlg_test
 import StrategyDlg_test
 import LabeledObject_test
+import FileLoader_test
+import AsyncServer_test
+import ConfigurationServer_test
+import ServerCommands_test
+import ConnectionManager_test
+import ServerCache_test
+import UndoStack_test
+import DependencyGraph_test
+import ElementListModel_test
+import SearchIndex_test
+import StructureIndex_test
+import ElementData_test
+import LazyDocument_test
+import CompactTree_test
+import Merger_test
+import BatchProcessor_test
+import UiLoader_test
 import CommonDataSourceDlg_test
 import DataSourceDlg_test
 import CommonDataSource_test
@@ -78,10 +96,26 @@ def main():
     GroupDlg_test.app = app
     ComponentItem_test.app = app
     DomTools_test.app = app
+    Component_test.app = app
     RichAttributeDlg_test.app = app
     LinkDlg_test.app = app
     StrategyDlg_test.app = app
     LabeledObject_test.app = app
+    FileLoader_test.app = app
+    UndoStack_test.app = app
+    DependencyGraph_test.app = app
+    ElementListModel_test.app = app
+    SearchIndex_test.app = app
+    StructureIndex_test.app = app
+    ElementData_test.app = app
+    LazyDocument_test.app = app
+    CompactTree_test.app = app
+    Merger_test.app = app
+    BatchProcessor_test.app = app
+    UiLoader_test.app = app
+    AsyncServer_test.app = app
+    ConfigurationServer_test.app = app
+    ServerCommands_test.app = app
     CommonDataSourceDlg_test.app = app
     DataSourceDlg_test.app = app
     CommonDataSource_test.app = app
@@ -126,10 +160,50 @@ def main():
 
     suite.addTests(
         unittest.defaultTestLoader.loadTestsFromModule(DomTools_test))
+    suite.addTests(
+        unittest.defaultTestLoader.loadTestsFromModule(Component_test))
 
     suite.addTests(
         unittest.defaultTestLoader.loadTestsFromModule(LabeledObject_test))
 
+    suite.addTests(
+        unittest.defaultTestLoader.loadTestsFromModule(FileLoader_test))
+
+    suite.addTests(
+        unittest.defaultTestLoader.loadTestsFromModule(AsyncServer_test))
+    suite.addTests(
+        unittest.defaultTestLoader.loadTestsFromModule(
+            ConfigurationServer_test))
+    suite.addTests(
+        unittest.defaultTestLoader.loadTestsFromModule(ServerCommands_test))
+    suite.addTests(
+        unittest.defaultTestLoader.loadTestsFromModule(
+            ConnectionManager_test))
+    suite.addTests(
+        unittest.defaultTestLoader.loadTestsFromModule(ServerCache_test))
+    suite.addTests(
+        unittest.defaultTestLoader.loadTestsFromModule(UndoStack_test))
+    suite.addTests(
+        unittest.defaultTestLoader.loadTestsFromModule(DependencyGraph_test))
+    suite.addTests(
+        unittest.defaultTestLoader.loadTestsFromModule(ElementListModel_test))
+    suite.addTests(
+        unittest.defaultTestLoader.loadTestsFromModule(SearchIndex_test))
+    suite.addTests(
+        unittest.defaultTestLoader.loadTestsFromModule(StructureIndex_test))
+    suite.addTests(
+        unittest.defaultTestLoader.loadTestsFromModule(ElementData_test))
+    suite.addTests(
+        unittest.defaultTestLoader.loadTestsFromModule(LazyDocument_test))
+    suite.addTests(
+        unittest.defaultTestLoader.loadTestsFromModule(CompactTree_test))
+    suite.addTests(
+        unittest.defaultTestLoader.loadTestsFromModule(Merger_test))
+    suite.addTests(
+        unittest.defaultTestLoader.loadTestsFromModule(BatchProcessor_test))
+    suite.addTests(
+        unittest.defaultTestLoader.loadTestsFromModule(UiLoader_test))
+
     suite.addTests(
         unittest.defaultTestLoader.loadTestsFromModule(
             CommonDataSourceDlg_test))